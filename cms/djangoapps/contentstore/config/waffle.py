@@ -12,6 +12,10 @@ WAFFLE_NAMESPACE = u'studio'
 # Switches
 ENABLE_ACCESSIBILITY_POLICY_PAGE = u'enable_policy_page'
 
+# Reindex only the blocks changed since the last indexed version of split courses
+# and libraries, rather than walking the whole course, when they are published.
+ENABLE_INCREMENTAL_SEARCH_INDEX = u'enable_incremental_search_index'
+
 
 def waffle():
     """
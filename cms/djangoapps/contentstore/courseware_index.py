@@ -13,13 +13,17 @@ from django.utils.translation import ugettext_lazy
 from search.search_engine_base import SearchEngine
 from six import add_metaclass, string_types, text_type
 
+from contentstore.config.waffle import ENABLE_INCREMENTAL_SEARCH_INDEX, waffle
 from contentstore.course_group_config import GroupConfiguration
+from contentstore.models import SearchIndexedVersion
 from course_modes.models import CourseMode
 from eventtracking import tracker
 from openedx.core.lib.courses import course_image_url
 from xmodule.annotator_mixin import html_to_text
 from xmodule.library_tools import normalize_key_for_search
 from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.exceptions import ItemNotFoundError
+from xmodule.modulestore.split_mongo import BlockKey
 
 # REINDEX_AGE is the default amount of time that we look back for changes
 # that might have happened. If we are provided with a time at which the
@@ -115,6 +119,30 @@ class SearchIndexerBase(object):
         result_ids = [result["data"]["id"] for result in response["results"]]
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
+    @classmethod
+    def _get_structure_diff(cls, modulestore, structure_key, structure):
+        """
+        Returns the diff of the published structure since the version last indexed, if
+        incremental indexing is enabled and the modulestore supports it, or None.
+
+        If the settings of the top-level item changed, they may have changed every item,
+        so None is returned as well.
+        """
+        if not waffle().is_enabled(ENABLE_INCREMENTAL_SEARCH_INDEX):
+            return None
+
+        indexed_version = SearchIndexedVersion.get_version(cls.INDEX_NAME, structure_key)
+        if indexed_version is None:
+            return None
+
+        try:
+            structure_diff = modulestore.get_structure_diff(structure_key, indexed_version)
+        except ItemNotFoundError:
+            return None
+        if structure_diff is None or BlockKey.from_usage_key(structure.location) in structure_diff.settings_changed:
+            return None
+        return structure_diff
+
     @classmethod
     def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
         """
@@ -132,6 +160,11 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        If incremental indexing is enabled and triggered_at is provided, items of
+        split courses and libraries are instead indexed according to the diff of their
+        published structure since the version last indexed: only items added, changed
+        or moved since are loaded and indexed, and only removed items are removed.
+
         Returns:
         Number of items that have been added to the index
         """
@@ -165,7 +198,7 @@ class SearchIndexerBase(object):
             """
             return item.location.version_agnostic().replace(branch=None)
 
-        def prepare_item_index(item, skip_index=False, groups_usage_info=None):
+        def prepare_item_index(item, skip_index=False, groups_usage_info=None, index_children=True):
             """
             Add this item to the items_index and indexed_items list
 
@@ -177,6 +210,8 @@ class SearchIndexerBase(object):
                 This should really only be passed from the recursive child calls when
                 this method has determined that it is safe to do so
 
+            index_children - whether to process the children of the item
+
             Returns:
             item_content_groups - content groups assigned to indexed item
             """
@@ -210,7 +245,7 @@ class SearchIndexerBase(object):
 
             item_id = text_type(cls._id_modifier(item.scope_ids.usage_id))
             indexed_items.add(item_id)
-            if item.has_children:
+            if item.has_children and index_children:
                 # determine if it's okay to skip adding the children herein based upon how recently any may have changed
                 skip_child_index = skip_index or \
                     (triggered_at is not None and (triggered_at - item.subtree_edited_on) > reindex_age)
@@ -248,6 +283,27 @@ class SearchIndexerBase(object):
                 log.warning(u'Could not index item: %s - %r', item.location, err)
                 error_list.append(_(u'Could not index item: {}').format(item.location))
 
+        def prepare_changed_item_index(item, structure_diff, groups_usage_info):
+            """
+            Walk down to the items changed in the given structure diff, adding them
+            to the items_index
+
+            Items that were added, or whose settings or position changed, are indexed
+            along with their descendants, which may inherit their settings.  Items whose
+            content or children only changed are indexed alone.
+            """
+            for child_item in item.get_children():
+                block_key = BlockKey.from_usage_key(child_item.location)
+                if block_key not in items_to_walk or not modulestore.has_published_version(child_item):
+                    continue
+                if block_key in subtrees_to_index:
+                    prepare_item_index(child_item, groups_usage_info=groups_usage_info)
+                    continue
+                if block_key in structure_diff.content_changed:
+                    prepare_item_index(child_item, groups_usage_info=groups_usage_info, index_children=False)
+                prepare_changed_item_index(child_item, structure_diff, groups_usage_info)
+
+        indexed_version = None
         try:
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
                 structure = cls._fetch_top_level(modulestore, structure_key)
@@ -256,11 +312,40 @@ class SearchIndexerBase(object):
                 # First perform any additional indexing from the structure object
                 cls.supplemental_index_information(modulestore, structure)
 
-                # Now index the content
-                for item in structure.get_children():
-                    prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                structure_diff = None
+                if triggered_at is not None:
+                    structure_diff = cls._get_structure_diff(modulestore, structure_key, structure)
+
+                if structure_diff is None:
+                    # Now index the content
+                    for item in structure.get_children():
+                        prepare_item_index(item, groups_usage_info=groups_usage_info)
+                    searcher.index(cls.DOCUMENT_TYPE, items_index)
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                    indexed_version = getattr(structure, 'course_version', None)
+                else:
+                    # Only walk down to the changed items.  The children of split tests are
+                    # indexed with the groups they are assigned to by their split test.
+                    subtrees_to_index = structure_diff.added | structure_diff.settings_changed
+                    items_to_walk = set()
+                    for block_key in subtrees_to_index | structure_diff.content_changed:
+                        ancestors = structure_diff.ancestors(block_key)
+                        subtrees_to_index.update(
+                            ancestor_key for ancestor_key in ancestors if ancestor_key.type == 'split_test'
+                        )
+                        items_to_walk.add(block_key)
+                        items_to_walk.update(ancestors)
+
+                    prepare_changed_item_index(structure, structure_diff, groups_usage_info)
+                    if items_index:
+                        searcher.index(cls.DOCUMENT_TYPE, items_index)
+                    if structure_diff.removed:
+                        # Removing items that were not indexed is a no-op
+                        searcher.remove(cls.DOCUMENT_TYPE, [
+                            text_type(cls._id_modifier(structure_key.make_usage_key(block_key.type, block_key.id)))
+                            for block_key in structure_diff.removed
+                        ])
+                    indexed_version = structure_diff.version
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -273,6 +358,9 @@ class SearchIndexerBase(object):
         if error_list:
             raise SearchIndexingError('Error(s) present during indexing', error_list)
 
+        if indexed_version is not None and waffle().is_enabled(ENABLE_INCREMENTAL_SEARCH_INDEX):
+            SearchIndexedVersion.set_version(cls.INDEX_NAME, structure_key, indexed_version)
+
         return indexed_count["count"]
 
     @classmethod
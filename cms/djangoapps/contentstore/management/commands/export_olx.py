@@ -18,17 +18,16 @@ from __future__ import absolute_import
 
 import os
 import re
-import shutil
 import tarfile
-from tempfile import mkdtemp, mktemp
+from tempfile import mktemp
 from textwrap import dedent
 
 from django.core.management.base import BaseCommand, CommandError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
-from path import Path as path
 
 from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tar_export import TarExportFS
 from xmodule.modulestore.xml_exporter import export_course_to_xml
 
 
@@ -75,16 +74,12 @@ class Command(BaseCommand):
 
 def export_course_to_tarfile(course_key, filename):
     """Exports a course into a tar.gz file"""
-    tmp_dir = mkdtemp()
-    try:
-        course_dir = export_course_to_directory(course_key, tmp_dir)
-        compress_directory(course_dir, filename)
-    finally:
-        shutil.rmtree(tmp_dir, ignore_errors=True)
+    with tarfile.open(filename, 'w:gz') as tar_file:
+        export_course_to_directory(course_key, TarExportFS(tar_file))
 
 
 def export_course_to_directory(course_key, root_dir):
-    """Export course into a directory"""
+    """Export course into a directory of root_dir, a path or a filesystem, and return its name"""
     store = modulestore()
     course = store.get_course(course_key)
     if course is None:
@@ -98,14 +93,4 @@ def export_course_to_directory(course_key, root_dir):
     course_dir = re.sub(r'[^\w\.\-]', replacement_char, course_dir)
 
     export_course_to_xml(store, None, course.id, root_dir, course_dir)
-
-    export_dir = path(root_dir) / course_dir
-    return export_dir
-
-
-def compress_directory(directory, filename):
-    """Compress a directory into a tar.gz file"""
-    mode = 'w:gz'
-    name = path(directory).name
-    with tarfile.open(filename, mode) as tar_file:
-        tar_file.add(directory, arcname=name)
+    return course_dir
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, unicode_literals
+
+from django.db import migrations, models
+from opaque_keys.edx.django.models import CourseKeyField
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contentstore', '0004_remove_push_notification_configmodel_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexedVersion',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('index_name', models.CharField(max_length=64)),
+                ('structure_key', CourseKeyField(max_length=255)),
+                ('version', models.CharField(max_length=255)),
+                ('modified', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchindexedversion',
+            unique_together=set([('index_name', 'structure_key')]),
+        ),
+    ]
@@ -5,7 +5,10 @@ Models for contentstore
 from __future__ import absolute_import
 
 from config_models.models import ConfigurationModel
+from django.db import models
 from django.db.models.fields import TextField
+from opaque_keys.edx.django.models import CourseKeyField
+from six import text_type
 
 
 class VideoUploadConfig(ConfigurationModel):
@@ -23,3 +26,41 @@ class VideoUploadConfig(ConfigurationModel):
     def get_profile_whitelist(cls):
         """Get the list of profiles to include in the encoding download"""
         return [profile for profile in cls.current().profile_whitelist.split(",") if profile]
+
+
+class SearchIndexedVersion(models.Model):
+    """
+    The version of the published structure of a course or library that was
+    last indexed into a search index, so that later publishes only need to
+    index the blocks changed since.
+
+    .. no_pii:
+    """
+    index_name = models.CharField(max_length=64)
+    structure_key = CourseKeyField(max_length=255)
+    version = models.CharField(max_length=255)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta(object):
+        unique_together = (('index_name', 'structure_key'),)
+
+    @classmethod
+    def get_version(cls, index_name, structure_key):
+        """
+        Returns the version of the given course or library last indexed into the
+        given search index, or None.
+        """
+        try:
+            return cls.objects.get(index_name=index_name, structure_key=structure_key).version
+        except cls.DoesNotExist:
+            return None
+
+    @classmethod
+    def set_version(cls, index_name, structure_key, version):
+        """
+        Records the version of the given course or library last indexed into the
+        given search index.
+        """
+        cls.objects.update_or_create(
+            index_name=index_name, structure_key=structure_key, defaults={'version': text_type(version)},
+        )
@@ -10,7 +10,7 @@ import shutil
 import tarfile
 from datetime import datetime
 from math import ceil
-from tempfile import NamedTemporaryFile, mkdtemp
+from tempfile import NamedTemporaryFile
 
 from celery import group
 from celery.task import task
@@ -53,6 +53,7 @@ from xmodule.exceptions import SerializationError
 from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
+from xmodule.modulestore.tar_export import TarExportFS
 from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
 from xmodule.modulestore.xml_importer import import_course_from_xml, import_library_from_xml
 from xmodule.video_module.transcripts_utils import (
@@ -631,20 +632,21 @@ def create_export_tarball(course_module, course_key, context, status=None):
     """
     name = course_module.url_name
     export_file = NamedTemporaryFile(prefix=name + '.', suffix=".tar.gz")
-    root_dir = path(mkdtemp())
 
     try:
-        if isinstance(course_key, LibraryLocator):
-            export_library_to_xml(modulestore(), contentstore(), course_key, root_dir, name)
-        else:
-            export_course_to_xml(modulestore(), contentstore(), course_module.id, root_dir, name)
-
-        if status:
-            status.set_state(u'Compressing')
-            status.increment_completed_steps()
+        # The export is streamed straight into the compressed tarball.
         LOGGER.debug(u'tar file being generated at %s', export_file.name)
-        with tarfile.open(name=export_file.name, mode='w:gz') as tar_file:
-            tar_file.add(root_dir / name, arcname=name)
+        with tarfile.open(fileobj=export_file, mode='w:gz') as tar_file:
+            export_fs = TarExportFS(tar_file)
+            if isinstance(course_key, LibraryLocator):
+                export_library_to_xml(modulestore(), contentstore(), course_key, export_fs, name)
+            else:
+                export_course_to_xml(modulestore(), contentstore(), course_module.id, export_fs, name)
+
+            if status:
+                status.set_state(u'Compressing')
+                status.increment_completed_steps()
+        export_file.seek(0)
 
     except SerializationError as exc:
         LOGGER.exception(u'There was an error exporting %s', course_key, exc_info=True)
@@ -677,9 +679,6 @@ def create_export_tarball(course_module, course_key, context, status=None):
         if status:
             status.fail(json.dumps({'raw_error_msg': context['raw_err_msg']}))
         raise
-    finally:
-        if os.path.exists(root_dir / name):
-            shutil.rmtree(root_dir / name)
 
     return export_file
 
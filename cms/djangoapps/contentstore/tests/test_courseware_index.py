@@ -19,12 +19,14 @@ from pytz import UTC
 from search.search_engine_base import SearchEngine
 from six.moves import range
 
+from contentstore.config.waffle import ENABLE_INCREMENTAL_SEARCH_INDEX, waffle
 from contentstore.courseware_index import (
     CourseAboutSearchIndexer,
     CoursewareSearchIndexer,
     LibrarySearchIndexer,
     SearchIndexingError
 )
+from contentstore.models import SearchIndexedVersion
 from contentstore.signals.handlers import listen_for_course_publish, listen_for_library_update
 from contentstore.tests.utils import CourseTestCase
 from contentstore.utils import reverse_course_url, reverse_usage_url
@@ -444,6 +446,42 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_incremental_index(self, store):
+        """ Make sure that an incremental index only indexes the items changed since the last index """
+        self.publish_item(store, self.vertical.location)
+        with waffle().override(ENABLE_INCREMENTAL_SEARCH_INDEX, True):
+            indexed_count = self.reindex_course(store)
+            self.assertEqual(indexed_count, 4)
+            self.assertIsNotNone(
+                SearchIndexedVersion.get_version(CoursewareSearchIndexer.INDEX_NAME, self.course.id)
+            )
+
+            # Add a new html unit: only it and the vertical whose children changed are indexed
+            ItemFactory.create(
+                parent_location=self.vertical.location,
+                category="html",
+                display_name="Some other content",
+                publish_item=False,
+                modulestore=store,
+            )
+            self.publish_item(store, self.vertical.location)
+            indexed_count = self.index_recent_changes(store, datetime.now(UTC))
+            self.assertEqual(indexed_count, 2)
+            response = self.search()
+            self.assertEqual(response["total"], 5)
+
+            # Delete the original html unit: it is removed from the index
+            self.delete_item(store, self.html_unit.location)
+            self.publish_item(store, self.vertical.location)
+            indexed_count = self.index_recent_changes(store, datetime.now(UTC))
+            self.assertEqual(indexed_count, 1)
+            response = self.search()
+            self.assertEqual(response["total"], 4)
+            self.assertNotIn(
+                six.text_type(self.html_unit.location),
+                [result["data"]["id"] for result in response["results"]],
+            )
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -579,6 +617,10 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
 
+    def test_incremental_index(self):
+        # Only split structures can be diffed
+        self._perform_test_using_store(ModuleStoreEnum.Type.split, self._test_incremental_index)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_course_about_property_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_course_about_property_index)
@@ -896,6 +938,31 @@ class TestLibrarySearchIndexer(MixedWithOptionsTestCase):
         response = self.search()
         self.assertEqual(response["total"], 1)
 
+    def _test_incremental_index(self, store):
+        """ Make sure that an incremental index only indexes the items changed since the last index """
+        library_key = self.library.location.library_key
+        with waffle().override(ENABLE_INCREMENTAL_SEARCH_INDEX, True):
+            self.assertEqual(self.reindex_library(store), 2)
+            self.assertIsNotNone(SearchIndexedVersion.get_version(LibrarySearchIndexer.INDEX_NAME, library_key))
+
+            # Only the updated item is indexed
+            new_data = "I'm new data"
+            self.html_unit1.data = new_data
+            self.update_item(store, self.html_unit1)
+            indexed_count = LibrarySearchIndexer.index(store, library_key, triggered_at=datetime.now(UTC))
+            self.assertEqual(indexed_count, 1)
+            response = self.search()
+            self.assertEqual(response["total"], 2)
+            html_contents = [cont['html_content'] for cont in self._get_contents(response)]
+            self.assertIn(new_data, html_contents)
+
+            # The deleted item is removed
+            self.delete_item(store, self.html_unit2.location)
+            indexed_count = LibrarySearchIndexer.index(store, library_key, triggered_at=datetime.now(UTC))
+            self.assertEqual(indexed_count, 0)
+            response = self.search()
+            self.assertEqual(response["total"], 1)
+
     def _test_not_indexable(self, store):
         """ test not indexable items """
         self.reindex_library(store)
@@ -954,6 +1021,10 @@ class TestLibrarySearchIndexer(MixedWithOptionsTestCase):
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index)
+
 
 class GroupConfigurationSearchMongo(CourseTestCase, MixedWithOptionsTestCase):
     """
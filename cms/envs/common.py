@@ -63,6 +63,12 @@ from lms.envs.common import (
     MEDIA_ROOT,
     MEDIA_URL,
 
+    # Course assets served by the contentserver
+    CONTENTSERVER_MAX_CACHED_ASSET_SIZE,
+    CONTENTSERVER_STREAM_CHUNK_SIZE,
+    CONTENTSERVER_DISK_CACHE_DIR,
+    CONTENTSERVER_DISK_CACHE_MAX_SIZE,
+
     # Lazy Gettext
     _,
 
@@ -142,6 +148,16 @@ BLOCK_STRUCTURES_SETTINGS = dict(
 
     # Backend storage options
     PRUNING_ACTIVE=False,
+
+    # Maximum aggregate size, in bytes of serialized data, of the block
+    # structures held in each process's local cache, when enabled with
+    # the block_structure.local_cache waffle switch.
+    LOCAL_CACHE_MAX_SIZE=100 * 1024 * 1024,
+
+    # Number of seconds for which block structures are held in the
+    # local cache when storage backing is disabled, since their
+    # version is then unknown.
+    LOCAL_CACHE_TIMEOUT=60,
 )
 
 ############################ FEATURE CONFIGURATION #############################
@@ -246,6 +246,15 @@ COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
 
+CONTENTSERVER_MAX_CACHED_ASSET_SIZE = ENV_TOKENS.get(
+    'CONTENTSERVER_MAX_CACHED_ASSET_SIZE', CONTENTSERVER_MAX_CACHED_ASSET_SIZE
+)
+CONTENTSERVER_STREAM_CHUNK_SIZE = ENV_TOKENS.get('CONTENTSERVER_STREAM_CHUNK_SIZE', CONTENTSERVER_STREAM_CHUNK_SIZE)
+CONTENTSERVER_DISK_CACHE_DIR = ENV_TOKENS.get('CONTENTSERVER_DISK_CACHE_DIR', CONTENTSERVER_DISK_CACHE_DIR)
+CONTENTSERVER_DISK_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'CONTENTSERVER_DISK_CACHE_MAX_SIZE', CONTENTSERVER_DISK_CACHE_MAX_SIZE
+)
+
 COMPREHENSIVE_THEME_DIRS = ENV_TOKENS.get('COMPREHENSIVE_THEME_DIRS', COMPREHENSIVE_THEME_DIRS) or []
 
 # COMPREHENSIVE_THEME_LOCALE_PATHS contain the paths to themes locale directories e.g.
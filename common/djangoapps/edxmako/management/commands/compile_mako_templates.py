@@ -0,0 +1,103 @@
+"""
+Django management command to compile the Mako templates ahead of time.
+"""
+
+from __future__ import absolute_import
+
+import logging
+import os
+from textwrap import dedent
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from mako.lookup import TemplateLookup
+
+from edxmako import LOOKUP
+from openedx.core.djangoapps.theming.helpers_dirs import get_theme_base_dirs_from_settings, get_themes_unchecked
+
+log = logging.getLogger(__name__)
+
+# The extensions of the files of the template directories that are Mako templates.
+TEMPLATE_EXTENSIONS = ('.html', '.js', '.txt', '.xml')
+
+
+class Command(BaseCommand):
+    """
+    Compiles the Mako templates of every template namespace, and of every theme, into
+    MAKO_MODULE_DIR, so that they are not compiled by the first requests that render them.
+
+    Templates are compiled into the modules that their lookup would compile them into,
+    so this should be run with the settings of the service being deployed.
+
+    Example usage:
+        $ ./manage.py lms compile_mako_templates --settings=production
+    """
+    help = dedent(__doc__).strip()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--namespace',
+            action='append',
+            dest='namespaces',
+            help='Compile the templates of the given namespace only; can be repeated.',
+        )
+
+    def handle(self, *args, **options):
+        namespaces = options['namespaces'] or sorted(LOOKUP)
+        compiled_count = 0
+        failed_uris = []
+        for namespace in namespaces:
+            lookup = LOOKUP[namespace]
+            for uri in _template_uris(lookup):
+                try:
+                    # Bypass the theme resolution of the lookup, so that the template is compiled
+                    # into the module it is loaded from when it is resolved at its uri.
+                    TemplateLookup.get_template(lookup, uri)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception(u'Could not compile the %s template %s', namespace, uri)
+                    failed_uris.append(uri)
+                else:
+                    compiled_count += 1
+
+        log.info(u'Compiled %d templates, %d could not be compiled.', compiled_count, len(failed_uris))
+
+
+def _template_uris(lookup):
+    """
+    Returns the uris of the templates of the directories of the given lookup, along with the
+    uris of the templates of the themes whose base directory is one of them.
+    """
+    uris = []
+    theme_base_dirs = []
+    if settings.ENABLE_COMPREHENSIVE_THEMING:
+        theme_base_dirs = [
+            os.path.normpath(theme_base_dir)
+            for theme_base_dir in get_theme_base_dirs_from_settings(settings.COMPREHENSIVE_THEME_DIRS)
+        ]
+        for theme in get_themes_unchecked(theme_base_dirs, settings.PROJECT_ROOT):
+            if os.path.normpath(theme.themes_base_dir) not in lookup.directories:
+                continue
+            for template_dir in theme.template_dirs:
+                uris.extend(
+                    os.path.join(theme.template_path, uri) for uri in _directory_template_uris(template_dir)
+                )
+
+    for directory in lookup.directories:
+        # The other templates of theme directories are not looked up at their uri in them.
+        if directory not in theme_base_dirs:
+            uris.extend(_directory_template_uris(directory))
+
+    # A uri is compiled from the first directory it is found in, as it is when looked up.
+    return sorted(set(uris))
+
+
+def _directory_template_uris(directory):
+    """
+    Returns the paths of the templates in the given directory, relative to it.
+    """
+    uris = []
+    for dirpath, __, filenames in os.walk(directory):
+        for filename in filenames:
+            if os.path.splitext(filename)[1] in TEMPLATE_EXTENSIONS:
+                uris.append(os.path.relpath(os.path.join(dirpath, filename), directory))
+    return uris
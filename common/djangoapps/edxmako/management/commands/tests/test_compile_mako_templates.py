@@ -0,0 +1,68 @@
+"""
+Tests for the compile_mako_templates management command.
+"""
+
+from __future__ import absolute_import
+
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
+from mock import patch
+
+from edxmako import LOOKUP, add_lookup
+
+
+class CompileMakoTemplatesTest(TestCase):
+    """
+    Test the compile_mako_templates management command.
+    """
+    def setUp(self):
+        super(CompileMakoTemplatesTest, self).setUp()
+        self.template_dir = tempfile.mkdtemp()
+        self.module_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.template_dir)
+        self.addCleanup(shutil.rmtree, self.module_dir)
+
+        os.makedirs(os.path.join(self.template_dir, 'courseware'))
+        for path, content in (
+            ('main.html', '${1 + 1}'),
+            ('courseware/info.txt', 'Info'),
+            ('courseware/broken.html', '% for'),
+            ('courseware/view.underscore', '<%= name %>'),
+        ):
+            with open(os.path.join(self.template_dir, path), 'w') as template_file:
+                template_file.write(content)
+
+        patcher = patch.dict('edxmako.LOOKUP', {}, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with override_settings(MAKO_MODULE_DIR=self.module_dir):
+            add_lookup('test', self.template_dir)
+
+    def _compiled_modules(self):
+        """
+        Returns the paths of the compiled template modules, relative to the module directory of the lookup.
+        """
+        module_directory = LOOKUP['test'].template_args['module_directory']
+        return sorted(
+            os.path.relpath(os.path.join(dirpath, filename), module_directory)
+            for dirpath, __, filenames in os.walk(module_directory)
+            for filename in filenames
+            if filename.endswith('.py')
+        )
+
+    def test_compile(self):
+        call_command('compile_mako_templates')
+        self.assertEqual(self._compiled_modules(), ['courseware/info.txt.py', 'main.html.py'])
+
+    def test_compile_namespace(self):
+        other_template_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other_template_dir)
+        with override_settings(MAKO_MODULE_DIR=self.module_dir):
+            add_lookup('other', other_template_dir)
+        call_command('compile_mako_templates', namespaces=['other'])
+        self.assertEqual(self._compiled_modules(), [])
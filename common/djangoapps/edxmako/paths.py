@@ -14,7 +14,11 @@ from django.conf import settings
 from mako.exceptions import TopLevelLookupException
 from mako.lookup import TemplateLookup
 
-from openedx.core.djangoapps.theming.helpers import get_template_path_with_theme, strip_site_theme_templates_path
+from openedx.core.djangoapps.theming.helpers import (
+    get_current_site_theme,
+    get_template_path_with_theme,
+    strip_site_theme_templates_path
+)
 from openedx.core.lib.cache_utils import request_cached
 
 from . import LOOKUP
@@ -37,6 +41,9 @@ class DynamicTemplateLookup(TemplateLookup):
     def __init__(self, *args, **kwargs):
         super(DynamicTemplateLookup, self).__init__(*args, **kwargs)
         self.__original_module_directory = self.template_args['module_directory']
+        # The uris that templates were found at, by the site theme and the uri that was looked up,
+        # so that the theme and template directories are only probed once per process.
+        self._resolved_uris = {}
 
     def __repr__(self):
         return "<{0.__class__.__name__} {0.directories}>".format(self)
@@ -61,6 +68,7 @@ class DynamicTemplateLookup(TemplateLookup):
         # Also clear the internal caches. Ick.
         self._collection.clear()
         self._uri_cache.clear()
+        self._resolved_uris.clear()
 
     def adjust_uri(self, uri, relativeto):
         """
@@ -94,7 +102,20 @@ class DynamicTemplateLookup(TemplateLookup):
 
         If still unable to find a template, it will fallback to the default template directories after stripping off
         the prefix path to theme.
+
+        The uri that the template is found at is cached for the site theme, so later lookups of
+        the same uri for the same theme get the template straight from the compiled templates.
         """
+        site_theme = get_current_site_theme()
+        cache_key = (
+            site_theme.theme_dir_name if site_theme else None,
+            isinstance(uri, TopLevelTemplateURI),
+            uri,
+        )
+        resolved_uri = self._resolved_uris.get(cache_key)
+        if resolved_uri is not None:
+            return super(DynamicTemplateLookup, self).get_template(resolved_uri)
+
         if isinstance(uri, TopLevelTemplateURI):
             template = self._get_toplevel_template(uri)
         else:
@@ -104,6 +125,7 @@ class DynamicTemplateLookup(TemplateLookup):
             except TopLevelLookupException:
                 template = self._get_toplevel_template(uri)
 
+        self._resolved_uris[cache_key] = template.uri
         return template
 
     def _get_toplevel_template(self, uri):
@@ -1,5 +1,8 @@
 from __future__ import absolute_import
 
+import os
+import shutil
+import tempfile
 import unittest
 
 import ddt
@@ -78,6 +81,49 @@ class AddLookupTests(TestCase):
         self.assertTrue(dirs[0].endswith('management'))
 
 
+class DynamicTemplateLookupTests(TestCase):
+    """
+    Test the caching of the uris that templates are found at by the `DynamicTemplateLookup`.
+    """
+    def setUp(self):
+        super(DynamicTemplateLookupTests, self).setUp()
+        self.template_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.template_dir)
+        with open(os.path.join(self.template_dir, 'test.html'), 'w') as template_file:
+            template_file.write('Test template')
+
+    @patch.dict('edxmako.LOOKUP', {}, clear=True)
+    def test_resolved_uri_cached(self):
+        add_lookup('test', self.template_dir)
+        lookup = LOOKUP['test']
+        with patch('edxmako.paths.get_template_path_with_theme', side_effect=lambda uri: uri) as mock_themed_path:
+            first = lookup.get_template('test.html')
+            second = lookup.get_template('test.html')
+        self.assertIs(first, second)
+        mock_themed_path.assert_called_once_with('test.html')
+
+    @patch.dict('edxmako.LOOKUP', {}, clear=True)
+    def test_resolved_uri_cached_per_theme(self):
+        add_lookup('test', self.template_dir)
+        lookup = LOOKUP['test']
+        with patch('edxmako.paths.get_template_path_with_theme', side_effect=lambda uri: uri) as mock_themed_path:
+            for theme_dir_name in ('red-theme', 'blue-theme', 'red-theme'):
+                site_theme = Mock(theme_dir_name=theme_dir_name)
+                with patch('edxmako.paths.get_current_site_theme', return_value=site_theme):
+                    lookup.get_template('test.html')
+        self.assertEqual(mock_themed_path.call_count, 2)
+
+    @patch.dict('edxmako.LOOKUP', {}, clear=True)
+    def test_add_directory_clears_cache(self):
+        add_lookup('test', self.template_dir)
+        lookup = LOOKUP['test']
+        with patch('edxmako.paths.get_template_path_with_theme', side_effect=lambda uri: uri) as mock_themed_path:
+            lookup.get_template('test.html')
+            add_lookup('test', tempfile.gettempdir())
+            lookup.get_template('test.html')
+        self.assertEqual(mock_themed_path.call_count, 2)
+
+
 class MakoRequestContextTest(TestCase):
     """
     Test MakoMiddleware.
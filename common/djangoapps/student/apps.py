@@ -7,7 +7,7 @@ import os
 
 from django.apps import AppConfig
 from django.contrib.auth.signals import user_logged_in
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 
 
 class StudentConfig(AppConfig):
@@ -26,6 +26,27 @@ class StudentConfig(AppConfig):
         from .signals.receivers import on_user_updated
         pre_save.connect(on_user_updated, sender=User)
 
+        # Invalidate the dashboard summaries of users when their statuses change
+        from openedx.core.djangoapps.signals.signals import COURSE_CERT_CHANGED, COURSE_GRADE_CHANGED
+        from .models import CourseEnrollment, CourseEnrollmentAttribute
+        from .signals.receivers import (
+            invalidate_dashboard_summary_of_enrollment_user,
+            invalidate_dashboard_summary_of_instance_user,
+            invalidate_dashboard_summary_of_instance_username,
+            invalidate_dashboard_summary_of_user
+        )
+        COURSE_CERT_CHANGED.connect(invalidate_dashboard_summary_of_user)
+        COURSE_GRADE_CHANGED.connect(invalidate_dashboard_summary_of_user)
+        post_save.connect(invalidate_dashboard_summary_of_instance_user, sender=CourseEnrollment)
+        post_delete.connect(invalidate_dashboard_summary_of_instance_user, sender=CourseEnrollment)
+        post_save.connect(invalidate_dashboard_summary_of_enrollment_user, sender=CourseEnrollmentAttribute)
+        for verification_model in ('SoftwareSecurePhotoVerification', 'SSOVerification', 'ManualVerification'):
+            post_save.connect(
+                invalidate_dashboard_summary_of_instance_user, sender='verify_student.' + verification_model
+            )
+        for credit_model in ('CreditEligibility', 'CreditRequest'):
+            post_save.connect(invalidate_dashboard_summary_of_instance_username, sender='credit.' + credit_model)
+
         # The django-simple-history model on CourseEnrollment creates performance
         # problems in testing, we mock it here so that the mock impacts all tests.
         if os.environ.get('DISABLE_COURSEENROLLMENT_HISTORY', False):
@@ -0,0 +1,61 @@
+"""
+Materialized summaries of the statuses of learners shown on their dashboard.
+
+Computing the certificate, credit and verification statuses of a learner in
+each of their enrollments takes several queries per enrollment, so the summary
+of these statuses is cached per learner, for the enrollments it was computed
+for.  It is invalidated by the signals of the changes to the enrollments,
+certificates, grades, credit and verifications of the learner, once their
+transaction commits.  Changes to courses, and the passing of deadlines, are
+picked up when the summary expires.
+"""
+from __future__ import absolute_import
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from openedx.core.djangoapps.waffle_utils import WaffleSwitch
+from student import STUDENT_WAFFLE_NAMESPACE
+
+# Waffle switch for caching the dashboard summaries of learners
+DASHBOARD_SUMMARY_SWITCH = WaffleSwitch(STUDENT_WAFFLE_NAMESPACE, 'materialize_dashboard_summary')
+
+
+def dashboard_summary_cache_key(username):
+    """
+    Returns the cache key of the dashboard summary of the given learner.
+    """
+    return u'student.dashboard_summary.{}'.format(username)
+
+
+def get_dashboard_summary(user, enrollments_key, build_summary):
+    """
+    Returns the dashboard summary of the given learner, for the enrollments identified
+    by the given key, from the cache if it is there, or built by calling build_summary.
+    """
+    if not DASHBOARD_SUMMARY_SWITCH.is_enabled():
+        return build_summary()
+
+    cache_key = dashboard_summary_cache_key(user.username)
+    cached = cache.get(cache_key)
+    if cached is not None and cached['enrollments_key'] == enrollments_key:
+        return cached['summary']
+
+    summary = build_summary()
+    cache.set(
+        cache_key,
+        {'enrollments_key': enrollments_key, 'summary': summary},
+        settings.DASHBOARD_SUMMARY_CACHE_TIMEOUT,
+    )
+    return summary
+
+
+def invalidate_dashboard_summary(username):
+    """
+    Deletes the cached dashboard summary of the given learner, once the current
+    transaction commits, so that a summary built by another request before the
+    changes of the transaction are visible is not left in the cache.
+    """
+    cache_key = dashboard_summary_cache_key(username)
+    transaction.on_commit(lambda: cache.delete(cache_key))
@@ -7,6 +7,7 @@ from django.conf import settings
 from django.utils import timezone
 
 from openedx.core.djangoapps.user_api.config.waffle import PREVENT_AUTH_USER_WRITES, waffle
+from student.dashboard_summary import invalidate_dashboard_summary
 from student.helpers import USERNAME_EXISTS_MSG_FMT, AccountValidationError
 from student.models import is_email_retired, is_username_retired
 
@@ -50,3 +51,31 @@ def on_user_updated(sender, instance, **kwargs):  # pylint: disable=unused-argum
                 EMAIL_EXISTS_MSG_FMT.format(username=instance.email),
                 field="email"
             )
+
+
+def invalidate_dashboard_summary_of_user(sender, user, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the dashboard summary of the user whose certificate or grade changed.
+    """
+    invalidate_dashboard_summary(user.username)
+
+
+def invalidate_dashboard_summary_of_instance_user(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the dashboard summary of the user of the saved or deleted enrollment or verification.
+    """
+    invalidate_dashboard_summary(instance.user.username)
+
+
+def invalidate_dashboard_summary_of_instance_username(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the dashboard summary of the user of the saved credit eligibility or request.
+    """
+    invalidate_dashboard_summary(instance.username)
+
+
+def invalidate_dashboard_summary_of_enrollment_user(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the dashboard summary of the user of the enrollment of the saved enrollment attribute.
+    """
+    invalidate_dashboard_summary(instance.enrollment.user.username)
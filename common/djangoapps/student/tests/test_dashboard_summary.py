@@ -0,0 +1,108 @@
+"""
+Tests for the materialized dashboard summaries of learners.
+"""
+from __future__ import absolute_import
+
+from django.core.cache import cache
+from django.test import TestCase
+from mock import Mock, patch
+
+from lms.djangoapps.verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
+from openedx.core.djangoapps.credit.tests.factories import (
+    CreditCourseFactory,
+    CreditEligibilityFactory,
+    CreditProviderFactory,
+    CreditRequestFactory
+)
+from openedx.core.djangoapps.signals.signals import COURSE_CERT_CHANGED, COURSE_GRADE_CHANGED
+from openedx.core.djangolib.testing.utils import skip_unless_lms
+from student.dashboard_summary import (
+    DASHBOARD_SUMMARY_SWITCH,
+    dashboard_summary_cache_key,
+    get_dashboard_summary,
+    invalidate_dashboard_summary
+)
+from student.tests.factories import CourseEnrollmentFactory, UserFactory
+
+
+@patch('student.dashboard_summary.transaction.on_commit', lambda func: func())
+class DashboardSummaryTest(TestCase):
+    """
+    Tests the caching and invalidation of dashboard summaries.
+    """
+    def setUp(self):
+        super(DashboardSummaryTest, self).setUp()
+        cache.clear()
+        self.user = UserFactory()
+        self.build_summary = Mock(return_value={'cert_statuses': {}})
+
+    def _is_cached(self):
+        """
+        Returns whether the dashboard summary of the user is cached.
+        """
+        return cache.get(dashboard_summary_cache_key(self.user.username)) is not None
+
+    def _cache_summary(self):
+        """
+        Caches the dashboard summary of the user.
+        """
+        with DASHBOARD_SUMMARY_SWITCH.override(active=True):
+            get_dashboard_summary(self.user, 'enrollments', self.build_summary)
+        self.assertTrue(self._is_cached())
+
+    def test_switch_disabled(self):
+        get_dashboard_summary(self.user, 'enrollments', self.build_summary)
+        get_dashboard_summary(self.user, 'enrollments', self.build_summary)
+        self.assertEqual(self.build_summary.call_count, 2)
+        self.assertFalse(self._is_cached())
+
+    def test_cached(self):
+        with DASHBOARD_SUMMARY_SWITCH.override(active=True):
+            summary = get_dashboard_summary(self.user, 'enrollments', self.build_summary)
+            self.assertEqual(get_dashboard_summary(self.user, 'enrollments', self.build_summary), summary)
+        self.build_summary.assert_called_once_with()
+
+    def test_enrollments_changed(self):
+        with DASHBOARD_SUMMARY_SWITCH.override(active=True):
+            get_dashboard_summary(self.user, 'enrollments', self.build_summary)
+            get_dashboard_summary(self.user, 'other enrollments', self.build_summary)
+            get_dashboard_summary(self.user, 'other enrollments', self.build_summary)
+        self.assertEqual(self.build_summary.call_count, 2)
+
+    def test_invalidated_by_enrollment(self):
+        self._cache_summary()
+        CourseEnrollmentFactory(user=self.user)
+        self.assertFalse(self._is_cached())
+
+    def test_invalidated_by_certificate_and_grade(self):
+        for signal in (COURSE_CERT_CHANGED, COURSE_GRADE_CHANGED):
+            self._cache_summary()
+            # Other receivers of the signals are not given the arguments they need
+            signal.send_robust(sender=None, user=self.user, course_key=None)
+            self.assertFalse(self._is_cached())
+
+    @skip_unless_lms
+    def test_invalidated_by_verification(self):
+        self._cache_summary()
+        SoftwareSecurePhotoVerificationFactory(user=self.user)
+        self.assertFalse(self._is_cached())
+
+    @skip_unless_lms
+    def test_invalidated_by_credit(self):
+        course = CreditCourseFactory()
+        self._cache_summary()
+        CreditEligibilityFactory(username=self.user.username, course=course)
+        self.assertFalse(self._is_cached())
+
+        self._cache_summary()
+        CreditRequestFactory(username=self.user.username, course=course, provider=CreditProviderFactory())
+        self.assertFalse(self._is_cached())
+
+    def test_invalidated_on_commit(self):
+        self._cache_summary()
+        with patch('student.dashboard_summary.transaction.on_commit') as mock_on_commit:
+            invalidate_dashboard_summary(self.user.username)
+        # The summary is only deleted once the transaction commits.
+        self.assertTrue(self._is_cached())
+        mock_on_commit.call_args[0][0]()
+        self.assertFalse(self._is_cached())
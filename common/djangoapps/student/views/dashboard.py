@@ -47,6 +47,7 @@ from openedx.core.djangolib.markup import HTML, Text
 from openedx.features.enterprise_support.api import get_dashboard_consent_notification
 from shoppingcart.api import order_history
 from shoppingcart.models import CourseRegistrationCode, DonationConfiguration
+from student.dashboard_summary import get_dashboard_summary
 from student.helpers import cert_info, check_verify_status_by_course, get_resume_urls_for_enrollments
 from student.models import (
     AccountRecovery,
@@ -526,6 +527,50 @@ def _credit_statuses(user, course_enrollments):
     return statuses
 
 
+def _dashboard_summary(request, course_enrollments, course_entitlements):
+    """
+    Returns the summary of the certificate, credit and verification statuses of the
+    current user in the given enrollments, which is cached if materialized dashboard
+    summaries are enabled.
+
+    Returns: dict with keys:
+        * cert_statuses: The certificate info of the user in each course.
+        * credit_statuses: The credit statuses of the user, see `_credit_statuses`.
+        * verification_status: The status of the ID verification of the user.
+        * verify_status_by_course: The verification status of the user in each course.
+    """
+    user = request.user
+    enrollments_key = (
+        request.site.id,
+        tuple((text_type(enrollment.course_id), enrollment.mode) for enrollment in course_enrollments),
+    )
+
+    def build_summary():
+        """
+        Computes the summary of the statuses of the user.
+        """
+        # Credit statuses are not shown for the enrollments of fulfilled entitlements
+        fulfilled_entitlement_course_ids = {
+            entitlement.enrollment_course_run.course_id
+            for entitlement in course_entitlements
+            if entitlement.enrollment_course_run is not None
+        }
+        return {
+            'cert_statuses': {
+                enrollment.course_id: cert_info(user, enrollment.course_overview)
+                for enrollment in course_enrollments
+            },
+            'credit_statuses': _credit_statuses(user, [
+                enrollment for enrollment in course_enrollments
+                if enrollment.course_id not in fulfilled_entitlement_course_ids
+            ]),
+            'verification_status': IDVerificationService.user_status(user),
+            'verify_status_by_course': check_verify_status_by_course(user, course_enrollments),
+        }
+
+    return get_dashboard_summary(user, enrollments_key, build_summary)
+
+
 def show_load_all_courses_link(user, course_limit, course_enrollments):
     """
     By default dashboard will show limited courses based on the course limit
@@ -750,11 +795,9 @@ def student_dashboard(request):
     #
     # If a course is not included in this dictionary,
     # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
-    cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview)
-        for enrollment in course_enrollments
-    }
+    dashboard_summary = _dashboard_summary(request, course_enrollments, course_entitlements)
+    verify_status_by_course = dashboard_summary['verify_status_by_course']
+    cert_statuses = dashboard_summary['cert_statuses']
 
     # only show email settings for Mongo course and when bulk email is turned on
     show_email_settings_for = frozenset(
@@ -765,7 +808,7 @@ def student_dashboard(request):
 
     # Verification Attempts
     # Used to generate the "you must reverify for course x" banner
-    verification_status = IDVerificationService.user_status(user)
+    verification_status = dashboard_summary['verification_status']
     verification_errors = get_verification_error_reasons_for_display(verification_status['error'])
 
     # Gets data for midcourse reverifications, if any are necessary or have failed
@@ -852,7 +895,7 @@ def student_dashboard(request):
         'show_courseware_links_for': show_courseware_links_for,
         'all_course_modes': course_mode_info,
         'cert_statuses': cert_statuses,
-        'credit_statuses': _credit_statuses(user, course_enrollments),
+        'credit_statuses': dashboard_summary['credit_statuses'],
         'show_email_settings_for': show_email_settings_for,
         'reverifications': reverifications,
         'verification_display': verification_status['should_display'],
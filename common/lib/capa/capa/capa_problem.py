@@ -18,6 +18,7 @@ from __future__ import absolute_import
 import logging
 import os.path
 import re
+import threading
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
@@ -74,8 +75,55 @@ html_problem_semantics = [
     "openendedrubric",
 ]
 
+# The maximum number of compiled problem templates cached per process.
+MAX_CACHED_PROBLEM_TEMPLATES = 512
+
+_problem_templates = OrderedDict()
+_problem_templates_lock = threading.Lock()
+
 log = logging.getLogger(__name__)
 
+
+class ProblemTemplate(object):
+    """
+    The seed-independent compilation of the XML of a capa problem, shared by
+    all the LoncapaProblems of the same problem id and problem text.
+
+    Attributes:
+        problem_text (string): the problem text, with startouttext and endouttext converted.
+        tree (Element): the parsed problem, with its includes inserted and the ids and
+            accessibility transformations of its responses and inputs applied.
+        responses (list): a (response element, input elements) tuple for each response
+            of the tree, in order.
+        problem_data (dict): the accessibility data of the inputs of the problem.
+    """
+    def __init__(self, problem_text, tree, responses, problem_data):
+        self.problem_text = problem_text
+        self.tree = tree
+        self.responses = responses
+        self.problem_data = problem_data
+
+    def clone(self):
+        """
+        Returns a copy of the tree of the template, the responses of the copy and
+        a copy of the problem data, for a LoncapaProblem to transform in place.
+        """
+        tree = deepcopy(self.tree)
+        copies = dict(zip(self.tree.iter(), tree.iter()))
+        responses = [
+            (copies[response], [copies[inputfield] for inputfield in inputfields])
+            for response, inputfields in self.responses
+        ]
+        return tree, responses, deepcopy(self.problem_data)
+
+
+def clear_problem_templates():
+    """
+    Clears the compiled problem templates cached by this process.
+    """
+    with _problem_templates_lock:
+        _problem_templates.clear()
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -179,21 +227,11 @@ class LoncapaProblem(object):
         self.done = state.get('done', False)
         self.input_state = state.get('input_state', {})
 
-        # Convert startouttext and endouttext to proper <text></text>
-        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
-        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
-        self.problem_text = problem_text
-
-        # parse problem XML file into an element tree
-        if isinstance(problem_text, six.text_type):
-            # etree chokes on Unicode XML with an encoding declaration
-            problem_text = problem_text.encode('utf-8')
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        # Parse and pre-process the problem XML, or reuse the template of a previous parse
+        # of the same problem, and take a copy of it to transform in place.
+        template = self._get_template(problem_text)
+        self.problem_text = template.problem_text
+        self.tree, responses, self.problem_data = template.clone()
 
         # construct script processor context (eg for customresponse problems)
         if minimal_init:
@@ -201,11 +239,9 @@ class LoncapaProblem(object):
         else:
             self.context = self._extract_context(self.tree)
 
-        # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
-        # transformations.  This also creates the dict (self.responders) of Response
-        # instances for each question in the problem. The dict has keys = xml subtree of
-        # Response, values = Response instance
-        self.problem_data = self._preprocess_problem(self.tree, minimal_init)
+        # Create the dict (self.responders) of Response instances for each question in
+        # the problem. The dict has keys = xml subtree of Response, values = Response instance
+        self._preprocess_problem(self.tree, responses, minimal_init)
 
         if not minimal_init:
             if not self.student_answers:  # True when student_answers is an empty dict
@@ -758,12 +794,62 @@ class LoncapaProblem(object):
 
     # ======= Private Methods Below ========
 
-    def _process_includes(self):
+    def _get_template(self, problem_text):
+        """
+        Returns the ProblemTemplate of the given problem text, from the cache of this
+        process if it was compiled before.
+        """
+        key = (self.problem_id, problem_text)
+        with _problem_templates_lock:
+            template = _problem_templates.get(key)
+            if template is not None:
+                _problem_templates[key] = _problem_templates.pop(key)
+                return template
+
+        template, cacheable = self._compile_template(problem_text)
+        if cacheable:
+            with _problem_templates_lock:
+                _problem_templates[key] = template
+                while len(_problem_templates) > MAX_CACHED_PROBLEM_TEMPLATES:
+                    _problem_templates.popitem(last=False)
+        return template
+
+    def _compile_template(self, problem_text):
+        """
+        Parses the given problem text and applies the transformations of its XML which do
+        not depend on the seed nor the state of the problem.
+
+        Returns the ProblemTemplate, and whether it may be cached; problems with
+        <include> tags are not, since the files they include may change.
+        """
+        # Convert startouttext and endouttext to proper <text></text>
+        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
+        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
+        template_text = problem_text
+
+        # parse problem XML file into an element tree
+        if isinstance(problem_text, six.text_type):
+            # etree chokes on Unicode XML with an encoding declaration
+            problem_text = problem_text.encode('utf-8')
+        tree = etree.XML(problem_text)
+
+        self.make_xml_compatible(tree)
+
+        # handle any <include file="foo"> tags
+        cacheable = tree.find('.//include') is None
+        self._process_includes(tree)
+
+        # Assign ids to the responses and their inputs, and apply their accessibility
+        # transformations.
+        responses, problem_data = self._annotate_responses(tree)
+        return ProblemTemplate(template_text, tree, responses, problem_data), cacheable
+
+    def _process_includes(self, tree):
         """
         Handle any <include file="foo"> tags by reading in the specified file and inserting it
-        into our XML tree.  Fail gracefully if debugging.
+        into the given XML tree.  Fail gracefully if debugging.
         """
-        includes = self.tree.findall('.//include')
+        includes = tree.findall('.//include')
         for inc in includes:
             filename = inc.get('file') if six.PY3 else inc.get('file').decode('utf-8')
             if filename is not None:
@@ -1021,20 +1107,19 @@ class LoncapaProblem(object):
 
         return tree
 
-    def _preprocess_problem(self, tree, minimal_init):  # private
+    def _annotate_responses(self, tree):  # private
         """
         Assign IDs to all the responses
         Assign sub-IDs to all entries (textline, schematic, etc.)
-        Annoted correctness and value
+        Annotate accessibility data
         In-place transformation
 
-        Also create capa Response instances for each responsetype and save as self.responders
-
-        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        Returns a list of (response, inputfields) tuples, and the dict of accessibility data
+        of the inputs.
         """
         response_id = 1
         problem_data = {}
-        self.responders = {}
+        responses = []
         for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
             responsetype_id = self.problem_id + "_" + str(response_id)
             # create and save ID for this response
@@ -1056,7 +1141,19 @@ class LoncapaProblem(object):
                 answer_id = answer_id + 1
 
             self.response_a11y_data(response, inputfields, responsetype_id, problem_data)
+            responses.append((response, inputfields))
 
+        return responses, problem_data
+
+    def _preprocess_problem(self, tree, responses, minimal_init):  # private
+        """
+        Create capa Response instances for each of the given (response, inputfields) of the
+        tree and save as self.responders
+
+        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        """
+        self.responders = {}
+        for response, inputfields in responses:
             # instantiate capa Response
             responsetype_cls = responsetypes.registry.get_class_for_tag(response.tag)
             responder = responsetype_cls(
@@ -1085,8 +1182,6 @@ class LoncapaProblem(object):
                 solution.attrib['id'] = "%s_solution_%i" % (self.problem_id, solution_id)
                 solution_id += 1
 
-        return problem_data
-
     def response_a11y_data(self, response, inputfields, responsetype_id, problem_data):
         """
         Construct data to be used for a11y.
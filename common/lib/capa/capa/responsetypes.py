@@ -52,7 +52,9 @@ from openedx.core.lib import edx_six
 from . import correctmap
 from .registry import TagRegistry
 from .util import (
+    CompiledFormula,
     compare_with_tolerance,
+    compile_formula,
     contextualize_text,
     convert_files_to_filenames,
     default_tolerance,
@@ -1517,6 +1519,7 @@ class NumericalResponse(LoncapaResponse):
         self.tolerance = default_tolerance
         self.range_tolerance = False
         self.answer_range = self.inclusion = None
+        self.staff_answer_values = {}
         super(NumericalResponse, self).__init__(*args, **kwargs)
 
     def setup_response(self):
@@ -1559,7 +1562,12 @@ class NumericalResponse(LoncapaResponse):
 
         Use `evaluator` for this, but for backward compatability, try the
         built-in method `complex` (which used to be the standard).
+
+        The values of the staff answers are kept for the later grading of this problem.
         """
+        if answer in self.staff_answer_values:
+            return self.staff_answer_values[answer]
+
         try:
             correct_ans = complex(answer)
         except ValueError:
@@ -1575,6 +1583,7 @@ class NumericalResponse(LoncapaResponse):
                     _("There was a problem with the staff answer to this problem.")
                 )
 
+        self.staff_answer_values[answer] = correct_ans
         return correct_ans
 
     def get_score(self, student_answers):
@@ -3083,72 +3092,72 @@ class FormulaResponse(LoncapaResponse):
         )
         return CorrectMap(self.answer_id, correctness)
 
-    def tupleize_answers(self, answer, var_dict_list):
+    def tupleize_answers(self, answer, var_dict_list, cached=False):
         """
         Takes in an answer and a list of dictionaries mapping variables to values.
         Each dictionary represents a test case for the answer.
         Returns a tuple of formula evaluation results.
+
+        The answer is parsed once, and evaluated for each test case.  If `cached`
+        is True, the parsed answer is reused from, and kept in, the cache of the
+        formulas of problems; only pass it for the answers of the problem.
         """
         _ = edx_six.get_gettext(self.capa_system.i18n)
 
-        out = []
-        for var_dict in var_dict_list:
-            try:
-                out.append(evaluator(
-                    var_dict,
-                    dict(),
-                    answer,
-                    case_sensitive=self.case_sensitive,
-                ))
-            except UndefinedVariable as err:
-                log.debug(
-                    'formularesponse: undefined variable in formula=%s',
-                    cgi.escape(answer)
-                )
-                raise StudentInputError(
-                    err.args[0]
-                )
-            except UnmatchedParenthesis as err:
+        try:
+            if cached:
+                formula = compile_formula(answer, self.case_sensitive)
+            else:
+                formula = CompiledFormula(answer, self.case_sensitive)
+            return formula.evaluate_samples(var_dict_list)
+        except UndefinedVariable as err:
+            log.debug(
+                'formularesponse: undefined variable in formula=%s',
+                cgi.escape(answer)
+            )
+            raise StudentInputError(
+                err.args[0]
+            )
+        except UnmatchedParenthesis as err:
+            log.debug(
+                'formularesponse: unmatched parenthesis in formula=%s',
+                cgi.escape(answer)
+            )
+            raise StudentInputError(
+                err.args[0]
+            )
+        except ValueError as err:
+            if 'factorial' in text_type(err):
+                # This is thrown when fact() or factorial() is used in a formularesponse answer
+                #   that tests on negative and/or non-integer inputs
+                # text_type(err) will be: `factorial() only accepts integral values` or
+                # `factorial() not defined for negative values`
                 log.debug(
-                    'formularesponse: unmatched parenthesis in formula=%s',
+                    ('formularesponse: factorial function used in response '
+                     'that tests negative and/or non-integer inputs. '
+                     'Provided answer was: %s'),
                     cgi.escape(answer)
                 )
                 raise StudentInputError(
-                    err.args[0]
+                    _("Factorial function not permitted in answer "
+                      "for this problem. Provided answer was: "
+                      "{bad_input}").format(bad_input=cgi.escape(answer))
                 )
-            except ValueError as err:
-                if 'factorial' in text_type(err):
-                    # This is thrown when fact() or factorial() is used in a formularesponse answer
-                    #   that tests on negative and/or non-integer inputs
-                    # text_type(err) will be: `factorial() only accepts integral values` or
-                    # `factorial() not defined for negative values`
-                    log.debug(
-                        ('formularesponse: factorial function used in response '
-                         'that tests negative and/or non-integer inputs. '
-                         'Provided answer was: %s'),
-                        cgi.escape(answer)
-                    )
-                    raise StudentInputError(
-                        _("Factorial function not permitted in answer "
-                          "for this problem. Provided answer was: "
-                          "{bad_input}").format(bad_input=cgi.escape(answer))
-                    )
-                # If non-factorial related ValueError thrown, handle it the same as any other Exception
-                log.debug('formularesponse: error %s in formula', err)
-                raise StudentInputError(
-                    _("Invalid input: Could not parse '{bad_input}' as a formula.").format(
-                        bad_input=cgi.escape(answer)
-                    )
+            # If non-factorial related ValueError thrown, handle it the same as any other Exception
+            log.debug('formularesponse: error %s in formula', err)
+            raise StudentInputError(
+                _("Invalid input: Could not parse '{bad_input}' as a formula.").format(
+                    bad_input=cgi.escape(answer)
                 )
-            except Exception as err:
-                # traceback.print_exc()
-                log.debug('formularesponse: error %s in formula', err)
-                raise StudentInputError(
-                    _("Invalid input: Could not parse '{bad_input}' as a formula").format(
-                        bad_input=cgi.escape(answer)
-                    )
+            )
+        except Exception as err:
+            # traceback.print_exc()
+            log.debug('formularesponse: error %s in formula', err)
+            raise StudentInputError(
+                _("Invalid input: Could not parse '{bad_input}' as a formula").format(
+                    bad_input=cgi.escape(answer)
                 )
-        return out
+            )
 
     def randomize_variables(self, samples):
         """
@@ -3171,15 +3180,18 @@ class FormulaResponse(LoncapaResponse):
             out.append(var_dict)
         return out
 
-    def check_formula(self, expected, given, samples):
+    def check_formula(self, expected, given, samples, cache_expected=True):
         """
         Given an expected answer string, a given (student-produced) answer
         string, and a samples string, return whether the given answer is
         "correct" or "incorrect".
+
+        The parsed expected answer is cached unless `cache_expected` is False,
+        for expected answers which are not those of the problem.
         """
         var_dict_list = self.randomize_variables(samples)
         student_result = self.tupleize_answers(given, var_dict_list)
-        instructor_result = self.tupleize_answers(expected, var_dict_list)
+        instructor_result = self.tupleize_answers(expected, var_dict_list, cached=cache_expected)
 
         correct = all(compare_with_tolerance(student, instructor, self.tolerance)
                       for student, instructor in zip(student_result, instructor_result))
@@ -3192,7 +3204,7 @@ class FormulaResponse(LoncapaResponse):
         """
         An external interface for comparing whether a and b are equal.
         """
-        internal_result = self.check_formula(ans1, ans2, self.samples)
+        internal_result = self.check_formula(ans1, ans2, self.samples, cache_expected=False)
         return internal_result == "correct"
 
     def validate_answer(self, answer):
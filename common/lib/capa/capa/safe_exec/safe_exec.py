@@ -2,7 +2,11 @@
 
 from __future__ import absolute_import
 
+import ast
+import copy
 import hashlib
+import threading
+from collections import OrderedDict
 
 from codejail.safe_exec import SafeExecException, json_safe
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
@@ -12,6 +16,11 @@ from six import text_type
 
 from . import lazymod
 
+try:
+    import newrelic.agent
+except ImportError:
+    newrelic = None  # pylint: disable=invalid-name
+
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
 # The name "random" is a properly-seeded stand-in for the random module.
@@ -55,6 +64,26 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# Globals which Capa gives to the code of a problem, and which differ from one
+# learner to the next.  When the cache of results is a TwoTierCache, they are
+# left out of the cache keys and the cached results of code which cannot read
+# them, so that learners share the results.
+LEARNER_GLOBALS = ("anonymous_student_id",)
+
+# Names, and parts of names, of the functions, modules and attributes through
+# which code can read its globals without naming them, or reach the frames and
+# tracebacks which hold them.  Code that uses any of them, or any name starting
+# with an underscore, is taken to read all of its globals.
+NAMESPACE_NAMES = frozenset([
+    "attrgetter", "builtins", "compile", "eval", "exc_info", "exec", "execfile", "format_map", "Formatter",
+    "gc", "getattr", "importlib", "import_module", "inspect", "methodcaller", "sys", "vars", "vformat",
+])
+NAMESPACE_NAME_PARTS = ("frame", "globals", "locals", "stack", "traceback")
+
+# Prefixes of the attributes of functions, frames, tracebacks, generators and
+# coroutines which lead to the globals of the code.
+NAMESPACE_ATTRIBUTE_PREFIXES = ("_", "ag_", "cr_", "f_", "func_", "gi_", "im_", "tb_")
+
 
 def update_hash(hasher, obj):
     """
@@ -79,6 +108,214 @@ def update_hash(hasher, obj):
         hasher.update(six.b(repr(obj)))
 
 
+def _literal_string(node):
+    """
+    Return the value of the given AST node if it is a string literal, or else None.
+    """
+    value = getattr(node, 'value', getattr(node, 's', None))
+    return value if isinstance(value, six.string_types) else None
+
+
+def _is_namespace_name(name, attribute=False):
+    """
+    Return whether code that uses the given name, or attribute name, may read
+    its globals without naming them.
+    """
+    lowered = name.lower()
+    return (
+        name in NAMESPACE_NAMES or
+        name.startswith(NAMESPACE_ATTRIBUTE_PREFIXES if attribute else "_") or
+        any(part in lowered for part in NAMESPACE_NAME_PARTS)
+    )
+
+
+def reads_namespace(code):
+    """
+    Return whether `code` may read its globals without naming them.
+
+    This is a conservative check of the syntax tree of the code: code that cannot
+    be parsed, that uses any of the NAMESPACE_NAMES or the names of dunder, frame
+    or traceback attributes, that calls getattr with anything but a literal name,
+    or that formats anything but a literal string, is taken to read its globals.
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, TypeError, ValueError):
+        return True
+
+    literal_getattrs = set()
+    for node in ast.walk(tree):
+        names = []
+        attribute = False
+        if isinstance(node, ast.Call):
+            if (
+                    isinstance(node.func, ast.Name) and node.func.id == "getattr" and len(node.args) >= 2 and
+                    _literal_string(node.args[1]) is not None and
+                    not _is_namespace_name(_literal_string(node.args[1]), attribute=True)
+            ):
+                literal_getattrs.add(id(node.func))
+        elif isinstance(node, ast.Name):
+            if id(node) not in literal_getattrs:
+                names = [node.id]
+        elif isinstance(node, ast.Attribute):
+            # Format strings can read the attributes of their arguments.
+            if node.attr == "format" and "_" in (_literal_string(node.value) or "_"):
+                return True
+            names = [node.attr]
+            attribute = True
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                names.extend(alias.name.split("."))
+            names.extend((getattr(node, "module", None) or "").split("."))
+        elif isinstance(node, ast.keyword):
+            names = [node.arg or ""]
+        elif type(node).__name__ == "Exec":
+            return True
+
+        if any(name and _is_namespace_name(name, attribute) for name in names):
+            return True
+    return False
+
+
+def unread_learner_globals(code, globals_dict, python_path=None, extra_files=None):
+    """
+    Return the names of the learner-specific globals in `globals_dict` that `code`
+    cannot read.
+
+    Code can read a global that it names, that it may find by reading its namespace,
+    or that the modules of its `python_path` or `extra_files` may find by inspecting
+    the stack, so nothing is returned in those cases.
+    """
+    if python_path or extra_files or reads_namespace(code):
+        return []
+    return [name for name in LEARNER_GLOBALS if name in globals_dict and name not in code]
+
+
+class LocalResultCache(object):
+    """
+    A bounded, least-recently-used cache of safe_exec results in the memory of
+    this process, which counts the lookups of each tier of the TwoTierCaches in
+    front of which it is used.
+
+    Values are copied in and out of the cache, since safe_exec updates the globals
+    of the code it runs with the cached results.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.stats = {'local': 0, 'shared': 0, 'miss': 0}
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return a copy of the result cached for key, or None.
+        """
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                return None
+            self._results[key] = self._results.pop(key)
+        return copy.deepcopy(result)
+
+    def set(self, key, value):
+        """
+        Cache a copy of the result value for key, evicting the least recently used results.
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._results.pop(key, None)
+            self._results[key] = value
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all results, and reset the counts of lookups.
+        """
+        with self._lock:
+            self._results.clear()
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def record_lookup(self, tier):
+        """
+        Count a lookup answered by the given tier: 'local', 'shared' or 'miss'.
+        """
+        with self._lock:
+            self.stats[tier] += 1
+        if newrelic:
+            newrelic.agent.record_custom_metric('Custom/safe_exec/cache/{}'.format(tier), 1)
+
+    def hit_rate(self):
+        """
+        Return the fraction of the lookups answered by either tier, or None if there were none.
+        """
+        with self._lock:
+            lookups = sum(self.stats.values())
+            return (lookups - self.stats['miss']) / float(lookups) if lookups else None
+
+
+class TwoTierCache(object):
+    """
+    A cache of safe_exec results which looks results up in a LocalResultCache before
+    the given shared cache, and keeps the results of both in the local one.
+
+    Learners share the results of code which cannot read their LEARNER_GLOBALS in
+    this cache.
+    """
+    shares_learner_results = True
+
+    def __init__(self, shared_cache, local_cache):
+        self.shared_cache = shared_cache
+        self.local_cache = local_cache
+
+    def get(self, key):
+        value = self.local_cache.get(key)
+        if value is not None:
+            self.local_cache.record_lookup('local')
+            return value
+
+        value = self.shared_cache.get(key) if self.shared_cache else None
+        if value is not None:
+            self.local_cache.set(key, value)
+            self.local_cache.record_lookup('shared')
+        else:
+            self.local_cache.record_lookup('miss')
+        return value
+
+    def set(self, key, value):
+        self.local_cache.set(key, value)
+        if self.shared_cache:
+            self.shared_cache.set(key, value)
+
+
+_local_result_cache = None
+_local_result_cache_lock = threading.Lock()
+
+
+def get_local_result_cache(max_size):
+    """
+    Return the LocalResultCache of this process, holding at most max_size results.
+    """
+    global _local_result_cache  # pylint: disable=global-statement
+    with _local_result_cache_lock:
+        if _local_result_cache is None:
+            _local_result_cache = LocalResultCache(max_size)
+        else:
+            _local_result_cache.max_size = max_size
+        return _local_result_cache
+
+
+def result_cache(shared_cache, local_cache_size):
+    """
+    Return the cache for safe_exec to use in front of the given shared cache: a
+    TwoTierCache with the LocalResultCache of this process if local_cache_size is
+    positive, or else the shared cache itself.
+    """
+    if local_cache_size <= 0:
+        return shared_cache
+    return TwoTierCache(shared_cache, get_local_result_cache(local_cache_size))
+
+
 def safe_exec(
     code,
     globals_dict,
@@ -107,7 +344,8 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    and the random seed.  If the cache is a TwoTierCache, the learner-specific globals
+    that the code cannot read are left out of it, so that learners share the execution.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
@@ -117,7 +355,12 @@ def safe_exec(
     """
     # Check the cache for a previous result.
     if cache:
-        safe_globals = json_safe(globals_dict)
+        unread_globals = []
+        if getattr(cache, 'shares_learner_results', False):
+            unread_globals = unread_learner_globals(code, globals_dict, python_path, extra_files)
+        safe_globals = json_safe({
+            name: value for name, value in globals_dict.items() if name not in unread_globals
+        })
         md5er = hashlib.md5()
         md5er.update(repr(code).encode('utf-8'))
         update_hash(md5er, safe_globals)
@@ -158,6 +401,8 @@ def safe_exec(
     # the globals dict might not be entirely serializable.
     if cache:
         cleaned_results = json_safe(globals_dict)
+        for name in unread_globals:
+            cleaned_results.pop(name, None)
         cache.set(key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
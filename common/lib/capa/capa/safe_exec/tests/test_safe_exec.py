@@ -16,7 +16,8 @@ from codejail.safe_exec import SafeExecException
 from six import text_type, unichr
 from six.moves import range
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import result_cache, safe_exec, update_hash
+from capa.safe_exec.safe_exec import LocalResultCache, TwoTierCache, reads_namespace
 
 
 class TestSafeExec(unittest.TestCase):
@@ -171,6 +172,71 @@ class TestSafeExecCaching(unittest.TestCase):
         safe_exec(code, g, cache=DictCache(cache))
         self.assertEqual(g['a'], 17)
 
+    def test_cache_shared_by_learners(self):
+        # Code which cannot read the learner's id shares its result between learners
+        # in a two-tier cache.
+        shared = {}
+        g = {'anonymous_student_id': 'learner1'}
+        safe_exec("a = int(math.pi)", g, cache=TwoTierCache(DictCache(shared), LocalResultCache(max_size=10)))
+        self.assertEqual(list(shared.values()), [(None, {'a': 3})])
+
+        shared[list(shared.keys())[0]] = (None, {'a': 17})
+        g = {'anonymous_student_id': 'learner2'}
+        safe_exec("a = int(math.pi)", g, cache=TwoTierCache(DictCache(shared), LocalResultCache(max_size=10)))
+        self.assertEqual(g, {'a': 17, 'anonymous_student_id': 'learner2'})
+
+    def test_cache_not_shared_by_learners_without_local_cache(self):
+        # Results in the shared cache alone are cached for each learner.
+        cache = {}
+        for learner in ('learner1', 'learner2'):
+            safe_exec("a = int(math.pi)", {'anonymous_student_id': learner}, cache=DictCache(cache))
+        self.assertEqual(len(cache), 2)
+
+    def test_cache_per_learner(self):
+        # Code which can read the learner's id is cached for each learner.
+        for code in (
+                "a = anonymous_student_id",
+                "a = globals()['anonymous' + '_student_id']",
+                "a = (lambda: 0).__globals__['anonymous_' + 'student_id']",
+                "a = getattr(lambda: 0, '__glob' + 'als__')['anonymous_' + 'student_id']",
+                "a = ('{0.__glob' + 'als__[anonymous_' + 'student_id]}').format(lambda: 0)",
+                textwrap.dedent("""\
+                    try:
+                        1 / 0
+                    except ZeroDivisionError:
+                        a = sys.exc_info()[2].tb_frame.f_globals['anonymous_' + 'student_id']
+                """),
+                textwrap.dedent("""\
+                    def generator():
+                        yield
+                    a = generator().gi_frame.f_globals['anonymous_' + 'student_id']
+                """),
+        ):
+            shared = {}
+            for learner in ('learner1', 'learner2'):
+                g = {'anonymous_student_id': learner}
+                safe_exec(code, g, cache=TwoTierCache(DictCache(shared), LocalResultCache(max_size=10)))
+                self.assertEqual(g['a'], learner)
+            self.assertEqual(len(shared), 2)
+
+    def test_reads_namespace(self):
+        for code in ("a = int(math.pi)", "a = '{0:.2f}'.format(x)", "a = getattr(math, 'pi')"):
+            self.assertFalse(reads_namespace(code), code)
+        for code in (
+                "a = vars()",
+                "g = getattr",
+                "a = getattr(x, name)",
+                "a = getattr(x, '__dict__')",
+                "a = x.__class__",
+                "a = f.func_globals",
+                "from inspect import currentframe",
+                "import numpy.distutils.misc_util as m; m.get_frame(0)",
+                "a = template.format(x)",
+                "a = '{0.__class__}'.format(x)",
+                "a = (",
+        ):
+            self.assertTrue(reads_namespace(code), code)
+
     def test_unicode_submission(self):
         # Check that using non-ASCII unicode does not raise an encoding error.
         # Try several non-ASCII unicode characters.
@@ -182,6 +248,56 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestTwoTierCaching(unittest.TestCase):
+    """Test the in-process cache of safe_exec results in front of the shared cache."""
+
+    def setUp(self):
+        super(TestTwoTierCaching, self).setUp()
+        self.shared = {}
+        self.local_cache = LocalResultCache(max_size=2)
+        self.cache = TwoTierCache(DictCache(self.shared), self.local_cache)
+
+    def test_miss_then_local_hit(self):
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.cache)
+        self.assertEqual(g['a'], 3)
+        self.assertEqual(list(self.shared.values()), [(None, {'a': 3})])
+
+        # The result is now served from the process, not the shared cache.
+        self.shared.clear()
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.cache)
+        self.assertEqual(g['a'], 3)
+        self.assertEqual(self.local_cache.stats, {'local': 1, 'shared': 0, 'miss': 1})
+        self.assertEqual(self.local_cache.hit_rate(), 0.5)
+
+    def test_shared_hit_fills_local(self):
+        safe_exec("a = [1]", {}, cache=TwoTierCache(DictCache(self.shared), LocalResultCache(max_size=2)))
+        g = {}
+        safe_exec("a = [1]", g, cache=self.cache)
+        self.assertEqual(g['a'], [1])
+        self.assertEqual(self.local_cache.stats, {'local': 0, 'shared': 1, 'miss': 0})
+
+        # The cached results are copied, so changes to the globals do not leak into the cache.
+        g['a'].append(2)
+        g = {}
+        safe_exec("a = [1]", g, cache=self.cache)
+        self.assertEqual(g['a'], [1])
+
+    def test_bounded(self):
+        for value in range(3):
+            safe_exec("a = {}".format(value), {}, cache=self.cache)
+        self.shared.clear()
+        for value in reversed(range(3)):
+            safe_exec("a = {}".format(value), {}, cache=self.cache)
+        self.assertEqual(self.local_cache.stats, {'local': 2, 'shared': 0, 'miss': 4})
+
+    def test_result_cache_disabled(self):
+        shared_cache = DictCache({})
+        self.assertIs(result_cache(shared_cache, 0), shared_cache)
+        self.assertIsInstance(result_cache(shared_cache, 10), TwoTierCache)
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
@@ -12,6 +12,7 @@ from lxml import etree
 from markupsafe import Markup
 from mock import patch
 
+from capa.capa_problem import clear_problem_templates
 from capa.tests.helpers import new_loncapa_problem
 from openedx.core.djangolib.markup import HTML
 
@@ -719,3 +720,66 @@ class CAPAProblemReportHelpersTest(unittest.TestCase):
             """
         )
         self.assertEquals(problem.find_answer_text('1_2_1', 'hide'), 'hide')
+
+
+class ProblemTemplateTest(unittest.TestCase):
+    """
+    Tests the compiled problem templates shared by the problems of the same XML.
+    """
+    xml = textwrap.dedent("""
+        <problem>
+            <multiplechoiceresponse>
+                <label>Which is the answer?</label>
+                <description>Only one is.</description>
+                <choicegroup type="MultipleChoice" shuffle="true">
+                    <choice correct="false">Apple</choice>
+                    <choice correct="false">Banana</choice>
+                    <choice correct="false">Chocolate</choice>
+                    <choice correct="true">Donut</choice>
+                </choicegroup>
+            </multiplechoiceresponse>
+            <solution><p>Donut.</p></solution>
+        </problem>
+    """)
+
+    def setUp(self):
+        super(ProblemTemplateTest, self).setUp()
+        clear_problem_templates()
+        self.addCleanup(clear_problem_templates)
+
+    def test_template_reused(self):
+        with patch('capa.capa_problem.etree.XML', wraps=etree.XML) as mock_parse:
+            problem = new_loncapa_problem(self.xml, seed=1)
+            other_problem = new_loncapa_problem(self.xml, seed=2)
+        self.assertEqual(mock_parse.call_count, 1)
+
+        self.assertIsNot(problem.tree, other_problem.tree)
+        self.assertEqual(problem.problem_data, other_problem.problem_data)
+        self.assertIsNot(problem.problem_data, other_problem.problem_data)
+        for loncapa_problem in (problem, other_problem):
+            response, = loncapa_problem.responders
+            self.assertIs(response.getroottree().getroot(), loncapa_problem.tree)
+            self.assertEqual(response.get('id'), '1_1')
+            self.assertIsNotNone(loncapa_problem.tree.find('.//solution[@id="1_solution_1"]'))
+
+        # The choices are shuffled by the seed of each problem, in its own tree.
+        fresh_problem = new_loncapa_problem(self.xml, seed=2)
+        self.assertEqual(etree.tostring(fresh_problem.tree), etree.tostring(other_problem.tree))
+        self.assertEqual(fresh_problem.get_html(), other_problem.get_html())
+
+    def test_template_per_problem_id(self):
+        new_loncapa_problem(self.xml)
+        problem = new_loncapa_problem(self.xml, problem_id='2')
+        response, = problem.responders
+        self.assertEqual(response.get('id'), '2_1')
+
+    def test_includes_not_cached(self):
+        xml = textwrap.dedent("""
+            <problem>
+                <include file="test_include.xml"/>
+            </problem>
+        """)
+        with patch('capa.capa_problem.LoncapaProblem._process_includes') as mock_process_includes:
+            new_loncapa_problem(xml)
+            new_loncapa_problem(xml)
+        self.assertEqual(mock_process_includes.call_count, 2)
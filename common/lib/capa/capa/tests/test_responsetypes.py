@@ -23,6 +23,7 @@ from pytz import UTC
 from six import text_type
 
 import calc
+from calc.calc import ParseAugmenter
 from capa.correctmap import CorrectMap
 from capa.responsetypes import LoncapaProblemError, ResponseError, StudentInputError
 from capa.tests.helpers import load_fixture, new_loncapa_problem, test_capa_system
@@ -458,6 +459,26 @@ class FormulaResponseTest(ResponseTest):
         input_formula = "x + y"
         self.assert_grade(problem, input_formula, "incorrect")
 
+    def test_parse_once(self):
+        """
+        Test that each formula is parsed once, however many samples it is
+        evaluated at, and that the answer of the problem is parsed only once.
+        """
+        sample_dict = {'x': (-10, 10), 'y': (-10, 10)}
+        problem = self.build_problem(sample_dict=sample_dict,
+                                     num_samples=10,
+                                     tolerance=0.01,
+                                     answer="x^2 + 2*y - sin(x)*y")
+
+        with mock.patch.object(ParseAugmenter, 'parse_algebra', autospec=True,
+                               side_effect=ParseAugmenter.parse_algebra) as mock_parse:
+            self.assert_grade(problem, "x*x - y*sin(x) + y + y", "correct")
+            self.assertLessEqual(mock_parse.call_count, 2)
+            mock_parse.reset_mock()
+
+            self.assert_grade(problem, "x^2 + y - sin(x)*y", "incorrect")
+            self.assertEqual(mock_parse.call_count, 1)
+
     def test_hint(self):
         """
         Test the hint-giving functionality of FormulaResponse
@@ -4,15 +4,21 @@ Tests capa util
 """
 from __future__ import absolute_import
 
+import math
 import unittest
 
 import ddt
+import mock
+from calc import UndefinedVariable, UnmatchedParenthesis, evaluator
 from lxml import etree
 
 from capa.tests.helpers import test_capa_system
 from capa.util import (
+    CompiledFormula,
     compare_with_tolerance,
+    compile_formula,
     contextualize_text,
+    evaluate_constant,
     get_inner_html_from_xpath,
     remove_markup,
     sanitize_html
@@ -119,6 +125,47 @@ class UtilTest(unittest.TestCase):
         result = compare_with_tolerance(111.0, complex(100.0, 0), '10%', True)
         self.assertTrue(result)
 
+    def test_evaluate_constant(self):
+        self.assertEqual(evaluate_constant('2*3'), 6)
+        with mock.patch('capa.util.evaluator') as mock_evaluator:
+            self.assertEqual(evaluate_constant('2*3'), 6)
+        self.assertFalse(mock_evaluator.called)
+
+    @ddt.data(
+        ('x^2 + 2*x*y + sin(z)', False),
+        ('R1||R2 + 3.5', False),
+        ('fact(n) / sqrt(x) - e^(-y)', False),
+        ('X*x + Y', True),
+    )
+    @ddt.unpack
+    def test_compiled_formula(self, formula, case_sensitive):
+        samples = [
+            {'x': 1.5, 'y': -2, 'z': 0.3, 'R1': 1, 'R2': 2, 'n': 4, 'X': 3, 'Y': 7},
+            {'x': 9, 'y': 0.5, 'z': -1, 'R1': 5, 'R2': 0.25, 'n': 0, 'X': -1, 'Y': 2j},
+        ]
+        compiled = CompiledFormula(formula, case_sensitive)
+        self.assertEqual(
+            compiled.evaluate_samples(samples),
+            [evaluator(sample, {}, formula, case_sensitive=case_sensitive) for sample in samples]
+        )
+
+    def test_compiled_formula_errors(self):
+        self.assertTrue(math.isnan(CompiledFormula(' ').evaluate({})))
+        with self.assertRaises(UnmatchedParenthesis):
+            CompiledFormula('(x + 1')
+        with self.assertRaises(UndefinedVariable):
+            CompiledFormula('x + y').evaluate({'x': 1})
+        with self.assertRaises(UndefinedVariable):
+            CompiledFormula('X + 1', case_sensitive=True).evaluate({'x': 1})
+
+    def test_compile_formula(self):
+        formula = compile_formula('x + 2*y')
+        self.assertIs(compile_formula('x + 2*y'), formula)
+        self.assertIsNot(compile_formula('x + 2*y', case_sensitive=True), formula)
+        with mock.patch('capa.util.ParseAugmenter') as mock_parser:
+            compile_formula('x + 2*y')
+        self.assertFalse(mock_parser.called)
+
     def test_sanitize_html(self):
         """
         Test for html sanitization with bleach.
@@ -5,11 +5,24 @@ from __future__ import absolute_import
 
 import re
 import six
+import threading
 from cmath import isinf, isnan
+from collections import OrderedDict
 from decimal import Decimal
 
 import bleach
 from calc import evaluator
+from calc.calc import (
+    ParseAugmenter,
+    add_defaults,
+    check_parens,
+    eval_atom,
+    eval_number,
+    eval_parallel,
+    eval_power,
+    eval_product,
+    eval_sum
+)
 from lxml import etree
 
 from openedx.core.djangolib.markup import HTML
@@ -19,6 +32,119 @@ from openedx.core.djangolib.markup import HTML
 # Utility functions used in CAPA responsetypes
 default_tolerance = '0.001%'
 
+# The maximum number of entries of the caches of constant math expressions and
+# of parsed formulas of this process.
+MAX_CACHED_EXPRESSIONS = 1024
+
+
+class _ExpressionCache(object):
+    """
+    A bounded, least-recently-used cache of the results of math expressions.
+    """
+    def __init__(self):
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._results:
+                return default
+            result = self._results[key] = self._results.pop(key)
+            return result
+
+    def set(self, key, result):
+        with self._lock:
+            self._results.pop(key, None)
+            self._results[key] = result
+            while len(self._results) > MAX_CACHED_EXPRESSIONS:
+                self._results.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+
+_constant_values = _ExpressionCache()
+_compiled_formulas = _ExpressionCache()
+
+
+def evaluate_constant(expression):
+    """
+    Returns the value of the given math expression without variables, like
+    `evaluator`, reusing the values of the expressions evaluated recently.
+    """
+    value = _constant_values.get(expression)
+    if value is None:
+        value = evaluator(dict(), dict(), expression)
+        _constant_values.set(expression, value)
+    return value
+
+
+class CompiledFormula(object):
+    """
+    A math expression parsed once, which can then be evaluated at any number of
+    points without being parsed again.  Evaluating it at a point gives the same
+    result, and raises the same errors, as `evaluator` does.
+
+    Parsing raises the errors of malformed expressions, like UnmatchedParenthesis;
+    evaluating raises those of the given variables, like UndefinedVariable.
+    """
+    def __init__(self, math_expr, case_sensitive=False):
+        self.math_expr = math_expr
+        self.case_sensitive = case_sensitive
+        self._parsed = None
+        if math_expr.strip():
+            check_parens(math_expr)
+            self._parsed = ParseAugmenter(math_expr, case_sensitive)
+            self._parsed.parse_algebra()
+
+    def _casify(self, name):
+        """
+        Returns the name as it is looked up in the variables and functions.
+        """
+        return name if self.case_sensitive else name.lower()
+
+    def evaluate(self, variables, functions=None):
+        """
+        Returns the value of the expression for the given variables and functions.
+        """
+        if self._parsed is None:
+            return float('nan')
+
+        all_variables, all_functions = add_defaults(variables, functions or {}, self.case_sensitive)
+        self._parsed.check_variables(all_variables, all_functions)
+        return self._parsed.reduce_tree({
+            'number': eval_number,
+            'variable': lambda x: all_variables[self._casify(x[0])],
+            'function': lambda x: all_functions[self._casify(x[0])](x[1]),
+            'atom': eval_atom,
+            'power': eval_power,
+            'parallel': eval_parallel,
+            'product': eval_product,
+            'sum': eval_sum,
+        })
+
+    def evaluate_samples(self, samples, functions=None):
+        """
+        Returns the list of the values of the expression for each of the given
+        dicts of the values of its variables.
+        """
+        return [self.evaluate(variables, functions) for variables in samples]
+
+
+def compile_formula(math_expr, case_sensitive=False):
+    """
+    Returns the CompiledFormula of the given expression, reusing those of the
+    expressions compiled recently.  Only use it for the expressions of problems,
+    such as their answers, not for those of learners.
+    """
+    key = (math_expr, case_sensitive)
+    formula = _compiled_formulas.get(key)
+    if formula is None:
+        formula = CompiledFormula(math_expr, case_sensitive)
+        _compiled_formulas.set(key, formula)
+    return formula
+
 
 def compare_with_tolerance(student_complex, instructor_complex, tolerance=default_tolerance, relative_tolerance=False):
     """
@@ -59,11 +185,11 @@ def compare_with_tolerance(student_complex, instructor_complex, tolerance=defaul
         if tolerance == default_tolerance:
             relative_tolerance = True
         if tolerance.endswith('%'):
-            tolerance = evaluator(dict(), dict(), tolerance[:-1]) * 0.01
+            tolerance = evaluate_constant(tolerance[:-1]) * 0.01
             if not relative_tolerance:
                 tolerance = tolerance * abs(instructor_complex)
         else:
-            tolerance = evaluator(dict(), dict(), tolerance)
+            tolerance = evaluate_constant(tolerance)
 
     if relative_tolerance:
         tolerance = tolerance * max(abs(student_complex), abs(instructor_complex))
@@ -295,6 +295,13 @@ class StaticContent(object):
     def stream_data(self):
         yield self._data
 
+    def stream_data_in_range(self, first_byte, last_byte, chunk_size=STREAM_DATA_CHUNK_SIZE):
+        """
+        Stream the data between first_byte and last_byte (included)
+        """
+        for position in range(first_byte, last_byte + 1, chunk_size):
+            yield self._data[position:min(position + chunk_size, last_byte + 1)]
+
     @staticmethod
     def serialize_asset_key_with_slash(asset_key):
         """
@@ -315,26 +322,26 @@ class StaticContentStream(StaticContent):
                                                   length=length, locked=locked, content_digest=content_digest)
         self._stream = stream
 
-    def stream_data(self):
+    def stream_data(self, chunk_size=STREAM_DATA_CHUNK_SIZE):
         while True:
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
+            chunk = self._stream.read(chunk_size)
             if len(chunk) == 0:
                 break
             yield chunk
 
-    def stream_data_in_range(self, first_byte, last_byte):
+    def stream_data_in_range(self, first_byte, last_byte, chunk_size=STREAM_DATA_CHUNK_SIZE):
         """
         Stream the data between first_byte and last_byte (included)
         """
         self._stream.seek(first_byte)
         position = first_byte
         while True:
-            if last_byte < position + STREAM_DATA_CHUNK_SIZE - 1:
+            if last_byte < position + chunk_size - 1:
                 chunk = self._stream.read(last_byte - position + 1)
                 yield chunk
                 break
-            chunk = self._stream.read(STREAM_DATA_CHUNK_SIZE)
-            position += STREAM_DATA_CHUNK_SIZE
+            chunk = self._stream.read(chunk_size)
+            position += chunk_size
             yield chunk
 
     def close(self):
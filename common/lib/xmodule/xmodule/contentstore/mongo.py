@@ -176,22 +176,25 @@ class MongoContentStore(ContentStore):
                 return None
 
     def export(self, location, output_directory):
-        content = self.find(location)
+        self.export_to_fs(location, OSFS(output_directory, create=True))
 
-        filename = content.name
-        if content.import_path is not None:
-            output_directory = output_directory + '/' + os.path.dirname(content.import_path)
-
-        if not os.path.exists(output_directory):
-            os.makedirs(output_directory)
-
-        # Escape invalid char from filename.
-        export_name = escape_invalid_characters(name=filename, invalid_char_list=['/', '\\'])
-
-        disk_fs = OSFS(output_directory)
+    def export_to_fs(self, location, export_fs):
+        """
+        Copies the asset of the given location to the given filesystem, a chunk at a time,
+        under the directory it was imported from.
+        """
+        content = self.find(location, as_stream=True)
+        try:
+            directory = os.path.dirname(content.import_path) if content.import_path is not None else u''
+            if directory:
+                export_fs.makedirs(directory, recreate=True)
 
-        with disk_fs.open(export_name, 'wb') as asset_file:
-            asset_file.write(content.data)
+            # Escape invalid char from filename.
+            export_name = escape_invalid_characters(name=content.name, invalid_char_list=['/', '\\'])
+            export_path = u'{}/{}'.format(directory, export_name) if directory else export_name
+            export_fs.setbinfile(export_path, content._stream)  # pylint: disable=protected-access
+        finally:
+            content.close()
 
     def export_all_for_course(self, course_key, output_directory, assets_policy_file):
         """
@@ -204,6 +207,20 @@ class MongoContentStore(ContentStore):
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
         """
+        policy = self.export_all_for_course_to_fs(course_key, OSFS(output_directory, create=True))
+
+        with open(assets_policy_file, 'w') as f:
+            json.dump(policy, f, sort_keys=True, indent=4)
+
+    def export_all_for_course_to_fs(self, course_key, export_fs):
+        """
+        Export all of this course's assets to the given filesystem, one at a time, and return
+        the policy of the assets: a dict of the attributes of each asset, by its name.
+
+        Args:
+            course_key (CourseKey): the :class:`CourseKey` identifying the course
+            export_fs (FS): the filesystem under which to put all the asset files
+        """
         policy = {}
         assets, __ = self.get_all_content_for_course(course_key)
 
@@ -216,13 +233,12 @@ class MongoContentStore(ContentStore):
             #
             # When debugging course exports, this might be a good place
             # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
+            self.export_to_fs(asset['asset_key'], export_fs)
             for attr, value in six.iteritems(asset):
                 if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
                     policy.setdefault(asset['asset_key'].block_id, {})[attr] = value
 
-        with open(assets_policy_file, 'w') as f:
-            json.dump(policy, f, sort_keys=True, indent=4)
+        return policy
 
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
@@ -613,6 +613,18 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         except NotImplementedError:
             return None, None
 
+    def get_structure_diff(self, course_key, previous_version):
+        """
+        Returns the diff of the structure of the given course since its given previous
+        version, or None if it is not available, e.g. for modulestores without versioned
+        structures.
+        """
+        try:
+            store = self._verify_modulestore_support(course_key, 'get_structure_diff')
+            return store.get_structure_diff(course_key, previous_version)
+        except (NotImplementedError, ItemNotFoundError):
+            return None
+
     def get_modulestore_type(self, course_id):
         """
         Returns a type which identifies which modulestore is servicing the given course_id.
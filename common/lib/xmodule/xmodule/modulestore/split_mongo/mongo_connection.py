@@ -3,6 +3,7 @@ Segregation of pymongo functions from the data modeling mechanisms for split mod
 """
 from __future__ import absolute_import
 
+import copy
 import datetime
 import logging
 import math
@@ -142,10 +143,131 @@ class QueryTimer(object):
 TIMER = QueryTimer(__name__, 0.01)
 
 
+class LazyBlockMap(dict):
+    """
+    A map {BlockKey: BlockData} of the blocks of a structure, which decodes
+    the BlockData of each block when it is first accessed.
+
+    Until then, a block is held in the form in which it was read: either its
+    mongo document, or its pickled document when the structure was read from
+    the CourseStructureCache.  A pickled map pickles each of its blocks
+    separately, so that unpickling it decodes none of them.
+    """
+    def __getitem__(self, block_key):
+        block = dict.__getitem__(self, block_key)
+        if not isinstance(block, BlockData):
+            block = _decode_block(block)
+            dict.__setitem__(self, block_key, block)
+        return block
+
+    def get(self, block_key, default=None):
+        return self[block_key] if block_key in self else default
+
+    def setdefault(self, block_key, default=None):
+        if block_key not in self:
+            self[block_key] = default
+        return self[block_key]
+
+    def pop(self, block_key, *default):
+        if block_key not in self:
+            if default:
+                return default[0]
+            raise KeyError(block_key)
+        block = self[block_key]
+        del self[block_key]
+        return block
+
+    def popitem(self):
+        if not self:
+            raise KeyError('popitem(): dictionary is empty')
+        block_key = next(iter(self))
+        return block_key, self.pop(block_key)
+
+    def values(self):
+        return [self[block_key] for block_key in self]
+
+    def items(self):
+        return [(block_key, self[block_key]) for block_key in self]
+
+    def itervalues(self):
+        for block_key in self:
+            yield self[block_key]
+
+    def iteritems(self):
+        for block_key in self:
+            yield block_key, self[block_key]
+
+    def copy(self):
+        return LazyBlockMap(dict.items(self))
+
+    def __eq__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            block_key in other and self[block_key] == other[block_key] for block_key in self
+        )
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __deepcopy__(self, memo):
+        # Pickled blocks are immutable, and so are shared with the copy.
+        block_map = LazyBlockMap()
+        memo[id(self)] = block_map
+        for block_key, block in dict.items(self):
+            dict.__setitem__(block_map, block_key, block if isinstance(block, bytes) else copy.deepcopy(block, memo))
+        return block_map
+
+    def __reduce__(self):
+        return (
+            _unpickle_lazy_block_map,
+            ([(block_key.type, block_key.id, _pickle_block(block)) for block_key, block in dict.items(self)],),
+        )
+
+
+def _unpickle_lazy_block_map(pickled_blocks):
+    """
+    Returns the LazyBlockMap of the given (block_type, block_id, pickled
+    block) triples.
+    """
+    return LazyBlockMap(
+        (BlockKey(block_type, block_id), pickled_block) for block_type, block_id, pickled_block in pickled_blocks
+    )
+
+
+def _pickle_block(block):
+    """
+    Returns the pickled document of the given block, which is either a
+    BlockData, a mongo document or an already pickled document.
+    """
+    if isinstance(block, bytes):
+        return block
+    if isinstance(block, BlockData):
+        block = block.to_storable()
+    return pickle.dumps(block, 2)
+
+
+def _decode_block(block):
+    """
+    Returns the BlockData of the given mongo document, or pickled document,
+    of a block, converting 'fields.children' from [[block_type, block_id]]
+    to [BlockKey].
+    """
+    if isinstance(block, bytes):
+        block = pickle.loads(block) if six.PY2 else pickle.loads(block, encoding='latin-1')
+    if 'children' in block['fields']:
+        check('list(seq[2])', block['fields']['children'])
+        block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
+    return BlockData(**block)
+
+
 def structure_from_mongo(structure, course_context=None):
     """
     Converts the 'blocks' key from a list [block_data] to a map
-        {BlockKey: block_data}.
+        {BlockKey: block_data}, which decodes each block on first access.
     Converts 'root' from [block_type, block_id] to BlockKey.
     Converts 'blocks.*.fields.children' from [[block_type, block_id]] to [BlockKey].
     N.B. Does not convert any other ReferenceFields (because we don't know which fields they are at this level).
@@ -160,17 +282,11 @@ def structure_from_mongo(structure, course_context=None):
 
         check('seq[2]', structure['root'])
         check('list(dict)', structure['blocks'])
-        for block in structure['blocks']:
-            if 'children' in block['fields']:
-                check('list(list[2])', block['fields']['children'])
 
         structure['root'] = BlockKey(*structure['root'])
-        new_blocks = {}
-        for block in structure['blocks']:
-            if 'children' in block['fields']:
-                block['fields']['children'] = [BlockKey(*child) for child in block['fields']['children']]
-            new_blocks[BlockKey(block['block_type'], block.pop('block_id'))] = BlockData(**block)
-        structure['blocks'] = new_blocks
+        structure['blocks'] = LazyBlockMap(
+            (BlockKey(block['block_type'], block.pop('block_id')), block) for block in structure['blocks']
+        )
 
         return structure
 
@@ -211,7 +327,13 @@ class CourseStructureCache(object):
 
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
+
+    The blocks of the cached structures are pickled separately, and decoded
+    on first access (see LazyBlockMap).  They are cached under VERSION, as
+    processes running older code cannot unpickle them.
     """
+    VERSION = 2
+
     def __init__(self):
         self.cache = None
         if DJANGO_AVAILABLE:
@@ -226,7 +348,7 @@ class CourseStructureCache(object):
             return None
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
-            compressed_pickled_data = self.cache.get(key)
+            compressed_pickled_data = self.cache.get(key, version=self.VERSION)
             tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
 
             if compressed_pickled_data is None:
@@ -258,7 +380,7 @@ class CourseStructureCache(object):
             tagger.measure('compressed_size', len(compressed_pickled_data))
 
             # Stuctures are immutable, so we set a timeout of "never"
-            self.cache.set(key, compressed_pickled_data, None)
+            self.cache.set(key, compressed_pickled_data, None, version=self.VERSION)
 
 
 class MongoConnection(object):
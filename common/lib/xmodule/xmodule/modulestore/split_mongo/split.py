@@ -104,6 +104,7 @@ from xmodule.modulestore.exceptions import (
 )
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.modulestore.split_mongo.mongo_connection import DuplicateKeyError, MongoConnection
+from xmodule.modulestore.split_mongo.structure_index import StructureDiff, StructureIndex, get_structure_index
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.partitions.partitions_service import PartitionService
 
@@ -355,6 +356,18 @@ class SplitBulkWriteMixin(BulkOperationsMixin):
             version_guid = course_key.as_object_id(version_guid)
             return self.db_connection.get_structure(version_guid, course_key)
 
+    def get_structure_index(self, course_key, structure):
+        """
+        Return the :class:`.StructureIndex` of the given structure of course_key.
+
+        The indexes of structures stored in the database are cached by version; those of
+        structures that are still being written in the active bulk operation are rebuilt.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        if bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db:
+            return StructureIndex(structure)
+        return get_structure_index(structure)
+
     def update_structure(self, course_key, structure):
         """
         Update a course structure, respecting the current bulk operation status
@@ -1272,45 +1285,55 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             return []
 
         course = self._lookup_course(course_locator)
-        items = []
+        structure_index = self.get_structure_index(course_locator, course.structure)
+        blocks = course.structure['blocks']
         qualifiers = qualifiers.copy() if qualifiers else {}  # copy the qualifiers (destructively manipulated here)
+        if settings is None:
+            settings = {}
 
-        def _block_matches_all(block_data):
+        def _matching_block_keys(candidates):
             """
-            Check that the block matches all the criteria
+            Return the candidate block keys whose blocks match all the criteria, in structure order
             """
             # do the checks which don't require loading any additional data
-            if (  # pylint: disable=bad-continuation
-                self._block_matches(block_data, qualifiers) and
-                self._block_matches(block_data.fields, settings)
-            ):
-                if content:
-                    definition_block = self.get_definition(course_locator, block_data.definition)
-                    return self._block_matches(definition_block['fields'], content)
-                else:
-                    return True
+            block_keys = [
+                block_key for block_key in structure_index.in_structure_order(candidates)
+                if self._block_matches(blocks[block_key], qualifiers) and
+                self._block_matches(blocks[block_key].fields, settings)
+            ]
+            if content and block_keys:
+                definitions = {
+                    definition['_id']: definition
+                    for definition in self.get_definitions(
+                        course_locator, [blocks[block_key].definition for block_key in block_keys]
+                    )
+                }
+                block_keys = [
+                    block_key for block_key in block_keys
+                    if blocks[block_key].definition in definitions and
+                    self._block_matches(definitions[blocks[block_key].definition]['fields'], content)
+                ]
+            return block_keys
 
-        if settings is None:
-            settings = {}
         if 'name' in qualifiers:
             # odd case where we don't search just confirm
             block_name = qualifiers.pop('name')
-            block_ids = []
-            for block_id, block in six.iteritems(course.structure['blocks']):
-                # Don't do an in comparison blindly; first check to make sure
-                # that the name qualifier we're looking at isn't a plain string;
-                # if it is a string, then it should match exactly. If it's other
-                # than a string, we check whether it contains the block ID; this
-                # is so a list or other iterable can be passed with multiple
-                # valid qualifiers.
-                if isinstance(block_name, six.string_types):
-                    name_matches = block_id.id == block_name
-                else:
-                    name_matches = block_id.id in block_name
-                if name_matches and _block_matches_all(block):
-                    block_ids.append(block_id)
-
-            return self._load_items(course, block_ids, **kwargs)
+            # Don't do an in comparison blindly; first check to make sure
+            # that the name qualifier we're looking at isn't a plain string;
+            # if it is a string, then it should match exactly. If it's other
+            # than a string, we check whether it contains the block ID; this
+            # is so a list or other iterable can be passed with multiple
+            # valid qualifiers.
+            if isinstance(block_name, six.string_types):
+                candidates = structure_index.block_keys_by_id.get(block_name, [])
+            else:
+                candidates = [
+                    block_key
+                    for block_id, block_keys in six.iteritems(structure_index.block_keys_by_id)
+                    if block_id in block_name
+                    for block_key in block_keys
+                ]
+            return self._load_items(course, _matching_block_keys(candidates), **kwargs)
 
         if 'category' in qualifiers:
             qualifiers['block_type'] = qualifiers.pop('category')
@@ -1319,24 +1342,34 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
 
-        # No need of these caches unless include_orphans is set to False
-        path_cache = None
-        parents_cache = None
+        # narrow the candidates down to the blocks of matching types which have all the
+        # settings fields that must be set; the remaining criteria are checked per block
+        candidates = None
+        block_type = qualifiers.get('block_type')
+        if block_type is not None and not (isinstance(block_type, dict) and '$exists' in block_type):
+            candidates = set(
+                block_key
+                for type_name, block_keys in six.iteritems(structure_index.block_keys_by_type)
+                if self._value_matches(type_name, block_type)
+                for block_key in block_keys
+            )
+        for field_name, criteria in six.iteritems(settings):
+            if isinstance(criteria, dict) and '$exists' in criteria and not criteria['$exists']:
+                continue
+            field_block_keys = structure_index.block_keys_by_field.get(field_name, set())
+            candidates = field_block_keys if candidates is None else candidates & field_block_keys
+        if candidates is None:
+            candidates = structure_index.all_block_keys()
 
+        items = _matching_block_keys(candidates)
         if not include_orphans:
             path_cache = {}
-            parents_cache = self.build_block_key_to_parents_mapping(course.structure)
-
-        for block_id, value in six.iteritems(course.structure['blocks']):
-            if _block_matches_all(value):
-                if not include_orphans:
-                    if (  # pylint: disable=bad-continuation
-                        block_id.type in DETACHED_XBLOCK_TYPES or
-                        self.has_path_to_root(block_id, course, path_cache, parents_cache)
-                    ):
-                        items.append(block_id)
-                else:
-                    items.append(block_id)
+            parents_cache = structure_index.parents
+            items = [
+                block_id for block_id in items
+                if block_id.type in DETACHED_XBLOCK_TYPES or
+                self.has_path_to_root(block_id, course, path_cache, parents_cache)
+            ]
 
         if len(items) > 0:
             return self._load_items(course, items, depth=0, **kwargs)
@@ -1501,6 +1534,27 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             'edited_on': course['edited_on']
         }
 
+    def get_structure_diff(self, course_key, previous_version):
+        """
+        Returns the :class:`.StructureDiff` of the structure of the given course since its
+        given previous version, or None if that version is not stored.
+
+        :param course_key: a course or library locator, which must have a branch set, or a version_guid
+        :param previous_version: the version guid of a previous structure of the course
+        """
+        if not isinstance(course_key, (CourseLocator, LibraryLocator)) or course_key.deprecated:
+            # The supplied CourseKey is of the wrong type, so it can't possibly be stored in this modulestore.
+            raise ItemNotFoundError(course_key)
+
+        structure = self._lookup_course(course_key).structure
+        previous_structure = self.get_structure(course_key, course_key.as_object_id(previous_version))
+        if previous_structure is None:
+            return None
+        return StructureDiff(
+            self.get_structure_index(course_key, previous_structure), previous_structure,
+            self.get_structure_index(course_key, structure), structure,
+        )
+
     def get_definition_history_info(self, definition_locator, course_context=None):
         """
         Because xblocks doesn't give a means to separate the definition's meta information from
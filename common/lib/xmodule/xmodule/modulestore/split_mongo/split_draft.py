@@ -508,6 +508,13 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         course_locator = self._map_revision_to_branch(course_locator)
         return super(DraftVersioningModuleStore, self).get_course_history_info(course_locator)
 
+    def get_structure_diff(self, course_key, previous_version):
+        """
+        See :py:meth `xmodule.modulestore.split_mongo.split.SplitMongoModuleStore.get_structure_diff`
+        """
+        course_key = self._map_revision_to_branch(course_key)
+        return super(DraftVersioningModuleStore, self).get_structure_diff(course_key, previous_version)
+
     def get_course_successors(self, course_locator, version_history_depth=1):
         """
         See :py:meth `xmodule.modulestore.split_mongo.split.SplitMongoModuleStore.get_course_successors`
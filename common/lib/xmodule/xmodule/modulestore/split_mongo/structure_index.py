@@ -0,0 +1,140 @@
+"""
+Indexes of the blocks of split modulestore structures, used to answer
+`get_items` queries without testing every block of a structure.
+
+Structures are immutable once they are stored in the database, so the
+index of a stored structure is cached, per process, by its version.
+"""
+from __future__ import absolute_import
+
+import threading
+from collections import OrderedDict, defaultdict
+
+import six
+
+# The maximum number of structure indexes cached per process.
+MAX_CACHED_INDEXES = 64
+
+_cached_indexes = OrderedDict()
+_cached_indexes_lock = threading.Lock()
+
+
+class StructureIndex(object):
+    """
+    The blocks of a structure, indexed by their type, their id, the names
+    of the settings fields set on them and their parents.
+    """
+    def __init__(self, structure):
+        self.version = structure['_id']
+        self.positions = {}
+        self.block_keys_by_type = defaultdict(list)
+        self.block_keys_by_id = defaultdict(list)
+        self.block_keys_by_field = defaultdict(set)
+        self.parents = defaultdict(list)
+
+        for position, (block_key, block_data) in enumerate(six.iteritems(structure['blocks'])):
+            self.positions[block_key] = position
+            self.block_keys_by_type[block_key.type].append(block_key)
+            self.block_keys_by_id[block_key.id].append(block_key)
+            for field_name in block_data.fields:
+                self.block_keys_by_field[field_name].add(block_key)
+            for child_key in block_data.fields.get('children', []):
+                self.parents[child_key].append(block_key)
+
+    def all_block_keys(self):
+        """
+        Returns the keys of all blocks of the structure.
+        """
+        return set(self.positions)
+
+    def in_structure_order(self, block_keys):
+        """
+        Returns the given block keys in the order of the blocks of the
+        structure.
+        """
+        return sorted(block_keys, key=self.positions.__getitem__)
+
+
+def get_structure_index(structure):
+    """
+    Returns the StructureIndex of the given structure, which must be
+    stored in the database, from the cache of this process.
+    """
+    version = structure['_id']
+    with _cached_indexes_lock:
+        index = _cached_indexes.get(version)
+        if index is not None:
+            _cached_indexes[version] = _cached_indexes.pop(version)
+            return index
+
+    index = StructureIndex(structure)
+    with _cached_indexes_lock:
+        _cached_indexes[version] = index
+        while len(_cached_indexes) > MAX_CACHED_INDEXES:
+            _cached_indexes.popitem(last=False)
+    return index
+
+
+def clear_structure_indexes():
+    """
+    Clears the cache of structure indexes of this process.
+    """
+    with _cached_indexes_lock:
+        _cached_indexes.clear()
+
+
+class StructureDiff(object):
+    """
+    The blocks of a structure that were added, changed or removed since a
+    previous version of the structure.
+
+    Blocks whose settings, defaults or parent changed are told apart from
+    blocks whose content or children only changed, because changes of the
+    former are inherited by, or change the position of, their descendants.
+    """
+    def __init__(self, previous_index, previous_structure, index, structure):
+        self.previous_version = previous_structure['_id']
+        self.version = structure['_id']
+        self.parents = index.parents
+
+        previous_blocks = previous_structure['blocks']
+        blocks = structure['blocks']
+        self.added = set(blocks) - set(previous_blocks)
+        self.removed = set(previous_blocks) - set(blocks)
+        self.settings_changed = set()
+        self.content_changed = set()
+
+        for block_key in set(blocks) & set(previous_blocks):
+            previous_block_data = previous_blocks[block_key]
+            block_data = blocks[block_key]
+            if (
+                _settings(block_data) != _settings(previous_block_data) or
+                block_data.defaults != previous_block_data.defaults or
+                index.parents.get(block_key) != previous_index.parents.get(block_key)
+            ):
+                self.settings_changed.add(block_key)
+            elif (
+                block_data.definition != previous_block_data.definition or
+                block_data.fields.get('children') != previous_block_data.fields.get('children')
+            ):
+                self.content_changed.add(block_key)
+
+    def ancestors(self, block_key):
+        """
+        Returns the keys of the ancestors of the given block in the structure.
+        """
+        ancestors = set()
+        parents = list(self.parents.get(block_key, []))
+        while parents:
+            parent_key = parents.pop()
+            if parent_key not in ancestors:
+                ancestors.add(parent_key)
+                parents.extend(self.parents.get(parent_key, []))
+        return ancestors
+
+
+def _settings(block_data):
+    """
+    Returns the fields of the given block data other than its children.
+    """
+    return {name: value for name, value in six.iteritems(block_data.fields) if name != 'children'}
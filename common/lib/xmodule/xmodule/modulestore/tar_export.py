@@ -0,0 +1,119 @@
+"""
+A filesystem that streams the files of an export into a tar archive.
+
+Exporting a course to a directory and then archiving the directory writes
+every file of the course twice.  Exporting it to a TarExportFS instead adds
+each file to the archive as soon as it is written, so that the export is
+written once, compressed, and without the course ever being on disk whole.
+"""
+from __future__ import absolute_import
+
+import io
+import os
+import tarfile
+import threading
+import time
+
+from fs import errors
+from fs.memoryfs import MemoryFS
+from fs.mode import Mode
+from fs.path import normpath, relpath
+
+
+class TarExportFS(MemoryFS):
+    """
+    A write-only filesystem that adds the files written to it as members of
+    the given TarFile, which must be open for writing.
+
+    The content of files is added to the archive when they are closed, or
+    when they are set with setbinfile, and is not kept, so they cannot be read back.
+    Only empty placeholders of the files are kept, so that their existence
+    can still be checked.
+
+    Files can be written by several threads at once.
+    """
+    def __init__(self, tar_file):
+        super(TarExportFS, self).__init__()
+        self.tar_file = tar_file
+        self._tar_lock = threading.Lock()
+
+    def makedir(self, path, permissions=None, recreate=False):
+        with self._lock:
+            created = not self.isdir(path)
+            sub_fs = super(TarExportFS, self).makedir(path, permissions=permissions, recreate=recreate)
+        if created:
+            self._add_member(self._member_info(path, tarfile.DIRTYPE))
+        return sub_fs
+
+    def openbin(self, path, mode='r', buffering=-1, **options):
+        if not Mode(mode).writing:
+            raise errors.Unsupported(path=path, msg=u'Files exported to a tar archive cannot be read back')
+        self._create_placeholder(path)
+        return _TarMemberFile(self, path)
+
+    def setbinfile(self, path, file):  # pylint: disable=redefined-builtin
+        """
+        Adds the content of the given binary file to the archive, copying it
+        in chunks if the size of the file can be determined by seeking it.
+        """
+        try:
+            start = file.tell()
+            file.seek(0, os.SEEK_END)
+            size = file.tell() - start
+            file.seek(start)
+        except (AttributeError, IOError, OSError):
+            # Buffer the file in memory, through openbin
+            super(TarExportFS, self).setbinfile(path, file)
+            return
+
+        self.add_file(path, file, size)
+
+    def add_file(self, path, file, size):
+        """
+        Adds size bytes of the given binary file to the archive, at the
+        given path.
+        """
+        self._create_placeholder(path)
+        self._add_member(self._member_info(path, tarfile.REGTYPE, size), file)
+
+    def _create_placeholder(self, path):
+        """
+        Creates the empty placeholder of the file of the given path, which
+        fails if its directory does not exist.
+        """
+        super(TarExportFS, self).openbin(path, 'wb').close()
+
+    def _member_info(self, path, member_type, size=0):
+        """
+        Returns the TarInfo of the member of the given path and type.
+        """
+        member_info = tarfile.TarInfo(relpath(normpath(path)))
+        member_info.type = member_type
+        member_info.mode = 0o755 if member_type == tarfile.DIRTYPE else 0o644
+        member_info.mtime = time.time()
+        member_info.size = size
+        return member_info
+
+    def _add_member(self, member_info, file=None):  # pylint: disable=redefined-builtin
+        """
+        Adds the given member, with the content of the given file, to the archive.
+        """
+        with self._tar_lock:
+            self.tar_file.addfile(member_info, file)
+
+
+class _TarMemberFile(io.BytesIO):
+    """
+    A file of a TarExportFS, buffered in memory until it is closed.
+    """
+    def __init__(self, export_fs, path):
+        super(_TarMemberFile, self).__init__()
+        self._export_fs = export_fs
+        self._path = path
+
+    def close(self):
+        if not self.closed:
+            size = self.seek(0, os.SEEK_END)
+            self.seek(0)
+            self._export_fs.add_file(self._path, self, size)
+        super(_TarMemberFile, self).close()
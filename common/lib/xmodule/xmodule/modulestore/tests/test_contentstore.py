@@ -3,9 +3,11 @@
 """
 from __future__ import absolute_import
 
+import io
 import logging
 import mimetypes
 import shutil
+import tarfile
 import unittest
 from tempfile import mkdtemp
 from uuid import uuid4
@@ -18,6 +20,7 @@ from opaque_keys.edx.locator import AssetLocator, CourseLocator
 from xmodule.contentstore.content import StaticContent
 from xmodule.contentstore.mongo import MongoContentStore
 from xmodule.exceptions import NotFoundError
+from xmodule.modulestore.tar_export import TarExportFS
 from xmodule.modulestore.tests.mongo_connection import MONGO_HOST, MONGO_PORT_NUM
 from xmodule.tests import DATA_DIR
 
@@ -148,6 +151,24 @@ class TestContentstore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    @ddt.data(True, False)
+    def test_export_for_course_to_tarball(self, deprecated):
+        """
+        Test streaming the export into a tarball
+        """
+        self.set_up_assets(deprecated)
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode='w:gz') as tar_file:
+            policy = self.contentstore.export_all_for_course_to_fs(self.course1_key, TarExportFS(tar_file))
+        self.assertEqual(sorted(policy), sorted(self.course1_files))
+
+        archive.seek(0)
+        with tarfile.open(fileobj=archive, mode='r:gz') as tar_file:
+            self.assertEqual(sorted(tar_file.getnames()), sorted(self.course1_files))
+            for filename in self.course1_files:
+                with open("{}/static/{}".format(DATA_DIR, filename), "rb") as asset_file:
+                    self.assertEqual(tar_file.extractfile(filename).read(), asset_file.read())
+
     @ddt.data(True, False)
     def test_get_all_content(self, deprecated):
         """
@@ -14,8 +14,11 @@ and then for each combination of modulestores, performing the sequence:
 
 from __future__ import absolute_import
 
+import io
 import itertools
+import json
 import os
+import tarfile
 from shutil import rmtree
 from tempfile import mkdtemp
 
@@ -24,6 +27,7 @@ from mock import patch
 from path import Path as path
 
 from openedx.core.lib.tests import attr
+from xmodule.modulestore.tar_export import TarExportFS
 from xmodule.modulestore.tests.utils import (
     CONTENTSTORE_SETUPS,
     MODULESTORE_SETUPS,
@@ -210,3 +214,38 @@ class CrossStoreXMLRoundtrip(CourseComparisonTest, PartitionTestCase):
                         dest_course = dest_store.get_course(dest_course_key, depth=None, lazy=False)
 
                         self.assertEqual(dest_course.url_name, 'course')
+
+    @patch('xmodule.video_module.video_module.edxval_api', None)
+    @patch('xmodule.tabs.CourseTab.from_json', side_effect=mock_tab_from_json)
+    def test_export_to_tarball(self, _mock_tab_from_json):
+        with MongoContentstoreBuilder().build() as content_store:
+            with SPLIT_MODULESTORE_SETUP.build(contentstore=content_store) as store:
+                course_key = store.make_course_key('a', 'course', 'course')
+                import_course_from_xml(
+                    store,
+                    'test_user',
+                    TEST_DATA_DIR,
+                    source_dirs=['toy'],
+                    static_content_store=content_store,
+                    target_id=course_key,
+                    raise_on_failure=True,
+                    create_if_not_present=True,
+                )
+
+                archive = io.BytesIO()
+                with tarfile.open(fileobj=archive, mode='w:gz') as tar_file:
+                    export_course_to_xml(
+                        store, content_store, course_key, TarExportFS(tar_file), EXPORTED_COURSE_DIR_NAME,
+                    )
+
+        archive.seek(0)
+        with tarfile.open(fileobj=archive, mode='r:gz') as tar_file:
+            names = tar_file.getnames()
+            self.assertIn(EXPORTED_COURSE_DIR_NAME + '/course.xml', names)
+            static_path = EXPORTED_COURSE_DIR_NAME + '/static/just_a_test.jpg'
+            with open(os.path.join(TEST_DATA_DIR, 'toy', 'static', 'just_a_test.jpg'), 'rb') as asset_file:
+                self.assertEqual(tar_file.extractfile(static_path).read(), asset_file.read())
+            assets_policy = json.loads(
+                tar_file.extractfile(EXPORTED_COURSE_DIR_NAME + '/policies/assets.json').read().decode('utf-8')
+            )
+            self.assertIn('just_a_test.jpg', assets_policy)
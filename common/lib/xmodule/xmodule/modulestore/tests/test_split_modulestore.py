@@ -1226,6 +1226,33 @@ class SplitModuleItemTests(SplitModuleTest):
         matches = modulestore().get_items(locator, settings={'group_access': {'$exists': False}})
         self.assertEqual(len(matches), 7)
 
+    def test_get_items_structure_index(self):
+        """
+        get_items narrows its matches with the index of the course structure, which is cached by version
+        """
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        structure = modulestore()._lookup_course(locator).structure
+        index = modulestore().get_structure_index(locator, structure)
+        self.assertIs(modulestore().get_structure_index(locator, structure), index)
+        self.assertEqual(
+            index.in_structure_order(index.block_keys_by_type['chapter']),
+            [block_key for block_key in structure['blocks'] if block_key.type == 'chapter'],
+        )
+
+        matches = modulestore().get_items(
+            locator,
+            qualifiers={'category': {'$in': ['chapter', 'course']}},
+            settings={'display_name': {'$exists': True}},
+        )
+        self.assertEqual(
+            [match.location.block_id for match in matches],
+            [block_key.id for block_key in structure['blocks'] if block_key.type in ('chapter', 'course')],
+        )
+        matches = modulestore().get_items(locator, qualifiers={'name': ['chapter1', 'garbage']})
+        self.assertEqual([match.location.block_id for match in matches], ['chapter1'])
+        matches = modulestore().get_items(locator, content={'garbage': {'$exists': False}}, include_orphans=False)
+        self.assertEqual(len(matches), 8)
+
     def test_get_parents(self):
         '''
         get_parent_location(locator): BlockUsageLocator
@@ -1,12 +1,21 @@
 """ Test the behavior of split_mongo/MongoConnection """
 from __future__ import absolute_import
 
+import copy
 import unittest
 
+import six.moves.cPickle as pickle
 from mock import patch
 
 from xmodule.exceptions import HeartbeatFailure
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.mongo_connection import (
+    LazyBlockMap,
+    MongoConnection,
+    structure_from_mongo,
+    structure_to_mongo
+)
 
 
 class TestHeartbeatFailureException(unittest.TestCase):
@@ -22,3 +31,79 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with self.assertRaises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+class TestLazyBlockMap(unittest.TestCase):
+    """ Test the lazy decoding of the blocks of structures """
+
+    def setUp(self):
+        super(TestLazyBlockMap, self).setUp()
+        self.structure = structure_from_mongo({
+            '_id': 'structure',
+            'root': ['course', 'course'],
+            'blocks': [
+                {
+                    'block_type': 'course',
+                    'block_id': 'course',
+                    'fields': {'children': [['chapter', 'chapter']], 'display_name': 'Course'},
+                    'edit_info': {'edited_by': 1},
+                },
+                {
+                    'block_type': 'chapter',
+                    'block_id': 'chapter',
+                    'fields': {'display_name': 'Chapter'},
+                    'edit_info': {'edited_by': 1},
+                },
+            ],
+        })
+        self.blocks = self.structure['blocks']
+
+    def assert_decoded(self, block_key, decoded):
+        """ Asserts whether the block of the given key was decoded """
+        self.assertEqual(isinstance(dict.__getitem__(self.blocks, block_key), BlockData), decoded)
+
+    def test_decoded_on_access(self):
+        course_key = BlockKey('course', 'course')
+        chapter_key = BlockKey('chapter', 'chapter')
+        self.assertEqual(self.structure['root'], course_key)
+        self.assertEqual(set(self.blocks), {course_key, chapter_key})
+        self.assert_decoded(course_key, False)
+
+        course = self.blocks[course_key]
+        self.assertIsInstance(course, BlockData)
+        self.assertEqual(course.fields['children'], [chapter_key])
+        self.assertIs(self.blocks.get(course_key), course)
+        self.assert_decoded(course_key, True)
+        self.assert_decoded(chapter_key, False)
+        self.assertIsNone(self.blocks.get(BlockKey('html', 'missing')))
+
+    def test_pickle(self):
+        course_key = BlockKey('course', 'course')
+        course = self.blocks[course_key]
+        unpickled = pickle.loads(pickle.dumps(self.structure, 2))
+        self.assertIsInstance(unpickled['blocks'], LazyBlockMap)
+        for block_key in unpickled['blocks']:
+            self.assertIsInstance(dict.__getitem__(unpickled['blocks'], block_key), bytes)
+        self.assertEqual(unpickled, self.structure)
+        self.assertEqual(unpickled['blocks'][course_key], course)
+
+    def test_deepcopy(self):
+        copied = copy.deepcopy(self.structure)
+        self.assertIsInstance(copied['blocks'], LazyBlockMap)
+        self.assertEqual(copied, self.structure)
+        copied['blocks'][BlockKey('chapter', 'chapter')].fields['display_name'] = 'Changed'
+        self.assertEqual(self.blocks[BlockKey('chapter', 'chapter')].fields['display_name'], 'Chapter')
+
+    def test_pop(self):
+        chapter = self.blocks.pop(BlockKey('chapter', 'chapter'))
+        self.assertIsInstance(chapter, BlockData)
+        self.assertEqual(list(self.blocks), [BlockKey('course', 'course')])
+        self.assertIsNone(self.blocks.pop(BlockKey('chapter', 'chapter'), None))
+        with self.assertRaises(KeyError):
+            self.blocks.pop(BlockKey('chapter', 'chapter'))
+
+    def test_to_mongo(self):
+        self.blocks[BlockKey('course', 'course')].fields['display_name'] = 'Changed'
+        blocks = {block['block_id']: block for block in structure_to_mongo(self.structure)['blocks']}
+        self.assertEqual(blocks['course']['fields']['display_name'], 'Changed')
+        self.assertEqual(blocks['chapter']['fields'], {'display_name': 'Chapter'})
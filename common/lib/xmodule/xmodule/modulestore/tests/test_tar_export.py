@@ -0,0 +1,70 @@
+"""
+Tests for the TarExportFS.
+"""
+from __future__ import absolute_import
+
+import io
+import tarfile
+import unittest
+
+from fs import errors
+
+from xmodule.modulestore.tar_export import TarExportFS
+
+
+class TestTarExportFS(unittest.TestCase):
+    """
+    Tests that the files written to a TarExportFS are added to its archive.
+    """
+    def setUp(self):
+        super(TestTarExportFS, self).setUp()
+        self.archive = io.BytesIO()
+        self.tar_file = tarfile.open(fileobj=self.archive, mode='w:gz')
+        self.export_fs = TarExportFS(self.tar_file)
+
+    def _read_archive(self):
+        """
+        Returns a dict of the members of the archive, by name.
+        """
+        self.tar_file.close()
+        self.archive.seek(0)
+        with tarfile.open(fileobj=self.archive, mode='r:gz') as tar_file:
+            return {
+                member.name: tar_file.extractfile(member).read() if member.isfile() else None
+                for member in tar_file.getmembers()
+            }
+
+    def test_write(self):
+        course_fs = self.export_fs.makedir(u'course')
+        course_fs.makedirs(u'html/drafts', recreate=True)
+        with course_fs.open(u'course.xml', 'wb') as course_xml:
+            course_xml.write(b'<course/>')
+        with course_fs.open(u'html/drafts/intro.html', 'w') as html_file:
+            html_file.write(u'<p>Intro</p>')
+
+        self.assertTrue(course_fs.exists(u'course.xml'))
+        self.assertEqual(self._read_archive(), {
+            u'course': None,
+            u'course/html': None,
+            u'course/html/drafts': None,
+            u'course/course.xml': b'<course/>',
+            u'course/html/drafts/intro.html': b'<p>Intro</p>',
+        })
+
+    def test_setbinfile(self):
+        static_fs = self.export_fs.makedir(u'static')
+        static_fs.setbinfile(u'video.mp4', io.BytesIO(b'video data'))
+        self.assertEqual(self._read_archive(), {
+            u'static': None,
+            u'static/video.mp4': b'video data',
+        })
+
+    def test_missing_directory(self):
+        with self.assertRaises(errors.ResourceNotFound):
+            self.export_fs.open(u'missing/course.xml', 'wb')
+
+    def test_read(self):
+        with self.export_fs.open(u'course.xml', 'wb') as course_xml:
+            course_xml.write(b'<course/>')
+        with self.assertRaises(errors.Unsupported):
+            self.export_fs.open(u'course.xml', 'rb')
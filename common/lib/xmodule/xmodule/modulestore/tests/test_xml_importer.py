@@ -3,8 +3,11 @@ Tests for XML importer.
 """
 from __future__ import absolute_import
 
+import hashlib
 import importlib
 import os
+import shutil
+import tempfile
 import unittest
 from uuid import uuid4
 
@@ -351,6 +354,7 @@ class StaticContentImporterTest(unittest.TestCase):
     def setUp(self):
         self.course_data_path = path('/path')
         self.mocked_content_store = mock.Mock()
+        self.mocked_content_store.get_all_content_for_course.return_value = ([], 0)
         self.static_content_importer = StaticContentImporter(
             static_content_store=self.mocked_content_store,
             course_data_path=self.course_data_path,
@@ -392,3 +396,43 @@ class StaticContentImporterTest(unittest.TestCase):
             )
             mock_file.assert_called_with(full_file_path, 'rb')
             self.mocked_content_store.generate_thumbnail.assert_called_once()
+
+    def test_import_unchanged_static_file(self):
+        base_dir = path('/path/to/dir')
+        full_file_path = os.path.join(base_dir, 'static/some_file.txt')
+        asset_key = self.static_content_importer.target_id.make_asset_key('asset', 'static_some_file.txt')
+        stored_asset = {
+            'asset_key': asset_key,
+            'md5': hashlib.md5(b"data").hexdigest(),
+            'displayname': 'some_file.txt',
+            'contentType': 'text/plain',
+            'import_path': 'static/some_file.txt',
+        }
+        self.mocked_content_store.get_all_content_for_course.return_value = ([stored_asset], 1)
+        with mock.patch(OPEN_BUILTIN, mock.mock_open(read_data=b"data")):
+            imported_file_attrs = self.static_content_importer.import_static_file(
+                full_file_path=full_file_path,
+                base_dir=base_dir
+            )
+        self.assertEqual(imported_file_attrs, ('static/some_file.txt', asset_key))
+        self.assertFalse(self.mocked_content_store.generate_thumbnail.called)
+        self.assertFalse(self.mocked_content_store.save.called)
+
+    @mock.patch('xmodule.modulestore.xml_importer.STATIC_FILE_CHUNK_SIZE', 3)
+    @mock.patch('xmodule.modulestore.xml_importer.STREAMED_STATIC_FILE_SIZE', 4)
+    def test_import_streamed_static_file(self):
+        base_dir = path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, base_dir)
+        full_file_path = base_dir / 'large_file.txt'
+        with open(full_file_path, 'wb') as large_file:
+            large_file.write(b"large data")
+
+        saved_data = []
+        self.mocked_content_store.generate_thumbnail.return_value = (None, None)
+        self.mocked_content_store.save.side_effect = lambda content: saved_data.extend(content.data)
+        self.static_content_importer.import_static_file(full_file_path=full_file_path, base_dir=base_dir)
+
+        self.assertEqual(saved_data, [b"lar", b"ge ", b"dat", b"a"])
+        self.mocked_content_store.generate_thumbnail.assert_called_once_with(
+            mock.ANY, tempfile_path=full_file_path
+        )
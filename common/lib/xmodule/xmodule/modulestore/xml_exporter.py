@@ -5,12 +5,13 @@ Methods for exporting course data to XML
 from __future__ import absolute_import
 
 import logging
-import os
 from abc import abstractmethod
 from json import dumps
 
 import lxml.etree
 import six
+from concurrent.futures import ThreadPoolExecutor
+from fs.base import FS
 from fs.osfs import OSFS
 from opaque_keys.edx.locator import CourseLocator, LibraryLocator
 from six import text_type
@@ -115,7 +116,7 @@ class ExportManager(object):
         `modulestore`: A `ModuleStore` object that is the source of the modules to export
         `contentstore`: A `ContentStore` object that is the source of the content to export, can be None
         `courselike_key`: The Locator of the Descriptor to export
-        `root_dir`: The directory to write the exported xml to
+        `root_dir`: The directory, or the filesystem (e.g. a `TarExportFS`), to write the exported xml to
         `target_dir`: The name of the directory inside `root_dir` to write the content to
         """
         self.modulestore = modulestore
@@ -136,11 +137,22 @@ class ExportManager(object):
         Perform any additional tasks to the root XML node.
         """
 
-    def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
+    def process_extra(self, root, courselike, xml_centric_courselike_key, export_fs):
         """
-        Process additional content, like static assets.
+        Process additional content, like static tabs and policies.
         """
 
+    def export_assets(self, export_fs):
+        """
+        Export the static assets and their policy.
+        """
+        if self.contentstore:
+            static_fs = export_fs.makedir(u'static', recreate=True)
+            policy = self.contentstore.export_all_for_course_to_fs(self.courselike_key, static_fs)
+            export_fs.makedir(u'policies', recreate=True)
+            with export_fs.open(u'policies/assets.json', 'wb') as assets_policy:
+                assets_policy.write(dumps(policy, sort_keys=True, indent=4).encode('utf-8'))
+
     def post_process(self, root, export_fs):
         """
         Perform any final processing after the other export tasks are done.
@@ -158,29 +170,36 @@ class ExportManager(object):
         """
         with self.modulestore.bulk_operations(self.courselike_key):
 
-            fsm = OSFS(self.root_dir)
+            fsm = self.root_dir if isinstance(self.root_dir, FS) else OSFS(self.root_dir)
+            export_fs = fsm.makedir(self.target_dir, recreate=True)
             root = lxml.etree.Element('unknown')
 
-            # export only the published content
-            with self.modulestore.branch_setting(ModuleStoreEnum.Branch.published_only, self.courselike_key):
-                courselike = self.get_courselike()
-                export_fs = courselike.runtime.export_fs = fsm.makedir(self.target_dir, recreate=True)
+            # The assets are read from the contentstore while the blocks are serialized.
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                exported_assets = executor.submit(self.export_assets, export_fs)
+
+                # export only the published content
+                with self.modulestore.branch_setting(ModuleStoreEnum.Branch.published_only, self.courselike_key):
+                    courselike = self.get_courselike()
+                    courselike.runtime.export_fs = export_fs
 
-                # change all of the references inside the course to use the xml expected key type w/o version & branch
-                xml_centric_courselike_key = self.get_key()
-                adapt_references(courselike, xml_centric_courselike_key, export_fs)
-                root.set('url_name', self.courselike_key.run)
-                courselike.add_xml_to_node(root)
+                    # change all of the references inside the course to use the xml expected key type
+                    # w/o version & branch
+                    xml_centric_courselike_key = self.get_key()
+                    adapt_references(courselike, xml_centric_courselike_key, export_fs)
+                    root.set('url_name', self.courselike_key.run)
+                    courselike.add_xml_to_node(root)
 
-            # Make any needed adjustments to the root node.
-            self.process_root(root, export_fs)
+                # Make any needed adjustments to the root node.
+                self.process_root(root, export_fs)
 
-            # Process extra items-- drafts, assets, etc
-            root_courselike_dir = self.root_dir + '/' + self.target_dir
-            self.process_extra(root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs)
+                # Process extra items-- drafts, tabs, etc
+                self.process_extra(root, courselike, xml_centric_courselike_key, export_fs)
 
-            # Any last pass adjustments
-            self.post_process(root, export_fs)
+                # Any last pass adjustments
+                self.post_process(root, export_fs)
+
+                exported_assets.result()
 
 
 class CourseExportManager(ExportManager):
@@ -204,29 +223,20 @@ class CourseExportManager(ExportManager):
         with export_fs.open(u'course.xml', 'wb') as course_xml:
             lxml.etree.ElementTree(root).write(course_xml, encoding='utf-8')
 
-    def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
+    def process_extra(self, root, courselike, xml_centric_courselike_key, export_fs):
         # Export the modulestore's asset metadata.
-        asset_dir = root_courselike_dir + '/' + AssetMetadata.EXPORTED_ASSET_DIR + '/'
-        if not os.path.isdir(asset_dir):
-            os.makedirs(asset_dir)
+        asset_fs = export_fs.makedir(AssetMetadata.EXPORTED_ASSET_DIR, recreate=True)
         asset_root = lxml.etree.Element(AssetMetadata.ALL_ASSETS_XML_TAG)
         course_assets = self.modulestore.get_all_asset_metadata(self.courselike_key, None)
         for asset_md in course_assets:
             # All asset types are exported using the "asset" tag - but their asset type is specified in each asset key.
             asset = lxml.etree.SubElement(asset_root, AssetMetadata.ASSET_XML_TAG)
             asset_md.to_xml(asset)
-        with OSFS(asset_dir).open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
+        with asset_fs.open(AssetMetadata.EXPORTED_ASSET_FILENAME, 'wb') as asset_xml_file:
             lxml.etree.ElementTree(asset_root).write(asset_xml_file, encoding='utf-8')
 
-        # export the static assets
         policies_dir = export_fs.makedir('policies', recreate=True)
         if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                root_courselike_dir + '/static/',
-                root_courselike_dir + '/policies/assets.json',
-            )
-
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
             if courselike.course_image == courselike.fields['course_image'].default:
@@ -240,10 +250,8 @@ class CourseExportManager(ExportManager):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_courselike_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open(u'course_image.jpg', 'wb') as course_image_file:
+                    export_fs.makedirs(u'static/images', recreate=True)
+                    with export_fs.open(u'static/images/course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
@@ -311,21 +319,13 @@ class LibraryExportManager(ExportManager):
         root.set('org', self.courselike_key.org)
         root.set('library', self.courselike_key.library)
 
-    def process_extra(self, root, courselike, root_courselike_dir, xml_centric_courselike_key, export_fs):
+    def process_extra(self, root, courselike, xml_centric_courselike_key, export_fs):
         """
         Notionally, libraries may have assets. This is currently unsupported, but the structure is here
         to ease in duck typing during import. This may be expanded as a useful feature eventually.
         """
-        # export the static assets
         export_fs.makedir('policies', recreate=True)
 
-        if self.contentstore:
-            self.contentstore.export_all_for_course(
-                self.courselike_key,
-                self.root_dir + '/' + self.target_dir + '/static/',
-                self.root_dir + '/' + self.target_dir + '/policies/assets.json',
-            )
-
     def post_process(self, root, export_fs):
         """
         Because Libraries are XBlocks, they aren't exported in the same way Course Modules
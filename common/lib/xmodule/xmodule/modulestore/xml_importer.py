@@ -22,6 +22,7 @@ Modulestore virtual   |          XML physical (draft, published)
 """
 from __future__ import absolute_import, print_function
 
+import hashlib
 import json
 import io
 import logging
@@ -32,6 +33,7 @@ from abc import abstractmethod
 
 import six
 import xblock
+from concurrent.futures import ThreadPoolExecutor
 from lxml import etree
 from opaque_keys.edx.keys import UsageKey
 from opaque_keys.edx.locator import LibraryLocator
@@ -61,6 +63,14 @@ log = logging.getLogger(__name__)
 
 DEFAULT_STATIC_CONTENT_SUBDIR = 'static'
 
+# The number of static files imported at a time by each StaticContentImporter.
+DEFAULT_STATIC_IMPORT_WORKERS = 4
+
+# Static files larger than this many bytes are streamed to the contentstore in
+# chunks of STATIC_FILE_CHUNK_SIZE bytes, rather than read into memory.
+STREAMED_STATIC_FILE_SIZE = 1024 * 1024
+STATIC_FILE_CHUNK_SIZE = 1024 * 1024
+
 
 class LocationMixin(XBlockMixin):
     """
@@ -84,10 +94,12 @@ class LocationMixin(XBlockMixin):
 
 
 class StaticContentImporter:
-    def __init__(self, static_content_store, course_data_path, target_id):
+    def __init__(self, static_content_store, course_data_path, target_id, workers=DEFAULT_STATIC_IMPORT_WORKERS):
         self.static_content_store = static_content_store
         self.target_id = target_id
         self.course_data_path = course_data_path
+        self.workers = workers
+        self._stored_assets = None
         try:
             with open(course_data_path / 'policies/assets.json') as f:
                 self.policy = json.load(f)
@@ -101,7 +113,12 @@ class StaticContentImporter:
         self.mimetypes_list = list(mimetypes.types_map.values())
 
     def import_static_content_directory(self, content_subdir=DEFAULT_STATIC_CONTENT_SUBDIR, verbose=False):
-        remap_dict = {}
+        """
+        Imports the static files of the given directory of the course, `workers`
+        files at a time.  Returns a dict that maps the subpaths of the imported
+        files to their asset keys.
+        """
+        file_paths = []
 
         static_dir = self.course_data_path / content_subdir
         for dirname, _, filenames in os.walk(static_dir):
@@ -114,23 +131,44 @@ class StaticContentImporter:
                         log.debug('skipping static content %s...', file_path)
                     continue
 
-                if verbose:
-                    log.debug('importing static content %s...', file_path)
+                file_paths.append(file_path)
+
+        # Load the stored assets before they are shared by the worker threads.
+        self._get_stored_assets()
 
-                imported_file_attrs = self.import_static_file(file_path, base_dir=static_dir)
+        def _import_static_file(file_path):
+            """Imports the given static file."""
+            if verbose:
+                log.debug('importing static content %s...', file_path)
+            return self.import_static_file(file_path, base_dir=static_dir)
 
-                if imported_file_attrs:
-                    # store the remapping information which will be needed
-                    # to subsitute in the module data
-                    remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
+        if self.workers > 1 and len(file_paths) > 1:
+            executor = ThreadPoolExecutor(max_workers=self.workers)
+            try:
+                imported_files_attrs = list(executor.map(_import_static_file, file_paths))
+            finally:
+                executor.shutdown(wait=True)
+        else:
+            imported_files_attrs = [_import_static_file(file_path) for file_path in file_paths]
+
+        remap_dict = {}
+        for imported_file_attrs in imported_files_attrs:
+            if imported_file_attrs:
+                # store the remapping information which will be needed
+                # to subsitute in the module data
+                remap_dict[imported_file_attrs[0]] = imported_file_attrs[1]
 
         return remap_dict
 
     def import_static_file(self, full_file_path, base_dir):
+        """
+        Imports the given static file, unless the asset stored for it has the same
+        content and attributes.  Returns a tuple of the subpath of the file and its
+        asset key, or None if the file is to be ignored.
+        """
         filename = os.path.basename(full_file_path)
         try:
-            with open(full_file_path, 'rb') as f:
-                data = f.read()
+            data, content_digest = self._read_static_file(full_file_path)
         except IOError:
             # OS X "companion files". See
             # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
@@ -158,13 +196,34 @@ class StaticContentImporter:
         # Check extracted contentType in list of all valid mimetypes
         if not mime_type or mime_type not in self.mimetypes_list:
             mime_type = mimetypes.guess_type(filename)[0]  # Assign guessed mimetype
+
+        stored_asset = self._get_stored_assets().get(asset_key.block_id)
+        if stored_asset is not None and (
+            stored_asset.get('md5') == content_digest and
+            stored_asset.get('displayname') == displayname and
+            stored_asset.get('contentType') == mime_type and
+            stored_asset.get('locked', False) == locked and
+            stored_asset.get('import_path') == file_subpath
+        ):
+            log.debug(u'Skipping unchanged static content %s', file_subpath)
+            return file_subpath, asset_key
+
+        # Files too large to be read into memory are streamed from disk, and so are
+        # their thumbnails.
+        thumbnail_source_path = None
+        if data is None:
+            data = _iter_file_chunks(full_file_path)
+            thumbnail_source_path = full_file_path
+
         content = StaticContent(
             asset_key, displayname, mime_type, data,
             import_path=file_subpath, locked=locked
         )
 
         # first let's save a thumbnail so we can get back a thumbnail location
-        thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(content)
+        thumbnail_content, thumbnail_location = self.static_content_store.generate_thumbnail(
+            content, tempfile_path=thumbnail_source_path
+        )
 
         if thumbnail_content is not None:
             content.thumbnail_location = thumbnail_location
@@ -179,6 +238,42 @@ class StaticContentImporter:
 
         return file_subpath, asset_key
 
+    def _read_static_file(self, full_file_path):
+        """
+        Returns the data of the given file and the md5 hex digest of its content.
+        The data of files larger than STREAMED_STATIC_FILE_SIZE is not kept in
+        memory, and None is returned in its place.
+        """
+        content_digest = hashlib.md5()
+        with open(full_file_path, 'rb') as f:
+            data = f.read(STREAMED_STATIC_FILE_SIZE + 1)
+            content_digest.update(data)
+            if len(data) <= STREAMED_STATIC_FILE_SIZE:
+                return data, content_digest.hexdigest()
+
+            for chunk in iter(lambda: f.read(STATIC_FILE_CHUNK_SIZE), b''):
+                content_digest.update(chunk)
+        return None, content_digest.hexdigest()
+
+    def _get_stored_assets(self):
+        """
+        Returns a dict that maps the names of the assets already stored for the
+        target course to their attributes, loaded in a single query.
+        """
+        if self._stored_assets is None:
+            assets, __ = self.static_content_store.get_all_content_for_course(self.target_id)
+            self._stored_assets = {asset['asset_key'].block_id: asset for asset in assets}
+        return self._stored_assets
+
+
+def _iter_file_chunks(full_file_path):
+    """
+    A generator of the content of the given file, in chunks of STATIC_FILE_CHUNK_SIZE bytes.
+    """
+    with open(full_file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(STATIC_FILE_CHUNK_SIZE), b''):
+            yield chunk
+
 
 class ImportManager(object):
     """
@@ -217,6 +217,19 @@ class ContentTest(unittest.TestCase):
 
         self.assertEqual(total_length, last_byte - first_byte + 1)
 
+    def test_static_content_stream_data_in_range(self):
+        """
+        Test StaticContent stream_data_in_range function,
+        asserts that we get the requested bytes in chunks of at most chunk_size bytes
+        """
+        data = SAMPLE_STRING
+        static_content = StaticContent('loc', 'name', 'type', data, length=len(data))
+
+        chunks = list(static_content.stream_data_in_range(100, 1500, chunk_size=512))
+
+        self.assertEqual(''.join(chunks), data[100:1501])
+        self.assertEqual([len(chunk) for chunk in chunks], [512, 512, 377])
+
     def test_static_content_write_js(self):
         """
         Test that only one filename starts with 000.
@@ -39,6 +39,7 @@ class IgnoredFilesTestCase(unittest.TestCase):
         course_id = CourseLocator("edX", "course_ignore", "2014_Fall")
         content_store = Mock()
         content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store.get_all_content_for_course.return_value = ([], 0)
         static_content_importer = StaticContentImporter(
             static_content_store=content_store,
             course_data_path=self.course_dir,
@@ -13,6 +13,13 @@ Currently, this module is used in the `module_render` module in this same
 package and is used to wrap the `authored_data` when constructing an
 `LmsFieldData`.  This means overrides will be in effect for all scopes covered
 by `authored_data`, e.g. course content and settings stored in Mongo.
+
+The overrides of providers that are `resolved_per_request` are shared, for the
+rest of the request, by all the `OverrideFieldData` of the same user, so that
+each field of each block is resolved by them once per request however many
+times it is read.  Code that sets or clears overrides calls
+`clear_resolved_overrides` so that later reads in the same request see the
+change.
 """
 from __future__ import absolute_import
 
@@ -22,14 +29,17 @@ from contextlib import contextmanager
 
 import six
 from django.conf import settings
+from edx_django_utils import monitoring as monitoring_utils
 from edx_django_utils.cache import DEFAULT_REQUEST_CACHE
 from xblock.field_data import FieldData
 
 from xmodule.modulestore.inheritance import InheritanceMixin
 
 NOTSET = object()
+_UNRESOLVED = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+RESOLVED_OVERRIDES_KEY = u'courseware.field_overrides.resolved_overrides'
 
 
 def resolve_dotted(name):
@@ -94,6 +104,14 @@ def overrides_disabled():
     return bool(_OVERRIDES_DISABLED.disabled)
 
 
+def clear_resolved_overrides():
+    """
+    Clears the field overrides resolved so far in this request.  Must be called
+    whenever overrides are set or cleared.
+    """
+    DEFAULT_REQUEST_CACHE.data.pop(RESOLVED_OVERRIDES_KEY, None)
+
+
 class FieldOverrideProvider(six.with_metaclass(ABCMeta, object)):
     """
     Abstract class which defines the interface that a `FieldOverrideProvider`
@@ -106,6 +124,11 @@ class FieldOverrideProvider(six.with_metaclass(ABCMeta, object)):
     the concrete override implementation being used.
     """
 
+    # Whether the overrides of this provider depend only on the user and the
+    # location of the block, so that they can be resolved once per request and
+    # shared by all the blocks of the same location.
+    resolved_per_request = False
+
     def __init__(self, user, fallback_field_data):
         self.user = user
         self.fallback_field_data = fallback_field_data
@@ -202,6 +225,7 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):
         self.fallback = fallback
         self.providers = tuple(provider(user, fallback) for provider in providers)
+        self.user_id = getattr(user, 'id', None)
 
     def get_override(self, block, name):
         """
@@ -209,12 +233,32 @@ class OverrideFieldData(FieldData):
         Returns the overridden value or `NOTSET` if no override is found.
         """
         if not overrides_disabled():
+            location = getattr(block, 'location', None)
             for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
+                if provider.resolved_per_request and location is not None:
+                    value = self._get_resolved_override(provider, location, block, name)
+                else:
+                    value = provider.get(block, name, NOTSET)
                 if value is not NOTSET:
                     return value
         return NOTSET
 
+    def _get_resolved_override(self, provider, location, block, name):
+        """
+        Returns the override of the given provider for the field identified by
+        `name` in `block`, or `NOTSET`, resolving it only once per request for
+        all the blocks of the same location.
+        """
+        resolved_overrides = DEFAULT_REQUEST_CACHE.data.setdefault(RESOLVED_OVERRIDES_KEY, {})
+        block_overrides = resolved_overrides.setdefault((provider.__class__, self.user_id, location), {})
+        value = block_overrides.get(name, _UNRESOLVED)
+        if value is _UNRESOLVED:
+            monitoring_utils.accumulate(u'field_overrides.misses', 1)
+            value = block_overrides[name] = provider.get(block, name, NOTSET)
+        else:
+            monitoring_utils.accumulate(u'field_overrides.hits', 1)
+        return value
+
     def get(self, block, name):
         value = self.get_override(block, name)
         if value is not NOTSET:
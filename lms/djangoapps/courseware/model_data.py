@@ -19,10 +19,16 @@ UserStateSummaryCache: A cache for Scope.user_state_summary
 PreferencesCache: A cache for Scope.preferences
 UserInfoCache: A cache for Scope.user_info
 DjangoOrmFieldCache: A base-class for single-row-per-field caches.
+
+The single-row-per-field caches can additionally read through a cache that
+is shared across requests, configured per scope by the
+FIELD_DATA_SHARED_CACHE setting. Writes through these caches invalidate the
+affected entries of the shared cache.
 """
 
 from __future__ import absolute_import
 
+import hashlib
 import json
 import logging
 from abc import ABCMeta, abstractmethod
@@ -30,7 +36,10 @@ from collections import defaultdict, namedtuple
 
 import six
 from contracts import contract, new_contract
+from django.conf import settings
+from django.core.cache import caches
 from django.db import DatabaseError, IntegrityError, transaction
+from edx_django_utils import monitoring as monitoring_utils
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideUsageKeyV2
 from opaque_keys.edx.block_types import BlockTypeKeyV1
 from opaque_keys.edx.keys import LearningContextKey
@@ -40,6 +49,8 @@ from xblock.fields import Scope, UserScope
 from xblock.runtime import KeyValueStore
 
 from lms.djangoapps.courseware.user_state_client import DjangoXBlockUserStateClient
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.lib.cache_utils import get_cache
 from xmodule.modulestore.django import modulestore
 
 from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsField, XModuleUserStateSummaryField
@@ -155,12 +166,36 @@ new_contract("DjangoKeyValueStore", DjangoKeyValueStore)
 new_contract("DjangoKeyValueStore_Key", DjangoKeyValueStore.Key)
 
 
+def _shared_cache_timeout(scope):
+    """
+    Return the number of seconds for which the field objects of the given
+    scope are held in the shared cache, or None if they are not shared.
+    """
+    return getattr(settings, 'FIELD_DATA_SHARED_CACHE', {}).get('TIMEOUTS', {}).get(scope.name) or None
+
+
+def _shared_cache():
+    """
+    Return the Django cache that holds the shared field objects.
+    """
+    return caches[getattr(settings, 'FIELD_DATA_SHARED_CACHE', {}).get('CACHE', 'default')]
+
+
 class DjangoOrmFieldCache(six.with_metaclass(ABCMeta, object)):
     """
     Baseclass for Scope-specific field cache objects that are based on
     single-row-per-field Django ORM objects.
+
+    Subclasses that set ``scope`` read through the shared cache, using their
+    ``_shared_cache_*`` methods. The shared cache holds all field objects of
+    a group (such as a single usage, or a single user), so that reads of any
+    of their fields can be served from it.
     """
 
+    # The scope whose fields are cached; None if the field objects are never
+    # held in the shared cache.
+    scope = None
+
     def __init__(self):
         self._cache = {}
 
@@ -174,9 +209,143 @@ class DjangoOrmFieldCache(six.with_metaclass(ABCMeta, object)):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
-        for field_object in self._read_objects(fields, xblocks, aside_types):
+        shared_cache_timeout = _shared_cache_timeout(self.scope) if self.scope else None
+        if shared_cache_timeout:
+            field_objects = self._read_objects_through_shared_cache(fields, xblocks, aside_types, shared_cache_timeout)
+        else:
+            field_objects = self._read_objects(fields, xblocks, aside_types)
+
+        for field_object in field_objects:
             self._cache[self._cache_key_for_field_object(field_object)] = field_object
 
+    def _read_objects_through_shared_cache(self, fields, xblocks, aside_types, timeout):
+        """
+        Return a list of all objects for the ``fields`` on the ``xblocks``
+        and the ``aside_types`` associated with them, reading the objects of
+        each group from the shared cache and reading only the groups that
+        are missing from it from the underlying datastore.
+
+        Arguments:
+            fields (list of :class:`~Field`): Fields to return values for
+            xblocks (list of :class:`~XBlock`): XBlocks to load fields for
+            aside_types (list of str): Asides to load field for (which annotate the supplied
+                xblocks).
+            timeout (int): The number of seconds for which read groups are held
+                in the shared cache.
+        """
+        shared_cache = _shared_cache()
+        group_ids_by_cache_key = {
+            self._shared_cache_key(group_id): group_id
+            for group_id in self._shared_cache_group_ids(xblocks, aside_types)
+        }
+        field_objects_by_cache_key = shared_cache.get_many(list(group_ids_by_cache_key))
+
+        missing_group_ids = [
+            group_id for cache_key, group_id in six.iteritems(group_ids_by_cache_key)
+            if cache_key not in field_objects_by_cache_key
+        ]
+        if missing_group_ids:
+            read_field_objects = defaultdict(list)
+            for field_object in self._read_shared_cache_groups(missing_group_ids):
+                read_field_objects[self._shared_cache_group_id_for_field_object(field_object)].append(field_object)
+            missing_field_objects_by_cache_key = {
+                self._shared_cache_key(group_id): read_field_objects[group_id] for group_id in missing_group_ids
+            }
+            shared_cache.set_many(missing_field_objects_by_cache_key, timeout)
+            field_objects_by_cache_key.update(missing_field_objects_by_cache_key)
+
+        self._shared_cache_stat_increment('hits', len(group_ids_by_cache_key) - len(missing_group_ids))
+        self._shared_cache_stat_increment('misses', len(missing_group_ids))
+        if not missing_group_ids:
+            self._shared_cache_stat_increment('queries_avoided')
+
+        field_names = set(field.name for field in fields)
+        return [
+            field_object
+            for field_objects in six.itervalues(field_objects_by_cache_key)
+            for field_object in field_objects
+            if field_object.field_name in field_names
+        ]
+
+    def _invalidate_shared_cache(self, kvs_keys):
+        """
+        Remove the groups of the given keys from the shared cache, so that
+        they are read again from the underlying datastore.
+
+        The groups are removed when the current transaction commits.  Removed
+        any earlier, they could be cached again from the datastore by another
+        request before the written fields are visible to it.
+
+        Arguments:
+            kvs_keys (list of :class:`~DjangoKeyValueStore.Key`): The keys of the written fields
+        """
+        if self.scope and _shared_cache_timeout(self.scope):
+            cache_keys = list(set(
+                self._shared_cache_key(self._shared_cache_group_id_for_kvs_key(kvs_key)) for kvs_key in kvs_keys
+            ))
+            transaction.on_commit(lambda: _shared_cache().delete_many(cache_keys))
+
+    def _shared_cache_key(self, group_id):
+        """
+        Return the key used in the shared cache for the given group.
+
+        Arguments:
+            group_id (tuple): The id of a group of field objects
+        """
+        group_id_hash = hashlib.md5(u'.'.join(six.text_type(part) for part in group_id).encode('utf-8'))
+        return u'courseware.field_data.{}.{}'.format(self.scope.name, group_id_hash.hexdigest())
+
+    def _shared_cache_stat_increment(self, stat_name, count=1):
+        """
+        Increment NR stats of the shared cache for the scope of this cache.
+        """
+        monitoring_utils.accumulate(u'field_data_shared_cache.{}.{}'.format(self.scope.name, stat_name), count)
+
+    @abstractmethod
+    def _shared_cache_group_ids(self, xblocks, aside_types):
+        """
+        Return the ids of the groups of field objects that hold the fields
+        on the ``xblocks`` and the ``aside_types`` associated with them.
+
+        Arguments:
+            xblocks (list of :class:`~XBlock`): XBlocks to load fields for
+            aside_types (list of str): Asides to load field for (which annotate the supplied
+                xblocks).
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _read_shared_cache_groups(self, group_ids):
+        """
+        Return an iterator for all objects, of any field, stored in the
+        underlying datastore for the given groups.
+
+        Arguments:
+            group_ids (list of tuple): The ids of the groups to read
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _shared_cache_group_id_for_field_object(self, field_object):
+        """
+        Return the id of the group that holds the specified field_object.
+
+        Arguments:
+            field_object: A Django model instance that stores the data for fields in this cache
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _shared_cache_group_id_for_kvs_key(self, key):
+        """
+        Return the id of the group that holds the field for the specified
+        KeyValueStore key.
+
+        Arguments:
+            key (:class:`~DjangoKeyValueStore.Key`): The key representing the cached field
+        """
+        raise NotImplementedError()
+
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def get(self, kvs_key):
         """
@@ -217,31 +386,34 @@ class DjangoOrmFieldCache(six.with_metaclass(ABCMeta, object)):
                 objects to values to set.
         """
         saved_fields = []
-        for kvs_key, value in sorted(kv_dict.items()):
-            cache_key = self._cache_key_for_kvs_key(kvs_key)
-            field_object = self._cache.get(cache_key)
-
-            try:
-                serialized_value = json.dumps(value)
-                # It is safe to force an insert or an update, because
-                # a) we should have retrieved the object as part of the
-                #    prefetch step, so if it isn't in our cache, it doesn't exist yet.
-                # b) no other code should be modifying these models out of band of
-                #    this cache.
-                if field_object is None:
-                    field_object = self._create_object(kvs_key, serialized_value)
-                    field_object.save(force_insert=True)
-                    self._cache[cache_key] = field_object
-                else:
-                    field_object.value = serialized_value
-                    field_object.save(force_update=True)
-
-            except DatabaseError:
-                log.exception(u"Saving field %r failed", kvs_key.field_name)
-                raise KeyValueMultiSaveError(saved_fields)
-
-            finally:
-                saved_fields.append(kvs_key.field_name)
+        try:
+            for kvs_key, value in sorted(kv_dict.items()):
+                cache_key = self._cache_key_for_kvs_key(kvs_key)
+                field_object = self._cache.get(cache_key)
+
+                try:
+                    serialized_value = json.dumps(value)
+                    # It is safe to force an insert or an update, because
+                    # a) we should have retrieved the object as part of the
+                    #    prefetch step, so if it isn't in our cache, it doesn't exist yet.
+                    # b) no other code should be modifying these models out of band of
+                    #    this cache.
+                    if field_object is None:
+                        field_object = self._create_object(kvs_key, serialized_value)
+                        field_object.save(force_insert=True)
+                        self._cache[cache_key] = field_object
+                    else:
+                        field_object.value = serialized_value
+                        field_object.save(force_update=True)
+
+                except DatabaseError:
+                    log.exception(u"Saving field %r failed", kvs_key.field_name)
+                    raise KeyValueMultiSaveError(saved_fields)
+
+                finally:
+                    saved_fields.append(kvs_key.field_name)
+        finally:
+            self._invalidate_shared_cache(list(kv_dict))
 
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def delete(self, kvs_key):
@@ -261,6 +433,7 @@ class DjangoOrmFieldCache(six.with_metaclass(ABCMeta, object)):
 
         field_object.delete()
         del self._cache[cache_key]
+        self._invalidate_shared_cache([kvs_key])
 
     @contract(kvs_key=DjangoKeyValueStore.Key, returns=bool)
     def has(self, kvs_key):
@@ -353,6 +526,10 @@ class UserStateCache(object):
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
 
+        # The usage keys whose state has already been read, whether or not
+        # any state is stored for them.
+        self._fetched_keys = set()
+
     def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
         """
         Load all fields specified by ``fields`` for the supplied ``xblocks``
@@ -363,12 +540,27 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
+        self.prefetch(_all_usage_keys(xblocks, aside_types))
+
+    def prefetch(self, usage_keys):
+        """
+        Load the state of the supplied ``usage_keys`` into this cache, reading
+        only the state of the keys that were not already loaded.
+
+        Arguments:
+            usage_keys (set of :class:`UsageKey`): Usages to cache the state of.
+        """
+        usage_keys = set(usage_keys) - self._fetched_keys
+        if not usage_keys:
+            return
+
         block_field_state = self._client.get_many(
             self.user.username,
-            _all_usage_keys(xblocks, aside_types),
+            usage_keys,
         )
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
+        self._fetched_keys.update(usage_keys)
 
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def set(self, kvs_key, value):
@@ -498,7 +690,11 @@ class UserStateCache(object):
 class UserStateSummaryCache(DjangoOrmFieldCache):
     """
     Cache for Scope.user_state_summary xblock field data.
+
+    The field objects of each usage are shared across requests.
     """
+    scope = Scope.user_state_summary
+
     def __init__(self, course_id):
         super(UserStateSummaryCache, self).__init__()
         self.course_id = course_id
@@ -555,11 +751,44 @@ class UserStateSummaryCache(DjangoOrmFieldCache):
         """
         return key.block_scope_id, key.field_name
 
+    def _shared_cache_group_ids(self, xblocks, aside_types):
+        """
+        Return the ids of the groups of field objects, one per usage, that
+        hold the fields on the ``xblocks`` and the ``aside_types``.
+        """
+        return [(usage_key,) for usage_key in _all_usage_keys(xblocks, aside_types)]
+
+    def _read_shared_cache_groups(self, group_ids):
+        """
+        Return an iterator for all objects stored in the underlying datastore
+        for the usages of the given groups.
+        """
+        return XModuleUserStateSummaryField.objects.chunked_filter(
+            'usage_id__in',
+            [usage_key for (usage_key,) in group_ids],
+        )
+
+    def _shared_cache_group_id_for_field_object(self, field_object):
+        """
+        Return the id of the group, of the usage, that holds the specified field_object.
+        """
+        return (field_object.usage_id.map_into_course(self.course_id),)
+
+    def _shared_cache_group_id_for_kvs_key(self, key):
+        """
+        Return the id of the group, of the usage, that holds the field of the specified key.
+        """
+        return (key.block_scope_id,)
+
 
 class PreferencesCache(DjangoOrmFieldCache):
     """
     Cache for Scope.preferences xblock field data.
+
+    The field objects of each user and block type are shared across requests.
     """
+    scope = Scope.preferences
+
     def __init__(self, user):
         super(PreferencesCache, self).__init__()
         self.user = user
@@ -618,11 +847,45 @@ class PreferencesCache(DjangoOrmFieldCache):
         """
         return BlockTypeKeyV1(key.block_family, key.block_scope_id), key.field_name
 
+    def _shared_cache_group_ids(self, xblocks, aside_types):
+        """
+        Return the ids of the groups of field objects, one per block type of
+        this user, that hold the fields on the ``xblocks`` and the ``aside_types``.
+        """
+        return [(self.user.pk, block_type) for block_type in _all_block_types(xblocks, aside_types)]
+
+    def _read_shared_cache_groups(self, group_ids):
+        """
+        Return an iterator for all objects stored in the underlying datastore
+        for the block types of the given groups.
+        """
+        return XModuleStudentPrefsField.objects.chunked_filter(
+            'module_type__in',
+            [block_type for (_, block_type) in group_ids],
+            student=self.user.pk,
+        )
+
+    def _shared_cache_group_id_for_field_object(self, field_object):
+        """
+        Return the id of the group, of the user and block type, that holds the specified field_object.
+        """
+        return self.user.pk, field_object.module_type
+
+    def _shared_cache_group_id_for_kvs_key(self, key):
+        """
+        Return the id of the group, of the user and block type, that holds the field of the specified key.
+        """
+        return key.user_id, BlockTypeKeyV1(key.block_family, key.block_scope_id)
+
 
 class UserInfoCache(DjangoOrmFieldCache):
     """
     Cache for Scope.user_info xblock field data
+
+    The field objects of each user are shared across requests.
     """
+    scope = Scope.user_info
+
     def __init__(self, user):
         super(UserInfoCache, self).__init__()
         self.user = user
@@ -678,6 +941,31 @@ class UserInfoCache(DjangoOrmFieldCache):
         """
         return key.field_name
 
+    def _shared_cache_group_ids(self, xblocks, aside_types):
+        """
+        Return the ids of the groups of field objects, one for this user.
+        """
+        return [(self.user.pk,)]
+
+    def _read_shared_cache_groups(self, group_ids):
+        """
+        Return an iterator for all objects stored in the underlying datastore
+        for this user.
+        """
+        return XModuleStudentInfoField.objects.filter(student=self.user.pk)
+
+    def _shared_cache_group_id_for_field_object(self, field_object):
+        """
+        Return the id of the group, of the user, that holds the specified field_object.
+        """
+        return (self.user.pk,)
+
+    def _shared_cache_group_id_for_kvs_key(self, key):
+        """
+        Return the id of the group, of the user, that holds the field of the specified key.
+        """
+        return (key.user_id,)
+
 
 class FieldDataCache(object):
     """
@@ -778,6 +1066,35 @@ class FieldDataCache(object):
 
         self.add_descriptors_to_cache(descriptors)
 
+    def prefetch_user_state_for_descendents(self, usage_key):
+        """
+        Add the Scope.user_state data of `usage_key` and all of its descendants,
+        and of their asides, to this FieldDataCache, with a constant number of
+        queries and without loading their descriptors.
+
+        The descendants are read from the collected block structure of the course,
+        so descriptors that are added to this FieldDataCache later on only need
+        their data of the other scopes, and of blocks missing from that structure,
+        to be read.
+
+        Arguments:
+            usage_key: The UsageKey of the root of the blocks to prefetch
+        """
+        if not self.user.is_authenticated:
+            return
+
+        block_structure = get_block_structure_manager(usage_key.course_key).get_collected()
+        if usage_key not in block_structure:
+            return
+
+        usage_keys = set()
+        for block_key in block_structure.topological_traversal(start_node=usage_key):
+            usage_keys.add(block_key)
+            for aside_type in self.asides:
+                usage_keys.add(AsideUsageKeyV1(block_key, aside_type))
+                usage_keys.add(AsideUsageKeyV2(block_key, aside_type))
+        self.cache[Scope.user_state].prefetch(usage_keys)
+
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
                                          descriptor_filter=lambda descriptor: True,
@@ -941,6 +1258,8 @@ class ScoresClient(object):
     """
     Score = namedtuple('Score', 'correct total created')
 
+    _CACHE_NAMESPACE = u'courseware.model_data.ScoresClient'
+
     def __init__(self, course_key, user_id):
         self.course_key = course_key
         self.user_id = user_id
@@ -986,10 +1305,43 @@ class ScoresClient(object):
     @classmethod
     def create_for_locations(cls, course_id, user_id, scorable_locations):
         """Create a ScoresClient with pre-fetched data for the given locations."""
+        prefetched = get_cache(cls._CACHE_NAMESPACE).get(six.text_type(course_id), {}).get(user_id)
+        if prefetched is not None:
+            return prefetched
+
         client = cls(course_id, user_id)
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def prefetch(cls, course_key, user_ids):
+        """
+        Fetches, with a single query, the scores of all locations of the given
+        course for the given users, for create_for_locations to return.
+        """
+        # pylint: disable=protected-access
+        clients = {user_id: cls(course_key, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=list(clients),
+            course_id=course_key,
+        )
+        for user_id, location, correct, total, created in scores_qset.values_list(
+                'student_id', 'module_state_key', 'grade', 'max_grade', 'created',
+        ):
+            clients[user_id]._locations_to_scores[location.map_into_course(course_key)] = cls.Score(
+                correct, total, created,
+            )
+        for client in six.itervalues(clients):
+            client._has_fetched = True
+        get_cache(cls._CACHE_NAMESPACE)[six.text_type(course_key)] = clients
+
+    @classmethod
+    def clear_prefetched_data(cls, course_key):
+        """
+        Clears the prefetched scores for the given course from the RequestCache.
+        """
+        get_cache(cls._CACHE_NAMESPACE).pop(six.text_type(course_key), None)
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
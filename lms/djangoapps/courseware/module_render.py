@@ -55,6 +55,7 @@ from lms.djangoapps.courseware.masquerade import (
     setup_masquerade
 )
 from lms.djangoapps.courseware.model_data import DjangoKeyValueStore, FieldDataCache
+from lms.djangoapps.courseware.toggles import BULK_PREFETCH_USER_STATE
 from edxmako.shortcuts import render_to_string
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData
 from lms.djangoapps.grades.api import GradesUtilService
@@ -1067,10 +1068,15 @@ def handle_xblock_callback(request, course_id, usage_id, handler, suffix=None):
         return _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course=course)
 
 
-def get_module_by_usage_id(request, course_id, usage_id, disable_staff_debug_info=False, course=None):
+def get_module_by_usage_id(request, course_id, usage_id, disable_staff_debug_info=False, course=None,
+                           prefetch_user_state=False):
     """
     Gets a module instance based on its `usage_id` in a course, for a given request/user
 
+    If `prefetch_user_state` is True, the user state of the module and all of its
+    descendants is read at once when the bulk_prefetch_user_state flag is enabled
+    for the course.  Only requests that render the whole module should ask for it.
+
     Returns (instance, tracking_context)
     """
     user = request.user
@@ -1106,12 +1112,15 @@ def get_module_by_usage_id(request, course_id, usage_id, disable_staff_debug_inf
         tracking_context['module']['original_usage_version'] = six.text_type(descriptor_orig_version)
 
     unused_masquerade, user = setup_masquerade(request, course_id, has_access(user, 'staff', descriptor, course_id))
-    field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+    field_data_cache = FieldDataCache(
+        [],
         course_id,
         user,
-        descriptor,
         read_only=CrawlersConfig.is_crawler(request),
     )
+    if prefetch_user_state and BULK_PREFETCH_USER_STATE.is_enabled(course_id):
+        field_data_cache.prefetch_user_state_for_descendents(descriptor.location)
+    field_data_cache.add_descriptor_descendents(descriptor)
     instance = get_module_for_descriptor(
         user,
         request,
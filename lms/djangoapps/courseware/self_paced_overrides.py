@@ -12,6 +12,8 @@ class SelfPacedDateOverrideProvider(FieldOverrideProvider):
     :class:`~courseware.field_overrides.FieldOverrideProvider` which allows for
     due dates to be overridden for self-paced courses.
     """
+    resolved_per_request = True
+
     def get(self, block, name, default):
         # Remove due dates
         if name == 'due':
@@ -6,10 +6,13 @@ from __future__ import absolute_import
 
 import json
 
+import six
+
 from lms.djangoapps.courseware.models import StudentFieldOverride
+from openedx.core.lib.cache_utils import get_cache
 from openedx.core.lib.xblock_utils import is_xblock_aside
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_resolved_overrides
 
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
@@ -18,6 +21,8 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     :class:`~courseware.field_overrides.FieldOverrideProvider` which allows for
     overrides to be made on a per user basis.
     """
+    resolved_per_request = True
+
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
@@ -56,19 +61,44 @@ def _get_overrides_for_user(user, block):
     else:
         location = block.location
 
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=location,
-        student_id=user.id,
-    )
+    course_overrides = _get_overrides_for_user_in_course(user, block.runtime.course_id)
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, serialized_value in six.iteritems(course_overrides.get(six.text_type(location), {})):
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(json.loads(serialized_value))
     return overrides
 
 
+def _get_overrides_for_user_in_course(user, course_id):
+    """
+    Gets all of the individual student overrides for given user in the given
+    course, with a single query per request.  Returns a dictionary mapping the
+    serialized locations of blocks to dictionaries of their serialized field
+    override values keyed by field name.
+    """
+    overrides_cache = get_cache('student-field-overrides')
+    cache_key = (user.id, six.text_type(course_id))
+    if cache_key not in overrides_cache:
+        overrides = {}
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_id,
+            student_id=user.id,
+        ).values_list('location', 'field', 'value')
+        for location, field_name, serialized_value in query:
+            overrides.setdefault(six.text_type(location), {})[field_name] = serialized_value
+        overrides_cache[cache_key] = overrides
+    return overrides_cache[cache_key]
+
+
+def _clear_overrides_for_user_in_course(user, course_id):
+    """
+    Clears the individual student overrides of the given user in the given
+    course loaded in this request, and the field overrides resolved from them.
+    """
+    get_cache('student-field-overrides').pop((user.id, six.text_type(course_id)), None)
+    clear_resolved_overrides()
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -83,6 +113,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_overrides_for_user_in_course(user, block.runtime.course_id)
 
 
 def clear_override_for_user(user, block, name):
@@ -100,3 +131,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_overrides_for_user_in_course(user, block.runtime.course_id)
@@ -7,6 +7,7 @@ from __future__ import absolute_import
 import unittest
 
 from django.test.utils import override_settings
+from mock import Mock
 from xblock.field_data import DictFieldData
 
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
@@ -16,6 +17,7 @@ from ..field_overrides import (
     FieldOverrideProvider,
     OverrideFieldData,
     OverrideModulestoreFieldData,
+    clear_resolved_overrides,
     disable_overrides,
     resolve_dotted
 )
@@ -46,6 +48,25 @@ class TestOverrideProvider(FieldOverrideProvider):
         return True
 
 
+class TestResolvedOverrideProvider(FieldOverrideProvider):
+    """
+    A concrete implementation of `FieldOverrideProvider` resolved once per
+    request, for testing.
+    """
+    resolved_per_request = True
+    calls = []
+
+    def get(self, block, name, default):
+        self.calls.append(name)
+        if name == 'foo':
+            return 'fu'
+        return default
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
 class OverrideFieldBase(SharedModuleStoreTestCase):
     """
     Base class for field data override tests.  Using override_settings and
@@ -148,6 +169,55 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+@override_settings(FIELD_OVERRIDE_PROVIDERS=(
+    'courseware.tests.test_field_overrides.TestResolvedOverrideProvider',))
+class ResolvedOverridesTests(OverrideFieldBase):
+    """
+    Tests for the overrides of providers resolved once per request.
+    """
+
+    def setUp(self):
+        super(ResolvedOverridesTests, self).setUp()
+        OverrideFieldData.provider_classes = None
+        TestResolvedOverrideProvider.calls = []
+        clear_resolved_overrides()
+        self.addCleanup(clear_resolved_overrides)
+        self.block = Mock(location=self.course.location)
+
+    def tearDown(self):
+        super(ResolvedOverridesTests, self).tearDown()
+        OverrideFieldData.provider_classes = None
+
+    def make_one(self):
+        """
+        Factory method.
+        """
+        return OverrideFieldData.wrap(TESTUSER, self.course, DictFieldData({
+            'foo': 'bar',
+            'bees': 'knees',
+        }))
+
+    def test_resolved_once(self):
+        for __ in range(2):
+            data = self.make_one()
+            self.assertEqual(data.get(self.block, 'foo'), 'fu')
+            self.assertEqual(data.get(self.block, 'bees'), 'knees')
+        self.assertEqual(TestResolvedOverrideProvider.calls, ['foo', 'bees'])
+
+    def test_disabled(self):
+        data = self.make_one()
+        with disable_overrides():
+            self.assertEqual(data.get(self.block, 'foo'), 'bar')
+        self.assertEqual(data.get(self.block, 'foo'), 'fu')
+
+    def test_clear_resolved_overrides(self):
+        data = self.make_one()
+        self.assertEqual(data.get(self.block, 'foo'), 'fu')
+        clear_resolved_overrides()
+        self.assertEqual(data.get(self.block, 'foo'), 'fu')
+        self.assertEqual(TestResolvedOverrideProvider.calls, ['foo', 'foo'])
+
+
 class ResolveDottedTests(unittest.TestCase):
     """
     Tests for `resolve_dotted`.
@@ -6,8 +6,9 @@ from __future__ import absolute_import
 import json
 from functools import partial
 
+from django.core.cache import caches
 from django.db import DatabaseError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from mock import Mock, patch
 from xblock.core import XBlock
 from xblock.exceptions import KeyValueMultiSaveError
@@ -23,6 +24,8 @@ from lms.djangoapps.courseware.models import (
 from lms.djangoapps.courseware.tests.factories import StudentInfoFactory
 from lms.djangoapps.courseware.tests.factories import StudentModuleFactory as cmfStudentModuleFactory
 from lms.djangoapps.courseware.tests.factories import StudentPrefsFactory, UserStateSummaryFactory, course_id, location
+from lms.djangoapps.courseware.toggles import BULK_PREFETCH_USER_STATE
+from openedx.core.djangoapps.waffle_utils.testutils import override_waffle_flag
 from student.tests.factories import UserFactory
 
 
@@ -283,6 +286,74 @@ class TestMissingStudentModule(TestCase):
             self.assertFalse(self.kvs.has(user_state_key('a_field')))
 
 
+class TestPrefetchUserState(TestCase):
+    """Tests for prefetching the user_state of many blocks at once"""
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestPrefetchUserState, self).setUp()
+        self.user = UserFactory.create()
+        self.usage_keys = [location('usage_{}'.format(index)) for index in range(600)]
+        for usage_key in self.usage_keys[::100]:
+            StudentModuleFactory(
+                student=self.user,
+                module_state_key=usage_key,
+                state=json.dumps({'a_field': usage_key.block_id}),
+            )
+        self.field_data_cache = FieldDataCache([], course_id, self.user)
+        self.kvs = DjangoKeyValueStore(self.field_data_cache)
+
+    def _cache_flag(self):
+        """
+        Reads the bulk prefetch flag of the course, so that its queries are not counted.
+        """
+        BULK_PREFETCH_USER_STATE.is_enabled(course_id)
+
+    def test_prefetch_in_chunks(self):
+        # Without the flag, the usage keys are read one chunk at a time.
+        self._cache_flag()
+        with self.assertNumQueries(2):
+            self.field_data_cache.cache[Scope.user_state].prefetch(self.usage_keys)
+
+    @override_waffle_flag(BULK_PREFETCH_USER_STATE, active=True)
+    def test_prefetch_with_single_query(self):
+        # More usage keys than fit in one chunk are read with one query for the course.
+        self._cache_flag()
+        with self.assertNumQueries(1):
+            self.field_data_cache.cache[Scope.user_state].prefetch(self.usage_keys)
+        with self.assertNumQueries(0):
+            for usage_key in self.usage_keys[::100]:
+                self.assertEquals(
+                    usage_key.block_id,
+                    self.kvs.get(DjangoKeyValueStore.Key(Scope.user_state, self.user.id, usage_key, 'a_field')),
+                )
+            self.assertFalse(
+                self.kvs.has(DjangoKeyValueStore.Key(Scope.user_state, self.user.id, self.usage_keys[1], 'a_field'))
+            )
+
+    def test_prefetched_descriptors_not_read_again(self):
+        self.field_data_cache.cache[Scope.user_state].prefetch([location('usage_id')])
+        with self.assertNumQueries(0):
+            self.field_data_cache.add_descriptors_to_cache([mock_descriptor([mock_field(Scope.user_state, 'a_field')])])
+
+    @override_waffle_flag(BULK_PREFETCH_USER_STATE, active=True)
+    @patch('lms.djangoapps.courseware.model_data.get_block_structure_manager')
+    def test_prefetch_user_state_for_descendents(self, mock_get_manager):
+        block_structure = mock_get_manager.return_value.get_collected.return_value
+        block_structure.__contains__ = Mock(return_value=True)
+        block_structure.topological_traversal.return_value = self.usage_keys
+        self._cache_flag()
+        with self.assertNumQueries(1):
+            self.field_data_cache.prefetch_user_state_for_descendents(self.usage_keys[0])
+        block_structure.topological_traversal.assert_called_once_with(start_node=self.usage_keys[0])
+        with self.assertNumQueries(0):
+            self.assertEquals(
+                u'usage_100',
+                self.kvs.get(DjangoKeyValueStore.Key(Scope.user_state, self.user.id, self.usage_keys[100], 'a_field')),
+            )
+
+
 class StorageTestBase(object):
     """
     A base class for that gets subclassed when testing each of the scopes.
@@ -397,6 +468,62 @@ class StorageTestBase(object):
         exception = exception_context.exception
         self.assertEquals(exception.saved_field_names, ['existing_field', 'other_existing_field'])
 
+    def shared_cache_settings(self):
+        """
+        Returns settings that hold the field data of the tested scope in
+        a cleared, working shared cache.
+        """
+        caches['blockstore'].clear()
+        return override_settings(FIELD_DATA_SHARED_CACHE={
+            'CACHE': 'blockstore',
+            'TIMEOUTS': {self.scope.name: 60},
+        })
+
+    def test_shared_cache_read(self):
+        """Test that the field data is read from the database once across FieldDataCaches"""
+        with self.shared_cache_settings():
+            with self.assertNumQueries(1):
+                FieldDataCache([self.mock_descriptor], course_id, self.user)
+            with self.assertNumQueries(0):
+                kvs = DjangoKeyValueStore(FieldDataCache([self.mock_descriptor], course_id, self.user))
+                self.assertEquals('old_value', kvs.get(self.key_factory('existing_field')))
+                self.assertRaises(KeyError, kvs.get, self.key_factory('missing_field'))
+
+    @patch('lms.djangoapps.courseware.model_data.transaction.on_commit', lambda func: func())
+    def test_shared_cache_invalidated_by_set(self):
+        """Test that setting a field invalidates the shared cache"""
+        with self.shared_cache_settings():
+            kvs = DjangoKeyValueStore(FieldDataCache([self.mock_descriptor], course_id, self.user))
+            kvs.set_many({self.key_factory('existing_field'): 'new_value', self.key_factory('missing_field'): 'value'})
+            with self.assertNumQueries(1):
+                kvs = DjangoKeyValueStore(FieldDataCache([self.mock_descriptor], course_id, self.user))
+            self.assertEquals('new_value', kvs.get(self.key_factory('existing_field')))
+
+    @patch('lms.djangoapps.courseware.model_data.transaction.on_commit', lambda func: func())
+    def test_shared_cache_invalidated_by_delete(self):
+        """Test that deleting a field invalidates the shared cache"""
+        with self.shared_cache_settings():
+            kvs = DjangoKeyValueStore(FieldDataCache([self.mock_descriptor], course_id, self.user))
+            kvs.delete(self.key_factory('existing_field'))
+            with self.assertNumQueries(1):
+                kvs = DjangoKeyValueStore(FieldDataCache([self.mock_descriptor], course_id, self.user))
+            self.assertFalse(kvs.has(self.key_factory('existing_field')))
+
+    def test_shared_cache_invalidated_on_commit(self):
+        """Test that the shared cache is only invalidated when the transaction commits"""
+        with self.shared_cache_settings():
+            kvs = DjangoKeyValueStore(FieldDataCache([self.mock_descriptor], course_id, self.user))
+            with patch('lms.djangoapps.courseware.model_data.transaction.on_commit') as mock_on_commit:
+                kvs.set(self.key_factory('existing_field'), 'new_value')
+            with self.assertNumQueries(0):
+                DjangoKeyValueStore(FieldDataCache([self.mock_descriptor], course_id, self.user))
+
+            for call_args in mock_on_commit.call_args_list:
+                call_args[0][0]()
+            with self.assertNumQueries(1):
+                kvs = DjangoKeyValueStore(FieldDataCache([self.mock_descriptor], course_id, self.user))
+            self.assertEquals('new_value', kvs.get(self.key_factory('existing_field')))
+
 
 class TestUserStateSummaryStorage(StorageTestBase, TestCase):
     """Tests for UserStateSummaryStorage"""
@@ -57,11 +57,13 @@ from lms.djangoapps.courseware.tests.factories import (
 )
 from lms.djangoapps.courseware.tests.test_submitting_problems import TestSubmittingProblems
 from lms.djangoapps.courseware.tests.tests import LoginEnrollmentTestCase
+from lms.djangoapps.courseware.toggles import BULK_PREFETCH_USER_STATE
 from lms.djangoapps.courseware.field_overrides import OverrideFieldData
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from openedx.core.djangoapps.credit.api import set_credit_requirement_status, set_credit_requirements
 from openedx.core.djangoapps.credit.models import CreditCourse
 from openedx.core.djangoapps.oauth_dispatch.jwt import create_jwt_for_user
+from openedx.core.djangoapps.waffle_utils.testutils import override_waffle_flag
 from openedx.core.lib.courses import course_image_url
 from openedx.core.lib.gating import api as gating_api
 from openedx.core.lib.url_utils import quote_slashes
@@ -614,6 +616,26 @@ class TestHandleXBlockCallback(SharedModuleStoreTestCase, LoginEnrollmentTestCas
         )
         self.assertEqual(200, response.status_code)
 
+    @override_waffle_flag(BULK_PREFETCH_USER_STATE, active=True)
+    @patch.object(FieldDataCache, 'prefetch_user_state_for_descendents')
+    def test_prefetch_user_state_only_for_rendering(self, mock_prefetch):
+        request = self.request_factory.post('dummy_url', data={'position': 1})
+        request.user = self.mock_user
+        response = render.handle_xblock_callback(
+            request,
+            text_type(self.course_key),
+            quote_slashes(text_type(self.location)),
+            'xmodule_handler',
+            'goto_position',
+        )
+        self.assertEqual(200, response.status_code)
+        self.assertFalse(mock_prefetch.called)
+
+        render.get_module_by_usage_id(
+            request, text_type(self.course_key), text_type(self.location), prefetch_user_state=True
+        )
+        mock_prefetch.assert_called_once_with(self.location)
+
     def test_invalid_location(self):
         request = self.request_factory.post('dummy_url', data={'position': 1})
         request.user = self.mock_user
@@ -0,0 +1,31 @@
+"""
+Toggles for courseware.
+"""
+
+from __future__ import absolute_import
+
+from openedx.core.djangoapps.waffle_utils import CourseWaffleFlag, WaffleFlagNamespace
+
+COURSEWARE_NAMESPACE = WaffleFlagNamespace(name=u'courseware')
+
+# Waffle course override to prefetch the user state of all blocks of a rendered
+# course outline or sequence at once, as listed in the collected block structure.
+# .. toggle_name: courseware.bulk_prefetch_user_state
+# .. toggle_implementation: CourseWaffleFlag
+# .. toggle_default: False
+# .. toggle_description: Reads the StudentModules of a whole course outline or sequence with a constant
+#   number of queries, rather than with queries that grow with the number of its blocks, when rendering
+#   the courseware or a single block.  Reads of the StudentModules of many blocks of the course at once
+#   query all of the user's StudentModules in the course.
+# .. toggle_category: courseware
+# .. toggle_use_cases: monitored_rollout
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_expiration_date: ??
+# .. toggle_warnings: None
+# .. toggle_tickets: None
+# .. toggle_status: supported
+BULK_PREFETCH_USER_STATE = CourseWaffleFlag(
+    waffle_namespace=COURSEWARE_NAMESPACE,
+    flag_name=u'bulk_prefetch_user_state',
+    flag_undefined_default=False
+)
@@ -21,6 +21,7 @@ from edx_user_state_client.interface import XBlockUserState, XBlockUserStateClie
 from xblock.fields import Scope
 
 from lms.djangoapps.courseware.models import BaseStudentModuleHistory, StudentModule
+from lms.djangoapps.courseware.toggles import BULK_PREFETCH_USER_STATE
 
 try:
     import simplejson as json
@@ -54,6 +55,12 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
     # Use this sample rate for DataDog events.
     API_DATADOG_SAMPLE_RATE = 0.1
 
+    # Number of usage keys of a single course above which their StudentModules
+    # are read with a single query for the whole course, rather than with one
+    # query per chunk of usage keys, when the bulk_prefetch_user_state flag is
+    # enabled for the course.
+    COURSE_QUERY_THRESHOLD = 500
+
     class ServiceUnavailable(XBlockUserStateClient.ServiceUnavailable):
         """
         This error is raised if the service backing this client is currently unavailable.
@@ -96,16 +103,29 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         )
 
         for course_key, usage_keys in by_course:
-            query = StudentModule.objects.chunked_filter(
-                'module_state_key__in',
-                usage_keys,
-                student__username=username,
-                course_id=course_key,
-            )
+            usage_keys = list(usage_keys)
+            if len(usage_keys) > self.COURSE_QUERY_THRESHOLD and BULK_PREFETCH_USER_STATE.is_enabled(course_key):
+                # Rather than issuing one query per chunk of usage keys, read
+                # all of the user's StudentModules in the course at once, using
+                # the student index, and drop the unrequested ones.
+                requested_keys = set(usage_keys)
+                query = StudentModule.objects.filter(
+                    student__username=username,
+                    course_id=course_key,
+                )
+            else:
+                requested_keys = None
+                query = StudentModule.objects.chunked_filter(
+                    'module_state_key__in',
+                    usage_keys,
+                    student__username=username,
+                    course_id=course_key,
+                )
 
             for student_module in query:
                 usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
-                yield (student_module, usage_key)
+                if requested_keys is None or usage_key in requested_keys:
+                    yield (student_module, usage_key)
 
     def _nr_metric_name(self, function_name, stat_name, block_type=None):
         """
@@ -396,7 +416,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
             yield XBlockUserState(username, block_key, state, history_entry.created, scope)
 
-    def iter_all_for_block(self, block_key, scope=Scope.user_state):
+    def iter_all_for_block(self, block_key, scope=Scope.user_state, user_ids=None):
         """
         Return an iterator over the data stored in the block (e.g. a problem block).
 
@@ -406,6 +426,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         Arguments:
             block_key: an XBlock's locator (e.g. :class:`~BlockUsageLocator`)
             scope (Scope): must be `Scope.user_state`
+            user_ids (list): if given, only the data of the users with these ids is returned
 
         Returns:
             an iterator over all data. Each invocation returns the next :class:`~XBlockUserState`
@@ -415,6 +436,8 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             raise ValueError("Only Scope.user_state is supported")
 
         results = StudentModule.objects.order_by('id').filter(module_state_key=block_key)
+        if user_ids is not None:
+            results = results.filter(student_id__in=user_ids)
         p = Paginator(results, settings.USER_STATE_BATCH_SIZE)
 
         for page_number in p.page_range:
@@ -67,6 +67,7 @@ from ..masquerade import check_content_start_date_for_masquerade_user, setup_mas
 from ..model_data import FieldDataCache
 from ..module_render import get_module_for_descriptor, toc_for_course
 from ..permissions import MASQUERADE_AS_STUDENT
+from ..toggles import BULK_PREFETCH_USER_STATE
 
 from .views import CourseTabView
 
@@ -356,13 +357,17 @@ class CoursewareIndex(View):
         Prefetches all descendant data for the requested section and
         sets up the runtime, which binds the request user to the section.
         """
-        self.field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+        self.field_data_cache = FieldDataCache(
+            [],
             self.course_key,
             self.effective_user,
-            self.course,
-            depth=CONTENT_DEPTH,
             read_only=CrawlersConfig.is_crawler(request),
         )
+        if BULK_PREFETCH_USER_STATE.is_enabled(self.course_key):
+            # Prefetch the user state of the whole course, including that of
+            # the requested section, in one go.
+            self.field_data_cache.prefetch_user_state_for_descendents(self.course.location)
+        self.field_data_cache.add_descriptor_descendents(self.course, depth=CONTENT_DEPTH)
 
         self.course = get_module_for_descriptor(
             self.effective_user,
@@ -1565,7 +1565,8 @@ def render_xblock(request, usage_key_string, check_if_enrolled=True):
 
         # get the block, which verifies whether the user has access to the block.
         block, _ = get_module_by_usage_id(
-            request, text_type(course_key), text_type(usage_key), disable_staff_debug_info=True, course=course
+            request, text_type(course_key), text_type(usage_key), disable_staff_debug_info=True, course=course,
+            prefetch_user_state=True,
         )
 
         student_view_context = request.GET.dict()
@@ -4,12 +4,15 @@ from __future__ import absolute_import
 
 import datetime
 import json
+import threading
 
 import ddt
 import mock
 import six
 from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
 from django.urls import reverse
+from django.utils.translation import get_language, override
 from edx_django_utils.cache import RequestCache
 from mock import Mock, patch
 from pytz import UTC
@@ -30,7 +33,10 @@ from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
 from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
     CommentClientMaintenanceError,
-    perform_request
+    CommentClientRequestError,
+    perform_request,
+    reset_transport,
+    start_concurrent_request
 )
 from openedx.core.djangoapps.django_comment_common.models import (
     CourseDiscussionSettings,
@@ -1840,6 +1846,77 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+class ClientTransportTestCase(TestCase):
+    """Tests for the pooled and concurrent transport of comment service requests."""
+
+    def setUp(self):
+        super(ClientTransportTestCase, self).setUp()
+        config = ForumsConfig.current()
+        config.enabled = True
+        config.save()
+        reset_transport()
+        self.addCleanup(reset_transport)
+
+    @staticmethod
+    def _response():
+        """Returns a successful comment service response."""
+        response = Mock()
+        response.status_code = 200
+        response.json = lambda: {'id': 'a'}
+        return response
+
+    @patch('requests.request')
+    @patch('requests.Session.request')
+    def test_unpooled(self, mock_session_request, mock_request):
+        mock_request.return_value = self._response()
+        self.assertEqual(perform_request('get', 'http://localhost/a'), {'id': 'a'})
+        self.assertTrue(mock_request.called)
+        self.assertFalse(mock_session_request.called)
+
+    @override_settings(COMMENTS_SERVICE_MAX_CONNECTIONS=2)
+    @patch('requests.request')
+    @patch('requests.Session.request')
+    def test_pooled(self, mock_session_request, mock_request):
+        mock_session_request.return_value = self._response()
+        self.assertEqual(perform_request('get', 'http://localhost/a'), {'id': 'a'})
+        self.assertEqual(perform_request('get', 'http://localhost/a'), {'id': 'a'})
+        self.assertEqual(mock_session_request.call_count, 2)
+        self.assertFalse(mock_request.called)
+
+    def test_sequential_request(self):
+        calling_thread = threading.current_thread()
+        request = start_concurrent_request(lambda value: (threading.current_thread(), value), 1)
+        self.assertEqual(request.result(), (calling_thread, 1))
+
+    @override_settings(COMMENTS_SERVICE_CONCURRENT_REQUESTS=2)
+    @patch('requests.request')
+    def test_concurrent_requests(self, mock_request):
+        mock_request.return_value = self._response()
+
+        def _request(path):
+            """Performs a request and returns the thread and language it was performed in."""
+            return perform_request('get', 'http://localhost/' + path), threading.current_thread(), get_language()
+
+        with override('eo'):
+            pending = [start_concurrent_request(_request, path) for path in ('a', 'b')]
+            results = [request.result() for request in pending]
+
+        for result, thread, language in results:
+            self.assertEqual(result, {'id': 'a'})
+            self.assertNotEqual(thread, threading.current_thread())
+            self.assertEqual(language, 'eo')
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_request.call_args[1]['headers']['Accept-Language'], 'eo')
+
+    @override_settings(COMMENTS_SERVICE_CONCURRENT_REQUESTS=1)
+    @patch('requests.request')
+    def test_concurrent_request_error(self, mock_request):
+        mock_request.return_value = Mock(status_code=404, text='Not found')
+        request = start_concurrent_request(perform_request, 'get', 'http://localhost/a')
+        with self.assertRaises(CommentClientRequestError):
+            request.result()
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
@@ -49,7 +49,11 @@ from lms.djangoapps.discussion.rest_api.serializers import (
 )
 from openedx.core.djangoapps.django_comment_common.comment_client.comment import Comment
 from openedx.core.djangoapps.django_comment_common.comment_client.thread import Thread
-from openedx.core.djangoapps.django_comment_common.comment_client.utils import CommentClientRequestError
+from openedx.core.djangoapps.django_comment_common.comment_client.user import User as CommentClientUser
+from openedx.core.djangoapps.django_comment_common.comment_client.utils import (
+    CommentClientRequestError,
+    start_concurrent_request
+)
 from openedx.core.djangoapps.django_comment_common.signals import (
     comment_created,
     comment_deleted,
@@ -558,7 +562,8 @@ def get_thread_list(
         })
 
     course = _get_course(course_key, request.user)
-    context = get_context(course, request)
+    cc_requester = CommentClientUser.from_django_user(request.user)
+    context = get_context(course, request, cc_requester=cc_requester)
 
     query_params = {
         "user_id": six.text_type(request.user.id),
@@ -580,13 +585,19 @@ def get_thread_list(
                 "view": [u"Invalid value. '{}' must be 'unread' or 'unanswered'".format(view)]
             })
 
+    # The threads are searched for while the requester is retrieved.
+    requester_retrieval = start_concurrent_request(cc_requester.retrieve)
     if following:
-        paginated_results = context["cc_requester"].subscribed_threads(query_params)
+        requester_retrieval.result()
+        cc_requester["course_id"] = course.id
+        paginated_results = cc_requester.subscribed_threads(query_params)
     else:
         query_params["course_id"] = six.text_type(course.id)
         query_params["commentable_ids"] = ",".join(topic_id_list) if topic_id_list else None
         query_params["text"] = text_search
         paginated_results = Thread.search(query_params)
+        requester_retrieval.result()
+        cc_requester["course_id"] = course.id
     # The comments service returns the last page of results if the requested
     # page is beyond the last page, but we want be consistent with DRF's general
     # behavior and return a PageNotFoundError in that case
@@ -37,10 +37,14 @@ from openedx.core.djangoapps.django_comment_common.utils import get_course_discu
 from student.models import get_user_by_username_or_email
 
 
-def get_context(course, request, thread=None):
+def get_context(course, request, thread=None, cc_requester=None):
     """
     Returns a context appropriate for use with ThreadSerializer or
     (if thread is provided) CommentSerializer.
+
+    The requester's comment client user is retrieved, unless cc_requester is
+    provided, in which case it is up to the caller to retrieve it and to set
+    its course_id before the context is used.
     """
     # TODO: cache staff_user_ids and ta_user_ids if we need to improve perf
     staff_user_ids = {
@@ -57,8 +61,9 @@ def get_context(course, request, thread=None):
         for user in role.users.all()
     }
     requester = request.user
-    cc_requester = CommentClientUser.from_django_user(requester).retrieve()
-    cc_requester["course_id"] = course.id
+    if cc_requester is None:
+        cc_requester = CommentClientUser.from_django_user(requester).retrieve()
+        cc_requester["course_id"] = course.id
     course_discussion_settings = get_course_discussion_settings(course.id)
     return {
         "course": course,
@@ -302,7 +302,8 @@ def single_thread(request, course_key, discussion_id, thread_id):
     request.user.is_community_ta = utils.is_user_community_ta(request.user, course.id)
     if request.is_ajax():
         cc_user = cc.User.from_django_user(request.user)
-        user_info = cc_user.to_dict()
+        # The thread is retrieved while the user is.
+        user_retrieval = cc.utils.start_concurrent_request(cc_user.to_dict)
         is_staff = has_permission(request.user, 'openclose_thread', course.id)
         thread = _load_thread_for_viewing(
             request,
@@ -311,6 +312,7 @@ def single_thread(request, course_key, discussion_id, thread_id):
             thread_id=thread_id,
             raise_event=True,
         )
+        user_info = user_retrieval.result()
 
         with function_trace("get_annotated_content_infos"):
             annotated_content_info = utils.get_annotated_content_infos(
@@ -18,6 +18,7 @@ REJECTED_EXAM_OVERRIDES_GRADE = u'rejected_exam_overrides_grade'
 ENFORCE_FREEZE_GRADE_AFTER_COURSE_END = u'enforce_freeze_grade_after_course_end'
 WRITABLE_GRADEBOOK = u'writable_gradebook'
 BULK_MANAGEMENT = u'bulk_management'
+GRADE_MATRIX = u'grade_matrix'
 
 
 def waffle():
@@ -55,6 +56,12 @@ def waffle_flags():
             BULK_MANAGEMENT,
             flag_undefined_default=False,
         ),
+        # Serve the gradebook from the course's grade matrix rather than computing course grades.
+        GRADE_MATRIX: CourseWaffleFlag(
+            namespace,
+            GRADE_MATRIX,
+            flag_undefined_default=False,
+        ),
     }
 
 
@@ -72,3 +79,10 @@ def gradebook_can_see_bulk_management(course_key):
     (provided that course contains a masters track, as of this writing)
     """
     return waffle_flags()[BULK_MANAGEMENT].is_enabled(course_key)
+
+
+def is_grade_matrix_enabled(course_key):
+    """
+    Returns whether the gradebook of the given course is served from its grade matrix.
+    """
+    return waffle_flags()[GRADE_MATRIX].is_enabled(course_key)
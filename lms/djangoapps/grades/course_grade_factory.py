@@ -4,11 +4,16 @@ Course Grade Factory Class
 from __future__ import absolute_import
 
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
 import six
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection
 from six import text_type
 
+from lms.djangoapps.courseware.model_data import ScoresClient
 from openedx.core.djangoapps.signals.signals import (
     COURSE_GRADE_CHANGED,
     COURSE_GRADE_NOW_FAILED,
@@ -19,7 +24,11 @@ from .config import assume_zero_if_absent, should_persist_grades
 from .course_data import CourseData
 from .course_grade import CourseGrade, ZeroCourseGrade
 from .models import PersistentCourseGrade
-from .models_api import prefetch_grade_overrides_and_visible_blocks
+from .models_api import (
+    clear_prefetched_grades_for_users,
+    prefetch_grade_overrides_and_visible_blocks,
+    prefetch_grades_for_users
+)
 
 log = getLogger(__name__)
 
@@ -99,6 +108,11 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        When COURSE_GRADE_ITER_WORKERS is set, the students are graded in chunks
+        of COURSE_GRADE_ITER_CHUNK_SIZE, each split across that many worker
+        threads which prefetch the stored grades and scores of their students
+        in bulk. The results are still yielded in the order of the students.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -109,8 +123,74 @@ class CourseGradeFactory(object):
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
         stats_tags = [u'action:{}'.format(course_data.course_key)]
-        for user in users:
-            yield self._iter_grade_result(user, course_data, force_update)
+        workers = getattr(settings, 'COURSE_GRADE_ITER_WORKERS', 0)
+        if workers:
+            for result in self._iter_grade_results_in_parallel(users, course_data, force_update, workers):
+                yield result
+        else:
+            for user in users:
+                yield self._iter_grade_result(user, course_data, force_update)
+
+    def _iter_grade_results_in_parallel(self, users, course_data, force_update, workers):
+        """
+        Yields a GradeResult for every given user, in order, while grading the
+        users of the next chunk in the given number of worker threads.
+        """
+        chunk_size = getattr(settings, 'COURSE_GRADE_ITER_CHUNK_SIZE', 100)
+        users = iter(users)
+
+        # Load the course and its collected structure once, before they are
+        # shared by the worker threads.  Each student is graded against a
+        # copy-on-write view of the collected structure, whose block data are
+        # only read; the field values of a deserialized structure are decoded
+        # under its lock, on first access by any of the threads.
+        course_data.course  # pylint: disable=pointless-statement
+        course_data.collected_structure  # pylint: disable=pointless-statement
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            pending = []
+            while True:
+                users_chunk = list(islice(users, chunk_size))
+                if not users_chunk:
+                    break
+
+                batch_size = -(-len(users_chunk) // workers)  # ceiling division
+                submitted = [
+                    executor.submit(self._grade_batch, users_chunk[start:start + batch_size], course_data, force_update)
+                    for start in range(0, len(users_chunk), batch_size)
+                ]
+                for future in pending:
+                    for result in future.result():
+                        yield result
+                pending = submitted
+
+            for future in pending:
+                for result in future.result():
+                    yield result
+        finally:
+            executor.shutdown(wait=True)
+
+    def _grade_batch(self, users, course_data, force_update):
+        """
+        Returns a list of GradeResults for the given users, after prefetching
+        their stored grades and scores in bulk. Runs in a worker thread, which
+        has its own RequestCache and database connection.
+        """
+        course_key = course_data.course_key
+        try:
+            try:
+                prefetch_grades_for_users(course_key, users)
+                ScoresClient.prefetch(course_key, [user.id for user in users])
+            except Exception:  # pylint: disable=broad-except
+                # The users can still be graded one at a time, without the
+                # prefetched data.
+                log.exception(u'Cannot prefetch grades of %d students in course %s', len(users), course_key)
+            return [self._iter_grade_result(user, course_data, force_update) for user in users]
+        finally:
+            clear_prefetched_grades_for_users(course_key, users)
+            ScoresClient.clear_prefetched_data(course_key)
+            connection.close()
 
     def _iter_grade_result(self, user, course_data, force_update):
         try:
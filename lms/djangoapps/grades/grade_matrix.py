@@ -0,0 +1,403 @@
+"""
+A columnar matrix of the persisted grades of the learners of a course, with a
+row per learner and a column per graded subsection.
+
+Each process builds the matrix of a course with a single scan of the
+persisted course and subsection grades of the course, and holds it in memory.
+The matrix is then kept up to date incrementally: as the grades of a learner
+change, the learner's id is appended to a log of changed learners, which is
+shared by all processes through the cache.  Before a matrix is read, the rows
+of the learners logged since it was built or last updated are read again
+from the database, in bulk.  The matrix is built anew when the log is
+incomplete, for example after cache evictions, when the graded subsections
+of the course change, or when the matrix is older than GRADE_MATRIX_MAX_AGE.
+"""
+from __future__ import absolute_import, division
+
+import logging
+from collections import OrderedDict
+from threading import Lock
+from time import time
+from uuid import uuid4
+
+import numpy
+import six
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import PersistentCourseGrade, PersistentSubsectionGrade
+
+log = logging.getLogger(__name__)
+
+# Number of seconds for which the log of the learners whose grades changed is
+# held in the cache.
+CHANGE_LOG_TIMEOUT = 24 * 60 * 60
+
+CACHE_KEY_PREFIX = u'grades.grade_matrix'
+
+
+class CourseGradeMatrix(object):
+    """
+    A columnar matrix of the persisted grades of the learners of a course.
+
+    The course-level grades are held in one-dimensional arrays, and the
+    subsection-level grades in two-dimensional arrays, indexed by
+    [row, column], where each learner has a row and each graded subsection a
+    column.  Learners without persisted grades, and learners without a
+    persisted grade for a subsection, have zero grades, and are told apart
+    by the has_course_grade and has_subsection_grade arrays.
+    """
+    def __init__(self, course_key, subsection_keys):
+        self.course_key = course_key
+
+        # The usage keys of the graded subsections, in column order.
+        # [UsageKey]
+        self.subsection_keys = list(subsection_keys)
+        self._column_indices = {subsection_key: index for index, subsection_key in enumerate(self.subsection_keys)}
+
+        # Map of each learner's user id to the index of the learner's row.
+        # dict {int: int}
+        self._row_indices = {}
+
+        # The id of each row's learner, and their course grades.
+        self.user_ids = numpy.zeros(0, dtype=numpy.int64)
+        self.has_course_grade = numpy.zeros(0, dtype=bool)
+        self.percent = numpy.zeros(0)
+        self.letter_grade = numpy.zeros(0, dtype=object)
+        self.passed = numpy.zeros(0, dtype=bool)
+
+        # The subsection grades of each row's learner: whether they are
+        # persisted, their graded earned and possible scores, with any
+        # overrides applied, whether they were attempted, and whether they
+        # were overridden.
+        num_columns = len(self.subsection_keys)
+        self.has_subsection_grade = numpy.zeros((0, num_columns), dtype=bool)
+        self.earned = numpy.zeros((0, num_columns))
+        self.possible = numpy.zeros((0, num_columns))
+        self.attempted = numpy.zeros((0, num_columns), dtype=bool)
+        self.overridden = numpy.zeros((0, num_columns), dtype=bool)
+
+        # The position in the change log up to which, and the time at which,
+        # the matrix was last brought up to date.
+        self.change_log_id = None
+        self.change_log_position = 0
+        self.created = time()
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    @classmethod
+    def build(cls, course_key, subsection_keys, user_ids=None):
+        """
+        Returns the matrix of the persisted grades of the given course, read
+        with a single scan of each of the grades tables.
+
+        Arguments:
+            course_key (CourseKey) - The course.
+            subsection_keys ([UsageKey]) - The graded subsections of the
+                course, in column order.
+            user_ids ([int]) - If given, only the grades of these users are
+                read, with a row for each of them.
+        """
+        matrix = cls(course_key, subsection_keys)
+        matrix._read_grades(user_ids)  # pylint: disable=protected-access
+        return matrix
+
+    def percent_graded(self):
+        """
+        Returns a two-dimensional array of the graded percent of each
+        subsection grade, rounded as by scores.compute_percent.
+        """
+        percent = numpy.zeros(self.earned.shape)
+        numpy.divide(self.earned, self.possible, out=percent, where=self.possible > 0)
+        return numpy.around(percent, decimals=2)
+
+    def assignment_grade_in_range(self, subsection_key, percent_min, percent_max):
+        """
+        Returns a one-dimensional array of whether each learner has a
+        persisted grade of the given subsection whose graded percent, from 0
+        to 100, is within the given range, as filtered by the gradebook.
+        """
+        column_index = self._column_indices[subsection_key]
+        earned = self.earned[:, column_index]
+        possible = self.possible[:, column_index]
+        percent = numpy.zeros(len(self))
+        numpy.divide(earned * 100, possible, out=percent, where=possible > 0)
+        return (
+            self.has_subsection_grade[:, column_index] & (possible > 0) &
+            (percent >= percent_min) & (percent <= percent_max)
+        )
+
+    def course_grade_in_range(self, percent_min=None, percent_max=None):
+        """
+        Returns a one-dimensional array of whether each learner has a
+        persisted course grade whose percent, from 0 to 1, is within the
+        given range, as filtered by the gradebook.
+        """
+        in_range = self.has_course_grade.copy()
+        if percent_min is not None:
+            in_range &= self.percent >= percent_min
+        if percent_max is not None:
+            in_range &= self.percent <= percent_max
+        return in_range
+
+    def has_subsection(self, subsection_key):
+        """
+        Returns whether the given subsection has a column in the matrix.
+        """
+        return subsection_key in self._column_indices
+
+    def slice(self, user_ids):
+        """
+        Returns a matrix of the rows of the given users, in the given order.
+        Users without a row in this matrix have zero grades.
+        """
+        # Rows of unknown users are read from a zero row appended to each
+        # column, at index -1.
+        row_indices = numpy.array([self._row_indices.get(user_id, -1) for user_id in user_ids], dtype=numpy.int64)
+
+        def _slice_column(column):
+            """
+            Returns the given rows of the given column.
+            """
+            zero_row = numpy.zeros((1,) + column.shape[1:], dtype=column.dtype)
+            return numpy.concatenate((column, zero_row))[row_indices]
+
+        matrix = CourseGradeMatrix(self.course_key, self.subsection_keys)
+        matrix._set_rows(  # pylint: disable=protected-access
+            user_ids,
+            *[_slice_column(column) for column in self._columns()]
+        )
+        matrix.letter_grade[row_indices == -1] = None
+        return matrix
+
+    def update_users(self, user_ids):
+        """
+        Reads the grades of the given users anew from the database.
+        """
+        updated = CourseGradeMatrix.build(self.course_key, self.subsection_keys, user_ids)
+        new_user_ids = [user_id for user_id in updated.user_ids if user_id not in self._row_indices]
+        if new_user_ids:
+            self._add_rows(new_user_ids)
+
+        row_indices = numpy.array([self._row_indices[user_id] for user_id in updated.user_ids], dtype=numpy.int64)
+        for column, updated_column in zip(self._columns(), updated._columns()):  # pylint: disable=protected-access
+            column[row_indices] = updated_column
+
+    def _columns(self):
+        """
+        Returns the arrays of the grades of the matrix.
+        """
+        return (
+            self.has_course_grade, self.percent, self.letter_grade, self.passed,
+            self.has_subsection_grade, self.earned, self.possible, self.attempted, self.overridden,
+        )
+
+    def _set_rows(
+            self, user_ids, has_course_grade, percent, letter_grade, passed,
+            has_subsection_grade, earned, possible, attempted, overridden,
+    ):
+        """
+        Replaces all rows of the matrix with the given ones.
+        """
+        self.user_ids = numpy.array(user_ids, dtype=numpy.int64)
+        self._row_indices = {user_id: index for index, user_id in enumerate(user_ids)}
+        self.has_course_grade = has_course_grade
+        self.percent = percent
+        self.letter_grade = letter_grade
+        self.passed = passed
+        self.has_subsection_grade = has_subsection_grade
+        self.earned = earned
+        self.possible = possible
+        self.attempted = attempted
+        self.overridden = overridden
+
+    def _add_rows(self, user_ids):
+        """
+        Appends rows of zero grades for the given users.
+        """
+        num_rows = len(user_ids)
+        self._set_rows(
+            list(self.user_ids) + list(user_ids),
+            *[
+                numpy.concatenate((column, numpy.zeros((num_rows,) + column.shape[1:], dtype=column.dtype)))
+                for column in self._columns()
+            ]
+        )
+        self.letter_grade[-num_rows:] = None
+
+    def _read_grades(self, user_ids=None):
+        """
+        Reads the rows of the given users, or of all users with persisted
+        grades in the course, from the database.
+        """
+        course_grades = PersistentCourseGrade.objects.filter(course_id=self.course_key)
+        subsection_grades = PersistentSubsectionGrade.objects.filter(course_id=self.course_key)
+        if user_ids is not None:
+            course_grades = course_grades.filter(user_id__in=user_ids)
+            subsection_grades = subsection_grades.filter(user_id__in=user_ids)
+
+        course_grade_rows = list(course_grades.values_list('user_id', 'percent_grade', 'letter_grade'))
+        subsection_grade_rows = list(subsection_grades.values_list(
+            'user_id',
+            'usage_key',
+            'earned_graded',
+            'possible_graded',
+            'first_attempted',
+            'override__id',
+            'override__earned_graded_override',
+            'override__possible_graded_override',
+        ))
+
+        if user_ids is None:
+            user_ids = sorted(
+                {row[0] for row in course_grade_rows} | {row[0] for row in subsection_grade_rows}
+            )
+        self._add_rows(user_ids)
+
+        for user_id, percent, letter_grade in course_grade_rows:
+            row_index = self._row_indices[user_id]
+            self.has_course_grade[row_index] = True
+            self.percent[row_index] = percent
+            self.letter_grade[row_index] = letter_grade or None
+            self.passed[row_index] = letter_grade != u''
+
+        for (
+                user_id, usage_key, earned, possible, first_attempted,
+                override_id, earned_override, possible_override,
+        ) in subsection_grade_rows:
+            # The usage_key may not have the run filled in for old mongo courses.
+            column_index = self._column_indices.get(usage_key.map_into_course(self.course_key))
+            if column_index is None:
+                continue
+            row_index = self._row_indices[user_id]
+            self.has_subsection_grade[row_index, column_index] = True
+            self.earned[row_index, column_index] = earned if earned_override is None else earned_override
+            self.possible[row_index, column_index] = possible if possible_override is None else possible_override
+            self.attempted[row_index, column_index] = first_attempted is not None
+            self.overridden[row_index, column_index] = override_id is not None
+
+
+_local_matrices = OrderedDict()  # pylint: disable=invalid-name
+_local_matrices_lock = Lock()  # pylint: disable=invalid-name
+
+
+def get_course_grade_matrix(course_key, subsection_keys):
+    """
+    Returns the up-to-date grade matrix of the given course, with a column
+    for each of the given graded subsections.
+
+    The returned matrix is shared with other readers in this process, and so
+    is not to be mutated; use its slice method to get a copy of some of its
+    rows.
+    """
+    subsection_keys = list(subsection_keys)
+    change_log_id, change_log_position = _get_change_log(course_key)
+
+    with _local_matrices_lock:
+        matrix = _local_matrices.pop(course_key, None)
+        if matrix is not None and not _update(matrix, subsection_keys, change_log_id, change_log_position):
+            matrix = None
+        if matrix is None:
+            matrix = CourseGradeMatrix.build(course_key, subsection_keys)
+            matrix.change_log_id = change_log_id
+            matrix.change_log_position = change_log_position
+            log.info(u'Grades: Built grade matrix of %s, with %d rows', course_key, len(matrix))
+
+        _local_matrices[course_key] = matrix
+        while len(_local_matrices) > settings.GRADE_MATRIX_LOCAL_CACHE_SIZE:
+            _local_matrices.popitem(last=False)
+        return matrix
+
+
+def log_grade_change(course_key, user_id):
+    """
+    Records, once the current transaction is committed, that the grades of
+    the given user in the given course changed, so that the grade matrices
+    of the course update the user's row.
+    """
+    transaction.on_commit(lambda: _append_to_change_log(course_key, user_id))
+
+
+def clear_local_grade_matrices():
+    """
+    Removes the grade matrices held by this process.
+    """
+    with _local_matrices_lock:
+        _local_matrices.clear()
+
+
+def _update(matrix, subsection_keys, change_log_id, change_log_position):
+    """
+    Brings the given matrix up to date with the given position of the given
+    change log.  Returns False if the matrix cannot be brought up to date,
+    and is to be built anew.
+    """
+    if (
+            matrix.subsection_keys != subsection_keys or
+            matrix.change_log_id != change_log_id or
+            matrix.change_log_position > change_log_position or
+            change_log_position - matrix.change_log_position > settings.GRADE_MATRIX_MAX_UPDATES or
+            time() - matrix.created > settings.GRADE_MATRIX_MAX_AGE
+    ):
+        return False
+
+    if change_log_position > matrix.change_log_position:
+        entry_keys = [
+            _change_log_entry_key(matrix.course_key, change_log_id, position)
+            for position in range(matrix.change_log_position + 1, change_log_position + 1)
+        ]
+        user_ids = cache.get_many(entry_keys)
+        if len(user_ids) != len(entry_keys):
+            return False
+        matrix.update_users(set(six.itervalues(user_ids)))
+        matrix.change_log_position = change_log_position
+    return True
+
+
+def _get_change_log(course_key):
+    """
+    Returns the id and current position of the change log of the given
+    course, creating the change log if it does not exist.
+    """
+    change_log_id_key = _change_log_id_key(course_key)
+    change_log_id = cache.get(change_log_id_key)
+    if change_log_id is None:
+        new_change_log_id = uuid4().hex
+        cache.add(_change_log_position_key(course_key, new_change_log_id), 0, CHANGE_LOG_TIMEOUT)
+        cache.add(change_log_id_key, new_change_log_id, CHANGE_LOG_TIMEOUT)
+        change_log_id = cache.get(change_log_id_key)
+    return change_log_id, cache.get(_change_log_position_key(course_key, change_log_id), -1)
+
+
+def _append_to_change_log(course_key, user_id):
+    """
+    Appends the given user id to the change log of the given course, if the
+    change log exists.  When it does not, no grade matrix of the course has
+    been built since it expired.
+    """
+    change_log_id = cache.get(_change_log_id_key(course_key))
+    if change_log_id is None:
+        return
+
+    try:
+        position = cache.incr(_change_log_position_key(course_key, change_log_id))
+    except ValueError:
+        # The position was evicted, so the change log is incomplete and
+        # the matrices of the course are to be built anew.
+        cache.delete(_change_log_id_key(course_key))
+        return
+    cache.set(_change_log_entry_key(course_key, change_log_id, position), user_id, CHANGE_LOG_TIMEOUT)
+
+
+def _change_log_id_key(course_key):
+    return u'{}.{}.change_log_id'.format(CACHE_KEY_PREFIX, course_key)
+
+
+def _change_log_position_key(course_key, change_log_id):
+    return u'{}.{}.{}.position'.format(CACHE_KEY_PREFIX, course_key, change_log_id)
+
+
+def _change_log_entry_key(course_key, change_log_id, position):
+    return u'{}.{}.{}.{}'.format(CACHE_KEY_PREFIX, course_key, change_log_id, position)
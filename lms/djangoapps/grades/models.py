@@ -235,6 +235,33 @@ class VisibleBlocks(models.Model):
         non_existent_brls = {brl.hash_value for brl in block_record_lists if brl.hash_value not in cached_records}
         cls.bulk_create(user_id, course_key, non_existent_brls)
 
+    @classmethod
+    def bulk_prefetch(cls, course_key, users):
+        """
+        Prefetches the visible blocks for the given users in the given course,
+        with a single query, and stores them in the cache.
+        """
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        prefetched = {user.id: {} for user in users}
+        grades_with_blocks = PersistentSubsectionGrade.objects.select_related('visible_blocks').filter(
+            user_id__in=list(prefetched),
+            course_id=course_key,
+        )
+        for grade in grades_with_blocks:
+            prefetched[grade.user_id][grade.visible_blocks.hashed] = grade.visible_blocks
+        for user_id, user_prefetched in six.iteritems(prefetched):
+            cache[cls._cache_key(user_id, course_key)] = user_prefetched
+
+    @classmethod
+    def clear_prefetched_data(cls, course_key, users):
+        """
+        Clears the prefetched visible blocks for the given users in the given
+        course from the RequestCache.
+        """
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        for user in users:
+            cache.pop(cls._cache_key(user.id, course_key), None)
+
     @classmethod
     def _initialize_cache(cls, user_id, course_key):
         """
@@ -701,6 +728,41 @@ class PersistentSubsectionGradeOverride(models.Model):
             cls.objects.filter(grade__user_id=user_id, grade__course_id=course_key)
         }
 
+    @classmethod
+    def bulk_prefetch(cls, course_key, users):
+        """
+        Prefetches the overrides for the given users in the given course, with
+        a single query.
+        """
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        prefetched = {user.id: {} for user in users}
+        overrides = cls.objects.select_related('grade').filter(
+            grade__user_id__in=list(prefetched),
+            grade__course_id=course_key,
+        )
+        for override in overrides:
+            prefetched[override.grade.user_id][override.grade.usage_key] = override
+        for user_id, user_prefetched in six.iteritems(prefetched):
+            cache[(user_id, str(course_key))] = user_prefetched
+
+    @classmethod
+    def is_prefetched(cls, user_id, course_key):
+        """
+        Returns whether the overrides for the given user in the given course
+        are prefetched.
+        """
+        return (user_id, str(course_key)) in get_cache(cls._CACHE_NAMESPACE)
+
+    @classmethod
+    def clear_prefetched_data(cls, course_key, users):
+        """
+        Clears the prefetched overrides for the given users in the given
+        course from the RequestCache.
+        """
+        cache = get_cache(cls._CACHE_NAMESPACE)
+        for user in users:
+            cache.pop((user.id, str(course_key)), None)
+
     @classmethod
     def get_override(cls, user_id, usage_key):
         prefetch_values = get_cache(cls._CACHE_NAMESPACE).get((user_id, str(usage_key.course_key)), None)
@@ -13,10 +13,29 @@ from lms.djangoapps.utils import _get_key
 
 
 def prefetch_grade_overrides_and_visible_blocks(user, course_key):
-    _PersistentSubsectionGradeOverride.prefetch(user.id, course_key)
+    if not _PersistentSubsectionGradeOverride.is_prefetched(user.id, course_key):
+        _PersistentSubsectionGradeOverride.prefetch(user.id, course_key)
     _VisibleBlocks.bulk_read(user.id, course_key)
 
 
+def prefetch_grades_for_users(course_key, users):
+    """
+    Prefetches all the stored grade data needed to read or compute the
+    course grades of the given users, with a constant number of queries.
+    """
+    _PersistentCourseGrade.prefetch(course_key, users)
+    _PersistentSubsectionGrade.prefetch(course_key, users)
+    _PersistentSubsectionGradeOverride.bulk_prefetch(course_key, users)
+    _VisibleBlocks.bulk_prefetch(course_key, users)
+
+
+def clear_prefetched_grades_for_users(course_key, users):
+    _PersistentCourseGrade.clear_prefetched_data(course_key)
+    _PersistentSubsectionGrade.clear_prefetched_data(course_key)
+    _PersistentSubsectionGradeOverride.clear_prefetched_data(course_key, users)
+    _VisibleBlocks.clear_prefetched_data(course_key, users)
+
+
 def prefetch_course_grades(course_key, users):
     _PersistentCourseGrade.prefetch(course_key, users)
 
@@ -3,6 +3,7 @@ Defines an endpoint for gradebook data related to a course.
 """
 from __future__ import absolute_import
 
+import bisect
 import logging
 from collections import namedtuple
 from contextlib import contextmanager
@@ -23,6 +24,7 @@ from six import text_type
 
 from lms.djangoapps.courseware.courses import get_course_by_id
 from lms.djangoapps.grades.api import CourseGradeFactory, clear_prefetched_course_and_subsection_grades
+from lms.djangoapps.grades.api import get_course_grade_matrix, is_grade_matrix_enabled
 from lms.djangoapps.grades.api import constants as grades_constants
 from lms.djangoapps.grades.api import context as grades_context
 from lms.djangoapps.grades.api import events as grades_events
@@ -66,11 +68,15 @@ from track.event_transaction_utils import (
     set_event_transaction_type
 )
 from util.date_utils import to_timestamp
+from util.query import use_read_replica_if_available
 from xmodule.modulestore.django import modulestore
 from xmodule.util.misc import get_default_short_labeler
 
 log = logging.getLogger(__name__)
 
+# The course grade of a learner, as read from the course's grade matrix.
+MatrixCourseGrade = namedtuple('MatrixCourseGrade', ['passed', 'percent', 'letter_grade'])
+
 
 @contextmanager
 def bulk_gradebook_view_context(course_key, users):
@@ -476,7 +482,7 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
             })
         return breakdown
 
-    def _gradebook_entry(self, user, course, graded_subsections, course_grade):
+    def _gradebook_entry(self, user, course, graded_subsections, course_grade, breakdown=None):
         """
         Returns a dictionary of course- and subsection-level grade data for
         a given user in a given course.
@@ -486,9 +492,11 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
             course: A Course Descriptor object.
             graded_subsections: A list of graded subsections in the given course.
             course_grade: A CourseGrade object.
+            breakdown: The user's grade data broken down by subsection, if already known.
         """
         user_entry = self._serialize_user_grade(user, course.id, course_grade)
-        breakdown = self._section_breakdown(course, graded_subsections, course_grade)
+        if breakdown is None:
+            breakdown = self._section_breakdown(course, graded_subsections, course_grade)
 
         user_entry['section_breakdown'] = breakdown
         user_entry['progress_page_url'] = reverse(
@@ -504,6 +512,75 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
 
         return user_entry
 
+    def _gradebook_entries_from_matrix(self, course, graded_subsections, users, matrix, collected_block_structure):
+        """
+        Returns the gradebook entries of the given users in the given course,
+        read from the course's grade matrix rather than computed from their
+        course grades.  The course grades of users without a persisted course
+        grade are computed, as they are when the matrix is not used.
+
+        Args:
+            course: A Course Descriptor object.
+            graded_subsections: A list of graded subsections in the given course.
+            users: A list of User objects.
+            matrix: The CourseGradeMatrix of the course.
+            collected_block_structure: The collected block structure of the course.
+        """
+        matrix = matrix.slice([user.id for user in users])
+        percent_graded = matrix.percent_graded()
+        is_scored = matrix.attempted | matrix.overridden
+
+        # The labels are the same for all users, as in _section_breakdown.
+        default_labeler = get_default_short_labeler(course)
+        subsection_fields = [
+            {
+                'category': subsection.format,
+                'label': default_labeler(subsection.format),
+                'module_id': text_type(subsection.location),
+                'subsection_name': subsection.display_name,
+            }
+            for subsection in graded_subsections
+        ]
+
+        users_without_grade = [user for row, user in enumerate(users) if not matrix.has_course_grade[row]]
+        computed_entries = {}
+        if users_without_grade:
+            with bulk_gradebook_view_context(course.id, users_without_grade):
+                for user, course_grade, exc in CourseGradeFactory().iter(
+                    users_without_grade, course_key=course.id, collected_block_structure=collected_block_structure
+                ):
+                    if not exc:
+                        computed_entries[user.id] = self._gradebook_entry(
+                            user, course, graded_subsections, course_grade
+                        )
+
+        entries = []
+        for row, user in enumerate(users):
+            if not matrix.has_course_grade[row]:
+                if user.id in computed_entries:
+                    entries.append(computed_entries[user.id])
+                continue
+
+            breakdown = []
+            for column, fields in enumerate(subsection_fields):
+                attempted = bool(is_scored[row, column])
+                section = dict(fields)
+                section.update({
+                    'attempted': attempted,
+                    'percent': float(percent_graded[row, column]),
+                    'score_earned': float(matrix.earned[row, column]) if attempted else 0,
+                    'score_possible': float(matrix.possible[row, column]) if attempted else 0,
+                })
+                breakdown.append(section)
+
+            course_grade = MatrixCourseGrade(
+                passed=bool(matrix.passed[row]),
+                percent=float(matrix.percent[row]),
+                letter_grade=matrix.letter_grade[row],
+            )
+            entries.append(self._gradebook_entry(user, course, graded_subsections, course_grade, breakdown))
+        return entries
+
     @staticmethod
     def _get_external_user_key(user, course_id):
         program_enrollment = CourseEnrollment.get_program_enrollment(user, course_id)
@@ -557,7 +634,16 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
                     q_objects.append(Q(user__in=[]))
             if request.GET.get('enrollment_mode'):
                 q_objects.append(Q(mode=request.GET.get('enrollment_mode')))
-            if request.GET.get('assignment') and (
+
+            matrix = None
+            matrix_filters = {}
+            if is_grade_matrix_enabled(course_key):
+                matrix = get_course_grade_matrix(
+                    course_key, [subsection.location for subsection in graded_subsections]
+                )
+                matrix_filters = self._grade_matrix_filters(request, course_key, matrix)
+
+            if 'assignment' not in matrix_filters and request.GET.get('assignment') and (
                     request.GET.get('assignment_grade_max')
                     or request.GET.get('assignment_grade_min')):
                 subqueryset = PersistentSubsectionGrade.objects.annotate(
@@ -585,7 +671,8 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
                     )
                 )
                 q_objects.append(Q(selected_assignment_grade_in_range=True))
-            if request.GET.get('course_grade_min') or request.GET.get('course_grade_max'):
+            if 'course_grade' not in matrix_filters and (
+                    request.GET.get('course_grade_min') or request.GET.get('course_grade_max')):
                 grade_conditions = {}
                 q_object = Q()
                 course_grade_min = request.GET.get('course_grade_min')
@@ -620,23 +707,135 @@ class GradebookView(GradeViewMixin, PaginatedAPIView):
 
                 q_objects.append(q_object)
 
+            filtered_users_count = None
+            if matrix_filters:
+                filtered_enrollment_ids = self._filter_enrollments_by_matrix(
+                    course_key, q_objects, matrix, list(matrix_filters.values()), annotations=annotations
+                )
+                q_objects.append(Q(id__in=self._enrollment_ids_of_page(request, filtered_enrollment_ids)))
+                filtered_users_count = len(filtered_enrollment_ids)
+
             entries = []
             related_models = ['user']
             users = self._paginate_users(course_key, q_objects, related_models, annotations=annotations)
 
-            users_counts = self._get_users_counts(course_key, q_objects, annotations=annotations)
+            if filtered_users_count is None:
+                users_counts = self._get_users_counts(course_key, q_objects, annotations=annotations)
+            else:
+                users_counts = {
+                    'total_users_count': self._get_user_count([Q(course_id=course_key) & Q(is_active=True)]),
+                    'filtered_users_count': filtered_users_count,
+                }
 
-            with bulk_gradebook_view_context(course_key, users):
-                for user, course_grade, exc in CourseGradeFactory().iter(
-                    users, course_key=course_key, collected_block_structure=course_data.collected_structure
-                ):
-                    if not exc:
-                        entry = self._gradebook_entry(user, course, graded_subsections, course_grade)
-                        entries.append(entry)
+            if matrix is not None:
+                entries = self._gradebook_entries_from_matrix(
+                    course, graded_subsections, users, matrix, course_data.collected_structure
+                )
+            else:
+                with bulk_gradebook_view_context(course_key, users):
+                    for user, course_grade, exc in CourseGradeFactory().iter(
+                        users, course_key=course_key, collected_block_structure=course_data.collected_structure
+                    ):
+                        if not exc:
+                            entry = self._gradebook_entry(user, course, graded_subsections, course_grade)
+                            entries.append(entry)
 
             serializer = StudentGradebookEntrySerializer(entries, many=True)
             return self.get_paginated_response(serializer.data, **users_counts)
 
+    @staticmethod
+    def _grade_matrix_filters(request, course_key, matrix):
+        """
+        Returns the grade filters of the given request that can be applied from
+        the given grade matrix of the course, keyed by the name of the filter.
+        Each one is a function that returns an array of whether the learners of
+        a grade matrix pass the filter, in the same way as the database filter.
+        """
+        matrix_filters = {}
+        if request.GET.get('assignment') and (
+                request.GET.get('assignment_grade_max')
+                or request.GET.get('assignment_grade_min')):
+            assignment_key = UsageKey.from_string(request.GET.get('assignment')).map_into_course(course_key)
+            assignment_grade_min = float(request.GET.get('assignment_grade_min', 0))
+            assignment_grade_max = float(request.GET.get('assignment_grade_max', 100))
+            if matrix.has_subsection(assignment_key):
+                matrix_filters['assignment'] = lambda filtered_matrix: filtered_matrix.assignment_grade_in_range(
+                    assignment_key, assignment_grade_min, assignment_grade_max,
+                )
+
+        if request.GET.get('course_grade_min') or request.GET.get('course_grade_max'):
+            course_grade_min = request.GET.get('course_grade_min')
+            course_grade_min = float(course_grade_min) / 100 if course_grade_min else None
+            course_grade_max = request.GET.get('course_grade_max')
+            course_grade_max = float(course_grade_max) / 100 if course_grade_max else None
+
+            def _course_grade_filter(filtered_matrix):
+                """
+                Learners without a persisted course grade pass, unless a minimum grade is given.
+                """
+                in_range = filtered_matrix.course_grade_in_range(course_grade_min, course_grade_max)
+                if not course_grade_min:
+                    in_range |= ~filtered_matrix.has_course_grade
+                return in_range
+            matrix_filters['course_grade'] = _course_grade_filter
+        return matrix_filters
+
+    @staticmethod
+    def _filter_enrollments_by_matrix(course_key, course_enrollment_filters, matrix, matrix_filters, annotations=None):
+        """
+        Returns the sorted ids of the active CourseEnrollments of the given course that
+        match the given filters of CourseEnrollments and, according to the given grade
+        matrix, all of the given filters of grade matrices.
+
+        Arguments:
+            course_key: the opaque key for the course
+            course_enrollment_filters: a list of Q objects representing filters to be applied to CourseEnrollments
+            matrix: the CourseGradeMatrix of the course
+            matrix_filters: a list of functions returning a boolean array of the rows of a grade matrix to keep
+            annotations: Optional dict of fields to add to the queryset via annotation
+        """
+        queryset = CourseEnrollment.objects
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        enrollment_ids_by_user_id = dict(use_read_replica_if_available(
+            queryset.filter(
+                Q(course_id=course_key) & Q(is_active=True), *course_enrollment_filters
+            ).values_list('user_id', 'id')
+        ))
+        filtered_matrix = matrix.slice(list(enrollment_ids_by_user_id))
+        keep = matrix_filters[0](filtered_matrix)
+        for matrix_filter in matrix_filters[1:]:
+            keep &= matrix_filter(filtered_matrix)
+        return sorted(enrollment_ids_by_user_id[int(user_id)] for user_id in filtered_matrix.user_ids[keep])
+
+    def _enrollment_ids_of_page(self, request, enrollment_ids):
+        """
+        Returns the ids, among the given sorted CourseEnrollment ids, that the paginator
+        can read for the page of the given request, so that the page is queried with a
+        list of ids the size of a page rather than the size of the course.
+
+        The paginator orders CourseEnrollments by id, and reads the page from those
+        after (or, for a previous page, before) the position of the request's cursor.
+        """
+        page_size = self.paginator.get_page_size(request)
+        if not page_size:
+            return enrollment_ids
+
+        cursor = self.paginator.decode_cursor(request)
+        # One more row than a page is read to know whether there is a next page, and the
+        # row at the position of the cursor is kept in case the paginator reads it again.
+        num_ids = page_size + 2
+        if cursor is None:
+            return enrollment_ids[:num_ids]
+
+        num_ids += cursor.offset
+        if cursor.position is None:
+            return enrollment_ids[-num_ids:] if cursor.reverse else enrollment_ids[:num_ids]
+        index = bisect.bisect_left(enrollment_ids, int(cursor.position))
+        if cursor.reverse:
+            return enrollment_ids[max(index + 1 - num_ids, 0):index + 1]
+        return enrollment_ids[index:index + num_ids]
+
     def _get_user_count(self, query_args, cache_time=3600, annotations=None):
         """
         Return the user count for the given query arguments to CourseEnrollment.
@@ -20,10 +20,11 @@ from six import text_type
 from course_modes.models import CourseMode
 from lms.djangoapps.certificates.models import CertificateStatuses, GeneratedCertificate
 from lms.djangoapps.courseware.tests.factories import InstructorFactory, StaffFactory
-from lms.djangoapps.grades.config.waffle import WRITABLE_GRADEBOOK, waffle_flags
+from lms.djangoapps.grades.config.waffle import GRADE_MATRIX, WRITABLE_GRADEBOOK, waffle_flags
 from lms.djangoapps.grades.constants import GradeOverrideFeatureEnum
 from lms.djangoapps.grades.course_data import CourseData
 from lms.djangoapps.grades.course_grade import CourseGrade
+from lms.djangoapps.grades.grade_matrix import clear_local_grade_matrices
 from lms.djangoapps.grades.models import (
     BlockRecord,
     BlockRecordList,
@@ -31,6 +32,7 @@ from lms.djangoapps.grades.models import (
     PersistentSubsectionGradeOverride,
     PersistentCourseGrade,
 )
+from lms.djangoapps.grades.rest_api.v1.gradebook_views import GradebookView
 from lms.djangoapps.grades.rest_api.v1.tests.mixins import GradeViewTestMixin
 from lms.djangoapps.grades.rest_api.v1.views import CourseEnrollmentPagination
 from lms.djangoapps.grades.subsection_grade import ReadSubsectionGrade
@@ -1275,6 +1277,100 @@ class GradebookViewTest(GradebookViewTestBase):
                 self.assertEqual(actual_data['filtered_users_count'], num_enrollments)
 
 
+    @ddt.data(
+        ['login_staff', 4],
+        ['login_course_admin', 5],
+        ['login_course_staff', 5]
+    )
+    @ddt.unpack
+    def test_filter_course_grade_from_matrix(self, login_method, num_enrollments):
+        clear_local_grade_matrices()
+        self.addCleanup(clear_local_grade_matrices)
+        with patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read') as mock_grade:
+            # Only the course grade of the student without a persisted one is computed.
+            mock_grade.side_effect = [
+                self.mock_course_grade(self.student, passed=True, percent=0.0),
+            ]
+
+            PersistentCourseGrade(
+                user_id=self.other_student.id,
+                course_id=self.course_key,
+                percent_grade=0.45
+            ).save()
+            PersistentCourseGrade(
+                user_id=self.program_student.id,
+                course_id=self.course_key,
+                percent_grade=0.75
+            ).save()
+
+            with override_waffle_flag(self.waffle_flag, active=True):
+                with override_waffle_flag(waffle_flags()[GRADE_MATRIX], active=True):
+                    getattr(self, login_method)()
+                    resp = self.client.get(
+                        self.get_url(course_key=self.course.id) + '?course_grade_max=60'
+                    )
+
+                self.assertEqual(status.HTTP_200_OK, resp.status_code)
+                actual_data = dict(resp.data)
+                self.assertEqual(
+                    [(result['user_id'], result['percent']) for result in actual_data['results']],
+                    [(self.student.id, 0.0), (self.other_student.id, 0.45)],
+                )
+                self.assertEqual(actual_data['total_users_count'], num_enrollments)
+                self.assertEqual(actual_data['filtered_users_count'], num_enrollments - 1)
+
+    def test_paginate_filter_from_matrix(self):
+        clear_local_grade_matrices()
+        self.addCleanup(clear_local_grade_matrices)
+        users = UserFactory.create_batch(7)
+        for user in users:
+            self._create_user_enrollments(user)
+            PersistentCourseGrade(user_id=user.id, course_id=self.course_key, percent_grade=0.3).save()
+        PersistentCourseGrade(user_id=self.program_student.id, course_id=self.course_key, percent_grade=0.75).save()
+
+        page_id_counts = []
+
+        def _enrollment_ids_of_page(view, request, enrollment_ids):
+            page_ids = enrollment_ids_of_page(view, request, enrollment_ids)
+            page_id_counts.append(len(page_ids))
+            return page_ids
+
+        enrollment_ids_of_page = GradebookView._enrollment_ids_of_page
+        with patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read') as mock_grade, patch.object(
+            GradebookView, '_enrollment_ids_of_page', _enrollment_ids_of_page
+        ):
+            mock_grade.side_effect = lambda user, *args, **kwargs: self.mock_course_grade(
+                user, passed=False, percent=0.0
+            )
+            with override_waffle_flag(self.waffle_flag, active=True):
+                with override_waffle_flag(waffle_flags()[GRADE_MATRIX], active=True):
+                    self.login_staff()
+                    resp = self.client.get(self.get_url(course_key=self.course.id) + '?course_grade_max=60')
+                    self.assertEqual(status.HTTP_200_OK, resp.status_code)
+                    all_user_ids = [result['user_id'] for result in resp.data['results']]
+
+                    paged_user_ids = []
+                    pages = []
+                    url = self.get_url(course_key=self.course.id) + '?course_grade_max=60&page_size=3'
+                    while url:
+                        resp = self.client.get(url)
+                        self.assertEqual(status.HTTP_200_OK, resp.status_code)
+                        self.assertEqual(resp.data['filtered_users_count'], len(all_user_ids))
+                        paged_user_ids.extend(result['user_id'] for result in resp.data['results'])
+                        pages.append(resp.data)
+                        url = resp.data['next']
+
+                    resp = self.client.get(pages[-1]['previous'])
+                    self.assertEqual(resp.data['results'], pages[-2]['results'])
+
+        self.assertGreater(len(pages), 2)
+        self.assertEqual(paged_user_ids, all_user_ids)
+        self.assertNotIn(self.program_student.id, all_user_ids)
+        self.assertTrue(set(user.id for user in users) <= set(all_user_ids))
+        # Each page is queried with the ids of at most a page, the row after it, and the cursor's row.
+        self.assertTrue(all(count <= 3 + 2 for count in page_id_counts[1:]))
+
+
 @ddt.ddt
 class GradebookBulkUpdateViewTest(GradebookViewTestBase):
     """
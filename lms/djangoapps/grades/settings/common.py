@@ -4,3 +4,19 @@ def plugin_settings(settings):
 
     # Queue to use for updating grades due to grading policy change
     settings.POLICY_CHANGE_GRADES_ROUTING_KEY = settings.DEFAULT_PRIORITY_QUEUE
+
+    # Number of worker threads across which CourseGradeFactory.iter grades
+    # students; 0 grades them one at a time in the calling thread.
+    settings.COURSE_GRADE_ITER_WORKERS = 0
+
+    # Number of students whose grades CourseGradeFactory.iter prefetches and
+    # computes at once, when using worker threads.
+    settings.COURSE_GRADE_ITER_CHUNK_SIZE = 100
+
+    # Number of courses whose grade matrices each process holds in memory.
+    settings.GRADE_MATRIX_LOCAL_CACHE_SIZE = 10
+
+    # Number of seconds after which, and number of learners with changed
+    # grades beyond which, a grade matrix is built anew rather than updated.
+    settings.GRADE_MATRIX_MAX_AGE = 60 * 60
+    settings.GRADE_MATRIX_MAX_UPDATES = 1000
@@ -12,3 +12,22 @@ def plugin_settings(settings):
     settings.POLICY_CHANGE_GRADES_ROUTING_KEY = settings.ENV_TOKENS.get(
         'POLICY_CHANGE_GRADES_ROUTING_KEY', settings.DEFAULT_PRIORITY_QUEUE,
     )
+
+    # Worker threads and chunk size for CourseGradeFactory.iter
+    settings.COURSE_GRADE_ITER_WORKERS = settings.ENV_TOKENS.get(
+        'COURSE_GRADE_ITER_WORKERS', settings.COURSE_GRADE_ITER_WORKERS,
+    )
+    settings.COURSE_GRADE_ITER_CHUNK_SIZE = settings.ENV_TOKENS.get(
+        'COURSE_GRADE_ITER_CHUNK_SIZE', settings.COURSE_GRADE_ITER_CHUNK_SIZE,
+    )
+
+    # Grade matrices
+    settings.GRADE_MATRIX_LOCAL_CACHE_SIZE = settings.ENV_TOKENS.get(
+        'GRADE_MATRIX_LOCAL_CACHE_SIZE', settings.GRADE_MATRIX_LOCAL_CACHE_SIZE,
+    )
+    settings.GRADE_MATRIX_MAX_AGE = settings.ENV_TOKENS.get(
+        'GRADE_MATRIX_MAX_AGE', settings.GRADE_MATRIX_MAX_AGE,
+    )
+    settings.GRADE_MATRIX_MAX_UPDATES = settings.ENV_TOKENS.get(
+        'GRADE_MATRIX_MAX_UPDATES', settings.GRADE_MATRIX_MAX_UPDATES,
+    )
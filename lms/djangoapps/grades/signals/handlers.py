@@ -14,6 +14,7 @@ from xblock.scorable import ScorableXBlockMixin, Score
 
 from lms.djangoapps.courseware.model_data import get_score, set_score
 from openedx.core.djangoapps.course_groups.signals.signals import COHORT_MEMBERSHIP_UPDATED
+from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
 from student.models import user_by_anonymous_id
 from student.signals import ENROLLMENT_TRACK_UPDATED
@@ -23,6 +24,7 @@ from util.date_utils import to_timestamp
 from .. import events
 from ..constants import ScoreDatabaseTableEnum
 from ..course_grade_factory import CourseGradeFactory
+from ..grade_matrix import log_grade_change
 from ..scores import weighted_score
 from ..tasks import (
     RECALCULATE_GRADE_DELAY_SECONDS,
@@ -251,6 +253,23 @@ def recalculate_course_grade_only(sender, course, course_structure, user, **kwar
     CourseGradeFactory().update(user, course=course, course_structure=course_structure)
 
 
+@receiver(SUBSECTION_SCORE_CHANGED)
+def log_subsection_grade_change(sender, course, user, **kwargs):  # pylint: disable=unused-argument
+    """
+    Records the change of a subsection grade for the grade matrices of the
+    course.
+    """
+    log_grade_change(course.id, user.id)
+
+
+@receiver(COURSE_GRADE_CHANGED)
+def log_course_grade_change(sender, user, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Records the change of a course grade for the grade matrices of the course.
+    """
+    log_grade_change(course_key, user.id)
+
+
 @receiver(ENROLLMENT_TRACK_UPDATED)
 @receiver(COHORT_MEMBERSHIP_UPDATED)
 def recalculate_course_and_subsection_grades(sender, user, course_key, countdown=None, **kwargs):  # pylint: disable=unused-argument
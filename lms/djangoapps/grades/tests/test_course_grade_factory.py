@@ -6,7 +6,9 @@ from __future__ import absolute_import
 import itertools
 
 import ddt
+from concurrent.futures import Future
 from django.conf import settings
+from django.test.utils import override_settings
 from mock import patch
 from six import text_type
 
@@ -243,6 +245,23 @@ class TestCourseGradeFactory(GradeTestBase):
         self.assertEqual(expected_summary, actual_summary)
 
 
+class InlineExecutor(object):
+    """
+    Executor that runs the submitted functions right away, in the calling
+    thread, so that they see the data of the test's transaction.
+    """
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+
+    def submit(self, func, *args):
+        future = Future()
+        future.set_result(func(*args))
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
 class TestGradeIteration(SharedModuleStoreTestCase):
     """
     Test iteration through student course grades.
@@ -337,6 +356,30 @@ class TestGradeIteration(SharedModuleStoreTestCase):
         self.assertIsNotNone(all_course_grades[student2])
         self.assertIsNotNone(all_course_grades[student5])
 
+    @override_settings(COURSE_GRADE_ITER_WORKERS=2, COURSE_GRADE_ITER_CHUNK_SIZE=3)
+    @patch('lms.djangoapps.grades.course_grade_factory.connection')
+    @patch('lms.djangoapps.grades.course_grade_factory.ThreadPoolExecutor', InlineExecutor)
+    @patch('lms.djangoapps.grades.course_grade_factory.CourseGradeFactory.read')
+    def test_parallel_iteration(self, mock_course_grade, mock_connection):
+        mock_course_grade.side_effect = [
+            Exception(u"Error for {}.".format(student.username))
+            if student.username == 'student4'
+            else student.username
+            for student in self.students
+        ]
+        grade_results = list(CourseGradeFactory().iter(self.students, self.course))
+
+        # The results are yielded in the order of the students, even though
+        # they are graded in batches.
+        self.assertEqual([result.student for result in grade_results], self.students)
+        self.assertEqual(
+            [result.course_grade for result in grade_results],
+            ['student1', 'student2', 'student3', None, 'student5'],
+        )
+        self.assertEqual(text_type(grade_results[3].error), u"Error for student4.")
+        # The connections of the worker threads are closed after each batch.
+        self.assertEqual(mock_connection.close.call_count, 4)
+
     def _course_grades_and_errors_for(self, course, students):
         """
         Simple helper method to iterate through student grades and give us
@@ -0,0 +1,176 @@
+"""
+Tests for the grade matrix of courses.
+"""
+from __future__ import absolute_import
+
+from datetime import datetime
+
+import pytz
+from django.core.cache import cache
+from django.test import TestCase
+from mock import patch
+from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
+
+from lms.djangoapps.grades.constants import GradeOverrideFeatureEnum
+from lms.djangoapps.grades.grade_matrix import (
+    CourseGradeMatrix,
+    clear_local_grade_matrices,
+    get_course_grade_matrix,
+    log_grade_change
+)
+from lms.djangoapps.grades.models import (
+    BlockRecord,
+    BlockRecordList,
+    PersistentCourseGrade,
+    PersistentSubsectionGrade,
+    PersistentSubsectionGradeOverride
+)
+from student.tests.factories import UserFactory
+
+
+@patch('lms.djangoapps.grades.grade_matrix.transaction.on_commit', lambda func: func())
+class CourseGradeMatrixTest(TestCase):
+    """
+    Tests the CourseGradeMatrix and the grade matrices of courses.
+    """
+    def setUp(self):
+        super(CourseGradeMatrixTest, self).setUp()
+        cache.clear()
+        clear_local_grade_matrices()
+        self.addCleanup(clear_local_grade_matrices)
+
+        self.course_key = CourseLocator(org='some_org', course='some_course', run='some_run')
+        self.subsection_keys = [
+            BlockUsageLocator(course_key=self.course_key, block_type='sequential', block_id=block_id)
+            for block_id in ('subsection_1', 'subsection_2')
+        ]
+        self.users = [UserFactory() for _ in range(3)]
+
+    def _create_subsection_grade(self, user, subsection_key, earned, possible, attempted=True):
+        """
+        Creates the persisted grade of the given user in the given subsection.
+        """
+        block_record = BlockRecord(subsection_key, 1, possible, True)
+        return PersistentSubsectionGrade.update_or_create_grade(
+            user_id=user.id,
+            usage_key=subsection_key,
+            course_version='deadbeef',
+            subtree_edited_timestamp=datetime(2019, 1, 1, tzinfo=pytz.UTC),
+            earned_all=earned,
+            possible_all=possible,
+            earned_graded=earned,
+            possible_graded=possible,
+            visible_blocks=BlockRecordList([block_record], self.course_key),
+            first_attempted=datetime(2019, 1, 2, tzinfo=pytz.UTC) if attempted else None,
+        )
+
+    def _create_course_grade(self, user, percent, letter_grade):
+        """
+        Creates the persisted course grade of the given user.
+        """
+        PersistentCourseGrade.update_or_create(
+            user_id=user.id,
+            course_id=self.course_key,
+            course_version='deadbeef',
+            course_edited_timestamp=datetime(2019, 1, 1, tzinfo=pytz.UTC),
+            percent_grade=percent,
+            letter_grade=letter_grade,
+            passed=bool(letter_grade),
+        )
+
+    def test_build(self):
+        self._create_course_grade(self.users[0], 0.75, u'Pass')
+        self._create_subsection_grade(self.users[0], self.subsection_keys[0], 3.0, 4.0)
+        self._create_subsection_grade(self.users[1], self.subsection_keys[1], 0.0, 2.0, attempted=False)
+
+        matrix = CourseGradeMatrix.build(self.course_key, self.subsection_keys)
+        self.assertEqual(list(matrix.user_ids), [self.users[0].id, self.users[1].id])
+        self.assertEqual(list(matrix.percent), [0.75, 0.0])
+        self.assertEqual(list(matrix.letter_grade), [u'Pass', None])
+        self.assertEqual(list(matrix.passed), [True, False])
+        self.assertEqual(matrix.earned.tolist(), [[3.0, 0.0], [0.0, 0.0]])
+        self.assertEqual(matrix.possible.tolist(), [[4.0, 0.0], [0.0, 2.0]])
+        self.assertEqual(matrix.attempted.tolist(), [[True, False], [False, False]])
+        self.assertEqual(matrix.percent_graded().tolist(), [[0.75, 0.0], [0.0, 0.0]])
+
+    def test_slice(self):
+        self._create_course_grade(self.users[1], 0.5, u'')
+        self._create_subsection_grade(self.users[1], self.subsection_keys[1], 1.0, 3.0)
+
+        matrix = CourseGradeMatrix.build(self.course_key, self.subsection_keys)
+        sliced = matrix.slice([self.users[2].id, self.users[1].id])
+        self.assertEqual(list(sliced.user_ids), [self.users[2].id, self.users[1].id])
+        self.assertEqual(list(sliced.percent), [0.0, 0.5])
+        self.assertEqual(list(sliced.letter_grade), [None, None])
+        self.assertEqual(list(sliced.passed), [False, False])
+        self.assertEqual(sliced.percent_graded().tolist(), [[0.0, 0.0], [0.0, 0.33]])
+        self.assertEqual(len(matrix), 1)
+
+    def test_grades_in_range(self):
+        self._create_course_grade(self.users[0], 0.75, u'Pass')
+        self._create_course_grade(self.users[1], 0.25, u'')
+        self._create_subsection_grade(self.users[0], self.subsection_keys[0], 3.0, 4.0)
+        self._create_subsection_grade(self.users[1], self.subsection_keys[0], 0.0, 0.0)
+
+        matrix = CourseGradeMatrix.build(self.course_key, self.subsection_keys).slice(
+            [user.id for user in self.users]
+        )
+        self.assertEqual(list(matrix.has_course_grade), [True, True, False])
+        self.assertEqual(matrix.has_subsection_grade.tolist(), [[True, False], [True, False], [False, False]])
+        self.assertEqual(list(matrix.course_grade_in_range(0.5)), [True, False, False])
+        self.assertEqual(list(matrix.course_grade_in_range(percent_max=0.5)), [False, True, False])
+        in_range = matrix.assignment_grade_in_range(self.subsection_keys[0], 0, 100)
+        self.assertEqual(list(in_range), [True, False, False])
+        in_range = matrix.assignment_grade_in_range(self.subsection_keys[0], 80, 100)
+        self.assertEqual(list(in_range), [False, False, False])
+        self.assertTrue(matrix.has_subsection(self.subsection_keys[1]))
+
+    def test_override(self):
+        grade = self._create_subsection_grade(self.users[0], self.subsection_keys[0], 1.0, 4.0, attempted=False)
+        PersistentSubsectionGradeOverride.update_or_create_override(
+            self.users[2],
+            grade,
+            earned_graded_override=2.0,
+            possible_graded_override=5.0,
+            feature=GradeOverrideFeatureEnum.gradebook,
+        )
+
+        matrix = CourseGradeMatrix.build(self.course_key, self.subsection_keys)
+        self.assertEqual(matrix.earned.tolist(), [[2.0, 0.0]])
+        self.assertEqual(matrix.possible.tolist(), [[5.0, 0.0]])
+        self.assertEqual(matrix.attempted.tolist(), [[False, False]])
+        self.assertEqual(matrix.overridden.tolist(), [[True, False]])
+
+    def test_logged_changes(self):
+        self._create_subsection_grade(self.users[0], self.subsection_keys[0], 1.0, 4.0)
+        matrix = get_course_grade_matrix(self.course_key, self.subsection_keys)
+        self.assertEqual(len(matrix), 1)
+
+        self._create_subsection_grade(self.users[0], self.subsection_keys[0], 4.0, 4.0)
+        self._create_subsection_grade(self.users[1], self.subsection_keys[1], 2.0, 2.0)
+        log_grade_change(self.course_key, self.users[0].id)
+        log_grade_change(self.course_key, self.users[1].id)
+
+        with patch.object(CourseGradeMatrix, 'build', wraps=CourseGradeMatrix.build) as mock_build:
+            updated = get_course_grade_matrix(self.course_key, self.subsection_keys)
+        mock_build.assert_called_once_with(self.course_key, self.subsection_keys, {self.users[0].id, self.users[1].id})
+        self.assertIs(updated, matrix)
+        self.assertEqual(
+            updated.slice([self.users[0].id, self.users[1].id]).earned.tolist(), [[4.0, 0.0], [0.0, 2.0]],
+        )
+
+    def test_incomplete_change_log(self):
+        matrix = get_course_grade_matrix(self.course_key, self.subsection_keys)
+        self._create_subsection_grade(self.users[0], self.subsection_keys[0], 1.0, 4.0)
+        log_grade_change(self.course_key, self.users[0].id)
+        cache.clear()
+
+        rebuilt = get_course_grade_matrix(self.course_key, self.subsection_keys)
+        self.assertIsNot(rebuilt, matrix)
+        self.assertEqual(list(rebuilt.user_ids), [self.users[0].id])
+
+    def test_subsections_changed(self):
+        matrix = get_course_grade_matrix(self.course_key, self.subsection_keys)
+        rebuilt = get_course_grade_matrix(self.course_key, self.subsection_keys[:1])
+        self.assertIsNot(rebuilt, matrix)
+        self.assertEqual(rebuilt.subsection_keys, self.subsection_keys[:1])
@@ -432,7 +432,7 @@ def coupon_codes_features(features, coupons_list, course_id):
     return [extract_coupon(coupon, features) for coupon in coupons_list]
 
 
-def list_problem_responses(course_key, problem_location, limit_responses=None):
+def list_problem_responses(course_key, problem_location, limit_responses=None, user_ids=None):
     """
     Return responses to a given problem as a dict.
 
@@ -445,7 +445,8 @@ def list_problem_responses(course_key, problem_location, limit_responses=None):
     ]
 
     where `state` represents a student's response to the problem
-    identified by `problem_location`.
+    identified by `problem_location`.  If `user_ids` is given, only the
+    responses of the users with these ids are returned.
     """
     if isinstance(problem_location, UsageKey):
         problem_key = problem_location
@@ -462,6 +463,8 @@ def list_problem_responses(course_key, problem_location, limit_responses=None):
         course_id=course_key,
         module_state_key=problem_key
     )
+    if user_ids is not None:
+        smdat = smdat.filter(student_id__in=user_ids)
     smdat = smdat.order_by('student')
     if limit_responses is not None:
         smdat = smdat[:limit_responses]
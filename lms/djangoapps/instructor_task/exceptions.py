@@ -16,3 +16,8 @@ class UpdateProblemModuleStateError(Exception):
 class DuplicateTaskException(Exception):
     """Exception indicating that a task already exists or has already completed."""
     pass
+
+
+class ReportShardsFailed(Exception):
+    """Exception indicating that some of the shards of a report failed, so that the report is incomplete."""
+    pass
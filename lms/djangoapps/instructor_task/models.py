@@ -20,20 +20,21 @@ import hashlib
 import json
 import logging
 import os.path
+from tempfile import SpooledTemporaryFile
 from uuid import uuid4
 
 import six
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.db import models, transaction
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext as _
 from opaque_keys.edx.django.models import CourseKeyField
 from six import text_type
 
-from openedx.core.storage import get_storage
+from openedx.core.storage import S3ReportStorage, get_storage
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,14 @@ QUEUING = 'QUEUING'
 PROGRESS = 'PROGRESS'
 TASK_INPUT_LENGTH = 10000
 
+# Size, in bytes, above which the CSV file of a report being written is moved
+# from memory to disk before it is uploaded.
+REPORT_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+# Number of characters of CSV data that are encoded and written to the file
+# of a report at once.
+REPORT_WRITE_CHUNK_SIZE = 64 * 1024
+
 
 @python_2_unicode_compatible
 class InstructorTask(models.Model):
@@ -196,9 +205,7 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -285,15 +292,87 @@ class DjangoStorageReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+
+        `rows` can be any iterable, such as a generator, and is consumed
+        lazily: the rows are encoded in chunks, which S3 storage gzips and
+        uploads in parts as they are written.  Other storage backends are
+        handed a temporary file of the rows to save, which only stays in
+        memory while it is smaller than REPORT_SPOOL_MAX_SIZE.
+        """
+        if isinstance(self.storage, S3ReportStorage):
+            with self.storage.open_upload(self.path_to(course_id, filename)) as output_file:
+                self._write_csv_file(output_file, rows)
+            return
+
+        with SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE) as output_file:
+            self._write_csv_file(output_file, rows)
+            output_file.seek(0)
+            self.store(course_id, filename, File(output_file))
+
+    def _write_csv_file(self, output_file, rows):
+        """
+        Writes the given rows to the given binary file as a csv file.
         """
-        output_buffer = ContentFile('')
         # Adding unicode signature (BOM) for MS Excel 2013 compatibility
         if six.PY2:
-            output_buffer.write(codecs.BOM_UTF8)
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+            output_file.write(codecs.BOM_UTF8)
+        self._write_csv_rows(output_file, rows)
+
+    def _write_csv_rows(self, output_file, rows):
+        """
+        Writes the given rows to the given binary file in csv format, utf-8
+        encoded, a chunk of REPORT_WRITE_CHUNK_SIZE characters at a time.
+        """
+        chunk_buffer = six.BytesIO() if six.PY2 else six.StringIO()
+        csvwriter = csv.writer(chunk_buffer)
+
+        def flush():
+            """
+            Moves the contents of the chunk buffer to the output file.
+            """
+            chunk = chunk_buffer.getvalue()
+            output_file.write(chunk if six.PY2 else chunk.encode('utf-8'))
+            chunk_buffer.seek(0)
+            chunk_buffer.truncate()
+
+        for row in self._get_utf8_encoded_rows(rows):
+            csvwriter.writerow(row)
+            if chunk_buffer.tell() >= REPORT_WRITE_CHUNK_SIZE:
+                flush()
+        flush()
+
+    def read_rows(self, course_id, filename):
+        """
+        A generator of the rows of the csv file `filename` of the given
+        course_id, as written by store_rows, with each row as a list of
+        unicode strings.
+        """
+        with self.storage.open(self.path_to(course_id, filename), 'rb') as csv_file:
+            if six.PY2:
+                for index, row in enumerate(csv.reader(csv_file)):
+                    if index == 0 and row and row[0].startswith(codecs.BOM_UTF8):
+                        row[0] = row[0][len(codecs.BOM_UTF8):]
+                    yield [item.decode('utf-8') for item in row]
+            else:
+                for row in csv.reader(codecs.iterdecode(csv_file, 'utf-8-sig')):
+                    yield row
+
+    def filenames_in(self, course_id, directory):
+        """
+        Returns the names of the files in the given directory of the files
+        of the given course_id.
+        """
+        try:
+            _, filenames = self.storage.listdir(self.path_to(course_id, directory))
+        except OSError:
+            return []
+        return filenames
+
+    def delete(self, course_id, filename):
+        """
+        Deletes the file `filename` of the given course_id.
+        """
+        self.storage.delete(self.path_to(course_id, filename))
 
     def links_for(self, course_id):
         """
@@ -52,9 +52,16 @@ from lms.djangoapps.instructor_task.tasks_helper.module_state import (
     reset_attempts_module_state
 )
 from lms.djangoapps.instructor_task.tasks_helper.runner import run_main_task
+from lms.djangoapps.instructor_task.tasks_helper.shards import generate_report, run_report_shard
 
 TASK_LOG = logging.getLogger('edx.celery.task')
 
+# The reports that can be generated in shards, by name.
+SHARDED_REPORT_CLASSES = {
+    report_class.__name__: report_class
+    for report_class in (CourseGradeReport, ProblemGradeReport, ProblemResponses)
+}
+
 
 @task(base=BaseInstructorTask)
 def rescore_problem(entry_id, xmodule_instance_args):
@@ -169,7 +176,7 @@ def calculate_problem_responses_csv(entry_id, xmodule_instance_args):
     """
     # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
     action_name = ugettext_noop('generated')
-    task_fn = partial(ProblemResponses.generate, xmodule_instance_args)
+    task_fn = partial(generate_report, ProblemResponses, generate_report_shard, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
@@ -185,7 +192,7 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(CourseGradeReport.generate, xmodule_instance_args)
+    task_fn = partial(generate_report, CourseGradeReport, generate_report_shard, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
@@ -202,10 +209,37 @@ def calculate_problem_grade_report(entry_id, xmodule_instance_args):
         xmodule_instance_args.get('task_id'), entry_id, action_name
     )
 
-    task_fn = partial(ProblemGradeReport.generate, xmodule_instance_args)
+    task_fn = partial(generate_report, ProblemGradeReport, generate_report_shard, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)
+def generate_report_shard(
+    entry_id,  # pylint: disable=bad-continuation
+    report_class_name,
+    shard_index,
+    user_ids,
+    xmodule_instance_args,
+    action_name,
+    subtask_status_dict,
+):
+    """
+    Generate the partial reports of a shard of the users of a report, and
+    merge the partial reports of all shards once the last shard completes.
+
+    Subtasks of this task are queued by `generate_report`.
+    """
+    return run_report_shard(
+        SHARDED_REPORT_CLASSES[report_class_name],
+        entry_id,
+        shard_index,
+        user_ids,
+        xmodule_instance_args,
+        action_name,
+        subtask_status_dict,
+    )
+
+
 @task(base=BaseInstructorTask)
 def calculate_students_features_csv(entry_id, xmodule_instance_args):
     """
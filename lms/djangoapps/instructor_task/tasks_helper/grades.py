@@ -223,13 +223,51 @@ class CourseGradeReport(object):
         batched_rows = self._batched_rows(context)
 
         context.update_status(u'Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
+        error_rows = []
+        success_rows = self._compile(context, batched_rows, error_rows)
 
-        context.update_status(u'Uploading grades')
+        # The success rows are compiled while they are being uploaded, and
+        # the error rows are collected meanwhile.
         self._upload(context, success_headers, success_rows, error_headers, error_rows)
 
         return context.update_status(u'Completed grades')
 
+    @classmethod
+    def shard_users(cls, course_id, _task_input):
+        """
+        Returns the users to shard a grade report over.
+        """
+        return CourseEnrollment.objects.users_enrolled_in(course_id, include_inactive=True)
+
+    @classmethod
+    def generate_shard(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name, user_ids):
+        """
+        Public method to generate the partial grade reports of the given users.
+        """
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
+            return CourseGradeReport()._generate_shard(context, user_ids)
+
+    def _generate_shard(self, context, user_ids):
+        """
+        Internal method for generating the partial grade reports of the given
+        users for the given context.
+        """
+        success_rows, error_rows = [], []
+        for index in range(0, len(user_ids), self.USER_BATCH_SIZE):
+            users = get_user_model().objects.filter(
+                id__in=user_ids[index:index + self.USER_BATCH_SIZE],
+            ).select_related('profile').order_by('id')
+            batch_success_rows, batch_error_rows = self._rows_for_users(context, list(users))
+            success_rows.extend(batch_success_rows)
+            error_rows.extend(batch_error_rows)
+
+        partial_reports = OrderedDict([
+            ('grade_report', [self._success_headers(context)] + success_rows),
+            ('grade_report_err', [self._error_headers()] + error_rows),
+        ])
+        return partial_reports, len(success_rows), len(error_rows)
+
     def _success_headers(self, context):
         """
         Returns a list of all applicable column headers for this grade report.
@@ -259,29 +297,42 @@ class CourseGradeReport(object):
             users = [u for u in users if u is not None]
             yield self._rows_for_users(context, users)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, error_rows):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        A generator of the success rows of the given batched_rows, which
+        appends their error rows to the given error_rows list and updates the
+        task progress as each batch is compiled.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = zip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
+        task_progress = context.task_progress
+        task_progress.total = self._num_users(context)
+        for batch_success_rows, batch_error_rows in batched_rows:
+            error_rows.extend(batch_error_rows)
 
-        # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
-        context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
-        context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
+            # update metrics on task status
+            task_progress.succeeded += len(batch_success_rows)
+            task_progress.failed += len(batch_error_rows)
+            task_progress.attempted = task_progress.succeeded + task_progress.failed
+            task_progress.total = max(task_progress.total, task_progress.attempted)
+            context.update_status(u'Compiling grades')
+
+            for row in batch_success_rows:
+                yield row
+
+        task_progress.total = task_progress.attempted
+        context.update_status(u'Uploading grades')
+
+    def _num_users(self, context):
+        """
+        Returns the number of users expected in this report.
+        """
+        return CourseEnrollment.objects.users_enrolled_in(context.course_id, include_inactive=True).count()
 
     def _upload(self, context, success_headers, success_rows, error_headers, error_rows):
         """
         Creates and uploads a CSV for the given headers and rows.
         """
         date = datetime.now(UTC)
-        upload_csv_to_report_store([success_headers] + success_rows, 'grade_report', context.course_id, date)
+        upload_csv_to_report_store(chain([success_headers], success_rows), 'grade_report', context.course_id, date)
         if len(error_rows) > 0:
             error_rows = [error_headers] + error_rows
             upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
@@ -503,6 +554,11 @@ class CourseGradeReport(object):
 
 
 class ProblemGradeReport(object):
+    # This struct encapsulates both the display names of each static item in the
+    # header row as values as well as the django User field names of those items
+    # as the keys.  It is structured in this way to keep the values related.
+    HEADER_ROW = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
+
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
         """
@@ -511,29 +567,87 @@ class ProblemGradeReport(object):
         """
         start_time = time()
         start_date = datetime.now(UTC)
-        status_interval = 100
         enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id, include_inactive=True)
         task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
 
-        # This struct encapsulates both the display names of each static item in the
-        # header row as values as well as the django User field names of those items
-        # as the keys.  It is structured in this way to keep the values related.
-        header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
-
+        header_row = cls.HEADER_ROW
         course = get_course_by_id(course_id)
         graded_scorable_blocks = cls._graded_scorable_blocks_to_header(course)
 
         # Just generate the static fields for now.
-        rows = [
-            list(header_row.values()) + ['Enrollment Status', 'Grade'] + _flatten(list(graded_scorable_blocks.values()))
-        ]
-        error_rows = [list(header_row.values()) + ['error_msg']]
-        current_step = {'step': 'Calculating Grades'}
+        header, error_header = cls._headers(graded_scorable_blocks)
+        error_rows = [error_header]
 
         # Bulk fetch and cache enrollment states so we can efficiently determine
         # whether each user is currently enrolled in the course.
         CourseEnrollment.bulk_fetch_enrollment_states(enrolled_students, course_id)
 
+        # The rows are generated while they are being uploaded, and the error
+        # rows are collected meanwhile.
+        rows = cls._rows(
+            course, enrolled_students, header_row, graded_scorable_blocks, error_rows, task_progress,
+        )
+
+        # Perform the upload if any students have been successfully graded
+        first_row = next(rows, None)
+        if first_row is not None:
+            upload_csv_to_report_store(chain([header, first_row], rows), 'problem_grade_report', course_id, start_date)
+        # If there are any error rows, write them out as well
+        if len(error_rows) > 1:
+            upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
+
+        return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
+
+    @classmethod
+    def shard_users(cls, course_id, _task_input):
+        """
+        Returns the users to shard a problem grade report over.
+        """
+        return CourseEnrollment.objects.users_enrolled_in(course_id, include_inactive=True)
+
+    @classmethod
+    def generate_shard(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name, user_ids):
+        """
+        Generate the partial problem grade reports of the given users within a
+        given `course_id`.
+        """
+        students = get_user_model().objects.filter(id__in=user_ids).order_by('id')
+        task_progress = TaskProgress(action_name, len(user_ids), time())
+
+        course = get_course_by_id(course_id)
+        graded_scorable_blocks = cls._graded_scorable_blocks_to_header(course)
+        header, error_header = cls._headers(graded_scorable_blocks)
+        error_rows = [error_header]
+
+        CourseEnrollment.bulk_fetch_enrollment_states(students, course_id)
+        rows = [header]
+        rows.extend(cls._rows(course, students, cls.HEADER_ROW, graded_scorable_blocks, error_rows, task_progress))
+
+        partial_reports = OrderedDict([
+            ('problem_grade_report', rows),
+            ('problem_grade_report_err', error_rows),
+        ])
+        return partial_reports, task_progress.succeeded, task_progress.failed
+
+    @classmethod
+    def _headers(cls, graded_scorable_blocks):
+        """
+        Returns the header row and the error header row of the report.
+        """
+        header_values = list(cls.HEADER_ROW.values())
+        header = header_values + ['Enrollment Status', 'Grade'] + _flatten(list(graded_scorable_blocks.values()))
+        return header, header_values + ['error_msg']
+
+    @classmethod
+    def _rows(cls, course, enrolled_students, header_row, graded_scorable_blocks, error_rows, task_progress):
+        """
+        A generator of the rows of the students who were successfully graded,
+        which appends the rows of the students who could not be graded to the
+        given error_rows list and updates the given task_progress.
+        """
+        status_interval = 100
+        current_step = {'step': 'Calculating Grades'}
+
         for student, course_grade, error in CourseGradeFactory().iter(enrolled_students, course):
             student_fields = [getattr(student, field_name) for field_name in header_row]
             task_progress.attempted += 1
@@ -547,7 +661,7 @@ class ProblemGradeReport(object):
                 task_progress.failed += 1
                 continue
 
-            enrollment_status = _user_enrollment_status(student, course_id)
+            enrollment_status = _user_enrollment_status(student, course.id)
 
             earned_possible_values = []
             for block_location in graded_scorable_blocks:
@@ -561,21 +675,12 @@ class ProblemGradeReport(object):
                     else:
                         earned_possible_values.append([u'Not Attempted', problem_score.possible])
 
-            rows.append(student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values))
+            yield student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values)
 
             task_progress.succeeded += 1
             if task_progress.attempted % status_interval == 0:
                 task_progress.update_task_state(extra_meta=current_step)
 
-        # Perform the upload if any students have been successfully graded
-        if len(rows) > 1:
-            upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
-        # If there are any error rows, write them out as well
-        if len(error_rows) > 1:
-            upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
-
-        return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
-
     @classmethod
     def _graded_scorable_blocks_to_header(cls, course):
         """
@@ -631,7 +736,7 @@ class ProblemResponses(object):
                 yield result
 
     @classmethod
-    def _build_student_data(cls, user_id, course_key, usage_key_str):
+    def _build_student_data(cls, user_id, course_key, usage_key_str, student_ids=None):
         """
         Generate a list of problem responses for all problem under the
         ``problem_location`` root.
@@ -642,6 +747,8 @@ class ProblemResponses(object):
                 is being generated
             usage_key_str (str): The generated report will include this
                 block and it child blocks.
+            student_ids (List[int]): If given, the report will only include
+                the responses of the students with these ids.
 
         Returns:
               Tuple[List[Dict], List[str]]: Returns a list of dictionaries
@@ -674,7 +781,7 @@ class ProblemResponses(object):
                 # human-readable formatting for user state.
                 if hasattr(block, 'generate_report_data'):
                     try:
-                        user_state_iterator = user_state_client.iter_all_for_block(block_key)
+                        user_state_iterator = user_state_client.iter_all_for_block(block_key, user_ids=student_ids)
                         for username, state in block.generate_report_data(user_state_iterator, max_count):
                             generated_report_data[username].append(state)
                     except NotImplementedError:
@@ -682,7 +789,7 @@ class ProblemResponses(object):
 
                 responses = []
 
-                for response in list_problem_responses(course_key, block_key, max_count):
+                for response in list_problem_responses(course_key, block_key, max_count, user_ids=student_ids):
                     response['title'] = title
                     # A human-readable location for the current block
                     response['location'] = ' > '.join(path)
@@ -709,16 +816,41 @@ class ProblemResponses(object):
                     if max_count <= 0:
                         break
 
+        return student_data, cls._student_data_keys_list(student_data_keys)
+
+    @classmethod
+    def _student_data_keys_list(cls, student_data_keys):
+        """
+        Returns the given keys of the columns returned by the xblock report
+        generators, together with the standard keys, in the order of the
+        report's columns.
+        """
         # Keep the keys in a useful order, starting with username, title and location,
         # then the columns returned by the xblock report generator in sorted order and
         # finally end with the more machine friendly block_key and state.
-        student_data_keys_list = (
+        return (
             ['username', 'title', 'location'] +
             sorted(student_data_keys) +
             ['block_key', 'state']
         )
 
-        return student_data, student_data_keys_list
+    @classmethod
+    def _csv_name(cls, problem_location):
+        """
+        Returns the name of the report of the given problem location.
+        """
+        return 'student_state_from_{}'.format(re.sub(r'[:/]', '_', problem_location))
+
+    @classmethod
+    def _rows(cls, student_data, student_data_keys):
+        """
+        Returns the header and the rows of the report of the given student data.
+        """
+        for data in student_data:
+            for key in student_data_keys:
+                data.setdefault(key, '')
+
+        return format_dictlist(student_data, student_data_keys)
 
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, task_input, action_name):
@@ -741,11 +873,7 @@ class ProblemResponses(object):
             usage_key_str=problem_location
         )
 
-        for data in student_data:
-            for key in student_data_keys:
-                data.setdefault(key, '')
-
-        header, rows = format_dictlist(student_data, student_data_keys)
+        header, rows = cls._rows(student_data, student_data_keys)
 
         task_progress.attempted = task_progress.succeeded = len(rows)
         task_progress.skipped = task_progress.total - task_progress.attempted
@@ -756,9 +884,49 @@ class ProblemResponses(object):
         task_progress.update_task_state(extra_meta=current_step)
 
         # Perform the upload
-        problem_location = re.sub(r'[:/]', '_', problem_location)
-        csv_name = 'student_state_from_{}'.format(problem_location)
+        csv_name = cls._csv_name(problem_location)
         report_name = upload_csv_to_report_store(rows, csv_name, course_id, start_date)
         current_step = {'step': 'CSV uploaded', 'report_name': report_name}
 
         return task_progress.update_task_state(extra_meta=current_step)
+
+    @classmethod
+    def shard_users(cls, course_id, _task_input):
+        """
+        Returns the users to shard a problem responses report over, or None if
+        the number of responses in the report is limited, since the limit
+        applies to the report as a whole.
+
+        The rows of a sharded report are ordered by shard first, and by
+        problem within each shard.
+        """
+        if settings.FEATURES.get('MAX_PROBLEM_RESPONSES_COUNT') is not None:
+            return None
+        return get_user_model().objects.filter(studentmodule__course_id=course_id).distinct()
+
+    @classmethod
+    def generate_shard(cls, _xmodule_instance_args, _entry_id, course_id, task_input, _action_name, user_ids):
+        """
+        For a given `course_id`, generate the partial report of the answers of
+        the given students to a given problem.
+        """
+        problem_location = task_input.get('problem_location')
+        student_data, student_data_keys = cls._build_student_data(
+            user_id=task_input.get('user_id'),
+            course_key=course_id,
+            usage_key_str=problem_location,
+            student_ids=user_ids,
+        )
+        header, rows = cls._rows(student_data, student_data_keys)
+        return {cls._csv_name(problem_location): [header] + rows}, len(rows), 0
+
+    @classmethod
+    def merge_shard_headers(cls, _csv_name, headers):
+        """
+        Returns the header of the report of the given headers of its partial
+        reports, which include the columns of the students in their shard.
+        """
+        student_data_keys = set()
+        for header in headers:
+            student_data_keys.update(header[3:-2])
+        return cls._student_data_keys_list(student_data_keys)
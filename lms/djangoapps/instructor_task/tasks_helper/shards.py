@@ -0,0 +1,272 @@
+"""
+Functionality for generating reports in shards of users.
+
+A report that is generated in shards is fanned out into subtasks, each of
+which generates the partial reports of a range of users and stores them as
+partial CSVs in the report store.  The subtask that completes the last shard
+merges the partial CSVs of all shards into the final reports, and only then
+sets the final state of the InstructorTask.  As when a report is generated at
+once, a report whose csv name ends with ERROR_REPORT_SUFFIX is only uploaded
+if it has rows.
+
+Report classes that support sharding implement, in addition to `generate`:
+
+    shard_users(course_id, task_input)
+        Returns the queryset of the users to shard the report over, or None
+        if the report cannot be sharded.
+
+    generate_shard(xmodule_instance_args, entry_id, course_id, task_input, action_name, user_ids)
+        Returns a tuple of a dict that maps the csv names of the partial
+        reports of the given users to their rows, with a header row first,
+        and the numbers of users that succeeded and failed.
+
+    merge_shard_headers(csv_name, headers)
+        Optional.  Returns the header row of the merged report of the given
+        header rows of its partial reports, for reports whose columns
+        depend on their rows.  By default the header rows are expected to
+        be identical.
+"""
+from __future__ import absolute_import
+
+import json
+import logging
+import traceback
+from datetime import datetime
+from itertools import chain, count
+
+import six
+from celery.states import FAILURE, SUCCESS
+from django.conf import settings
+from pytz import UTC
+
+from lms.djangoapps.instructor_task.exceptions import ReportShardsFailed
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status
+)
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
+
+from .utils import upload_csv_to_report_store
+
+TASK_LOG = logging.getLogger('edx.celery.task')
+
+WAFFLE_SWITCHES = WaffleSwitchNamespace(name='instructor_task')
+
+# Waffle switch to fan out the generation of grade and problem response reports
+# into subtasks of REPORT_USERS_PER_SHARD users each.
+# .. toggle_name: instructor_task.shard_reports
+# .. toggle_implementation: WaffleSwitch
+# .. toggle_default: False
+# .. toggle_description: Generates the course grade, problem grade and problem response reports of
+#   courses with more than REPORT_USERS_PER_SHARD users in parallel subtasks, merging their partial CSVs.
+# .. toggle_category: instructor_task
+# .. toggle_use_cases: monitored_rollout
+# .. toggle_creation_date: 2026-10-18
+# .. toggle_expiration_date: ??
+# .. toggle_warnings: The partial CSVs are stored in the GRADES_DOWNLOAD report store until they are merged.
+# .. toggle_tickets: None
+# .. toggle_status: supported
+SHARD_REPORTS = 'shard_reports'
+
+# The report store directory, within the directory of a course, of the
+# partial reports of the shards of an instructor task.
+PARTIAL_REPORTS_DIRECTORY = u'partial_reports/{task_id}'
+
+REPORT_STORE_CONFIG_NAME = 'GRADES_DOWNLOAD'
+
+# The suffix of the csv names of the reports of the students that could not
+# be included in a report.
+ERROR_REPORT_SUFFIX = u'_err'
+
+
+def generate_report(report_class, shard_task, xmodule_instance_args, entry_id, course_id, task_input, action_name):
+    """
+    Generates the report of the given report_class, fanning it out into
+    subtasks of the given shard_task when sharding is enabled and there are
+    more users than REPORT_USERS_PER_SHARD.
+
+    The shard_task is called with the entry_id, the name of the
+    report_class and the remaining arguments of `run_report_shard`.
+    """
+    users = report_class.shard_users(course_id, task_input) if WAFFLE_SWITCHES.is_enabled(SHARD_REPORTS) else None
+    users_per_shard = settings.REPORT_USERS_PER_SHARD
+    total_num_users = users.count() if users is not None else 0
+    if total_num_users <= users_per_shard:
+        return report_class.generate(xmodule_instance_args, entry_id, course_id, task_input, action_name)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    shard_indices = count()
+
+    def _create_report_shard_subtask(user_list, initial_subtask_status):
+        """Creates a subtask to generate the partial reports of the given users."""
+        return shard_task.subtask(
+            (
+                entry_id,
+                report_class.__name__,
+                next(shard_indices),
+                [user['pk'] for user in user_list],
+                xmodule_instance_args,
+                action_name,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    TASK_LOG.info(
+        u'Task: %s, InstructorTask ID: %s, Course: %s, Sharding report of %d users',
+        entry.task_id, entry_id, course_id, total_num_users,
+    )
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_report_shard_subtask,
+        [users.order_by('id')],
+        [],
+        users_per_shard,
+        total_num_users,
+    )
+
+
+def run_report_shard(
+    report_class,  # pylint: disable=bad-continuation
+    entry_id,
+    shard_index,
+    user_ids,
+    xmodule_instance_args,
+    action_name,
+    subtask_status_dict,
+):
+    """
+    Generates and stores the partial reports of the given users, and merges
+    the partial reports of all shards if this is the last shard to complete.
+
+    Returns the status of the subtask, as a dict.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    try:
+        partial_reports, num_succeeded, num_failed = report_class.generate_shard(
+            xmodule_instance_args, entry_id, entry.course_id, json.loads(entry.task_input), action_name, user_ids,
+        )
+        report_store = ReportStore.from_config(REPORT_STORE_CONFIG_NAME)
+        for csv_name, rows in six.iteritems(partial_reports):
+            report_store.store_rows(
+                entry.course_id, _partial_report_filename(entry.task_id, csv_name, shard_index), rows,
+            )
+    except Exception:
+        TASK_LOG.exception(u'Report shard %s of instructor task %s failed', current_task_id, entry_id)
+        subtask_status.increment(failed=len(user_ids), state=FAILURE)
+        if update_subtask_status(entry_id, current_task_id, subtask_status, complete_entry=False):
+            merge_report_shards(report_class, entry_id)
+        raise
+
+    subtask_status.increment(succeeded=num_succeeded, failed=num_failed, state=SUCCESS)
+    if update_subtask_status(entry_id, current_task_id, subtask_status, complete_entry=False):
+        merge_report_shards(report_class, entry_id)
+    return subtask_status.to_dict()
+
+
+def merge_report_shards(report_class, entry_id):
+    """
+    Merges the partial reports of all shards of the given InstructorTask
+    into its final reports, and deletes them.
+
+    The InstructorTask is then marked as succeeded, or as failed if any of
+    its shards failed, or if the merge fails.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    course_id = entry.course_id
+    report_store = ReportStore.from_config(REPORT_STORE_CONFIG_NAME)
+    partial_filenames = _partial_report_filenames(report_store, entry)
+    try:
+        num_failed_shards = json.loads(entry.subtasks)['failed']
+        if num_failed_shards:
+            raise ReportShardsFailed(u'{} of the report shards failed'.format(num_failed_shards))
+
+        timestamp = datetime.now(UTC)
+        report_names = {}
+        for csv_name, filenames in sorted(partial_filenames.items()):
+            rows = _merged_rows(report_class, report_store, course_id, csv_name, filenames)
+            header = next(rows)
+            first_row = next(rows, None)
+            if first_row is None and csv_name.endswith(ERROR_REPORT_SUFFIX):
+                continue
+            report_names[csv_name] = upload_csv_to_report_store(
+                chain([header], [first_row] if first_row is not None else [], rows),
+                csv_name,
+                course_id,
+                timestamp,
+                config_name=REPORT_STORE_CONFIG_NAME,
+            )
+    except Exception as exc:  # pylint: disable=broad-except
+        TASK_LOG.exception(u'Merging the report shards of instructor task %s failed', entry_id)
+        entry.task_output = InstructorTask.create_output_for_failure(exc, traceback.format_exc())
+        entry.task_state = FAILURE
+        entry.save_now()
+        return
+    finally:
+        for filenames in partial_filenames.values():
+            for filename in filenames:
+                report_store.delete(course_id, filename)
+
+    task_progress = json.loads(entry.task_output)
+    task_progress['step'] = u'CSV uploaded'
+    for csv_name, report_name in six.iteritems(report_names):
+        if not csv_name.endswith(ERROR_REPORT_SUFFIX):
+            task_progress['report_name'] = report_name
+    entry.task_output = InstructorTask.create_output_for_success(task_progress)
+    entry.task_state = SUCCESS
+    entry.save_now()
+    TASK_LOG.info(u'Merged the report shards of instructor task %s into %s', entry_id, list(report_names.values()))
+
+
+def _partial_report_filename(task_id, csv_name, shard_index):
+    """
+    Returns the report store filename of the partial report of the given
+    csv name and shard.
+    """
+    return u'{}/{}.{:05d}.csv'.format(PARTIAL_REPORTS_DIRECTORY.format(task_id=task_id), csv_name, shard_index)
+
+
+def _partial_report_filenames(report_store, entry):
+    """
+    Returns a dict that maps the csv names of the partial reports stored
+    for the given InstructorTask to their filenames, in shard order.
+    """
+    directory = PARTIAL_REPORTS_DIRECTORY.format(task_id=entry.task_id)
+    partial_filenames = {}
+    for filename in sorted(report_store.filenames_in(entry.course_id, directory)):
+        csv_name = filename.rsplit(u'.', 2)[0]
+        partial_filenames.setdefault(csv_name, []).append(u'{}/{}'.format(directory, filename))
+    return partial_filenames
+
+
+def _merged_rows(report_class, report_store, course_id, csv_name, filenames):
+    """
+    A generator of the header row and the rows of the given partial reports
+    of the given csv name.  The rows are read from one partial report at a
+    time, and their columns rearranged if its header row differs from the
+    merged one.
+    """
+    partial_headers = [next(report_store.read_rows(course_id, filename), []) for filename in filenames]
+    merge_shard_headers = getattr(report_class, 'merge_shard_headers', None)
+    header = merge_shard_headers(csv_name, partial_headers) if merge_shard_headers else partial_headers[0]
+    yield header
+
+    for filename, partial_header in zip(filenames, partial_headers):
+        rows = report_store.read_rows(course_id, filename)
+        next(rows, None)
+        if partial_header == header:
+            for row in rows:
+                yield row
+        else:
+            column_indices = {column: index for index, column in enumerate(partial_header)}
+            for row in rows:
+                yield [row[column_indices[column]] if column in column_indices else u'' for column in header]
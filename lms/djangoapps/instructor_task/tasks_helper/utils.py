@@ -30,6 +30,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            Any iterable of rows, such as a generator, can be given; it is
+            consumed lazily while the CSV is written.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
 
@@ -4,10 +4,13 @@ Tests for instructor_task/models.py.
 from __future__ import absolute_import
 
 import copy
+import gzip
+import hashlib
 import time
-from six import StringIO
+from six import BytesIO, StringIO
 
 import boto
+from boto.s3.multipart import MultiPartUpload
 from django.conf import settings
 from django.test import SimpleTestCase, TestCase, override_settings
 from mock import patch
@@ -114,6 +117,24 @@ class DjangoStorageReportStoreLocalTestCase(ReportStoreTestMixin, TestReportMixi
         with override_settings(GRADES_DOWNLOAD=test_settings):
             return ReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
+    @patch('lms.djangoapps.instructor_task.models.REPORT_SPOOL_MAX_SIZE', 16)
+    @patch('lms.djangoapps.instructor_task.models.REPORT_WRITE_CHUNK_SIZE', 8)
+    def test_store_rows_from_generator(self):
+        """
+        Test that rows given by a generator are written in chunks, through a
+        temporary file, and stored in csv format.
+        """
+        report_store = self.create_report_store()
+        rows = ([u'row{}'.format(index), u'caf\xe9, "{}"'.format(index)] for index in range(3))
+        report_store.store_rows(self.course_id, 'rows.csv', rows)
+
+        with report_store.storage.open(report_store.path_to(self.course_id, 'rows.csv')) as report_file:
+            content = report_file.read()
+        self.assertEqual(
+            content.decode('utf-8').lstrip(u'\ufeff'),
+            u'row0,"caf\xe9, ""0"""\r\nrow1,"caf\xe9, ""1"""\r\nrow2,"caf\xe9, ""2"""\r\n',
+        )
+
 
 class DjangoStorageReportStoreS3TestCase(MockS3Mixin, ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -135,6 +156,36 @@ class DjangoStorageReportStoreS3TestCase(MockS3Mixin, ReportStoreTestMixin, Test
             connection.create_bucket(settings.GRADES_DOWNLOAD['STORAGE_KWARGS']['bucket'])
             return ReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
+    @patch('moto.s3.models.UPLOAD_PART_MIN_SIZE', 1024)
+    @patch('openedx.core.storage.MULTIPART_UPLOAD_PART_SIZE', 1024)
+    def test_store_rows_gzipped_in_parts(self):
+        """
+        Test that the rows of a report are gzipped and uploaded in parts as
+        they are written, when the storage gzips csv files.
+        """
+        report_store = self.create_report_store()
+        report_store.storage.gzip = True
+        report_store.storage.gzip_content_types = ('text/csv',)
+        # Rows of hashes, which zlib gzips in several blocks
+        digests = (hashlib.sha1(u'{}'.format(index).encode('utf-8')).hexdigest() for index in range(2000))
+        expected_rows = [
+            [u'row{}'.format(index), u'caf\xe9, {}'.format(digest)] for index, digest in enumerate(digests)
+        ]
+        rows = (row for row in expected_rows)
+        upload_part = MultiPartUpload.upload_part_from_file
+        with patch.object(
+            MultiPartUpload, 'upload_part_from_file', autospec=True, side_effect=upload_part
+        ) as mock_upload_part:
+            report_store.store_rows(self.course_id, 'rows.csv', rows)
+        self.assertGreater(mock_upload_part.call_count, 1)
+
+        with report_store.storage.open(report_store.path_to(self.course_id, 'rows.csv')) as report_file:
+            content = gzip.GzipFile(fileobj=BytesIO(report_file.read())).read()
+        self.assertEqual(
+            content.decode('utf-8').lstrip(u'\ufeff'),
+            u''.join(u'{},"{}"\r\n'.format(*row) for row in expected_rows),
+        )
+
 
 class TestS3ReportStorage(MockS3Mixin, TestCase):
     """
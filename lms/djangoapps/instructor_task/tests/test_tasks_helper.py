@@ -9,11 +9,13 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 """
 from __future__ import absolute_import, unicode_literals
 
+import json
 import os
 import shutil
 import tempfile
 from contextlib import contextmanager
 from datetime import datetime, timedelta
+from uuid import uuid4
 
 import ddt
 import unicodecsv
@@ -62,6 +64,13 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_course_survey_report,
     upload_ora2_data
 )
+from lms.djangoapps.instructor_task.tasks_helper.shards import (
+    SHARD_REPORTS,
+    WAFFLE_SWITCHES,
+    generate_report,
+    merge_report_shards
+)
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -91,7 +100,8 @@ from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, check_mongo_calls
 from xmodule.partitions.partitions import Group, UserPartition
 
-from ..models import ReportStore
+from ..models import InstructorTask, ReportStore
+from ..tasks import generate_report_shard
 from ..tasks_helper.utils import UPDATE_STATUS_FAILED, UPDATE_STATUS_SUCCEEDED
 
 
@@ -416,7 +426,7 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
 
         RequestCache.clear_all_namespaces()
 
-        expected_query_count = 49
+        expected_query_count = 50
         with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
             with check_mongo_calls(mongo_count):
                 with self.assertNumQueries(expected_query_count):
@@ -445,6 +455,122 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         )
 
 
+@override_settings(REPORT_USERS_PER_SHARD=2)
+class TestShardedGradeReports(InstructorGradeReportTestCase):
+    """
+    Tests that grade reports generated in shards match those generated at once.
+    """
+    def setUp(self):
+        super(TestShardedGradeReports, self).setUp()
+        self.course = CourseFactory.create()
+        self.students = [self.create_student(u'student{}'.format(index)) for index in range(5)]
+
+    def _read_report_rows(self):
+        """
+        Returns the rows of the most recent report, and deletes it.
+        """
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        report_csv_filename = report_store.links_for(self.course.id)[0][0]
+        rows = list(report_store.read_rows(self.course.id, report_csv_filename))
+        report_store.delete(self.course.id, report_csv_filename)
+        return rows
+
+    def _generate_sharded(self, report_class):
+        """
+        Generates the report of the given report_class in shards, running
+        the shard subtasks in order, and returns its InstructorTask.
+        """
+        entry = InstructorTaskFactory.create(course_id=self.course.id, task_id=str(uuid4()))
+        shard_task = Mock()
+        with WAFFLE_SWITCHES.override(SHARD_REPORTS, active=True):
+            generate_report(report_class, shard_task, {}, entry.id, self.course.id, {}, 'graded')
+        self.assertEqual(shard_task.subtask.call_count, 3)
+        for subtask_args, _ in shard_task.subtask.call_args_list:
+            generate_report_shard(*subtask_args[0])
+        return InstructorTask.objects.get(pk=entry.id)
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task', Mock())
+    def test_course_grade_report(self):
+        CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+        expected_rows = self._read_report_rows()
+
+        entry = self._generate_sharded(CourseGradeReport)
+        self.assertEqual(entry.task_state, 'SUCCESS')
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0, 'step': 'CSV uploaded'}, json.loads(entry.task_output)
+        )
+        self.assertEqual(self._read_report_rows(), expected_rows)
+
+        # The partial reports of the shards are deleted once merged.
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(report_store.links_for(self.course.id), [])
+        self.assertEqual(report_store.filenames_in(self.course.id, 'partial_reports/{}'.format(entry.task_id)), [])
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task', Mock())
+    def test_problem_grade_report(self):
+        ProblemGradeReport.generate(None, None, self.course.id, None, 'graded')
+        expected_rows = self._read_report_rows()
+
+        entry = self._generate_sharded(ProblemGradeReport)
+        self.assertEqual(entry.task_state, 'SUCCESS')
+        self.assertEqual(self._read_report_rows(), expected_rows)
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task', Mock())
+    @patch('lms.djangoapps.instructor_task.tasks_helper.grades.CourseGradeReport._rows_for_users')
+    def test_shards_of_errors_and_no_rows(self, mock_rows_for_users):
+        success_rows = [[u'1', u'student0@example.com', u'student0'], [u'2', u'student1@example.com', u'student1']]
+        error_rows = [[u'3', u'student2', u'Cannot grade student']]
+        mock_rows_for_users.side_effect = [(success_rows, []), ([], error_rows), ([], [])]
+        task_states_when_merged = []
+
+        def _merge_report_shards(report_class, entry_id):
+            """
+            Records the state of the InstructorTask before merging its report shards.
+            """
+            task_states_when_merged.append(InstructorTask.objects.get(pk=entry_id).task_state)
+            merge_report_shards(report_class, entry_id)
+
+        with patch(
+            'lms.djangoapps.instructor_task.tasks_helper.shards.merge_report_shards', side_effect=_merge_report_shards
+        ):
+            entry = self._generate_sharded(CourseGradeReport)
+        self.assertEqual(len(task_states_when_merged), 1)
+        self.assertNotEqual(task_states_when_merged[0], 'SUCCESS')
+        self.assertEqual(entry.task_state, 'SUCCESS')
+
+        # The report is named in the task output rather than its error report,
+        # and both include the rows of all shards.
+        report_name = json.loads(entry.task_output)['report_name']
+        self.assertIn(u'_grade_report_', report_name)
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        report_rows = list(report_store.read_rows(self.course.id, report_name))
+        self.assertEqual(report_rows[1:], success_rows)
+        error_report_name = report_name.replace(u'_grade_report_', u'_grade_report_err_')
+        error_report_rows = list(report_store.read_rows(self.course.id, error_report_name))
+        self.assertEqual(error_report_rows, [[u'Student ID', u'Username', u'Error']] + error_rows)
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task', Mock())
+    @patch('lms.djangoapps.instructor_task.tasks_helper.grades.CourseGradeReport._rows_for_users')
+    def test_failed_shard(self, mock_rows_for_users):
+        mock_rows_for_users.side_effect = [([], []), ValueError('Cannot grade students'), ([], [])]
+        entry_id = InstructorTaskFactory.create(course_id=self.course.id, task_id=str(uuid4())).id
+        shard_task = Mock()
+        with WAFFLE_SWITCHES.override(SHARD_REPORTS, active=True):
+            generate_report(CourseGradeReport, shard_task, {}, entry_id, self.course.id, {}, 'graded')
+        for index, (subtask_args, _) in enumerate(shard_task.subtask.call_args_list):
+            if index == 1:
+                with self.assertRaises(ValueError):
+                    generate_report_shard(*subtask_args[0])
+            else:
+                generate_report_shard(*subtask_args[0])
+
+        entry = InstructorTask.objects.get(pk=entry_id)
+        self.assertEqual(entry.task_state, 'FAILURE')
+        self.assertEqual(json.loads(entry.task_output)['exception'], 'ReportShardsFailed')
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(report_store.links_for(self.course.id), [])
+
+
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
 
@@ -996,6 +996,21 @@ CONTENTSTORE = {
     'DOC_STORE_CONFIG': DOC_STORE_CONFIG
 }
 
+# Course assets smaller than this many bytes are cached whole in the "course_assets"
+# cache by the contentserver.  Larger assets are streamed from the contentstore.
+CONTENTSERVER_MAX_CACHED_ASSET_SIZE = 1048576
+
+# The number of bytes read from the contentstore at a time when streaming an asset.
+CONTENTSERVER_STREAM_CHUNK_SIZE = 64 * 1024
+
+# A local directory to which the contentserver copies the assets too large for the
+# "course_assets" cache, to serve them from disk.  None disables the disk cache.
+CONTENTSERVER_DISK_CACHE_DIR = None
+
+# The number of bytes of assets kept in the contentserver disk cache, beyond which
+# the least recently used assets are removed from it.
+CONTENTSERVER_DISK_CACHE_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
 MODULESTORE = {
     'default': {
         'ENGINE': 'xmodule.modulestore.mixed.MixedModuleStore',
@@ -1095,6 +1110,10 @@ CODE_JAIL = {
 #   ]
 COURSES_WITH_UNSAFE_CODE = []
 
+# The number of results of sandboxed problem code to cache in the memory of each
+# process, in front of the shared cache.  0 disables the in-process cache.
+SAFE_EXEC_LOCAL_CACHE_SIZE = 0
+
 ############################### DJANGO BUILT-INS ###############################
 # Change DEBUG in your environment settings files, not here
 DEBUG = False
@@ -2133,6 +2152,16 @@ BLOCK_STRUCTURES_SETTINGS = dict(
 
     # Backend storage options
     PRUNING_ACTIVE=False,
+
+    # Maximum aggregate size, in bytes of serialized data, of the block
+    # structures held in each process's local cache, when enabled with
+    # the block_structure.local_cache waffle switch.
+    LOCAL_CACHE_MAX_SIZE=100 * 1024 * 1024,
+
+    # Number of seconds for which block structures are held in the
+    # local cache when storage backing is disabled, since their
+    # version is then unknown.
+    LOCAL_CACHE_TIMEOUT=60,
 )
 
 ################################ Bulk Email ###################################
@@ -2810,6 +2839,10 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': None,
 }
 
+# Number of users in each of the subtasks that generate a report when the
+# instructor_task.shard_reports waffle switch is enabled.
+REPORT_USERS_PER_SHARD = 2000
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': None,
@@ -3175,6 +3208,12 @@ DEFAULT_MOBILE_AVAILABLE = False
 # Enrollment API Cache Timeout
 ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT = 60
 
+# How long the dashboard summaries of learners are cached, when the
+# student.materialize_dashboard_summary waffle switch is enabled. Changes to
+# their enrollments, certificates, grades, credit and verifications invalidate
+# them, so this only bounds how long changes to courses and deadlines take to show.
+DASHBOARD_SUMMARY_CACHE_TIMEOUT = 10 * 60
+
 # These tabs are currently disabled
 NOTES_DISABLED_TABS = ['course_structure', 'tags']
 
@@ -3297,6 +3336,15 @@ CREDENTIALS_PUBLIC_SERVICE_URL = 'http://localhost:8005'
 COMMENTS_SERVICE_URL = 'http://localhost:18080'
 COMMENTS_SERVICE_KEY = 'password'
 
+# Maximum number of keep-alive connections to the comments service that each
+# process pools.  When 0, each request opens a new connection.
+COMMENTS_SERVICE_MAX_CONNECTIONS = 0
+
+# Number of worker threads of each process that send requests to the comments
+# service concurrently, for views that need several independent ones.  When 0,
+# the requests are sent one after the other.
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = 0
+
 # Reverification checkpoint name pattern
 CHECKPOINT_PATTERN = r'(?P<checkpoint_name>[^/]+)'
 
@@ -3310,6 +3358,19 @@ FIELD_OVERRIDE_PROVIDERS = ()
 # require student context.
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ('openedx.features.content_type_gating.field_override.ContentTypeGatingFieldOverride',)  # pylint: disable=line-too-long
 
+# Cache, shared across requests, for the xblock field data of the
+# read-mostly scopes (user_state_summary, preferences and user_info) that
+# FieldDataCache otherwise reads from the database on every request.
+# TIMEOUTS maps scope names to the number of seconds for which their field
+# data is cached; scopes that are not listed are always read from the
+# database. Writes through FieldDataCache invalidate the cached entries.
+# For example:
+#   'TIMEOUTS': {'user_state_summary': 300, 'preferences': 3600, 'user_info': 3600}
+FIELD_DATA_SHARED_CACHE = {
+    'CACHE': 'default',
+    'TIMEOUTS': {},
+}
+
 # PROFILE IMAGE CONFIG
 # WARNING: Certain django storage backends do not support atomic
 # file overwrites (including the default, OverwriteStorage) - instead
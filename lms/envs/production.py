@@ -364,6 +364,10 @@ LOGGING = get_logger_config(LOG_DIR,
 COURSE_LISTINGS = ENV_TOKENS.get('COURSE_LISTINGS', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_MAX_CONNECTIONS = ENV_TOKENS.get('COMMENTS_SERVICE_MAX_CONNECTIONS', COMMENTS_SERVICE_MAX_CONNECTIONS)
+COMMENTS_SERVICE_CONCURRENT_REQUESTS = ENV_TOKENS.get(
+    'COMMENTS_SERVICE_CONCURRENT_REQUESTS', COMMENTS_SERVICE_CONCURRENT_REQUESTS
+)
 CERT_NAME_SHORT = ENV_TOKENS.get('CERT_NAME_SHORT', CERT_NAME_SHORT)
 CERT_NAME_LONG = ENV_TOKENS.get('CERT_NAME_LONG', CERT_NAME_LONG)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
@@ -394,9 +398,19 @@ for name, value in ENV_TOKENS.get("CODE_JAIL", {}).items():
         CODE_JAIL[name] = value
 
 COURSES_WITH_UNSAFE_CODE = ENV_TOKENS.get("COURSES_WITH_UNSAFE_CODE", [])
+SAFE_EXEC_LOCAL_CACHE_SIZE = ENV_TOKENS.get('SAFE_EXEC_LOCAL_CACHE_SIZE', SAFE_EXEC_LOCAL_CACHE_SIZE)
 
 ASSET_IGNORE_REGEX = ENV_TOKENS.get('ASSET_IGNORE_REGEX', ASSET_IGNORE_REGEX)
 
+CONTENTSERVER_MAX_CACHED_ASSET_SIZE = ENV_TOKENS.get(
+    'CONTENTSERVER_MAX_CACHED_ASSET_SIZE', CONTENTSERVER_MAX_CACHED_ASSET_SIZE
+)
+CONTENTSERVER_STREAM_CHUNK_SIZE = ENV_TOKENS.get('CONTENTSERVER_STREAM_CHUNK_SIZE', CONTENTSERVER_STREAM_CHUNK_SIZE)
+CONTENTSERVER_DISK_CACHE_DIR = ENV_TOKENS.get('CONTENTSERVER_DISK_CACHE_DIR', CONTENTSERVER_DISK_CACHE_DIR)
+CONTENTSERVER_DISK_CACHE_MAX_SIZE = ENV_TOKENS.get(
+    'CONTENTSERVER_DISK_CACHE_MAX_SIZE', CONTENTSERVER_DISK_CACHE_MAX_SIZE
+)
+
 # Event Tracking
 if "TRACKING_IGNORE_URL_PATTERNS" in ENV_TOKENS:
     TRACKING_IGNORE_URL_PATTERNS = ENV_TOKENS.get("TRACKING_IGNORE_URL_PATTERNS")
@@ -647,6 +661,7 @@ DISABLE_ACCOUNT_ACTIVATION_REQUIREMENT_SWITCH = ENV_TOKENS.get(
 GRADES_DOWNLOAD_ROUTING_KEY = ENV_TOKENS.get('GRADES_DOWNLOAD_ROUTING_KEY', HIGH_MEM_QUEUE)
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
+REPORT_USERS_PER_SHARD = ENV_TOKENS.get('REPORT_USERS_PER_SHARD', REPORT_USERS_PER_SHARD)
 
 # Rate limit for regrading tasks that a grading policy change can kick off
 POLICY_CHANGE_TASK_RATE_LIMIT = ENV_TOKENS.get('POLICY_CHANGE_TASK_RATE_LIMIT', POLICY_CHANGE_TASK_RATE_LIMIT)
@@ -1125,3 +1140,4 @@ MANUAL_ENROLLMENT_ROLE_CHOICES = ENV_TOKENS.get('MANUAL_ENROLLMENT_ROLE_CHOICES'
 ########################## limiting dashboard courses ######################
 
 DASHBOARD_COURSE_LIMIT = ENV_TOKENS.get('DASHBOARD_COURSE_LIMIT', None)
+DASHBOARD_SUMMARY_CACHE_TIMEOUT = ENV_TOKENS.get('DASHBOARD_SUMMARY_CACHE_TIMEOUT', DASHBOARD_SUMMARY_CACHE_TIMEOUT)
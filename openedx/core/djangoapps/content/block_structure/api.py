@@ -7,6 +7,7 @@ from django.core.cache import cache
 
 from xmodule.modulestore.django import modulestore
 
+from .local_cache import get_local_cache
 from .manager import BlockStructureManager
 
 
@@ -46,6 +47,14 @@ def clear_course_from_cache(course_key):
     get_block_structure_manager(course_key).clear()
 
 
+def clear_course_from_local_cache(course_key):
+    """
+    Clears the block structure for the given course_key from the
+    process-local cache only.
+    """
+    get_local_cache().delete(modulestore().make_course_usage_key(course_key))
+
+
 def get_block_structure_manager(course_key):
     """
     Returns the manager for managing Block Structures for the given course.
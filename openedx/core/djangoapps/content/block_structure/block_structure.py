@@ -6,10 +6,12 @@ Module with family of classes for block structures.
 
 The following internal data structures are implemented:
     _BlockRelations - Data structure for a single block's relations.
+    _CompactBlockRelations - Compact data structure for all blocks' relations.
     _BlockData - Data structure for a single block's data.
 """
 from __future__ import absolute_import
 
+from array import array
 from copy import deepcopy
 from functools import partial
 from logging import getLogger
@@ -42,6 +44,315 @@ class _BlockRelations(object):
         # list [UsageKey]
         self.children = []
 
+    def copy(self):
+        """
+        Returns a copy of this instance, with copies of its lists.
+        """
+        block_relations = _BlockRelations()
+        block_relations.parents = list(self.parents)
+        block_relations.children = list(self.children)
+        return block_relations
+
+
+class _CompactBlockRelations(object):
+    """
+    Compact data structure to encapsulate relationships for all blocks
+    of a block structure, as an alternative to a dict of
+    {UsageKey: _BlockRelations}.
+
+    Each block is identified by a dense integer index, and the children
+    and parents of all blocks are stored as CSR-style arrays of offsets
+    and target indices. This takes considerably less memory than a dict
+    of lists per block and allows traversals to run over integers
+    rather than hashing usage keys.
+
+    The arrays are never mutated. The relations of blocks that are
+    mutated after construction are instead held as _BlockRelations
+    overrides, and removed blocks are tracked separately.
+
+    This class supports the subset of the dict protocol that is used by
+    BlockStructure, where item access returns the block's relations for
+    update. Use get_parents and get_children for read-only access.
+    """
+    def __init__(self, keys, child_offsets, child_targets, parent_offsets, parent_targets):
+        """
+        Arguments:
+            keys (list(UsageKey)) - The usage keys of the blocks, in the
+                order of their integer indices.
+
+            child_offsets (array('i')) - The offsets into child_targets
+                of each block's children, followed by the total number of
+                children.
+
+            child_targets (array('i')) - The indices of the children of
+                all blocks.
+
+            parent_offsets (array('i')) - Similar to child_offsets,
+                for parents.
+
+            parent_targets (array('i')) - Similar to child_targets, for
+                parents.
+        """
+        # list [UsageKey]
+        self._keys = keys
+
+        # dict {UsageKey: int}
+        self._index_of = {usage_key: index for index, usage_key in enumerate(keys)}
+
+        self._child_offsets = child_offsets
+        self._child_targets = child_targets
+        self._parent_offsets = parent_offsets
+        self._parent_targets = parent_targets
+
+        # Map of a block's index to its relations, for blocks whose
+        # relations were mutated or that were added after construction.
+        # dict {int: _BlockRelations}
+        self._overrides = {}
+
+        # Set of indices of blocks that were removed.
+        # set(int)
+        self._removed = set()
+
+        # Whether the keys and their index map are owned by this instance
+        # rather than shared with another one.
+        self._owns_keys = True
+
+    @classmethod
+    def from_dict(cls, block_relations):
+        """
+        Returns a new instance with the relations in the given map of
+        {UsageKey: _BlockRelations}.
+        """
+        keys = list(block_relations)
+        index_of = {usage_key: index for index, usage_key in enumerate(keys)}
+        arrays = []
+        for attr_name in ('children', 'parents'):
+            offsets = array('i', [0])
+            targets = array('i')
+            for usage_key in keys:
+                targets.extend([index_of[related_key] for related_key in getattr(block_relations[usage_key], attr_name)])
+                offsets.append(len(targets))
+            arrays.extend((offsets, targets))
+        return cls(keys, *arrays)
+
+    def __len__(self):
+        return len(self._index_of) - len(self._removed)
+
+    def __contains__(self, usage_key):
+        index = self._index_of.get(usage_key)
+        return index is not None and index not in self._removed
+
+    def __iter__(self):
+        removed = self._removed
+        return (usage_key for index, usage_key in enumerate(self._keys) if index not in removed)
+
+    def keys(self):
+        """
+        Returns an iterator of the usage keys of all blocks.
+        """
+        return iter(self)
+
+    iterkeys = keys
+
+    def __getitem__(self, usage_key):
+        """
+        Returns the relations of the given block, to be mutated.
+
+        Raises KeyError if not found.
+        """
+        index = self._get_index(usage_key)
+        block_relations = self._overrides.get(index)
+        if block_relations is None:
+            block_relations = _BlockRelations()
+            block_relations.children = self.get_children(usage_key)
+            block_relations.parents = self.get_parents(usage_key)
+            self._overrides[index] = block_relations
+        return block_relations
+
+    def __setitem__(self, usage_key, block_relations):
+        index = self._index_of.get(usage_key)
+        if index is None:
+            if not self._owns_keys:
+                self._keys = list(self._keys)
+                self._index_of = dict(self._index_of)
+                self._owns_keys = True
+            index = len(self._keys)
+            self._keys.append(usage_key)
+            self._index_of[usage_key] = index
+        self._removed.discard(index)
+        self._overrides[index] = block_relations
+
+    def pop(self, usage_key, default=None):
+        """
+        Removes the given block and returns its relations, or default if
+        not found.
+        """
+        try:
+            block_relations = self[usage_key]
+        except KeyError:
+            return default
+        index = self._index_of[usage_key]
+        self._removed.add(index)
+        del self._overrides[index]
+        return block_relations
+
+    def get_children(self, usage_key):
+        """
+        Returns a list of usage keys of the given block's children.
+
+        Raises KeyError if not found.
+        """
+        keys = self._keys
+        return [keys[index] for index in self._child_indices(self._get_index(usage_key))]
+
+    def get_parents(self, usage_key):
+        """
+        Returns a list of usage keys of the given block's parents.
+
+        Raises KeyError if not found.
+        """
+        keys = self._keys
+        return [keys[index] for index in self._parent_indices(self._get_index(usage_key))]
+
+    def copy_on_write(self):
+        """
+        Returns a new instance that shares this instance's arrays, keys
+        and relation overrides. The overrides are never to be mutated
+        through the new instance without first being replaced.
+        """
+        block_relations = _CompactBlockRelations.__new__(_CompactBlockRelations)
+        block_relations.__dict__.update(self.__dict__)
+        block_relations._overrides = dict(self._overrides)  # pylint: disable=protected-access
+        block_relations._removed = set(self._removed)  # pylint: disable=protected-access
+        block_relations._owns_keys = False  # pylint: disable=protected-access
+        return block_relations
+
+    def topological_traversal(self, start_node, filter_func, yield_descendants_of_unyielded):
+        """
+        Performs a topological sort over the indices of the blocks and
+        yields the usage key of each block as it is encountered.
+
+        Arguments:
+            See the description in
+            openedx.core.lib.graph_traversals.traverse_topologically.
+        """
+        keys = self._keys
+        for index in traverse_topologically(
+                start_node=self._get_index(start_node),
+                get_parents=self._parent_indices,
+                get_children=self._child_indices,
+                filter_func=self._index_filter(filter_func),
+                yield_descendants_of_unyielded=yield_descendants_of_unyielded,
+        ):
+            yield keys[index]
+
+    def post_order_traversal(self, start_node, filter_func):
+        """
+        Performs a post-order sort over the indices of the blocks and
+        yields the usage key of each block as it is encountered.
+
+        Arguments:
+            See the description in
+            openedx.core.lib.graph_traversals.traverse_post_order.
+        """
+        keys = self._keys
+        for index in traverse_post_order(
+                start_node=self._get_index(start_node),
+                get_children=self._child_indices,
+                filter_func=self._index_filter(filter_func),
+        ):
+            yield keys[index]
+
+    def pruned(self, root_block_usage_key):
+        """
+        Returns a new instance with only those blocks that are reachable
+        from the given root block, in their current order.
+        """
+        # Mark the reachable blocks with an iterative depth-first search.
+        reachable = bytearray(len(self._keys))
+        root_index = self._get_index(root_block_usage_key)
+        reachable[root_index] = 1
+        stack = [root_index]
+        while stack:
+            for child in self._child_indices(stack.pop()):
+                if not reachable[child]:
+                    reachable[child] = 1
+                    stack.append(child)
+
+        kept_indices = [index for index, is_reachable in enumerate(reachable) if is_reachable]
+        new_index_of = {index: new_index for new_index, index in enumerate(kept_indices)}
+
+        # All children of a reachable block are reachable, but only those
+        # of its parents that are reachable are kept.
+        child_offsets, child_targets = array('i', [0]), array('i')
+        parent_offsets, parent_targets = array('i', [0]), array('i')
+        for index in kept_indices:
+            child_targets.extend([new_index_of[child] for child in self._child_indices(index)])
+            child_offsets.append(len(child_targets))
+            parent_targets.extend([new_index_of[parent] for parent in self._parent_indices(index) if reachable[parent]])
+            parent_offsets.append(len(parent_targets))
+
+        keys = self._keys
+        return _CompactBlockRelations(
+            [keys[index] for index in kept_indices],
+            child_offsets,
+            child_targets,
+            parent_offsets,
+            parent_targets,
+        )
+
+    def _get_index(self, usage_key):
+        """
+        Returns the index of the given block.
+
+        Raises KeyError if not found.
+        """
+        index = self._index_of[usage_key]
+        if index in self._removed:
+            raise KeyError(usage_key)
+        return index
+
+    def _child_indices(self, index):
+        """
+        Returns the indices of the children of the block at the given
+        index.
+        """
+        if index in self._overrides or index in self._removed:
+            return self._mutated_indices(index, 'children')
+        offsets = self._child_offsets
+        return self._child_targets[offsets[index]:offsets[index + 1]]
+
+    def _parent_indices(self, index):
+        """
+        Returns the indices of the parents of the block at the given
+        index.
+        """
+        if index in self._overrides or index in self._removed:
+            return self._mutated_indices(index, 'parents')
+        offsets = self._parent_offsets
+        return self._parent_targets[offsets[index]:offsets[index + 1]]
+
+    def _mutated_indices(self, index, attr_name):
+        """
+        Returns the indices of the blocks that are related to the mutated
+        or removed block at the given index by the given relation.
+        """
+        block_relations = self._overrides.get(index)
+        if block_relations is None:
+            return []
+        index_of = self._index_of
+        return [index_of[usage_key] for usage_key in getattr(block_relations, attr_name)]
+
+    def _index_filter(self, filter_func):
+        """
+        Returns a filter function over block indices for the given filter
+        function over usage keys.
+        """
+        if filter_func is None:
+            return None
+        keys = self._keys
+        return lambda index: filter_func(keys[index])
+
 
 class BlockStructure(object):
     """
@@ -61,10 +372,18 @@ class BlockStructure(object):
 
         # Map of a block's usage key to its block relations. The
         # existence of a block in the structure is determined by its
-        # presence in this map.
-        # dict {UsageKey: _BlockRelations}
+        # presence in this map. This is replaced with an equivalent
+        # _CompactBlockRelations by _use_compact_relations.
+        # dict {UsageKey: _BlockRelations} or _CompactBlockRelations
         self._block_relations = {}
 
+        # Set of usage keys whose block relations are owned by this
+        # structure, when it is a copy-on-write view of another one; the
+        # relations of all other blocks are shared and are copied before
+        # they are mutated. None if all block relations are owned.
+        # set(UsageKey) or None
+        self._owned_block_relations = None
+
         # Add the root block.
         self._add_block(self._block_relations, root_block_usage_key)
 
@@ -94,7 +413,11 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's parents.
         """
-        return self._block_relations[usage_key].parents if usage_key in self else []
+        if usage_key not in self:
+            return []
+        if isinstance(self._block_relations, _CompactBlockRelations):
+            return self._block_relations.get_parents(usage_key)
+        return self._block_relations[usage_key].parents
 
     def get_children(self, usage_key):
         """
@@ -108,7 +431,11 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's children.
         """
-        return self._block_relations[usage_key].children if usage_key in self else []
+        if usage_key not in self:
+            return []
+        if isinstance(self._block_relations, _CompactBlockRelations):
+            return self._block_relations.get_children(usage_key)
+        return self._block_relations[usage_key].children
 
     def set_root_block(self, usage_key):
         """
@@ -123,7 +450,7 @@ class BlockStructure(object):
                 new root of the block structure.
         """
         self.root_block_usage_key = usage_key
-        self._block_relations[usage_key].parents = []
+        self._get_relations_for_update(usage_key).parents = []
 
     def __contains__(self, usage_key):
         """
@@ -170,8 +497,15 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_topologically method.
         """
+        start_node = start_node or self.root_block_usage_key
+        if self._has_compact_relations_for(start_node):
+            return self._block_relations.topological_traversal(
+                start_node,
+                filter_func,
+                yield_descendants_of_unyielded,
+            )
         return traverse_topologically(
-            start_node=start_node or self.root_block_usage_key,
+            start_node=start_node,
             get_parents=self.get_parents,
             get_children=self.get_children,
             filter_func=filter_func,
@@ -195,8 +529,11 @@ class BlockStructure(object):
             generator - A generator object created from the
                 traverse_post_order method.
         """
+        start_node = start_node or self.root_block_usage_key
+        if self._has_compact_relations_for(start_node):
+            return self._block_relations.post_order_traversal(start_node, filter_func)
         return traverse_post_order(
-            start_node=start_node or self.root_block_usage_key,
+            start_node=start_node,
             get_children=self.get_children,
             filter_func=filter_func,
         )
@@ -208,6 +545,10 @@ class BlockStructure(object):
         """
         Mutates this block structure by removing any unreachable blocks.
         """
+        if self._has_compact_relations_for(self.root_block_usage_key):
+            self._block_relations = self._block_relations.pruned(self.root_block_usage_key)
+            self._owned_block_relations = None
+            return
 
         # Create a new block relations map to store only those blocks
         # that are still linked
@@ -231,6 +572,24 @@ class BlockStructure(object):
 
         # Replace this structure's relations with the newly pruned one.
         self._block_relations = pruned_block_relations
+        self._owned_block_relations = None
+
+    def _use_compact_relations(self):
+        """
+        Replaces this block structure's map of block relations with an
+        equivalent _CompactBlockRelations, which holds the relations of
+        all blocks in integer arrays.
+        """
+        if not isinstance(self._block_relations, _CompactBlockRelations):
+            self._block_relations = _CompactBlockRelations.from_dict(self._block_relations)
+            self._owned_block_relations = None
+
+    def _has_compact_relations_for(self, usage_key):
+        """
+        Returns whether this block structure's relations are held in a
+        _CompactBlockRelations that contains the given block.
+        """
+        return isinstance(self._block_relations, _CompactBlockRelations) and usage_key in self._block_relations
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -240,8 +599,24 @@ class BlockStructure(object):
             parent_key (UsageKey) - Usage key of the parent block.
             child_key (UsageKey) - Usage key of the child block.
         """
+        for usage_key in (parent_key, child_key):
+            if usage_key in self._block_relations:
+                self._get_relations_for_update(usage_key)
         self._add_to_relations(self._block_relations, parent_key, child_key)
 
+    def _get_relations_for_update(self, usage_key):
+        """
+        Returns the block relations of the given block, to be mutated.
+        If the relations are shared with another block structure, they
+        are first replaced with a copy owned by this structure.
+        """
+        block_relations = self._block_relations[usage_key]
+        if self._owned_block_relations is not None and usage_key not in self._owned_block_relations:
+            block_relations = block_relations.copy()
+            self._block_relations[usage_key] = block_relations
+            self._owned_block_relations.add(usage_key)
+        return block_relations
+
     @staticmethod
     def _add_to_relations(block_relations, parent_key, child_key):
         """
@@ -350,6 +725,18 @@ class TransformerDataMap(dict):
         key = self._translate_key(key)
         dict.__delitem__(self, key)
 
+    def copy(self):
+        """
+        Returns a copy of this map, with copies of its TransformerData
+        objects, but not of their field values.
+        """
+        transformer_data_map = TransformerDataMap()
+        for key, transformer_data in six.iteritems(self):
+            transformer_data_copy = TransformerData()
+            transformer_data_copy.fields = transformer_data.fields.copy()
+            dict.__setitem__(transformer_data_map, key, transformer_data_copy)
+        return transformer_data_map
+
     def get_or_create(self, key):
         """
         Returns the TransformerData associated with the given
@@ -417,6 +804,17 @@ class BlockStructureBlockData(BlockStructure):
         # Map of a transformer's name to its non-block-specific data.
         self.transformer_data = TransformerDataMap()
 
+        # Set of usage keys whose block data is owned by this structure,
+        # when it is a copy-on-write view of another one; the block data
+        # of all other blocks is shared and is copied before it is
+        # mutated. None if all block data is owned.
+        # set(UsageKey) or None
+        self._owned_block_data = None
+
+        # Whether the non-block-specific transformer data is owned by
+        # this structure, rather than shared with another one.
+        self._owns_transformer_data = True
+
     def copy(self):
         """
         Returns a new instance of BlockStructureBlockData with a
@@ -430,6 +828,36 @@ class BlockStructureBlockData(BlockStructure):
             deepcopy(self._block_data_map),
         )
 
+    def copy_on_write(self):
+        """
+        Returns a new instance of BlockStructureBlockData that is a
+        copy-on-write view of this instance.
+
+        The view initially shares the relations and data of all blocks
+        with this instance, and copies those of a block only when they
+        are first mutated through the view. This makes it cheap to
+        create a view of a large structure that is then transformed.
+
+        Note: Field values are not copied, so they are never to be
+        mutated in place. This instance is not to be mutated while
+        views of it are in use.
+        """
+        from .factory import BlockStructureFactory
+        if isinstance(self._block_relations, _CompactBlockRelations):
+            block_relations = self._block_relations.copy_on_write()
+        else:
+            block_relations = dict(self._block_relations)
+        block_structure = BlockStructureFactory.create_new(
+            self.root_block_usage_key,
+            block_relations,
+            self.transformer_data,
+            dict(self._block_data_map),
+        )
+        block_structure._owned_block_relations = set()
+        block_structure._owned_block_data = set()
+        block_structure._owns_transformer_data = False
+        return block_structure
+
     def iteritems(self):
         """
         Returns iterator of (UsageKey, BlockData) pairs for all
@@ -482,7 +910,7 @@ class BlockStructureBlockData(BlockStructure):
 
             override_data (object) - The data you want to set
         """
-        block_data = self._block_data_map.get(usage_key)
+        block_data = self._get_block_for_update(usage_key) if usage_key in self._block_data_map else None
         setattr(block_data, field_name, override_data)
 
     def get_transformer_data(self, transformer, key, default=None):
@@ -516,6 +944,9 @@ class BlockStructureBlockData(BlockStructure):
             value (any picklable type) - The value to associate with the
                 given key for the given transformer's data.
         """
+        if not self._owns_transformer_data:
+            self.transformer_data = self.transformer_data.copy()
+            self._owns_transformer_data = True
         setattr(self.transformer_data.get_or_create(transformer), key, value)
 
     def get_transformer_block_data(self, usage_key, transformer):
@@ -596,7 +1027,7 @@ class BlockStructureBlockData(BlockStructure):
                 whose data entry is to be deleted.
         """
         try:
-            transformer_block_data = self.get_transformer_block_data(usage_key, transformer)
+            transformer_block_data = self._get_block_for_update(usage_key).transformer_data[transformer]
             delattr(transformer_block_data, key)
         except (AttributeError, KeyError):
             pass
@@ -626,11 +1057,11 @@ class BlockStructureBlockData(BlockStructure):
 
         # Remove block from its children.
         for child in children:
-            self._block_relations[child].parents.remove(usage_key)
+            self._get_relations_for_update(child).parents.remove(usage_key)
 
         # Remove block from its parents.
         for parent in parents:
-            self._block_relations[parent].children.remove(usage_key)
+            self._get_relations_for_update(parent).children.remove(usage_key)
 
         # Remove block.
         self._block_relations.pop(usage_key, None)
@@ -755,17 +1186,37 @@ class BlockStructureBlockData(BlockStructure):
 
     def _get_or_create_block(self, usage_key):
         """
-        Returns the BlockData associated with the given usage_key.
-        If not found, creates and returns a new BlockData and
+        Returns the BlockData associated with the given usage_key, to be
+        mutated. If not found, creates and returns a new BlockData and
         maps it to the given key.
         """
         try:
-            return self._block_data_map[usage_key]
+            return self._get_block_for_update(usage_key)
         except KeyError:
             block_data = BlockData(usage_key)
             self._block_data_map[usage_key] = block_data
+            if self._owned_block_data is not None:
+                self._owned_block_data.add(usage_key)
             return block_data
 
+    def _get_block_for_update(self, usage_key):
+        """
+        Returns the BlockData associated with the given usage_key, to be
+        mutated. If the BlockData is shared with another block structure,
+        it is first replaced with a copy owned by this structure.
+
+        Raises KeyError if not found.
+        """
+        block_data = self._block_data_map[usage_key]
+        if self._owned_block_data is not None and usage_key not in self._owned_block_data:
+            block_data_copy = BlockData(usage_key)
+            block_data_copy.fields = block_data.fields.copy()
+            block_data_copy.transformer_data = block_data.transformer_data.copy()
+            block_data = block_data_copy
+            self._block_data_map[usage_key] = block_data
+            self._owned_block_data.add(usage_key)
+        return block_data
+
 
 class BlockStructureModulestoreData(BlockStructureBlockData):
     """
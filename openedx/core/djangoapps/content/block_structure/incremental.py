@@ -0,0 +1,231 @@
+"""
+Module for incrementally recollecting a block structure from the
+modulestore, reusing the collected data of the blocks that are unchanged
+since the previously stored structure.
+
+Collected data only ever percolates down a block structure: the data
+that a transformer collects for a block depends on the block itself, its
+ancestors and the course-wide settings of the root block (see
+BlockStructureTransformer.collect). So when a block's own edit info is
+unchanged, and so is that of its ancestors, its previously collected
+data is still valid. And when a block's subtree edit info is unchanged,
+so is the data of the whole subtree.
+
+The recollection thus instantiates and collects:
+    * every block whose edited_on changed, together with all of its
+      descendants,
+    * the ancestors of those blocks, up to the root, and
+    * the children of those ancestors,
+and splices in the previously collected data of all other blocks.
+"""
+from __future__ import absolute_import
+
+from logging import getLogger
+
+from edx_django_utils.monitoring import set_custom_metric
+
+from .block_structure import BlockStructureModulestoreData
+from .transformer_registry import TransformerRegistry
+from .transformers import BlockStructureTransformers
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+# The xBlock edit info fields that are collected for each block in order
+# to detect the blocks that changed since the structure was collected.
+EDITED_ON = 'edited_on'
+SUBTREE_EDITED_ON = 'subtree_edited_on'
+EDIT_INFO_FIELDS = (EDITED_ON, SUBTREE_EDITED_ON)
+
+
+def collect_incrementally(root_block_usage_key, modulestore, previous_block_structure):
+    """
+    Returns a newly collected block structure starting at the given
+    root_block_usage_key, reusing the collected data of the blocks of the
+    given previously collected structure that are unchanged in the
+    modulestore.
+
+    Returns None if the previous structure cannot be reused, in which
+    case the block structure is to be fully recollected.
+
+    Arguments:
+        root_block_usage_key (UsageKey) - The usage_key for the root
+            of the block structure that is to be collected.
+
+        modulestore (ModuleStoreRead) - The modulestore that contains
+            the current data for the xBlocks within the block structure.
+
+        previous_block_structure (BlockStructureBlockData) - The
+            previously collected block structure. It is not mutated.
+    """
+    if not _has_current_transformer_data(previous_block_structure):
+        return None
+
+    collector = _IncrementalCollector(root_block_usage_key, previous_block_structure)
+    root_xblock = modulestore.get_item(root_block_usage_key, depth=0)
+    collector.build(root_xblock)
+
+    block_structure = collector.block_structure
+    block_structure.request_xblock_fields(*EDIT_INFO_FIELDS)
+    BlockStructureTransformers.collect(block_structure)
+
+    if not collector.splice():
+        logger.info(u"BlockStructure: Incremental collection not possible; %s.", root_block_usage_key)
+        return None
+
+    set_custom_metric('block_structure_incremental_recollected', len(collector.recollected_keys))
+    set_custom_metric('block_structure_incremental_reused', len(collector.reused_keys))
+    logger.info(
+        u"BlockStructure: Incrementally collected; %s, recollected: %d, reused: %d",
+        root_block_usage_key,
+        len(collector.recollected_keys),
+        len(collector.reused_keys),
+    )
+    return block_structure
+
+
+def _has_current_transformer_data(block_structure):
+    """
+    Returns whether the given block structure contains data that was
+    collected by the current version of each registered transformer.
+    """
+    return all(
+        block_structure._get_transformer_data_version(transformer) == transformer.WRITE_VERSION  # pylint: disable=protected-access
+        for transformer in TransformerRegistry.get_registered_transformers()
+    )
+
+
+class _IncrementalCollector(object):
+    """
+    Builds a partial block structure of the blocks that need to be
+    recollected and, once they are collected, completes it with the
+    data of the reusable blocks of the previous structure.
+    """
+    def __init__(self, root_block_usage_key, previous_block_structure):
+        self.previous_block_structure = previous_block_structure
+
+        # The partial, and eventually complete, block structure.
+        # BlockStructureModulestoreData
+        self.block_structure = BlockStructureModulestoreData(root_block_usage_key)
+
+        # Map of each expanded block's usage key to the usage keys of its
+        # children, in order.
+        # dict {UsageKey: [UsageKey]}
+        self.children_map = {}
+
+        # Usage keys of the recollected blocks, and of the blocks whose
+        # previously collected data is reused.
+        # set(UsageKey)
+        self.recollected_keys = set()
+        self.reused_keys = set()
+
+    def build(self, root_xblock):
+        """
+        Adds the given root xBlock and those of its descendants that need
+        to be recollected to the partial block structure.
+
+        The children of every expanded block are recollected, since
+        transformers may collect data for a block's children from the
+        block itself. Those children are only expanded in turn if they
+        or their subtrees changed; otherwise their descendants are
+        reused.
+        """
+        self._add_xblock(root_xblock)
+
+        # The stack holds (xblock, whether an ancestor was edited) pairs.
+        stack = [(root_xblock, False)]
+        while stack:
+            xblock, is_ancestor_edited = stack.pop()
+            usage_key = xblock.location
+            if usage_key in self.children_map:
+                continue
+
+            is_edited = is_ancestor_edited or self._is_changed(xblock, EDITED_ON)
+            children = xblock.get_children()
+            self.children_map[usage_key] = [child.location for child in children]
+            for child in children:
+                self._add_xblock(child)
+                self.block_structure._add_relation(usage_key, child.location)  # pylint: disable=protected-access
+                if is_edited or self._is_changed(child, SUBTREE_EDITED_ON) or self._is_changed(child, EDITED_ON):
+                    stack.append((child, is_edited))
+
+    def splice(self):
+        """
+        Completes the collected partial block structure with the
+        relations and collected data of the reused blocks of the
+        previous structure.
+
+        Returns False if the result would be inconsistent, which is the
+        case when a block is both recollected and reused, or when the
+        parents of a recollected block were not all recollected.
+        """
+        # pylint: disable=protected-access
+        previous = self.previous_block_structure
+        partial_parents = {
+            usage_key: set(self.block_structure.get_parents(usage_key)) for usage_key in self.recollected_keys
+        }
+
+        # Add the descendants of the recollected blocks that were not
+        # expanded from the previous structure.
+        stack = []
+        for usage_key in self.recollected_keys:
+            if usage_key not in self.children_map:
+                self.children_map[usage_key] = previous.get_children(usage_key)
+                stack.extend(self.children_map[usage_key])
+        while stack:
+            usage_key = stack.pop()
+            if usage_key in self.recollected_keys:
+                return False
+            if usage_key in self.reused_keys:
+                continue
+            self.reused_keys.add(usage_key)
+            self.children_map[usage_key] = previous.get_children(usage_key)
+            stack.extend(self.children_map[usage_key])
+            if usage_key in previous._block_data_map:
+                self.block_structure._block_data_map[usage_key] = previous._block_data_map[usage_key]
+
+        # Rebuild the relations of the complete structure in the same
+        # depth-first order as BlockStructureFactory.create_from_modulestore.
+        root_block_usage_key = self.block_structure.root_block_usage_key
+        self.block_structure._block_relations = {}
+        self.block_structure._add_block(self.block_structure._block_relations, root_block_usage_key)
+        visited = {root_block_usage_key}
+        stack = [(root_block_usage_key, iter(self.children_map[root_block_usage_key]))]
+        while stack:
+            parent_key, child_keys = stack[-1]
+            child_key = next(child_keys, None)
+            if child_key is None:
+                stack.pop()
+                continue
+            self.block_structure._add_relation(parent_key, child_key)
+            if child_key not in visited:
+                visited.add(child_key)
+                stack.append((child_key, iter(self.children_map[child_key])))
+
+        if any(
+                set(self.block_structure.get_parents(usage_key)) != parents
+                for usage_key, parents in partial_parents.items()
+        ):
+            return False
+
+        # The data of the reused blocks is shared with the previous
+        # structure, so it is to be copied before it is mutated.
+        self.block_structure._owned_block_data = set(self.recollected_keys)
+        return True
+
+    def _add_xblock(self, xblock):
+        """
+        Adds the given xBlock to the partial block structure, to be
+        recollected.
+        """
+        self.recollected_keys.add(xblock.location)
+        self.block_structure._add_xblock(xblock.location, xblock)  # pylint: disable=protected-access
+
+    def _is_changed(self, xblock, edit_info_field):
+        """
+        Returns whether the given edit info field of the given xBlock
+        differs from the one collected in the previous structure, or is
+        unknown.
+        """
+        current_value = getattr(xblock, edit_info_field, None)
+        previous_value = self.previous_block_structure.get_xblock_field(xblock.location, edit_info_field)
+        return current_value is None or current_value != previous_value
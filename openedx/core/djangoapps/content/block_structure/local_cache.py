@@ -0,0 +1,158 @@
+"""
+Module for the process-local tier of the Block Structure cache.
+"""
+from __future__ import absolute_import
+
+from collections import OrderedDict
+from logging import getLogger
+from threading import Lock
+from time import time
+
+from django.conf import settings
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+# Default maximum aggregate size, in bytes of serialized data, of the
+# block structures held in the process-local cache.
+DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+
+# Default number of seconds for which block structures whose version
+# is unknown are held in the process-local cache.
+DEFAULT_TIMEOUT = 60
+
+
+class BlockStructureLocalCache(object):
+    """
+    A size-bounded, least-recently-used cache of deserialized block
+    structures, held in the memory of the current process.
+
+    The cached block structures are shared by all readers of the cache,
+    and so are never to be mutated. Use the copy_on_write method of a
+    cached block structure to get a mutable view of it.
+    """
+    def __init__(self, max_size):
+        """
+        Arguments:
+            max_size (int) - The maximum aggregate size of the cached
+                block structures, as measured by their serialized size.
+        """
+        self.max_size = max_size
+
+        # Number of lookups that were, and were not, found in the cache.
+        self.hits = 0
+        self.misses = 0
+
+        # Map of cache key to a (block structure, size, expiration) tuple,
+        # ordered from least to most recently used.
+        # OrderedDict {(UsageKey, tuple): (BlockStructureBlockData, int, float or None)}
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Returns the block structure cached for the given key, or None if
+        not found or expired.
+
+        Arguments:
+            key ((UsageKey, tuple)) - The usage key of the root of the
+                block structure and the version data of the block
+                structure.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                block_structure, _, expiration = entry
+                if expiration is None or expiration > time():
+                    self._entries[key] = entry
+                    self.hits += 1
+                    return block_structure
+                self._size -= entry[1]
+
+            self.misses += 1
+            return None
+
+    def set(self, key, block_structure, size, timeout=None):
+        """
+        Caches the given block structure for the given key, evicting the
+        least recently used block structures as needed to stay within
+        the maximum size.
+
+        Arguments:
+            key ((UsageKey, tuple)) - See the description in get.
+
+            block_structure (BlockStructureBlockData) - The read-only
+                block structure to cache.
+
+            size (int) - The serialized size of the block structure.
+
+            timeout (int) - Number of seconds after which the block
+                structure expires; None if it does not expire.
+        """
+        if size > self.max_size:
+            logger.info(u"BlockStructure: Too large for local cache; %s, size: %d", key[0], size)
+            return
+
+        with self._lock:
+            self._remove(key)
+            while self._size + size > self.max_size:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+            self._entries[key] = (block_structure, size, time() + timeout if timeout is not None else None)
+            self._size += size
+
+    def delete(self, root_block_usage_key):
+        """
+        Removes all versions of the block structure starting at the
+        given root_block_usage_key from the cache.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == root_block_usage_key]:
+                self._remove(key)
+
+    def clear(self):
+        """
+        Removes all block structures from the cache and resets its
+        counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _remove(self, key):
+        """
+        Removes the given key from the cache, if present. Must be called
+        with the lock held.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+
+_local_cache = None  # pylint: disable=invalid-name
+
+
+def get_local_cache():
+    """
+    Returns the process-wide BlockStructureLocalCache, creating it on first
+    access with the configured maximum size.
+    """
+    global _local_cache  # pylint: disable=global-statement, invalid-name
+    if _local_cache is None:
+        _local_cache = BlockStructureLocalCache(
+            settings.BLOCK_STRUCTURES_SETTINGS.get('LOCAL_CACHE_MAX_SIZE', DEFAULT_MAX_SIZE),
+        )
+    return _local_cache
+
+
+def local_cache_timeout():
+    """
+    Returns the number of seconds for which block structures whose version
+    is unknown are held in the process-local cache.
+    """
+    return settings.BLOCK_STRUCTURES_SETTINGS.get('LOCAL_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
@@ -0,0 +1,179 @@
+"""
+Command to compare the performance of the block structure serialization formats.
+"""
+from __future__ import absolute_import
+
+import logging
+import timeit
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.locator import CourseLocator
+from pytz import utc
+from six.moves import range
+
+from openedx.core.djangoapps.content.block_structure import serialization
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+
+log = logging.getLogger(__name__)
+
+# The block types of each level of the synthetic course hierarchy, and
+# the number of children of each block at that level.
+COURSE_HIERARCHY = [
+    ('course', 20),
+    ('chapter', 10),
+    ('sequential', 5),
+    ('vertical', 5),
+    ('problem', 0),
+]
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_serialization --settings=devstack
+        $ ./manage.py lms benchmark_block_structure_serialization --num_blocks 1000 --repeat 5 --settings=devstack
+    """
+    help = u'Compares the zpickle and compact block structure serialization formats on synthetic courses.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--num_blocks',
+            dest='num_blocks',
+            nargs='+',
+            type=int,
+            default=[1000, 10000, 50000],
+            help=u'Number of blocks in each of the synthetic courses to benchmark.',
+        )
+        parser.add_argument(
+            '--repeat',
+            dest='repeat',
+            type=int,
+            default=3,
+            help=u'Number of times to repeat each measurement; the best time is reported.',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(u'{:>8} {:>8} {:>10} {:>10} {:>12} {:>10}'.format(
+            u'blocks', u'format', u'size', u'serialize', u'deserialize', u'read one',
+        ))
+        for num_blocks in options['num_blocks']:
+            block_structure = create_synthetic_block_structure(num_blocks)
+            for format_name, serialize, deserialize in (
+                    (u'zpickle', _zpickle, _zunpickle),
+                    (u'compact', serialization.serialize, serialization.deserialize),
+            ):
+                result = benchmark(block_structure, serialize, deserialize, options['repeat'])
+                self.stdout.write(
+                    u'{:>8} {:>8} {:>10} {:>9.1f}ms {:>10.1f}ms {:>8.1f}ms'.format(
+                        num_blocks, format_name, result['size'],
+                        result['serialize'] * 1000, result['deserialize'] * 1000, result['read_one_field'] * 1000,
+                    )
+                )
+
+
+def benchmark(block_structure, serialize, deserialize, repeat):
+    """
+    Returns the serialized size and the best times, over the given number
+    of repetitions, of serializing and deserializing the given block
+    structure and of deserializing it and then reading one field of every
+    block.
+    """
+    root_block_usage_key = block_structure.root_block_usage_key
+    serialized_data = serialize(block_structure)
+
+    def read_one_field():
+        """
+        Deserializes the structure and reads a single field of each block,
+        as a typical transformer would.
+        """
+        deserialized = deserialize(serialized_data, root_block_usage_key)
+        for block_key in deserialized:
+            deserialized.get_xblock_field(block_key, 'start')
+
+    return {
+        'size': len(serialized_data),
+        'serialize': min(timeit.repeat(lambda: serialize(block_structure), number=1, repeat=repeat)),
+        'deserialize': min(timeit.repeat(
+            lambda: deserialize(serialized_data, root_block_usage_key), number=1, repeat=repeat,
+        )),
+        'read_one_field': min(timeit.repeat(read_one_field, number=1, repeat=repeat)),
+    }
+
+
+def create_synthetic_block_structure(num_blocks):
+    """
+    Returns a collected block structure of a synthetic course with the given
+    number of blocks, with xBlock fields and transformer data resembling
+    those collected by the registered transformers.
+    """
+    course_key = CourseLocator(u'BenchmarkX', u'Blocks{}'.format(num_blocks), u'run')
+    root_key = course_key.make_usage_key(u'course', u'course')
+    block_structure = BlockStructureBlockData(root_key)
+
+    level_keys = [root_key]
+    num_created = 1
+    for (_, num_children), (child_type, _) in zip(COURSE_HIERARCHY, COURSE_HIERARCHY[1:]):
+        child_keys = []
+        for parent_key in level_keys:
+            for _ in range(num_children):
+                if num_created >= num_blocks:
+                    break
+                child_key = course_key.make_usage_key(child_type, u'{}_{}'.format(child_type, num_created))
+                block_structure._add_relation(parent_key, child_key)  # pylint: disable=protected-access
+                child_keys.append(child_key)
+                num_created += 1
+        level_keys = child_keys
+
+    # Attach any remaining blocks as problems beneath the last level.
+    parent_keys = level_keys or [root_key]
+    while num_created < num_blocks:
+        child_key = course_key.make_usage_key(u'problem', u'problem_{}'.format(num_created))
+        block_structure._add_relation(parent_keys[num_created % len(parent_keys)], child_key)  # pylint: disable=protected-access
+        num_created += 1
+
+    start = datetime(2019, 1, 1, tzinfo=utc)
+    for block_key in list(block_structure):
+        block_data = block_structure._get_or_create_block(block_key)  # pylint: disable=protected-access
+        block_data.display_name = u'Block {}'.format(block_key.block_id)
+        block_data.start = start
+        block_data.due = None
+        block_data.graded = block_key.block_type == u'problem'
+        block_data.format = u'Homework'
+        block_data.weight = 1.0
+        block_data.has_score = block_key.block_type == u'problem'
+        block_data.group_access = {}
+        block_data.visible_to_staff_only = False
+        block_structure.set_transformer_block_field(block_key, u'grades', u'max_score', 1)
+        block_structure.set_transformer_block_field(block_key, u'grades', u'explicit_graded', None)
+        block_structure.set_transformer_block_field(block_key, u'blocks_api:student_view_data', u'student_view_url', (
+            u'/xblock/{}'.format(block_key)
+        ))
+        block_structure.set_transformer_block_field(block_key, u'user_partitions', u'merged_group_access', {
+            50: [1, 2],
+        })
+    block_structure.set_transformer_data(u'grades', u'_version', 1)
+    return block_structure
+
+
+def _zpickle(block_structure):
+    """
+    Returns the zpickle serialization of the given block structure, as
+    written by BlockStructureStore.
+    """
+    # pylint: disable=protected-access
+    return zpickle((block_structure._block_relations, block_structure.transformer_data, block_structure._block_data_map))
+
+
+def _zunpickle(serialized_data, root_block_usage_key):
+    """
+    Returns the block structure deserialized from the given zpickle
+    serialization, as read by BlockStructureStore.
+    """
+    block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+    return BlockStructureFactory.create_new(root_block_usage_key, block_relations, transformer_data, block_data_map)
@@ -0,0 +1,28 @@
+"""
+Tests for benchmark_block_structure_serialization management command.
+"""
+from __future__ import absolute_import
+
+from unittest import TestCase
+
+from django.core.management import call_command
+from six import StringIO
+
+from .. import benchmark_block_structure_serialization
+
+
+class TestBenchmarkBlockStructureSerialization(TestCase):
+    """
+    Tests benchmark_block_structure_serialization management command.
+    """
+    def test_command(self):
+        out = StringIO()
+        call_command('benchmark_block_structure_serialization', '--num_blocks', '10', '50', '--repeat', '1', stdout=out)
+        output = out.getvalue()
+        for format_name in ('zpickle', 'compact'):
+            self.assertEqual(output.count(format_name), 2)
+
+    def test_synthetic_block_structure(self):
+        block_structure = benchmark_block_structure_serialization.create_synthetic_block_structure(100)
+        self.assertEqual(len(block_structure), 100)
+        self.assertEqual(len(list(block_structure.topological_traversal())), 100)
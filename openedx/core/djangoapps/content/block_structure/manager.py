@@ -11,6 +11,7 @@ import six
 from . import config
 from .exceptions import BlockStructureNotFound, TransformerDataIncompatible, UsageKeyNotInBlockStructure
 from .factory import BlockStructureFactory
+from .incremental import EDIT_INFO_FIELDS, collect_incrementally
 from .store import BlockStructureStore
 from .transformers import BlockStructureTransformers
 
@@ -64,7 +65,10 @@ class BlockStructureManager(object):
             BlockStructureBlockData - A transformed block structure,
                 starting at starting_block_usage_key.
         """
-        block_structure = collected_block_structure.copy() if collected_block_structure else self.get_collected()
+        # Transformers mutate the block structure, so they are given a
+        # copy-on-write view of the collected structure, which may be
+        # shared through the process-local cache.
+        block_structure = (collected_block_structure or self.get_collected()).copy_on_write()
 
         if starting_block_usage_key:
             # Override the root_block_usage_key so traversals start at the
@@ -122,16 +126,40 @@ class BlockStructureManager(object):
         """
         The store is updated with newly collected transformers data from
         the modulestore.
+
+        If incremental collection is enabled, only the blocks that changed
+        since the block structure was previously stored are recollected.
         """
         with self._bulk_operations():
-            block_structure = BlockStructureFactory.create_from_modulestore(
-                self.root_block_usage_key,
-                self.modulestore,
-            )
-            BlockStructureTransformers.collect(block_structure)
+            block_structure = None
+            is_incremental = config.waffle().is_enabled(config.INCREMENTAL_COLLECTION)
+            if is_incremental:
+                block_structure = self._collect_incrementally()
+
+            if block_structure is None:
+                block_structure = BlockStructureFactory.create_from_modulestore(
+                    self.root_block_usage_key,
+                    self.modulestore,
+                )
+                if is_incremental:
+                    block_structure.request_xblock_fields(*EDIT_INFO_FIELDS)
+                BlockStructureTransformers.collect(block_structure)
+
             self.store.add(block_structure)
             return block_structure
 
+    def _collect_incrementally(self):
+        """
+        Returns a block structure that is collected incrementally from the
+        block structure in the store, or None if there is no usable block
+        structure in the store.
+        """
+        try:
+            previous_block_structure = self.store.get(self.root_block_usage_key)
+        except BlockStructureNotFound:
+            return None
+        return collect_incrementally(self.root_block_usage_key, self.modulestore, previous_block_structure)
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
@@ -0,0 +1,918 @@
+"""
+Compact, versioned binary serialization of BlockStructureBlockData.
+
+This is an alternative to zpickling the block structure's internal
+data structures in their entirety. The format is designed so that
+deserialization only pays for what a request actually reads:
+
+    * Usage keys are interned: each distinct key is decoded exactly once
+      and shared by the block relations and block data of the structure.
+
+    * Parent and child relations are stored as array-backed adjacency
+      lists (CSR-style offsets and targets over integer block indices).
+
+    * Collected xBlock fields and per-block transformer data are stored
+      in columnar per-field tables. A column is decoded on first access
+      of any of its values, so fields that are never read are never
+      decoded. Decoding is guarded by a lock per structure, since the
+      structure may be shared by threads.
+
+The layout of a serialized structure is:
+
+    MAGIC | FORMAT_VERSION | zlib(payload)
+
+Values of types that the format does not natively support (for example,
+UserPartition objects) are individually pickled within their column.
+"""
+from __future__ import absolute_import
+
+import struct
+import threading
+import zlib
+from array import array
+from datetime import datetime
+
+import six
+from opaque_keys.edx.keys import CourseKey
+from pytz import utc
+from six.moves import cPickle as pickle
+from six.moves import range
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap, _BlockRelations, _CompactBlockRelations
+from .exceptions import BlockStructureSerializationError
+
+# Prefix identifying data serialized in this format. The leading null
+# byte can never start a zlib stream, so compact data is always
+# distinguishable from zpickled data.
+MAGIC = b'\x00BSC'
+
+# The version of the layout written by serialize. Increment whenever
+# the layout changes so that previously stored data is rejected rather
+# than misread.
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sB')
+_UINT = struct.Struct('<I')
+_INT64 = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+_DATETIME = struct.Struct('<HBBBBBIB')
+
+# Time zone flags of packed datetimes.
+_NAIVE_DATETIME = 0
+_UTC_DATETIME = 1
+_NO_DATETIME = 2
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+# Value tags used by the generic value encoding.
+_NONE = b'N'
+_TRUE = b'T'
+_FALSE = b'F'
+_INT = b'i'
+_BIG_INT = b'I'
+_FLOAT_TAG = b'f'
+_TEXT = b's'
+_BYTES = b'y'
+_LIST = b'l'
+_TUPLE = b't'
+_DICT = b'd'
+_SET = b'S'
+_FROZENSET = b'Z'
+_DATETIME_TAG = b'D'
+_USAGE_KEY = b'K'
+_COURSE_KEY = b'C'
+_PICKLE = b'P'
+
+# Column kinds; homogeneous columns are packed without per-value tags.
+_BOOL_COLUMN = b'B'
+_INT_COLUMN = b'q'
+_FLOAT_COLUMN = b'd'
+_TEXT_COLUMN = b's'
+_DATETIME_COLUMN = b'D'
+_GENERIC_COLUMN = b'g'
+
+# Whether a column has a value for all blocks of its table.
+_ALL_BLOCKS = b'A'
+_SOME_BLOCKS = b'S'
+
+# Sentinel for a value that is not present in a column.
+_MISSING = object()
+
+
+def is_compact(serialized_data):
+    """
+    Returns whether the given serialized data was written by serialize.
+    """
+    return serialized_data[:len(MAGIC)] == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Serializes the given BlockStructureBlockData into the compact format.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        bytes - The serialized data.
+    """
+    # pylint: disable=protected-access
+    key_table = _KeyTable()
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+
+    relation_indices = [key_table.add(usage_key) for usage_key in block_relations]
+    for usage_key in block_data_map:
+        key_table.add(usage_key)
+
+    body = _Writer()
+    body.uints(relation_indices)
+    _write_adjacency(body, key_table, relation_indices, block_structure.get_children)
+    _write_adjacency(body, key_table, relation_indices, block_structure.get_parents)
+
+    body.raw(_encode_value(
+        {name: data.fields for name, data in six.iteritems(block_structure.transformer_data)},
+        key_table,
+    ))
+
+    block_data_indices = []
+    xblock_fields = {}
+    transformer_tables = {}
+    for usage_key, block_data in six.iteritems(block_data_map):
+        block_index = key_table.index_of(usage_key)
+        block_data_indices.append(block_index)
+        _add_to_table(xblock_fields, block_index, block_data.fields)
+        for transformer_name, transformer_block_data in six.iteritems(block_data.transformer_data):
+            presence, table = transformer_tables.setdefault(transformer_name, ([], {}))
+            presence.append(block_index)
+            _add_to_table(table, block_index, transformer_block_data.fields)
+
+    body.uints(block_data_indices)
+    _write_table(body, key_table, xblock_fields, block_data_indices)
+    body.uint(len(transformer_tables))
+    for transformer_name, (presence, table) in six.iteritems(transformer_tables):
+        body.text(transformer_name)
+        body.uints(presence)
+        _write_table(body, key_table, table, presence)
+
+    # The key table is encoded only after the body, since encoding field
+    # values may intern additional keys, but it precedes the body.
+    payload = _Writer()
+    key_table.write(payload)
+    payload.raw(body.getvalue())
+    return _HEADER.pack(MAGIC, FORMAT_VERSION) + zlib.compress(payload.getvalue())
+
+
+def deserialize(serialized_data, root_block_usage_key, compact_relations=False):
+    """
+    Deserializes and returns the block structure from the given data,
+    which must have been written by serialize.
+
+    Arguments:
+        serialized_data (bytes) - The serialized data.
+
+        root_block_usage_key (UsageKey) - The usage key of the root
+            of the block structure.
+
+        compact_relations (bool) - Whether the block relations of the
+            returned structure are to be held in the array-backed
+            _CompactBlockRelations rather than in a dict.
+
+    Returns:
+        BlockStructureBlockData - The deserialized block structure,
+            whose block fields are decoded lazily on first access.
+
+    Raises:
+        BlockStructureSerializationError if the data is not in a
+        supported version of the format.
+    """
+    from .factory import BlockStructureFactory
+
+    magic, version = _HEADER.unpack_from(serialized_data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise BlockStructureSerializationError(
+            u'Unsupported block structure serialization format; version: {}'.format(version)
+        )
+
+    reader = _Reader(zlib.decompress(serialized_data[_HEADER.size:]))
+    keys = _KeyTable.read(reader)
+    body = _Reader(reader.raw())
+
+    relation_indices = body.uints()
+    if compact_relations:
+        block_relations = _read_compact_relations(body, keys, relation_indices)
+    else:
+        children = _read_adjacency(body, keys)
+        parents = _read_adjacency(body, keys)
+        block_relations = {}
+        for position, block_index in enumerate(relation_indices):
+            relations = _BlockRelations()
+            relations.children = children[position]
+            relations.parents = parents[position]
+            block_relations[keys[block_index]] = relations
+
+    transformer_data = TransformerDataMap()
+    for transformer_name, fields in six.iteritems(_decode_value(_Reader(body.raw()), keys)):
+        transformer_data[transformer_name] = _new_field_data(TransformerData.__new__(TransformerData), fields)
+
+    # Guards the decoding of the columns of the structure
+    decoding_lock = threading.Lock()
+    block_data_by_index = {}
+    block_data_indices = body.uints()
+    xblock_columns = _read_table(body, keys, block_data_indices)
+    for block_index in block_data_indices:
+        block_data_by_index[block_index] = _new_block_data(
+            keys[block_index],
+            _ColumnarFields(xblock_columns, block_index, decoding_lock),
+        )
+
+    for _ in range(body.uint()):
+        transformer_name = body.text()
+        presence = body.uints()
+        columns = _read_table(body, keys, presence)
+        for block_index in presence:
+            dict.__setitem__(
+                block_data_by_index[block_index].transformer_data,
+                transformer_name,
+                _new_field_data(
+                    TransformerData.__new__(TransformerData),
+                    _ColumnarFields(columns, block_index, decoding_lock),
+                ),
+            )
+
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        transformer_data,
+        {keys[block_index]: block_data for block_index, block_data in six.iteritems(block_data_by_index)},
+    )
+
+
+def _new_field_data(field_data, fields):
+    """
+    Sets the fields of the given, not yet initialized, FieldData object
+    and returns it.
+
+    The object's attributes are set directly, bypassing the overhead of
+    FieldData.__setattr__, since this is called for every block.
+    """
+    object.__setattr__(field_data, 'fields', fields)
+    return field_data
+
+
+def _new_block_data(usage_key, fields):
+    """
+    Returns a new BlockData object for the given key and fields.
+    """
+    block_data = _new_field_data(BlockData.__new__(BlockData), fields)
+    object.__setattr__(block_data, 'location', usage_key)
+    object.__setattr__(block_data, 'transformer_data', TransformerDataMap())
+    return block_data
+
+
+def _add_to_table(table, block_index, fields):
+    """
+    Adds the given block's fields to the given columnar table of
+    {field_name: ([block_index], [value])}.
+    """
+    for field_name, value in six.iteritems(fields):
+        block_indices, values = table.setdefault(field_name, ([], []))
+        block_indices.append(block_index)
+        values.append(value)
+
+
+def _write_adjacency(writer, key_table, relation_indices, get_related):
+    """
+    Writes the given relation (get_children or get_parents) of all
+    blocks as CSR-style offsets and targets.
+    """
+    offsets = [0]
+    targets = []
+    for block_index in relation_indices:
+        targets.extend(key_table.add(key) for key in get_related(key_table[block_index]))
+        offsets.append(len(targets))
+    writer.uints(offsets)
+    writer.uints(targets)
+
+
+def _read_adjacency(reader, keys):
+    """
+    Reads CSR-style offsets and targets and returns a list with the
+    list of related usage keys for each block.
+    """
+    offsets = reader.uints()
+    targets = [keys[index] for index in reader.uints()]
+    return [targets[offsets[position]:offsets[position + 1]] for position in range(len(offsets) - 1)]
+
+
+def _read_compact_relations(reader, keys, relation_indices):
+    """
+    Reads the CSR-style children and parents of all blocks directly into
+    a _CompactBlockRelations, without creating per-block relations.
+    """
+    arrays = []
+    if relation_indices == tuple(range(len(relation_indices))):
+        # The blocks with relations are the first ones in the key table,
+        # as written by serialize, so targets need no translation.
+        for _ in range(2):
+            arrays.append(array('i', reader.uints()))
+            arrays.append(array('i', reader.uints()))
+    else:
+        position_of = {block_index: position for position, block_index in enumerate(relation_indices)}
+        for _ in range(2):
+            arrays.append(array('i', reader.uints()))
+            arrays.append(array('i', [position_of[block_index] for block_index in reader.uints()]))
+    return _CompactBlockRelations([keys[block_index] for block_index in relation_indices], *arrays)
+
+
+def _write_table(writer, key_table, table, presence):
+    """
+    Writes the given table of {field_name: ([block_index], [value])}
+    as one column per field.
+
+    The block indices of a column are omitted when they equal the given
+    presence list of all blocks in the table, which is typically the
+    case since most fields are collected for every block.
+    """
+    writer.uint(len(table))
+    for field_name, (block_indices, values) in six.iteritems(table):
+        writer.text(field_name)
+        kind, payload = _encode_column(values, key_table)
+        writer.raw(kind)
+        if block_indices == presence:
+            writer.tag(_ALL_BLOCKS)
+        else:
+            writer.tag(_SOME_BLOCKS)
+            writer.uints(block_indices)
+        writer.raw(payload)
+
+
+def _read_table(reader, keys, presence):
+    """
+    Reads a table written by _write_table and returns a map of field
+    name to its not-yet-decoded _Column.
+    """
+    columns = {}
+    for _ in range(reader.uint()):
+        field_name = reader.text()
+        kind = reader.raw()
+        block_indices = presence if reader.tag() == _ALL_BLOCKS else reader.uints()
+        columns[field_name] = _Column(kind, block_indices, reader.raw(), keys)
+    return columns
+
+
+def _encode_column(values, key_table):
+    """
+    Returns the kind and the encoded payload for the given column values.
+    """
+    count = len(values)
+    if all(isinstance(value, bool) for value in values):
+        return _BOOL_COLUMN, struct.pack('<{}?'.format(count), *values)
+    if all(_is_int64(value) for value in values):
+        return _INT_COLUMN, struct.pack('<{}q'.format(count), *values)
+    if all(type(value) is float for value in values):  # pylint: disable=unidiomatic-typecheck
+        return _FLOAT_COLUMN, struct.pack('<{}d'.format(count), *values)
+    if all(isinstance(value, six.text_type) for value in values):
+        encoded = [value.encode('utf-8') for value in values]
+        return _TEXT_COLUMN, struct.pack('<{}I'.format(count), *[len(value) for value in encoded]) + b''.join(encoded)
+    if all(value is None or _is_encodable_datetime(value) for value in values):
+        return _DATETIME_COLUMN, b''.join(_encode_datetime(value) for value in values)
+    writer = _Writer()
+    for value in values:
+        writer.raw(_encode_value(value, key_table))
+    return _GENERIC_COLUMN, writer.getvalue()
+
+
+def _decode_column(kind, count, payload, keys):
+    """
+    Returns the list of values of a column encoded by _encode_column.
+    """
+    if kind == _BOOL_COLUMN:
+        return struct.unpack('<{}?'.format(count), payload)
+    if kind == _INT_COLUMN:
+        return struct.unpack('<{}q'.format(count), payload)
+    if kind == _FLOAT_COLUMN:
+        return struct.unpack('<{}d'.format(count), payload)
+    if kind == _TEXT_COLUMN:
+        lengths = struct.unpack_from('<{}I'.format(count), payload)
+        values = []
+        offset = count * _UINT.size
+        for length in lengths:
+            values.append(payload[offset:offset + length].decode('utf-8'))
+            offset += length
+        return values
+    if kind == _DATETIME_COLUMN:
+        return [
+            _decode_datetime(_DATETIME.unpack_from(payload, offset))
+            for offset in range(0, count * _DATETIME.size, _DATETIME.size)
+        ]
+    reader = _Reader(payload)
+    return [_decode_value(_Reader(reader.raw()), keys) for _ in range(count)]
+
+
+def _is_int64(value):
+    """
+    Returns whether the given value is a (non-bool) integer that fits in
+    64 bits.
+    """
+    return (
+        isinstance(value, six.integer_types) and
+        not isinstance(value, bool) and
+        _INT64_MIN <= value <= _INT64_MAX
+    )
+
+
+def _is_encodable_datetime(value):
+    """
+    Returns whether the given value is a naive or UTC datetime.
+    """
+    return type(value) is datetime and value.tzinfo in (None, utc)  # pylint: disable=unidiomatic-typecheck
+
+
+def _encode_datetime(value):
+    """
+    Returns the packed fields of the given naive or UTC datetime, or of
+    None.
+    """
+    if value is None:
+        return _DATETIME.pack(0, 0, 0, 0, 0, 0, 0, _NO_DATETIME)
+    return _DATETIME.pack(
+        value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond,
+        _UTC_DATETIME if value.tzinfo is utc else _NAIVE_DATETIME,
+    )
+
+
+def _decode_datetime(fields):
+    """
+    Returns the datetime, or None, for the given unpacked fields.
+    """
+    tz_flag = fields[7]
+    if tz_flag == _NO_DATETIME:
+        return None
+    return datetime(*fields[:7], tzinfo=utc if tz_flag == _UTC_DATETIME else None)
+
+
+def _encode_value(value, key_table):
+    """
+    Returns the tagged encoding of the given value.
+    """
+    writer = _Writer()
+    _write_value(writer, value, key_table)
+    return writer.getvalue()
+
+
+def _write_value(writer, value, key_table):
+    """
+    Writes the tagged encoding of the given value.
+    """
+    # pylint: disable=too-many-branches
+    if value is None:
+        writer.tag(_NONE)
+    elif value is True:
+        writer.tag(_TRUE)
+    elif value is False:
+        writer.tag(_FALSE)
+    elif _is_int64(value):
+        writer.tag(_INT)
+        writer.pack(_INT64, value)
+    elif isinstance(value, six.integer_types):
+        writer.tag(_BIG_INT)
+        writer.text(six.text_type(value))
+    elif type(value) is float:  # pylint: disable=unidiomatic-typecheck
+        writer.tag(_FLOAT_TAG)
+        writer.pack(_FLOAT, value)
+    elif type(value) is six.text_type:  # pylint: disable=unidiomatic-typecheck
+        writer.tag(_TEXT)
+        writer.text(value)
+    elif type(value) is bytes:  # pylint: disable=unidiomatic-typecheck
+        writer.tag(_BYTES)
+        writer.raw(value)
+    elif type(value) in (list, tuple, set, frozenset):
+        writer.tag({list: _LIST, tuple: _TUPLE, set: _SET, frozenset: _FROZENSET}[type(value)])
+        writer.uint(len(value))
+        for item in value:
+            _write_value(writer, item, key_table)
+    elif type(value) is dict:  # pylint: disable=unidiomatic-typecheck
+        writer.tag(_DICT)
+        writer.uint(len(value))
+        for item_key, item_value in six.iteritems(value):
+            _write_value(writer, item_key, key_table)
+            _write_value(writer, item_value, key_table)
+    elif _is_encodable_datetime(value):
+        writer.tag(_DATETIME_TAG)
+        writer.raw(_encode_datetime(value))
+    elif key_table.is_internable(value):
+        writer.tag(_USAGE_KEY)
+        writer.uint(key_table.add(value))
+    elif isinstance(value, CourseKey):
+        writer.tag(_COURSE_KEY)
+        writer.text(six.text_type(value))
+    else:
+        writer.tag(_PICKLE)
+        writer.raw(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+
+
+def _decode_value(reader, keys):
+    """
+    Reads and returns a value written by _write_value.
+    """
+    # pylint: disable=too-many-return-statements
+    tag = reader.tag()
+    if tag == _NONE:
+        return None
+    if tag == _TRUE:
+        return True
+    if tag == _FALSE:
+        return False
+    if tag == _INT:
+        return reader.unpack(_INT64)[0]
+    if tag == _BIG_INT:
+        return int(reader.text())
+    if tag == _FLOAT_TAG:
+        return reader.unpack(_FLOAT)[0]
+    if tag == _TEXT:
+        return reader.text()
+    if tag == _BYTES:
+        return reader.raw()
+    if tag in (_LIST, _TUPLE, _SET, _FROZENSET):
+        items = [_decode_value(reader, keys) for _ in range(reader.uint())]
+        return {_LIST: list, _TUPLE: tuple, _SET: set, _FROZENSET: frozenset}[tag](items)
+    if tag == _DICT:
+        value = {}
+        for _ in range(reader.uint()):
+            item_key = _decode_value(reader, keys)
+            value[item_key] = _decode_value(reader, keys)
+        return value
+    if tag == _DATETIME_TAG:
+        return _decode_datetime(_DATETIME.unpack(reader.raw()))
+    if tag == _USAGE_KEY:
+        return keys[reader.uint()]
+    if tag == _COURSE_KEY:
+        return CourseKey.from_string(reader.text())
+    if tag == _PICKLE:
+        return pickle.loads(reader.raw())
+    raise BlockStructureSerializationError(u'Unknown value tag in serialized block structure: {!r}'.format(tag))
+
+
+class _KeyTable(object):
+    """
+    Table of the distinct usage keys within a serialized block structure.
+
+    Keys are written as indices into an interned table of course keys
+    plus interned block types and block ids, so each usage key is
+    reconstructed only once when deserializing. Keys that cannot be
+    reconstructed from their course key are pickled.
+    """
+    def __init__(self):
+        self._keys = []
+        self._index_by_key = {}
+        self._internable_by_key = {}
+
+    def __getitem__(self, index):
+        return self._keys[index]
+
+    def add(self, usage_key):
+        """
+        Adds the given key to the table, if not already present, and
+        returns its index.
+        """
+        index = self._index_by_key.get(usage_key)
+        if index is None:
+            index = len(self._keys)
+            self._keys.append(usage_key)
+            self._index_by_key[usage_key] = index
+        return index
+
+    def index_of(self, usage_key):
+        """
+        Returns the index of the given key, which must have been added.
+        """
+        return self._index_by_key[usage_key]
+
+    def is_internable(self, value):
+        """
+        Returns whether the given value is a usage key that can be
+        reconstructed from its course key, block type and block id.
+        """
+        try:
+            return self._internable_by_key[value]
+        except (KeyError, TypeError):
+            pass
+        try:
+            internable = value.course_key.make_usage_key(value.block_type, value.block_id) == value
+        except (AttributeError, TypeError, ValueError):
+            return False
+        self._internable_by_key[value] = internable
+        return internable
+
+    def write(self, writer):
+        """
+        Writes the key table.
+        """
+        strings = _StringTable()
+        course_keys = _StringTable()
+        encoded_keys = []
+        pickled_keys = []
+        for index, usage_key in enumerate(self._keys):
+            if self.is_internable(usage_key):
+                encoded_keys.extend((
+                    course_keys.add(six.text_type(usage_key.course_key)) + 1,
+                    strings.add(usage_key.block_type),
+                    strings.add(usage_key.block_id),
+                ))
+            else:
+                encoded_keys.extend((0, 0, 0))
+                pickled_keys.append((index, usage_key))
+
+        writer.uint(len(self._keys))
+        course_keys.write(writer)
+        strings.write(writer)
+        writer.uints(encoded_keys)
+        writer.uint(len(pickled_keys))
+        for index, usage_key in pickled_keys:
+            writer.uint(index)
+            writer.raw(pickle.dumps(usage_key, pickle.HIGHEST_PROTOCOL))
+
+    @classmethod
+    def read(cls, reader):
+        """
+        Reads a key table written by write and returns the list of
+        usage keys, indexed by their position in the table.
+        """
+        count = reader.uint()
+        course_keys = [CourseKey.from_string(course_key) for course_key in _StringTable.read(reader)]
+        strings = _StringTable.read(reader)
+        encoded_keys = reader.uints()
+
+        # A course key index of 0 denotes a pickled key, read below.
+        keys = [None] * count
+        for index in range(count):
+            course_key_index, block_type_index, block_id_index = encoded_keys[index * 3:index * 3 + 3]
+            if course_key_index:
+                keys[index] = course_keys[course_key_index - 1].make_usage_key(
+                    strings[block_type_index],
+                    strings[block_id_index],
+                )
+
+        for _ in range(reader.uint()):
+            index = reader.uint()
+            keys[index] = pickle.loads(reader.raw())
+        return keys
+
+
+class _StringTable(object):
+    """
+    Table of interned text strings.
+    """
+    def __init__(self):
+        self._strings = []
+        self._index_by_string = {}
+
+    def add(self, string):
+        """
+        Adds the given string to the table, if not already present, and
+        returns its index.
+        """
+        index = self._index_by_string.get(string)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(string)
+            self._index_by_string[string] = index
+        return index
+
+    def write(self, writer):
+        """
+        Writes the string table.
+        """
+        writer.uint(len(self._strings))
+        for string in self._strings:
+            writer.text(string)
+
+    @staticmethod
+    def read(reader):
+        """
+        Reads a string table written by write and returns the list of
+        strings.
+        """
+        return [reader.text() for _ in range(reader.uint())]
+
+
+class _Column(object):
+    """
+    A single field's values for the blocks of a table, decoded on first
+    access. Only accessed by _ColumnarFields, under their decoding lock.
+    """
+    def __init__(self, kind, block_indices, payload, keys):
+        self._kind = kind
+        self._block_indices = block_indices
+        self._payload = payload
+        self._keys = keys
+        self._values_by_block = None
+
+    def get(self, block_index, default=None):
+        """
+        Returns the value for the given block, decoding the column if
+        it has not yet been decoded.
+        """
+        if self._values_by_block is None:
+            values = _decode_column(self._kind, len(self._block_indices), self._payload, self._keys)
+            self._values_by_block = dict(six.moves.zip(self._block_indices, values))
+            self._payload = None
+        return self._values_by_block.get(block_index, default)
+
+
+class _ColumnarFields(dict):
+    """
+    The fields dict of a single block's FieldData, whose values are
+    decoded from their columns on first access.
+
+    Values that have been decoded, set or deleted are tracked in the
+    dict itself; any operation other than item access materializes the
+    remaining values first. Values are decoded under the given lock,
+    which is shared by all fields of the structure, so that threads
+    sharing the structure do not decode its columns concurrently.
+    """
+    __slots__ = ('_columns', '_block_index', '_lock', '_deleted', '_materialized')
+
+    def __init__(self, columns, block_index, lock):  # pylint: disable=super-init-not-called
+        # dict.__init__ is not called since the dict starts out empty
+        # and this is called for every block.
+        self._columns = columns
+        self._block_index = block_index
+        self._lock = lock
+        self._deleted = ()
+        self._materialized = False
+
+    def __missing__(self, field_name):
+        with self._lock:
+            value = self._decode(field_name)
+        if value is _MISSING:
+            raise KeyError(field_name)
+        return value
+
+    def _decode(self, field_name):
+        """
+        Decodes the value of the given field into the dict, and returns
+        it, or _MISSING if the block has no such value. Must be called
+        under the lock.
+        """
+        if dict.__contains__(self, field_name):
+            # Decoded by another thread while this one waited for the lock
+            return dict.__getitem__(self, field_name)
+        if self._materialized or field_name in self._deleted:
+            return _MISSING
+        column = self._columns.get(field_name)
+        if column is None:
+            return _MISSING
+        value = column.get(self._block_index, _MISSING)
+        if value is not _MISSING:
+            dict.__setitem__(self, field_name, value)
+        return value
+
+    def __delitem__(self, field_name):
+        if field_name not in self:
+            raise KeyError(field_name)
+        self._deleted = set(self._deleted) | {field_name}
+        dict.pop(self, field_name, None)
+
+    def _materialize(self):
+        """
+        Decodes all of this block's values that are not yet in the dict.
+        """
+        if not self._materialized:
+            with self._lock:
+                for field_name in self._columns:
+                    self._decode(field_name)
+                self._materialized = True
+
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
+
+    def __deepcopy__(self, memo):
+        from copy import deepcopy
+        return deepcopy(dict(self.items()), memo)
+
+
+def _materializing(method):
+    """
+    Returns a wrapper of the given dict method that materializes all
+    values of a _ColumnarFields before delegating to the method.
+    """
+    def _wrapper(self, *args, **kwargs):
+        self._materialize()  # pylint: disable=protected-access
+        return method(self, *args, **kwargs)
+    return _wrapper
+
+
+for _method_name in (
+        '__contains__', '__iter__', '__len__', '__eq__', '__ne__', '__repr__', 'copy', 'get',
+        'items', 'keys', 'values', 'pop', 'popitem', 'setdefault', 'update',
+) + (('has_key', 'iteritems', 'iterkeys', 'itervalues') if six.PY2 else ()):
+    setattr(_ColumnarFields, _method_name, _materializing(getattr(dict, _method_name)))
+
+
+class _Writer(object):
+    """
+    Appends binary encoded values to a buffer.
+    """
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def getvalue(self):
+        """
+        Returns the bytes written so far.
+        """
+        return bytes(self._buffer)
+
+    def tag(self, tag):
+        """
+        Writes a single-byte value tag.
+        """
+        self._buffer += tag
+
+    def pack(self, packer, *values):
+        """
+        Writes the given values with the given struct.Struct.
+        """
+        self._buffer += packer.pack(*values)
+
+    def uint(self, value):
+        """
+        Writes an unsigned 32-bit integer.
+        """
+        self._buffer += _UINT.pack(value)
+
+    def uints(self, values):
+        """
+        Writes a length-prefixed array of unsigned 32-bit integers.
+        """
+        self.uint(len(values))
+        self._buffer += struct.pack('<{}I'.format(len(values)), *values)
+
+    def raw(self, data):
+        """
+        Writes length-prefixed bytes.
+        """
+        self.uint(len(data))
+        self._buffer += data
+
+    def text(self, value):
+        """
+        Writes length-prefixed UTF-8 encoded text.
+        """
+        self.raw(value.encode('utf-8'))
+
+
+class _Reader(object):
+    """
+    Reads binary encoded values written by _Writer.
+    """
+    def __init__(self, data):
+        self._data = data
+        self._offset = 0
+
+    def tag(self):
+        """
+        Reads a single-byte value tag.
+        """
+        self._offset += 1
+        return self._data[self._offset - 1:self._offset]
+
+    def unpack(self, packer):
+        """
+        Reads values with the given struct.Struct.
+        """
+        values = packer.unpack_from(self._data, self._offset)
+        self._offset += packer.size
+        return values
+
+    def uint(self):
+        """
+        Reads an unsigned 32-bit integer.
+        """
+        return self.unpack(_UINT)[0]
+
+    def uints(self):
+        """
+        Reads a length-prefixed array of unsigned 32-bit integers.
+        """
+        count = self.uint()
+        values = struct.unpack_from('<{}I'.format(count), self._data, self._offset)
+        self._offset += count * _UINT.size
+        return values
+
+    def raw(self):
+        """
+        Reads length-prefixed bytes.
+        """
+        length = self.uint()
+        self._offset += length
+        return self._data[self._offset - length:self._offset]
+
+    def text(self):
+        """
+        Reads length-prefixed UTF-8 encoded text.
+        """
+        return self.raw().decode('utf-8')
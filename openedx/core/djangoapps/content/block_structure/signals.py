@@ -11,7 +11,7 @@ from opaque_keys.edx.locator import LibraryLocator
 from xmodule.modulestore.django import SignalHandler
 
 from . import config
-from .api import clear_course_from_cache
+from .api import clear_course_from_cache, clear_course_from_local_cache
 from .tasks import update_course_in_cache_v2
 
 
@@ -27,6 +27,8 @@ def update_block_structure_on_course_publish(sender, course_key, **kwargs):  # p
 
     if config.waffle().is_enabled(config.INVALIDATE_CACHE_ON_PUBLISH):
         clear_course_from_cache(course_key)
+    else:
+        clear_course_from_local_cache(course_key)
 
     update_course_in_cache_v2.apply_async(
         kwargs=dict(course_id=six.text_type(course_key)),
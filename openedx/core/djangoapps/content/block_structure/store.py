@@ -9,12 +9,14 @@ from logging import getLogger
 import six
 
 from django.utils.encoding import python_2_unicode_compatible
+from edx_django_utils.monitoring import set_custom_metric
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
+from .local_cache import get_local_cache, local_cache_timeout
 from .models import BlockStructureModel
 from .transformer_registry import TransformerRegistry
 
@@ -70,6 +72,7 @@ class BlockStructureStore(object):
 
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
+        get_local_cache().delete(block_structure.root_block_usage_key)
 
     def get(self, root_block_usage_key):
         """
@@ -79,6 +82,10 @@ class BlockStructureStore(object):
         The given root_block_usage_key must equate the
         root_block_usage_key previously passed to the `add` method.
 
+        If the process-local cache is enabled, the returned block
+        structure may be shared with other callers and so is not to be
+        mutated; use its copy_on_write method to get a mutable view.
+
         Arguments:
             root_block_usage_key (UsageKey) - The usage_key for the
                 root of the block structure that is to be retrieved
@@ -94,13 +101,22 @@ class BlockStructureStore(object):
         """
         bs_model = self._get_model(root_block_usage_key)
 
+        use_local_cache = _is_local_cache_enabled()
+        if use_local_cache:
+            block_structure = self._get_from_local_cache(bs_model)
+            if block_structure is not None:
+                return block_structure
+
         try:
             serialized_data = self._get_from_cache(bs_model)
         except BlockStructureNotFound:
             serialized_data = self._get_from_store(bs_model)
             self._add_to_cache(serialized_data, bs_model)
 
-        return self._deserialize(serialized_data, root_block_usage_key)
+        block_structure = self._deserialize(serialized_data, root_block_usage_key)
+        if use_local_cache:
+            self._add_to_local_cache(block_structure, serialized_data, bs_model)
+        return block_structure
 
     def delete(self, root_block_usage_key):
         """
@@ -113,6 +129,7 @@ class BlockStructureStore(object):
         """
         bs_model = self._get_model(root_block_usage_key)
         self._cache.delete(self._encode_root_cache_key(bs_model))
+        get_local_cache().delete(root_block_usage_key)
         bs_model.delete()
         logger.info(u"BlockStructure: Deleted from cache and store; %s.", bs_model)
 
@@ -180,6 +197,33 @@ class BlockStructureStore(object):
             raise BlockStructureNotFound(bs_model.data_usage_key)
         return serialized_data
 
+    def _get_from_local_cache(self, bs_model):
+        """
+        Returns the block structure for the given BlockStructureModel
+        from the process-local cache, or None if not found.
+        """
+        local_cache = get_local_cache()
+        block_structure = local_cache.get(self._encode_local_cache_key(bs_model))
+        set_custom_metric('block_structure_local_cache_hit', block_structure is not None)
+        if block_structure is None:
+            logger.info(u"BlockStructure: Not found in local cache; %s.", bs_model)
+        return block_structure
+
+    def _add_to_local_cache(self, block_structure, serialized_data, bs_model):
+        """
+        Adds the given deserialized block_structure for the given
+        BlockStructureModel to the process-local cache.
+
+        Without storage backing, the version of the block structure is
+        unknown, so it is only cached for a limited time.
+        """
+        get_local_cache().set(
+            self._encode_local_cache_key(bs_model),
+            block_structure,
+            len(serialized_data),
+            timeout=None if _is_storage_backing_enabled() else local_cache_timeout(),
+        )
+
     def _get_from_store(self, bs_model):
         """
         Returns the serialized data for the given BlockStructureModel
@@ -194,8 +238,12 @@ class BlockStructureStore(object):
 
     def _serialize(self, block_structure):
         """
-        Serializes the data for the given block_structure.
+        Serializes the data for the given block_structure, in the
+        compact format if it is enabled and as a zpickle otherwise.
         """
+        if _is_compact_serialization_enabled():
+            return serialization.serialize(block_structure)
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -206,14 +254,22 @@ class BlockStructureStore(object):
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+        Data in either of the compact or zpickle formats is supported.
         """
+        compact_relations = _is_compact_relations_enabled()
+        if serialization.is_compact(serialized_data):
+            return serialization.deserialize(serialized_data, root_block_usage_key, compact_relations)
+
         block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
-        return BlockStructureFactory.create_new(
+        block_structure = BlockStructureFactory.create_new(
             root_block_usage_key,
             block_relations,
             transformer_data,
             block_data_map,
         )
+        if compact_relations:
+            block_structure._use_compact_relations()  # pylint: disable=protected-access
+        return block_structure
 
     @staticmethod
     def _encode_root_cache_key(bs_model):
@@ -230,6 +286,19 @@ class BlockStructureStore(object):
                 root_usage_key=six.text_type(bs_model.data_usage_key),
             )
 
+    @classmethod
+    def _encode_local_cache_key(cls, bs_model):
+        """
+        Returns the key to use in the process-local cache for the given
+        BlockStructureModel or StubModel, which includes the version data
+        of the model when storage backing is enabled.
+        """
+        if _is_storage_backing_enabled():
+            version_data = cls._version_data_of_model(bs_model)
+            return bs_model.data_usage_key, tuple(version_data[field_name] for field_name in sorted(version_data))
+        else:
+            return bs_model.data_usage_key, None
+
     @staticmethod
     def _version_data_of_block(root_block):
         """
@@ -259,3 +328,27 @@ def _is_storage_backing_enabled():
     Returns whether storage backing for Block Structures is enabled.
     """
     return config.waffle().is_enabled(config.STORAGE_BACKING_FOR_CACHE)
+
+
+def _is_compact_serialization_enabled():
+    """
+    Returns whether block structures are to be serialized in the compact
+    format rather than as zpickles.
+    """
+    return config.waffle().is_enabled(config.COMPACT_SERIALIZATION)
+
+
+def _is_local_cache_enabled():
+    """
+    Returns whether the process-local cache of deserialized Block
+    Structures is enabled.
+    """
+    return config.waffle().is_enabled(config.LOCAL_CACHE)
+
+
+def _is_compact_relations_enabled():
+    """
+    Returns whether the relations of deserialized Block Structures are
+    to be held in integer arrays rather than in per-block lists.
+    """
+    return config.waffle().is_enabled(config.COMPACT_RELATIONS)
@@ -267,10 +267,11 @@ class ChildrenMapTestMixin(object):
         """
         return block_id
 
-    def create_block_structure(self, children_map, block_structure_cls=BlockStructureBlockData):
+    def create_block_structure(self, children_map, block_structure_cls=BlockStructureBlockData, compact_relations=False):
         """
         Factory method for creating and returning a block structure
-        for the given children_map.
+        for the given children_map, optionally with its relations held
+        in a _CompactBlockRelations.
         """
         # create empty block structure
         block_structure = block_structure_cls(root_block_usage_key=self.block_key_factory(0))
@@ -279,6 +280,8 @@ class ChildrenMapTestMixin(object):
         for parent, children in enumerate(children_map):
             for child in children:
                 block_structure._add_relation(self.block_key_factory(parent), self.block_key_factory(child))  # pylint: disable=protected-access
+        if compact_relations:
+            block_structure._use_compact_relations()  # pylint: disable=protected-access
         return block_structure
 
     def get_parents_map(self, children_map):
@@ -28,13 +28,19 @@ class TestBlockStructure(TestCase, ChildrenMapTestMixin):
     """
 
     @ddt.data(
-        [],
-        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
-        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
-        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+        *itertools.product(
+            [
+                [],
+                ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+                ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+                ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+            ],
+            [True, False],
+        )
     )
-    def test_relations(self, children_map):
-        block_structure = self.create_block_structure(children_map, BlockStructure)
+    @ddt.unpack
+    def test_relations(self, children_map, compact_relations):
+        block_structure = self.create_block_structure(children_map, BlockStructure, compact_relations)
 
         # get_children
         for parent, children in enumerate(children_map):
@@ -49,6 +55,28 @@ class TestBlockStructure(TestCase, ChildrenMapTestMixin):
             self.assertIn(node, block_structure)
         self.assertNotIn(len(children_map) + 1, block_structure)
 
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_compact_relations_traversals(self, children_map):
+        block_structure = self.create_block_structure(children_map, BlockStructure)
+        compact_structure = self.create_block_structure(children_map, BlockStructure, compact_relations=True)
+
+        for filter_func in (None, lambda block: block != 1):
+            for yield_descendants_of_unyielded in (True, False):
+                self.assertEqual(
+                    list(compact_structure.topological_traversal(filter_func, yield_descendants_of_unyielded)),
+                    list(block_structure.topological_traversal(filter_func, yield_descendants_of_unyielded)),
+                )
+            self.assertEqual(
+                list(compact_structure.post_order_traversal(filter_func)),
+                list(block_structure.post_order_traversal(filter_func)),
+            )
+        self.assertEqual(list(compact_structure), list(block_structure))
+        self.assertEqual(len(compact_structure), len(block_structure))
+
 
 @ddt.ddt
 class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
@@ -209,16 +237,17 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
                 ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
                 ChildrenMapTestMixin.DAG_CHILDREN_MAP,
             ],
+            [True, False],
         )
     )
     @ddt.unpack
-    def test_remove_block(self, keep_descendants, block_to_remove, children_map):
+    def test_remove_block(self, keep_descendants, block_to_remove, children_map, compact_relations):
         ### skip test if invalid
         if (block_to_remove >= len(children_map)) or (keep_descendants and block_to_remove == 0):
             return
 
         ### create structure
-        block_structure = self.create_block_structure(children_map)
+        block_structure = self.create_block_structure(children_map, compact_relations=compact_relations)
         parents_map = self.get_parents_map(children_map)
 
         ### verify blocks pre-exist
@@ -263,8 +292,12 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
 
         self.assert_block_structure(block_structure, pruned_children_map, missing_blocks)
 
-    def test_remove_block_traversal(self):
-        block_structure = self.create_block_structure(ChildrenMapTestMixin.LINEAR_CHILDREN_MAP)
+    @ddt.data(True, False)
+    def test_remove_block_traversal(self, compact_relations):
+        block_structure = self.create_block_structure(
+            ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+            compact_relations=compact_relations,
+        )
         block_structure.remove_block_traversal(lambda block: block == 2)
         self.assert_block_structure(block_structure, [[1], [], [], []], missing_blocks=[2])
 
@@ -312,3 +345,42 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         self.assertEquals(_get_value(block_structure), 'edit1')
         self.assertEquals(_get_value(new_copy), 'edit2')
+
+    @ddt.data(True, False)
+    def test_copy_on_write(self, compact_relations):
+        block_structure = self.create_block_structure(
+            ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+            compact_relations=compact_relations,
+        )
+        for block in block_structure:
+            block_structure._get_or_create_block(block).display_name = u'original'
+            block_structure.set_transformer_block_field(block, 'transformer', 'test_key', 'original_value')
+        block_structure.set_transformer_data('transformer', 'test_key', 'original_value')
+
+        # edit a copy-on-write view of the structure
+        view = block_structure.copy_on_write()
+        view.remove_block(1, keep_descendants=True)
+        view.override_xblock_field(2, 'display_name', u'edited')
+        view.set_transformer_block_field(3, 'transformer', 'test_key', 'edited_value')
+        view.remove_transformer_block_field(4, 'transformer', 'test_key')
+        view.set_transformer_data('transformer', 'test_key', 'edited_value')
+        view._add_relation(2, 5)
+        self.assert_block_structure(view, [[2, 3, 4], [], [5], [], [], []], missing_blocks=[1])
+        self.assertEqual(view.get_xblock_field(2, 'display_name'), u'edited')
+        self.assertEqual(view.get_transformer_block_field(3, 'transformer', 'test_key'), 'edited_value')
+        self.assertIsNone(view.get_transformer_block_field(4, 'transformer', 'test_key'))
+        self.assertEqual(view.get_transformer_data('transformer', 'test_key'), 'edited_value')
+
+        view.set_root_block(2)
+        view._prune_unreachable()
+        self.assert_block_structure(view, [[], [], [5], [], [], []], missing_blocks=[0, 1, 3, 4])
+
+        # verify the original structure is unchanged
+        self.assert_block_structure(block_structure, ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        for block in block_structure:
+            self.assertEqual(block_structure.get_xblock_field(block, 'display_name'), u'original')
+            self.assertEqual(
+                block_structure.get_transformer_block_field(block, 'transformer', 'test_key'),
+                'original_value',
+            )
+        self.assertEqual(block_structure.get_transformer_data('transformer', 'test_key'), 'original_value')
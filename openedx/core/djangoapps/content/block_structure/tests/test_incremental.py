@@ -0,0 +1,175 @@
+"""
+Tests for incremental.py
+"""
+from __future__ import absolute_import
+
+import ddt
+from django.test import TestCase
+
+from ..config import INCREMENTAL_COLLECTION, waffle
+from ..manager import BlockStructureManager
+from .helpers import (
+    ChildrenMapTestMixin,
+    MockCache,
+    MockModulestoreFactory,
+    MockTransformer,
+    UsageKeyFactoryMixin,
+    mock_registered_transformers
+)
+
+
+class PathTransformer(MockTransformer):
+    """
+    Test Transformer that collects, for each block, the values of the
+    block and its ancestors, and records the blocks it collected.
+    """
+    WRITE_VERSION = 1
+    READ_VERSION = 1
+    collected_block_keys = []
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the path of values for each block.
+        """
+        for block_key in block_structure.topological_traversal():
+            paths = [
+                block_structure.get_transformer_block_field(parent_key, cls, 'path')
+                for parent_key in block_structure.get_parents(block_key)
+            ]
+            own_value = block_structure.get_xblock(block_key).value
+            block_structure.set_transformer_block_field(block_key, cls, 'path', min(paths or [()]) + (own_value,))
+            cls.collected_block_keys.append(block_key)
+
+
+@ddt.ddt
+class TestIncrementalCollection(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the incremental collection of block structures.
+    """
+    #       0
+    #     /   \
+    #    1     2
+    #   / \   / \
+    #  3   4 5   6
+    #  |
+    #  7
+    TREE_CHILDREN_MAP = [[1, 2], [3, 4], [5, 6], [7], [], [], [], []]
+
+    def setUp(self):
+        super(TestIncrementalCollection, self).setUp()
+        PathTransformer.collected_block_keys = []
+        self.timestamp = 0
+        self.set_children_map(self.TREE_CHILDREN_MAP)
+
+    def set_children_map(self, children_map):
+        """
+        Creates the mock modulestore, with edit info for all blocks, and
+        the manager for the given children_map.
+        """
+        self.children_map = children_map
+        self.modulestore = MockModulestoreFactory.create(children_map, self.block_key_factory)
+        for block_id in range(len(children_map)):
+            self.edit_block(block_id)
+        self.bs_manager = BlockStructureManager(self.block_key_factory(0), self.modulestore, MockCache())
+
+    def edit_block(self, block_id):
+        """
+        Updates the value and edit info of the given block, and the
+        subtree edit info of its ancestors, in the mock modulestore.
+        """
+        self.timestamp += 1
+        xblock = self.modulestore.blocks[self.block_key_factory(block_id)]
+        xblock.field_map['value'] = u'{}.{}'.format(block_id, self.timestamp)
+        xblock.field_map['edited_on'] = self.timestamp
+        self.edit_subtree(block_id)
+
+    def edit_subtree(self, block_id):
+        """
+        Updates the subtree edit info of the given block and its
+        ancestors.
+        """
+        self.modulestore.blocks[self.block_key_factory(block_id)].field_map['subtree_edited_on'] = self.timestamp
+        for parent_id, parent_children in enumerate(self.children_map):
+            if block_id in parent_children:
+                self.edit_subtree(parent_id)
+
+    def update_collected(self):
+        """
+        Recollects the block structure and returns it, along with the
+        ids of the blocks that were collected.
+        """
+        PathTransformer.collected_block_keys = []
+        with mock_registered_transformers([PathTransformer]):
+            block_structure = self.bs_manager._update_collected()  # pylint: disable=protected-access
+        return block_structure, {int(block_key.block_id) for block_key in PathTransformer.collected_block_keys}
+
+    def assert_fully_collected(self, block_structure):
+        """
+        Verifies that the given block structure equates a fully
+        recollected one.
+        """
+        with waffle().override(INCREMENTAL_COLLECTION, active=False):
+            expected, _ = self.update_collected()
+        self.assert_block_structure(block_structure, self.children_map)
+        self.assertEqual(list(block_structure), list(expected))
+        for block_key in expected:
+            self.assertEqual(block_structure.get_children(block_key), expected.get_children(block_key))
+            self.assertEqual(
+                block_structure.get_transformer_block_field(block_key, PathTransformer, 'path'),
+                expected.get_transformer_block_field(block_key, PathTransformer, 'path'),
+            )
+
+    @ddt.data(
+        # Only the edited leaf, its ancestors and their children are
+        # recollected; the subtrees of blocks 3 and 2 are reused.
+        (4, {0, 1, 2, 3, 4}),
+        (7, {0, 1, 2, 3, 4, 7}),
+        # The descendants of an edited block are recollected too.
+        (3, {0, 1, 2, 3, 4, 7}),
+        (2, {0, 1, 2, 5, 6}),
+        # Edits to the root recollect all blocks.
+        (0, set(range(8))),
+    )
+    @ddt.unpack
+    def test_incremental_collection(self, edited_block_id, expected_collected_ids):
+        with waffle().override(INCREMENTAL_COLLECTION, active=True):
+            self.update_collected()
+            self.edit_block(edited_block_id)
+            block_structure, collected_ids = self.update_collected()
+            self.assertEqual(collected_ids, expected_collected_ids)
+            self.assert_fully_collected(block_structure)
+
+    def test_unchanged(self):
+        with waffle().override(INCREMENTAL_COLLECTION, active=True):
+            self.update_collected()
+            block_structure, collected_ids = self.update_collected()
+            self.assertEqual(collected_ids, {0, 1, 2})
+            self.assert_fully_collected(block_structure)
+
+    def test_dag_recollected_fully(self):
+        # Block 3 has parents in both a reused and a recollected subtree,
+        # so its data cannot be collected incrementally.
+        self.set_children_map(self.DAG_CHILDREN_MAP)
+        with waffle().override(INCREMENTAL_COLLECTION, active=True):
+            self.update_collected()
+            self.edit_block(4)
+            block_structure, collected_ids = self.update_collected()
+            self.assertEqual(collected_ids, set(range(len(self.DAG_CHILDREN_MAP))))
+            self.assert_fully_collected(block_structure)
+
+    def test_without_previous_structure(self):
+        with waffle().override(INCREMENTAL_COLLECTION, active=True):
+            block_structure, collected_ids = self.update_collected()
+            self.assertEqual(collected_ids, set(range(len(self.children_map))))
+            self.assert_fully_collected(block_structure)
+
+    def test_outdated_transformer_data(self):
+        with waffle().override(INCREMENTAL_COLLECTION, active=True):
+            self.update_collected()
+            PathTransformer.WRITE_VERSION += 1
+            try:
+                _, collected_ids = self.update_collected()
+            finally:
+                PathTransformer.WRITE_VERSION -= 1
+        self.assertEqual(collected_ids, set(range(len(self.children_map))))
@@ -0,0 +1,70 @@
+"""
+Tests for local_cache.py
+"""
+from __future__ import absolute_import
+
+from unittest import TestCase
+
+from mock import patch
+
+from ..local_cache import BlockStructureLocalCache
+
+
+class TestBlockStructureLocalCache(TestCase):
+    """
+    Tests for BlockStructureLocalCache
+    """
+    def setUp(self):
+        super(TestBlockStructureLocalCache, self).setUp()
+        self.local_cache = BlockStructureLocalCache(max_size=10)
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.local_cache.get(('root', 1)))
+        self.local_cache.set(('root', 1), 'structure', size=5)
+        self.assertEqual(self.local_cache.get(('root', 1)), 'structure')
+        self.assertIsNone(self.local_cache.get(('root', 2)))
+        self.assertEqual((self.local_cache.hits, self.local_cache.misses), (1, 2))
+
+    def test_lru_eviction(self):
+        self.local_cache.set(('a', 1), 'a', size=4)
+        self.local_cache.set(('b', 1), 'b', size=4)
+        self.local_cache.get(('a', 1))
+        self.local_cache.set(('c', 1), 'c', size=4)
+
+        self.assertEqual(self.local_cache.get(('a', 1)), 'a')
+        self.assertIsNone(self.local_cache.get(('b', 1)))
+        self.assertEqual(self.local_cache.get(('c', 1)), 'c')
+
+    def test_too_large(self):
+        self.local_cache.set(('a', 1), 'a', size=4)
+        self.local_cache.set(('b', 1), 'b', size=11)
+        self.assertIsNone(self.local_cache.get(('b', 1)))
+        self.assertEqual(self.local_cache.get(('a', 1)), 'a')
+
+    def test_replace(self):
+        self.local_cache.set(('a', 1), 'a', size=6)
+        self.local_cache.set(('a', 1), 'a2', size=6)
+        self.local_cache.set(('b', 1), 'b', size=4)
+        self.assertEqual(self.local_cache.get(('a', 1)), 'a2')
+        self.assertEqual(self.local_cache.get(('b', 1)), 'b')
+
+    def test_delete(self):
+        self.local_cache.set(('a', 1), 'a', size=2)
+        self.local_cache.set(('a', 2), 'a', size=2)
+        self.local_cache.set(('b', 1), 'b', size=2)
+        self.local_cache.delete('a')
+        self.assertEqual(len(self.local_cache), 1)
+        self.assertEqual(self.local_cache.get(('b', 1)), 'b')
+
+    @patch('openedx.core.djangoapps.content.block_structure.local_cache.time')
+    def test_timeout(self, mock_time):
+        mock_time.return_value = 100
+        self.local_cache.set(('a', None), 'a', size=2, timeout=10)
+        self.local_cache.set(('b', 1), 'b', size=2)
+
+        mock_time.return_value = 109
+        self.assertEqual(self.local_cache.get(('a', None)), 'a')
+        mock_time.return_value = 111
+        self.assertIsNone(self.local_cache.get(('a', None)))
+        self.assertEqual(self.local_cache.get(('b', 1)), 'b')
+        self.assertEqual(len(self.local_cache), 1)
@@ -0,0 +1,188 @@
+"""
+Tests for serialization.py
+"""
+from __future__ import absolute_import
+
+# pylint: disable=protected-access
+import threading
+import time
+from copy import deepcopy
+from datetime import datetime
+from unittest import TestCase
+
+import ddt
+from mock import patch
+from pytz import utc
+from six.moves import cPickle as pickle
+
+from .. import serialization
+from ..block_structure import BlockStructureBlockData, _CompactBlockRelations
+from ..exceptions import BlockStructureSerializationError
+from .helpers import ChildrenMapTestMixin, MockTransformer, UsageKeyFactoryMixin
+
+
+@ddt.ddt
+class TestCompactSerialization(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the compact serialization of block structures.
+    """
+    FIELD_VALUES = {
+        'display_name': u'Unit \u2603',
+        'graded': True,
+        'weight': 1.5,
+        'max_attempts': 3,
+        'start': datetime(2019, 1, 1, 12, 30, tzinfo=utc),
+        'due': None,
+        'format': b'Homework',
+        'group_access': {50: [1, 2]},
+        'tags': frozenset([u'a', u'b']),
+    }
+
+    def create_populated_block_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map, with
+        xBlock fields and transformer data set on all of its blocks.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        block_structure.set_transformer_data(MockTransformer, 'partitions', [{'id': 50}])
+        for block_key in block_structure:
+            for field_name, value in self.FIELD_VALUES.items():
+                setattr(block_structure._get_or_create_block(block_key), field_name, value)
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'parent_keys', [
+                parent_key for parent_key in block_structure.get_parents(block_key)
+            ])
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'big', 2 ** 70)
+        return block_structure
+
+    def round_trip(self, block_structure):
+        """
+        Returns the result of serializing and deserializing the given
+        block structure.
+        """
+        return serialization.deserialize(
+            serialization.serialize(block_structure),
+            block_structure.root_block_usage_key,
+        )
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_populated_block_structure(children_map)
+        deserialized = self.round_trip(block_structure)
+
+        self.assert_block_structure(deserialized, children_map)
+        self.assertEqual(deserialized.root_block_usage_key, block_structure.root_block_usage_key)
+        self.assertEqual(
+            deserialized.get_transformer_data(MockTransformer, 'partitions'),
+            [{'id': 50}],
+        )
+        for block_key in block_structure:
+            self.assertEqual(deserialized[block_key].location, block_key)
+            self.assertEqual(deserialized[block_key].fields, self.FIELD_VALUES)
+            self.assertEqual(
+                deserialized.get_transformer_block_field(block_key, MockTransformer, 'parent_keys'),
+                block_structure.get_parents(block_key),
+            )
+            self.assertEqual(deserialized.get_transformer_block_field(block_key, MockTransformer, 'big'), 2 ** 70)
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_compact_relations(self, children_map):
+        block_structure = self.create_populated_block_structure(children_map)
+        deserialized = serialization.deserialize(
+            serialization.serialize(block_structure),
+            block_structure.root_block_usage_key,
+            compact_relations=True,
+        )
+        self.assertIsInstance(deserialized._block_relations, _CompactBlockRelations)
+        self.assert_block_structure(deserialized, children_map)
+        self.assertEqual(list(deserialized.topological_traversal()), list(block_structure.topological_traversal()))
+
+        # Structures with compact relations serialize to the same data.
+        self.assert_block_structure(self.round_trip(deserialized), children_map)
+
+    def test_pickled_fallbacks(self):
+        # Integer block keys and values of custom types are not natively
+        # supported by the format.
+        block_structure = BlockStructureBlockData(root_block_usage_key=0)
+        block_structure._add_relation(0, 1)
+        block_structure.set_transformer_block_field(0, MockTransformer, 'transformer', MockTransformer)
+
+        deserialized = serialization.deserialize(serialization.serialize(block_structure), 0)
+        self.assertEqual(deserialized.get_children(0), [1])
+        self.assertEqual(deserialized.get_transformer_block_field(0, MockTransformer, 'transformer'), MockTransformer)
+
+    def test_lazy_field_decoding(self):
+        deserialized = self.round_trip(self.create_populated_block_structure(self.SIMPLE_CHILDREN_MAP))
+        block_key = self.block_key_factory(1)
+
+        self.assertEqual(dict.__len__(deserialized[block_key].fields), 0)
+        self.assertEqual(deserialized.get_xblock_field(block_key, 'weight'), 1.5)
+        self.assertEqual(dict.__len__(deserialized[block_key].fields), 1)
+        self.assertIsNone(deserialized.get_xblock_field(block_key, 'not_collected'))
+        self.assertEqual(len(deserialized[block_key].fields), len(self.FIELD_VALUES))
+
+    def test_concurrent_field_decoding(self):
+        deserialized = self.round_trip(self.create_populated_block_structure(self.SIMPLE_CHILDREN_MAP))
+        decode_column = serialization._decode_column
+        fields_read = []
+
+        def slow_decode_column(*args):
+            """
+            Decodes the column slowly, to let other threads catch up.
+            """
+            time.sleep(0.01)
+            return decode_column(*args)
+
+        def read_fields():
+            """
+            Reads the fields of all blocks, one at a time and then all at once.
+            """
+            for block_key in deserialized:
+                fields = deserialized[block_key].fields
+                for field_name, value in self.FIELD_VALUES.items():
+                    self.assertEqual(fields[field_name], value)
+                fields_read.append(dict(fields.items()))
+
+        with patch.object(serialization, '_decode_column', side_effect=slow_decode_column) as mock_decode_column:
+            threads = [threading.Thread(target=read_fields) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(mock_decode_column.call_count, len(self.FIELD_VALUES))
+        self.assertEqual(fields_read, [self.FIELD_VALUES] * len(threads) * len(list(deserialized)))
+
+    def test_modify_deserialized(self):
+        deserialized = self.round_trip(self.create_populated_block_structure(self.SIMPLE_CHILDREN_MAP))
+        block_key = self.block_key_factory(1)
+        copied = deserialized.copy()
+
+        copied.override_xblock_field(block_key, 'graded', False)
+        delattr(copied[block_key], 'display_name')
+        copied.remove_transformer_block_field(block_key, MockTransformer, 'big')
+        self.assertFalse(copied.get_xblock_field(block_key, 'graded'))
+        self.assertIsNone(copied.get_xblock_field(block_key, 'display_name'))
+        self.assertIsNone(copied.get_transformer_block_field(block_key, MockTransformer, 'big'))
+
+        self.assertTrue(deserialized.get_xblock_field(block_key, 'graded'))
+        self.assertEqual(deserialized[block_key].fields, deepcopy(deserialized[block_key].fields))
+        self.assertEqual(pickle.loads(pickle.dumps(deserialized[block_key].fields)), self.FIELD_VALUES)
+
+    def test_is_compact(self):
+        serialized = serialization.serialize(self.create_block_structure(self.SIMPLE_CHILDREN_MAP))
+        self.assertTrue(serialization.is_compact(serialized))
+        self.assertFalse(serialization.is_compact(pickle.dumps(serialized)))
+
+    def test_unsupported_version(self):
+        serialized = serialization.serialize(self.create_block_structure(self.SIMPLE_CHILDREN_MAP))
+        serialized = serialization.MAGIC + b'\xff' + serialized[len(serialization.MAGIC) + 1:]
+        with self.assertRaises(BlockStructureSerializationError):
+            serialization.deserialize(serialized, self.block_key_factory(0))
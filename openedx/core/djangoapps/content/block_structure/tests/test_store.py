@@ -3,13 +3,17 @@ Tests for block_structure/cache.py
 """
 from __future__ import absolute_import
 
+import itertools
+
 import ddt
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle
+from ..block_structure import _CompactBlockRelations
+from ..config import COMPACT_RELATIONS, COMPACT_SERIALIZATION, LOCAL_CACHE, STORAGE_BACKING_FOR_CACHE, waffle
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
+from ..local_cache import get_local_cache
 from ..store import BlockStructureStore
 from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer, UsageKeyFactoryMixin
 
@@ -30,6 +34,8 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
 
         self.mock_cache = MockCache()
         self.store = BlockStructureStore(self.mock_cache)
+        get_local_cache().clear()
+        self.addCleanup(get_local_cache().clear)
 
     def add_transformers(self):
         """
@@ -59,6 +65,28 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             self.assertIsNotNone(stored_value)
             self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(*itertools.product((True, False), repeat=2))
+    @ddt.unpack
+    def test_serialization_formats(self, compact_when_added, compact_when_read):
+        with waffle().override(COMPACT_SERIALIZATION, active=compact_when_added):
+            self.store.add(self.block_structure)
+        with waffle().override(COMPACT_SERIALIZATION, active=compact_when_read):
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assert_block_structure(stored_value, self.children_map)
+        self.assertEqual(
+            stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+            u'{} val'.format(MockTransformer.name()),
+        )
+
+    @ddt.data(True, False)
+    def test_compact_relations(self, compact_serialization):
+        with waffle().override(COMPACT_SERIALIZATION, active=compact_serialization):
+            self.store.add(self.block_structure)
+            with waffle().override(COMPACT_RELATIONS, active=True):
+                stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assertIsInstance(stored_value._block_relations, _CompactBlockRelations)  # pylint: disable=protected-access
+        self.assert_block_structure(stored_value, self.children_map)
+
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
         with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
@@ -80,6 +108,27 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             stored_value = self.store.get(self.block_structure.root_block_usage_key)
             self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(True, False)
+    def test_local_cache(self, with_storage_backing):
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
+            with waffle().override(LOCAL_CACHE, active=True):
+                self.store.add(self.block_structure)
+                first_value = self.store.get(self.block_structure.root_block_usage_key)
+
+                # Served from the local cache without accessing the cache.
+                self.mock_cache.map.clear()
+                second_value = self.store.get(self.block_structure.root_block_usage_key)
+                self.assertIs(first_value, second_value)
+                self.assertEqual((get_local_cache().hits, get_local_cache().misses), (1, 1))
+
+                # Adding a new version invalidates the local cache.
+                self.store.add(self.block_structure)
+                self.assertIsNot(self.store.get(self.block_structure.root_block_usage_key), first_value)
+
+                self.store.delete(self.block_structure.root_block_usage_key)
+                with self.assertRaises(BlockStructureNotFound):
+                    self.store.get(self.block_structure.root_block_usage_key)
+
     @ddt.data(1, 5, None)
     def test_cache_timeout(self, timeout):
         if timeout is not None:
@@ -95,6 +95,12 @@ class BlockStructureTransformer(object):
         is directly accessed in the transform, all of its relevant data
         is readily available (without needing to access its ancestors).
 
+        Data collected for a block should depend only on the block, its
+        parent and ancestors, and the root block, and never on its
+        descendants. This allows the framework to recollect only the
+        blocks that changed, along with their ancestors, when
+        incremental collection is enabled.
+
         Traversals of the block_structure can be implemented using the
         following methods:
             topological_traversal
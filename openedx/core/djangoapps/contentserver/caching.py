@@ -1,15 +1,38 @@
 """
 Helper functions for caching course assets.
+
+Assets small enough to be cached whole are stored in the "course_assets" cache.
+Larger assets are copied to the disk cache of each node, if it is enabled, in
+CONTENTSERVER_DISK_CACHE_DIR, as they are first streamed whole from the
+contentstore.  Only one request copies an asset at a time, to a temporary file
+which is renamed once complete.  Copies are named by the digest of their
+content, so they never go stale, and the least recently used copies are evicted
+when the disk cache grows over CONTENTSERVER_DISK_CACHE_MAX_SIZE bytes.  The attributes
+of the assets in the disk cache are stored in the "course_assets" cache, so that
+they can be served without loading them from the contentstore.
 """
 from __future__ import absolute_import
 
+import errno
+import logging
+import os
+from time import time
+
 import six
 
+from django.conf import settings
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
 
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.content import (
+    STATIC_CONTENT_VERSION,
+    STREAM_DATA_CHUNK_SIZE,
+    StaticContent,
+    StaticContentStream
+)
+
+log = logging.getLogger(__name__)
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -18,19 +41,26 @@ try:
 except InvalidCacheBackendError:
     pass
 
+# The prefix of the names of the files being copied to the disk cache.
+DISK_CACHE_TEMP_PREFIX = '.tmp-'
+
+# Number of seconds after which a copy to the disk cache that is no longer being
+# written to is taken to be abandoned, and is taken over by the next request.
+DISK_CACHE_ABANDONED_COPY_AGE = 5 * 60
+
 
 def set_cached_content(content):
     """
     Stores the given piece of content in the cache, using its location as the key.
     """
-    CONTENT_CACHE.set(six.text_type(content.location).encode("utf-8"), content, version=STATIC_CONTENT_VERSION)
+    CONTENT_CACHE.set(_content_key(content.location), content, version=STATIC_CONTENT_VERSION)
 
 
 def get_cached_content(location):
     """
     Retrieves the given piece of content by its location if cached.
     """
-    return CONTENT_CACHE.get(six.text_type(location).encode("utf-8"), version=STATIC_CONTENT_VERSION)
+    return CONTENT_CACHE.get(_content_key(location), version=STATIC_CONTENT_VERSION)
 
 
 def del_cached_content(location):
@@ -40,15 +70,244 @@ def del_cached_content(location):
     It's possible that the content could have been cached without knowing the course_key,
     and so without having the run.
     """
-    def location_str(loc):
-        """Force the location to a Unicode string."""
-        return six.text_type(loc).encode("utf-8")
-
-    locations = [location_str(location)]
+    locations = [location]
     try:
-        locations.append(location_str(location.replace(run=None)))
+        locations.append(location.replace(run=None))
     except InvalidKeyError:
         # although deprecated keys allowed run=None, new keys don't if there is no version.
         pass
 
-    CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    keys = [_content_key(loc) for loc in locations] + [_disk_content_key(loc) for loc in locations]
+    CONTENT_CACHE.delete_many(keys, version=STATIC_CONTENT_VERSION)
+
+
+def _content_key(location):
+    """
+    Returns the cache key of the content of the given location.
+    """
+    return six.text_type(location).encode("utf-8")
+
+
+def _disk_content_key(location):
+    """
+    Returns the cache key of the attributes of the disk cached content of the given location.
+    """
+    return u'disk:{}'.format(location).encode("utf-8")
+
+
+class DiskCachedContentStream(StaticContentStream):
+    """
+    A StaticContentStream of the copy of an asset in the disk cache.
+    """
+    @property
+    def file(self):
+        """
+        The open file of the copy of the asset.
+        """
+        return self._stream
+
+
+class DiskCachingContentStream(StaticContentStream):
+    """
+    A StaticContentStream of an asset from the contentstore, which is copied to the
+    disk cache as it is streamed whole, unless another request is copying it.
+    """
+    def __init__(self, content):
+        super(DiskCachingContentStream, self).__init__(
+            content.location, content.name, content.content_type, content._stream,  # pylint: disable=protected-access
+            last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+            import_path=content.import_path, length=content.length, locked=content.locked,
+            content_digest=content.content_digest,
+        )
+
+    def stream_data(self, chunk_size=STREAM_DATA_CHUNK_SIZE):
+        temp = _start_disk_cache_copy(self.content_digest)
+        if temp is None:
+            for chunk in super(DiskCachingContentStream, self).stream_data(chunk_size=chunk_size):
+                yield chunk
+            return
+
+        temp_file, temp_path = temp
+        copied_length = 0
+        complete = False
+        try:
+            with temp_file:
+                for chunk in super(DiskCachingContentStream, self).stream_data(chunk_size=chunk_size):
+                    temp_file.write(chunk)
+                    copied_length += len(chunk)
+                    yield chunk
+            complete = copied_length == self.length
+        finally:
+            # The copy is dropped if the stream fails, or is closed early.
+            _finish_disk_cache_copy(self, temp_path, complete)
+
+
+def get_disk_cached_content(location):
+    """
+    Returns a DiskCachedContentStream of the content of the given location, if it is
+    in the disk cache, or None.
+    """
+    if not settings.CONTENTSERVER_DISK_CACHE_DIR:
+        return None
+
+    content = CONTENT_CACHE.get(_disk_content_key(location), version=STATIC_CONTENT_VERSION)
+    if content is None:
+        return None
+
+    path = _disk_cache_path(content.content_digest)
+    try:
+        cached_file = open(path, 'rb')
+    except IOError as error:
+        if error.errno != errno.ENOENT:
+            raise
+        # The copy was evicted.
+        return None
+
+    # Mark the copy as recently used.
+    os.utime(path, None)
+    return _disk_cached_content_stream(content, cached_file)
+
+
+def set_disk_cached_content(content):
+    """
+    Returns a DiskCachedContentStream of the copy of the given StaticContentStream in
+    the disk cache, if it is there, or else a DiskCachingContentStream of the content.
+
+    Returns None if the disk cache is disabled or the content has no digest.
+    """
+    if not settings.CONTENTSERVER_DISK_CACHE_DIR or not content.content_digest:
+        return None
+
+    try:
+        cached_file = open(_disk_cache_path(content.content_digest), 'rb')
+    except IOError as error:
+        if error.errno != errno.ENOENT:
+            raise
+        return DiskCachingContentStream(content)
+
+    content.close()
+    attributes = _disk_cached_content_attributes(content)
+    CONTENT_CACHE.set(_disk_content_key(content.location), attributes, version=STATIC_CONTENT_VERSION)
+    return _disk_cached_content_stream(attributes, cached_file)
+
+
+def _disk_cached_content_attributes(content):
+    """
+    Returns the StaticContent, without data, of the attributes of the given content.
+    """
+    return StaticContent(
+        content.location, content.name, content.content_type, None,
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest,
+    )
+
+
+def _disk_cache_path(content_digest):
+    """
+    Returns the path of the copy in the disk cache of the content of the given digest.
+    """
+    return os.path.join(settings.CONTENTSERVER_DISK_CACHE_DIR, content_digest)
+
+
+def _disk_cached_content_stream(content, cached_file):
+    """
+    Returns a DiskCachedContentStream of the given content, read from the given file.
+    """
+    return DiskCachedContentStream(
+        content.location, content.name, content.content_type, cached_file,
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest,
+    )
+
+
+def _start_disk_cache_copy(content_digest):
+    """
+    Creates the temporary file of a copy of the content of the given digest to the disk
+    cache, and returns it, opened for writing, with its path.
+
+    Returns None if another request is copying the content.  The temporary file is named
+    by the digest, so that its exclusive creation is a lock on the copy.
+    """
+    directory = settings.CONTENTSERVER_DISK_CACHE_DIR
+    try:
+        os.makedirs(directory)
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+
+    temp_path = os.path.join(directory, DISK_CACHE_TEMP_PREFIX + content_digest)
+    for __ in range(2):
+        try:
+            temp_fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+        else:
+            return os.fdopen(temp_fd, 'wb'), temp_path
+
+        # Take over the copy if it was abandoned.
+        try:
+            if time() - os.stat(temp_path).st_mtime < DISK_CACHE_ABANDONED_COPY_AGE:
+                return None
+            os.remove(temp_path)
+        except OSError:
+            # The copy was completed, or taken over, by another request.
+            pass
+    return None
+
+
+def _finish_disk_cache_copy(content, temp_path, complete):
+    """
+    Moves the complete copy of the given content from the given temporary file into the
+    disk cache, or removes the temporary file of an incomplete copy.
+    """
+    try:
+        if not complete:
+            os.remove(temp_path)
+            return
+        os.rename(temp_path, _disk_cache_path(content.content_digest))
+    except OSError:
+        # The copy was taken over by another request.
+        log.warning(u'Could not finish copying %s to the contentserver disk cache', content.location)
+        return
+
+    CONTENT_CACHE.set(
+        _disk_content_key(content.location), _disk_cached_content_attributes(content), version=STATIC_CONTENT_VERSION
+    )
+    _evict_disk_cached_content()
+
+
+def _evict_disk_cached_content():
+    """
+    Removes the least recently used copies from the disk cache until it is no larger
+    than CONTENTSERVER_DISK_CACHE_MAX_SIZE bytes.
+
+    Copies being served when they are removed can still be read until they are closed.
+    """
+    cache_dir = settings.CONTENTSERVER_DISK_CACHE_DIR
+    copies = []
+    for filename in os.listdir(cache_dir):
+        if filename.startswith(DISK_CACHE_TEMP_PREFIX):
+            continue
+        path = os.path.join(cache_dir, filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # The copy was evicted by another process.
+            continue
+        copies.append((stat.st_mtime, stat.st_size, path))
+
+    total_size = sum(size for __, size, __ in copies)
+    for __, size, path in sorted(copies):
+        if total_size <= settings.CONTENTSERVER_DISK_CACHE_MAX_SIZE:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            # The copy was evicted by another process.
+            pass
+        else:
+            log.info(u'Evicted %s from the contentserver disk cache', path)
+        total_size -= size
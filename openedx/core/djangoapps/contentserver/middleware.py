@@ -6,25 +6,34 @@ from __future__ import absolute_import
 
 import logging
 import datetime
+from uuid import uuid4
+
 import six
 log = logging.getLogger(__name__)
 try:
     import newrelic.agent
 except ImportError:
     newrelic = None  # pylint: disable=invalid-name
+from django.conf import settings
 from django.http import (
-    HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
-    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect)
+    FileResponse, HttpResponse, HttpResponseNotModified, HttpResponseForbidden,
+    HttpResponseBadRequest, HttpResponseNotFound, HttpResponsePermanentRedirect, StreamingHttpResponse)
 from six import text_type
 from student.models import CourseEnrollment
 
 from xmodule.assetstore.assetmgr import AssetManager
-from xmodule.contentstore.content import StaticContent, XASSET_LOCATION_TAG
+from xmodule.contentstore.content import StaticContent, StaticContentStream, XASSET_LOCATION_TAG
 from xmodule.modulestore import InvalidLocationError
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locator import AssetLocator
 from openedx.core.djangoapps.header_control import force_header_for_response
-from .caching import get_cached_content, set_cached_content
+from .caching import (
+    DiskCachedContentStream,
+    get_cached_content,
+    get_disk_cached_content,
+    set_cached_content,
+    set_disk_cached_content
+)
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.exceptions import NotFoundError
 
@@ -111,9 +120,17 @@ class StaticContentServer(object):
                 return HttpResponseForbidden('Unauthorized')
 
             # Figure out if the client sent us a conditional request, and let them know
-            # if this asset has changed since then.
+            # if this asset has changed since then.  If-None-Match takes precedence over
+            # If-Modified-Since, as the entity tag of an asset changes with its content.
+            # https://tools.ietf.org/html/rfc7232#section-6
+            etag = self.get_etag(content)
             last_modified_at_str = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
-            if 'HTTP_IF_MODIFIED_SINCE' in request.META:
+            if 'HTTP_IF_NONE_MATCH' in request.META:
+                if etag is not None and etag_matches(request.META['HTTP_IF_NONE_MATCH'], etag):
+                    response = HttpResponseNotModified()
+                    response['ETag'] = etag
+                    return response
+            elif 'HTTP_IF_MODIFIED_SINCE' in request.META:
                 if_modified_since = request.META['HTTP_IF_MODIFIED_SINCE']
                 if if_modified_since == last_modified_at_str:
                     return HttpResponseNotModified()
@@ -126,10 +143,6 @@ class StaticContentServer(object):
             # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.35
             response = None
             if request.META.get('HTTP_RANGE'):
-                # If we have a StaticContent, get a StaticContentStream.  Can't manipulate the bytes otherwise.
-                if isinstance(content, StaticContent):
-                    content = AssetManager.find(loc, as_stream=True)
-
                 header_value = request.META['HTTP_RANGE']
                 try:
                     unit, ranges = parse_range_header(header_value, content.length)
@@ -143,38 +156,24 @@ class StaticContentServer(object):
                     if unit != 'bytes':
                         # Only accept ranges in bytes
                         log.warning(u"Unknown unit in Range header: %s for content: %s", header_value, text_type(loc))
-                    elif len(ranges) > 1:
-                        # According to Http/1.1 spec content for multiple ranges should be sent as a multipart message.
-                        # http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
-                        # But we send back the full content.
-                        log.warning(
-                            u"More than 1 ranges in Range header: %s for content: %s", header_value, text_type(loc)
-                        )
                     else:
-                        first, last = ranges[0]
-
-                        if 0 <= first <= last < content.length:
-                            # If the byte range is satisfiable
-                            response = HttpResponse(content.stream_data_in_range(first, last))
-                            response['Content-Range'] = u'bytes {first}-{last}/{length}'.format(
-                                first=first, last=last, length=content.length
-                            )
-                            response['Content-Length'] = str(last - first + 1)
-                            response.status_code = 206  # Partial Content
-
-                            if newrelic:
-                                newrelic.agent.add_custom_parameter('contentserver.ranged', True)
-                        else:
+                        # Unsatisfiable ranges are ignored, as long as one of the ranges is satisfiable.
+                        ranges = [(first, last) for first, last in ranges if 0 <= first <= last < content.length]
+                        if not ranges:
                             log.warning(
                                 u"Cannot satisfy ranges in Range header: %s for content: %s",
                                 header_value, text_type(loc)
                             )
                             return HttpResponse(status=416)  # Requested Range Not Satisfiable
 
+                        response = self.ranged_response(content, ranges)
+
+                        if newrelic:
+                            newrelic.agent.add_custom_parameter('contentserver.ranged', True)
+
             # If Range header is absent or syntactically invalid return a full content response.
             if response is None:
-                response = HttpResponse(content.stream_data())
-                response['Content-Length'] = content.length
+                response = self.full_response(content)
 
             if newrelic:
                 newrelic.agent.add_custom_parameter('contentserver.content_len', content.length)
@@ -182,7 +181,6 @@ class StaticContentServer(object):
 
             # "Accept-Ranges: bytes" tells the user that only "bytes" ranges are allowed
             response['Accept-Ranges'] = 'bytes'
-            response['Content-Type'] = content.content_type
             response['X-Frame-Options'] = 'ALLOW'
 
             # Set any caching headers, and do any response cleanup needed.  Based on how much
@@ -193,6 +191,73 @@ class StaticContentServer(object):
 
             return response
 
+    def full_response(self, content):
+        """
+        Returns a response with the whole content.
+
+        Assets in the disk cache are sent as files, which lets the WSGI server use
+        sendfile, and other streamed assets are streamed from the contentstore.
+        """
+        if isinstance(content, DiskCachedContentStream):
+            response = FileResponse(content.file, content_type=content.content_type)
+        elif isinstance(content, StaticContentStream):
+            response = StreamingHttpResponse(
+                content.stream_data(chunk_size=settings.CONTENTSERVER_STREAM_CHUNK_SIZE),
+                content_type=content.content_type,
+            )
+        else:
+            response = HttpResponse(content.stream_data(), content_type=content.content_type)
+        response['Content-Length'] = content.length
+        return response
+
+    def ranged_response(self, content, ranges):
+        """
+        Returns a 206 Partial Content response with the given satisfiable byte ranges of
+        the content, as a multipart/byteranges message if there is more than one range.
+
+        http://www.w3.org/Protocols/rfc2616/rfc2616-sec14.html#sec14.16
+        """
+        chunk_size = settings.CONTENTSERVER_STREAM_CHUNK_SIZE
+        if len(ranges) == 1:
+            first, last = ranges[0]
+            response = StreamingHttpResponse(
+                content.stream_data_in_range(first, last, chunk_size=chunk_size),
+                content_type=content.content_type,
+            )
+            response['Content-Range'] = u'bytes {first}-{last}/{length}'.format(
+                first=first, last=last, length=content.length
+            )
+            response['Content-Length'] = str(last - first + 1)
+        else:
+            boundary = uuid4().hex
+            part_headers = [
+                u'{separator}--{boundary}\r\nContent-Type: {content_type}\r\n'
+                u'Content-Range: bytes {first}-{last}/{length}\r\n\r\n'.format(
+                    separator=u'\r\n' if index else u'', boundary=boundary, content_type=content.content_type,
+                    first=first, last=last, length=content.length,
+                ).encode('utf-8')
+                for index, (first, last) in enumerate(ranges)
+            ]
+            closing_boundary = u'\r\n--{boundary}--\r\n'.format(boundary=boundary).encode('utf-8')
+
+            def multipart_data():
+                """Streams the parts of the message, one range at a time."""
+                for part_header, (first, last) in zip(part_headers, ranges):
+                    yield part_header
+                    for chunk in content.stream_data_in_range(first, last, chunk_size=chunk_size):
+                        yield chunk
+                yield closing_boundary
+
+            response = StreamingHttpResponse(
+                multipart_data(), content_type=u'multipart/byteranges; boundary={}'.format(boundary),
+            )
+            response['Content-Length'] = str(
+                sum(len(part_header) for part_header in part_headers) + len(closing_boundary) +
+                sum(last - first + 1 for first, last in ranges)
+            )
+        response.status_code = 206  # Partial Content
+        return response
+
     def set_caching_headers(self, content, response):
         """
         Sets caching headers based on whether or not the asset is locked.
@@ -219,6 +284,9 @@ class StaticContentServer(object):
             response['Cache-Control'] = "private, no-cache, no-store"
 
         response['Last-Modified'] = content.last_modified_at.strftime(HTTP_DATE_FORMAT)
+        etag = self.get_etag(content)
+        if etag is not None:
+            response['ETag'] = etag
 
         # Force the Vary header to only vary responses on Origin, so that XHR and browser requests get cached
         # separately and don't screw over one another. i.e. a browser request that doesn't send Origin, and
@@ -241,6 +309,17 @@ class StaticContentServer(object):
 
         return False
 
+    @staticmethod
+    def get_etag(content):
+        """
+        Returns the strong entity tag of the given content, made from its digest, or
+        None if it has no digest.
+        """
+        content_digest = getattr(content, "content_digest", None)
+        if not content_digest:
+            return None
+        return u'"{}"'.format(content_digest)
+
     @staticmethod
     def get_expiration_value(now, cache_ttl):
         """Generates an RFC1123 datetime string based on a future offset."""
@@ -278,8 +357,10 @@ class StaticContentServer(object):
         or loading it directly from the contentstore.
         """
 
-        # See if we can load this item from cache.
+        # See if we can load this item from cache, or from the disk cache for larger items.
         content = get_cached_content(location)
+        if content is None:
+            content = get_disk_cached_content(location)
         if content is None:
             # Not in cache, so just try and load it from the asset manager.
             try:
@@ -288,15 +369,36 @@ class StaticContentServer(object):
                 raise
 
             # Now that we fetched it, let's go ahead and try to cache it. We cap this at 1MB
-            # because it's the default for memcached and also we don't want to do too much
-            # buffering in memory when we're serving an actual request.
-            if content.length is not None and content.length < 1048576:
+            # by default because it's the default for memcached and also we don't want to do
+            # too much buffering in memory when we're serving an actual request.  Larger
+            # assets are served from the disk cache, if it is enabled.
+            if content.length is not None and content.length < settings.CONTENTSERVER_MAX_CACHED_ASSET_SIZE:
                 content = content.copy_to_in_mem()
                 set_cached_content(content)
+            else:
+                content = set_disk_cached_content(content) or content
 
         return content
 
 
+def etag_matches(header_value, etag):
+    """
+    Returns whether the given If-None-Match header value matches the given entity tag.
+
+    If-None-Match uses the weak comparison, which ignores the weakness indicator of
+    the entity tags.  See spec for details: https://tools.ietf.org/html/rfc7232#section-3.2
+    """
+    if header_value.strip() == '*':
+        return True
+    for header_etag in header_value.split(','):
+        header_etag = header_etag.strip()
+        if header_etag.startswith('W/'):
+            header_etag = header_etag[2:]
+        if header_etag == etag:
+            return True
+    return False
+
+
 def parse_range_header(header_value, content_length):
     """
     Returns the unit and a list of (start, end) tuples of ranges.
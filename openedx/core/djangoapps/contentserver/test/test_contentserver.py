@@ -8,7 +8,10 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
 import six
+import tempfile
 import unittest
 from uuid import uuid4
 
@@ -30,7 +33,8 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
-from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
+from ..caching import DISK_CACHE_TEMP_PREFIX, _evict_disk_cached_content
+from ..middleware import etag_matches, parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
 
@@ -240,17 +244,148 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart/byteranges message
+        with a part for each range.
         """
-        first_byte = self.length_unlocked / 4
-        last_byte = self.length_unlocked / 2
+        first_byte = self.length_unlocked // 4
+        last_byte = self.length_unlocked // 2
         # pylint: disable=unicode-format-string
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
-        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
         self.assertNotIn('Content-Range', resp)
-        self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+        content_type, boundary = resp['Content-Type'].split('; boundary=')
+        self.assertEqual(content_type, 'multipart/byteranges')
+
+        data = self.contentstore.find(self.unlocked_asset).data
+        body = b''.join(resp.streaming_content)
+        self.assertEqual(resp['Content-Length'], str(len(body)))
+        parts = body.split(b'--' + boundary.encode('utf-8'))
+        self.assertEqual(parts[0], b'')
+        self.assertEqual(parts[-1], b'--\r\n')
+        expected_ranges = [(first_byte, last_byte), (self.length_unlocked - 100, self.length_unlocked - 1)]
+        for part, (first, last) in zip(parts[1:-1], expected_ranges):
+            headers, part_data = part.split(b'\r\n\r\n', 1)
+            self.assertIn(
+                u'Content-Range: bytes {}-{}/{}'.format(first, last, self.length_unlocked).encode('utf-8'), headers
+            )
+            self.assertEqual(part_data[:last - first + 1], data[first:last + 1])
+
+    def test_range_request_multiple_ranges_unsatisfiable(self):
+        """
+        Test that the unsatisfiable ranges of a request with multiple ranges are ignored.
+        """
+        resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-, 0-9'.format(
+            first=self.length_unlocked))
+
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
+        self.assertEqual(resp['Content-Range'], u'bytes 0-9/{}'.format(self.length_unlocked))
+        self.assertEqual(resp['Content-Length'], '10')
+
+    def test_disk_cache(self):
+        """
+        Test that assets too large for the cache are copied to the disk cache, named by
+        their digest, and served from there without loading them from the contentstore.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        content = self.contentstore.find(self.unlocked_asset)
+
+        with override_settings(CONTENTSERVER_DISK_CACHE_DIR=cache_dir, CONTENTSERVER_MAX_CACHED_ASSET_SIZE=0):
+            with patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content', return_value=None):
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(resp.status_code, 200)
+                self.assertEqual(b''.join(resp.streaming_content), content.data)
+                self.assertEqual(os.listdir(cache_dir), [content.content_digest])
+
+                with patch.object(AssetManager, 'find') as mock_find:
+                    resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9')
+                self.assertFalse(mock_find.called)
+                self.assertEqual(resp.status_code, 206)
+                self.assertEqual(b''.join(resp.streaming_content), content.data[:10])
+
+    def test_disk_cache_copy(self):
+        """
+        Test that assets are only copied to the disk cache by the requests that stream
+        them whole, one request at a time, and that incomplete copies are dropped.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        content = self.contentstore.find(self.unlocked_asset)
+        temp_path = os.path.join(cache_dir, DISK_CACHE_TEMP_PREFIX + content.content_digest)
+
+        with override_settings(
+            CONTENTSERVER_DISK_CACHE_DIR=cache_dir, CONTENTSERVER_MAX_CACHED_ASSET_SIZE=0,
+            CONTENTSERVER_STREAM_CHUNK_SIZE=1,
+        ):
+            with patch('openedx.core.djangoapps.contentserver.middleware.get_cached_content', return_value=None):
+                resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes=0-9')
+                self.assertEqual(b''.join(resp.streaming_content), content.data[:10])
+                self.assertEqual(os.listdir(cache_dir), [])
+
+                resp = self.client.get(self.url_unlocked)
+                next(iter(resp.streaming_content))
+                self.assertEqual(os.listdir(cache_dir), [os.path.basename(temp_path)])
+                resp.close()
+                self.assertEqual(os.listdir(cache_dir), [])
+
+                # Another request is copying the asset.
+                open(temp_path, 'wb').close()
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(b''.join(resp.streaming_content), content.data)
+                self.assertEqual(os.listdir(cache_dir), [os.path.basename(temp_path)])
+
+                # The other request abandoned its copy.
+                os.utime(temp_path, (0, 0))
+                resp = self.client.get(self.url_unlocked)
+                self.assertEqual(b''.join(resp.streaming_content), content.data)
+                self.assertEqual(os.listdir(cache_dir), [content.content_digest])
+
+    @override_settings(CONTENTSERVER_DISK_CACHE_MAX_SIZE=10)
+    def test_disk_cache_eviction(self):
+        """
+        Test that the least recently used copies are evicted when the disk cache grows
+        over its maximum size.
+        """
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        for mtime, filename in enumerate(['old', 'recent', '.tmp-copying']):
+            path = os.path.join(cache_dir, filename)
+            with open(path, 'wb') as cached_file:
+                cached_file.write(b'x' * 6)
+            os.utime(path, (mtime, mtime))
+
+        with override_settings(CONTENTSERVER_DISK_CACHE_DIR=cache_dir):
+            _evict_disk_cached_content()
+        self.assertEqual(sorted(os.listdir(cache_dir)), ['.tmp-copying', 'recent'])
+
+    def test_etag(self):
+        """
+        Test that assets are sent with a strong ETag, and that requests with a matching
+        If-None-Match are sent back a 304 Not Modified.
+        """
+        etag = u'"{}"'.format(self.contentstore.find(self.unlocked_asset).content_digest)
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['ETag'], etag)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+    def test_etag_precedence(self):
+        """
+        Test that If-Modified-Since is ignored when the request has an If-None-Match.
+        """
+        last_modified = self.client.get(self.url_unlocked)['Last-Modified']
+        resp = self.client.get(self.url_unlocked, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(resp.status_code, 304)
+
+        resp = self.client.get(
+            self.url_unlocked, HTTP_IF_MODIFIED_SINCE=last_modified, HTTP_IF_NONE_MATCH='"{}"'.format(FAKE_MD5_HASH)
+        )
+        self.assertEqual(resp.status_code, 200)
 
     @ddt.data(
         'bytes 0-',
@@ -402,6 +537,25 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         self.assertEqual(is_from_cdn, True)
 
 
+@ddt.ddt
+class EtagMatchesTestCase(unittest.TestCase):
+    """
+    Tests for the etag_matches function.
+    """
+    @ddt.data(
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ('*', True),
+        ('"xyz"', False),
+        ('abc', False),
+        ('', False),
+    )
+    @ddt.unpack
+    def test_etag_matches(self, header_value, expected_match):
+        self.assertEqual(etag_matches(header_value, '"abc"'), expected_match)
+
+
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
     """
@@ -3,16 +3,31 @@
 from __future__ import absolute_import
 
 import logging
+import os
+import threading
 from uuid import uuid4
 
 import requests
 import six
-from django.utils.translation import get_language
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection
+from django.utils.translation import get_language, override
+from requests.adapters import HTTPAdapter
 
 from .settings import SERVICE_HOST as COMMENTS_SERVICE
 
 log = logging.getLogger(__name__)
 
+# State of the calling thread that is handed over to the worker threads that
+# send comment service requests concurrently.
+_local = threading.local()  # pylint: disable=invalid-name
+
+# The process's pooled session with, and worker threads for requests to, the
+# comments service, along with the id of the process that created them.
+_transport_lock = threading.Lock()  # pylint: disable=invalid-name
+_transport = {}  # pylint: disable=invalid-name
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in six.iteritems(dic) if v is not None])
@@ -33,9 +48,7 @@ def extract(dic, keys):
 
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
-    # To avoid dependency conflict
-    from openedx.core.djangoapps.django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+    config = _get_forums_config()
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -63,7 +76,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = data_or_params.copy()
         params.update(request_id_dict)
-    response = requests.request(
+    response = _send_request(
         method,
         url,
         data=data,
@@ -102,6 +115,118 @@ def perform_request(method, url, data_or_params=None, raw=False,
             return data
 
 
+def start_concurrent_request(func, *args, **kwargs):
+    """
+    Starts calling the given function, which performs comment service
+    requests, with the given arguments, and returns an object whose result()
+    method returns the function's return value, or raises its exception.
+
+    When COMMENTS_SERVICE_CONCURRENT_REQUESTS is set, the function is called
+    in a worker thread, so that its requests are sent while the calling
+    thread goes on, for example to send other requests.  The forums config
+    and language of the calling thread are used by the worker thread.
+    Otherwise, the function is called right away in the calling thread.
+    """
+    executor = _get_executor()
+    if executor is None:
+        return _CompletedRequest(func(*args, **kwargs))
+    return executor.submit(_call_in_worker, _get_forums_config(), get_language(), func, args, kwargs)
+
+
+def _call_in_worker(config, language, func, args, kwargs):
+    """
+    Calls the given function with the given arguments in a worker thread,
+    using the given forums config and language of the calling thread.
+    """
+    _local.forums_config = config
+    try:
+        with override(language):
+            return func(*args, **kwargs)
+    finally:
+        _local.forums_config = None
+        connection.close()
+
+
+class _CompletedRequest(object):
+    """
+    The result of a function that performed comment service requests in the
+    calling thread, with the interface of a Future.
+    """
+    def __init__(self, result):
+        self._result = result
+
+    def result(self):
+        return self._result
+
+
+def _get_forums_config():
+    """
+    Returns the current forums config, or the one handed over by the calling
+    thread when called in a worker thread.
+    """
+    config = getattr(_local, 'forums_config', None)
+    if config is None:
+        # To avoid dependency conflict
+        from openedx.core.djangoapps.django_comment_common.models import ForumsConfig
+        config = ForumsConfig.current()
+    return config
+
+
+def _send_request(method, url, **kwargs):
+    """
+    Sends a request to the comments service, over a pooled keep-alive
+    connection when COMMENTS_SERVICE_MAX_CONNECTIONS is set.
+    """
+    session = _get_transport().get('session')
+    if session is None:
+        return requests.request(method, url, **kwargs)
+    return session.request(method, url, **kwargs)
+
+
+def _get_executor():
+    """
+    Returns the worker threads for concurrent comment service requests, or
+    None if concurrent requests are disabled.
+    """
+    return _get_transport().get('executor')
+
+
+def _get_transport():
+    """
+    Returns a dict of the pooled session and worker threads of this process,
+    creating them if needed, and after the process was forked.
+    """
+    pid = os.getpid()
+    with _transport_lock:
+        if _transport.get('pid') != pid:
+            _transport.clear()
+            _transport['pid'] = pid
+
+            max_connections = getattr(settings, 'COMMENTS_SERVICE_MAX_CONNECTIONS', 0)
+            if max_connections:
+                # The connections to the comments service are all pooled for
+                # the one host, of which at most max_connections are kept alive.
+                adapter = HTTPAdapter(pool_maxsize=max_connections)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _transport['session'] = session
+
+            concurrent_requests = getattr(settings, 'COMMENTS_SERVICE_CONCURRENT_REQUESTS', 0)
+            if concurrent_requests:
+                _transport['executor'] = ThreadPoolExecutor(max_workers=concurrent_requests)
+        return _transport
+
+
+def reset_transport():
+    """
+    Discards the pooled session and worker threads of this process, which
+    are created anew, from the current settings, when next needed.
+    """
+    with _transport_lock:
+        _transport.clear()
+
+
 class CommentClientError(Exception):
     pass
 
@@ -3,6 +3,11 @@ Django storage backends for Open edX.
 """
 from __future__ import absolute_import
 
+import mimetypes
+from contextlib import contextmanager
+from gzip import GzipFile
+from io import BytesIO
+
 from django.contrib.staticfiles.storage import StaticFilesStorage
 from django.core.files.storage import get_storage_class
 from django.utils.lru_cache import lru_cache
@@ -12,6 +17,13 @@ from storages.backends.s3boto import S3BotoStorage
 
 from openedx.core.djangoapps.theming.storage import ThemeCachedFilesMixin, ThemePipelineMixin, ThemeStorage
 
+# Size, in bytes, of the parts of the multipart uploads of reports.  S3
+# requires every part of a multipart upload but the last to be at least 5MB.
+MULTIPART_UPLOAD_PART_SIZE = 5 * 1024 * 1024
+
+# Number of bytes copied at once from a file being saved to its upload.
+UPLOAD_COPY_CHUNK_SIZE = 64 * 1024
+
 
 class PipelineForgivingStorage(PipelineCachedStorage):
     """
@@ -89,6 +101,101 @@ class S3ReportStorage(S3BotoStorage):  # pylint: disable=abstract-method
             self.custom_domain = custom_domain
         super(S3ReportStorage, self).__init__(acl=acl, bucket=bucket, **settings)
 
+    @contextmanager
+    def open_upload(self, name):
+        """
+        Context manager returning a binary file to write the content of the
+        file `name` to.  The content is gzipped, if gzip applies to its type,
+        and is uploaded in parts of MULTIPART_UPLOAD_PART_SIZE as it is written,
+        so that neither the content nor its gzipped copy is held in memory.
+        The upload is completed when the context exits, and cancelled if it
+        raises.
+        """
+        cleaned_name = self._clean_name(name)
+        content_type = mimetypes.guess_type(cleaned_name)[0] or self.key_class.DefaultContentType
+        gzipped = self.gzip and content_type in self.gzip_content_types
+        headers = self.headers.copy()
+        headers['Content-Type'] = content_type
+        if gzipped:
+            headers['Content-Encoding'] = 'gzip'
+        upload = self.bucket.initiate_multipart_upload(
+            self._encode_name(self._normalize_name(cleaned_name)),
+            headers=headers,
+            reduced_redundancy=self.reduced_redundancy,
+            encrypt_key=self.encryption,
+            policy=self.default_acl,
+        )
+        try:
+            upload_file = _MultipartUploadFile(upload)
+            if gzipped:
+                with GzipFile(mode='wb', fileobj=upload_file) as gzip_file:
+                    yield gzip_file
+            else:
+                yield upload_file
+            upload_file.close()
+            upload.complete_upload()
+        except Exception:
+            upload.cancel_upload()
+            raise
+
+    def _save(self, name, content):
+        """
+        Saves the content through a multipart upload when it is to be gzipped,
+        rather than compressing all of it in memory first.
+        """
+        content_type = getattr(content, 'content_type', None) or mimetypes.guess_type(name)[0]
+        if not (self.gzip and content_type in self.gzip_content_types):
+            return super(S3ReportStorage, self)._save(name, content)
+
+        content.seek(0)
+        with self.open_upload(name) as upload_file:
+            for chunk in iter(lambda: content.read(UPLOAD_COPY_CHUNK_SIZE), b''):
+                upload_file.write(chunk)
+        return self._clean_name(name)
+
+
+class _MultipartUploadFile(object):
+    """
+    Binary file uploading the data written to it as the parts of the given
+    boto multipart upload, once MULTIPART_UPLOAD_PART_SIZE bytes of it have
+    been written, and the rest of it when it is closed.
+    """
+    def __init__(self, upload):
+        self.upload = upload
+        self.part = BytesIO()
+        self.part_count = 0
+
+    def write(self, data):
+        """
+        Writes the data to the current part, and uploads the part once it is full.
+        """
+        self.part.write(data)
+        if self.part.tell() >= MULTIPART_UPLOAD_PART_SIZE:
+            self._upload_part()
+
+    def flush(self):
+        """
+        Does nothing, since parts smaller than MULTIPART_UPLOAD_PART_SIZE can
+        only be uploaded last.
+        """
+        pass
+
+    def close(self):
+        """
+        Uploads the last part, which is the only one if nothing was uploaded yet.
+        """
+        if self.part.tell() or not self.part_count:
+            self._upload_part()
+
+    def _upload_part(self):
+        """
+        Uploads the current part and starts the next one.
+        """
+        self.part_count += 1
+        self.part.seek(0)
+        self.upload.upload_part_from_file(self.part, self.part_count)
+        self.part = BytesIO()
+
 
 @lru_cache()
 def get_storage(storage_class=None, **kwargs):